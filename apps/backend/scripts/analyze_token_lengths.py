@@ -1,63 +1,46 @@
 #!/usr/bin/env python3
-"""Analyze token length distribution of training samples."""
-
-import json
-from pathlib import Path
-
-import tiktoken
-
-
-# Use cl100k_base (similar to GPT-4, Qwen uses similar tokenizer)
-enc = tiktoken.get_encoding("cl100k_base")
+"""Analyze token length distribution of training samples and plan packing.
 
+Token counts are computed once per export (threaded tiktoken batch encoding)
+and cached in a ``<export>.tokens.json`` sidecar; see ``training.token_stats``.
+With ``--plan-output`` the training file's samples are packed into
+``--max-seq-length`` sequences and the plan is written for
+``sft_train.py --packing_plan``.
 
-def count_tokens(conv: list[dict]) -> int:
-    """Count tokens in a conversation including tool calls and results."""
-    total = 0
-    for msg in conv:
-        # Count the main content/value field
-        content = msg.get("content", "") or msg.get("value", "") or ""
-        total += len(enc.encode(content))
+Usage:
+    uv run python scripts/analyze_token_lengths.py
 
-        # Count tool calls (assistant messages with function calls)
-        tool_calls = msg.get("tool_calls", [])
-        for tc in tool_calls:
-            # Function name
-            func = tc.get("function", {})
-            total += len(enc.encode(func.get("name", "")))
-            # Arguments (often JSON)
-            total += len(enc.encode(func.get("arguments", "")))
+    uv run python scripts/analyze_token_lengths.py \\
+        --train data/train.jsonl.gz --val data/val.jsonl.gz \\
+        --max-seq-length 8192 --plan-output data/train.packing.json
+"""
 
-        # Add overhead for role tokens and structure
-        total += 4
-    return total
+from __future__ import annotations
 
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
 
-def main():
-    # Load training data
-    train_path = Path("data/train.jsonl")
-    val_path = Path("data/val.jsonl")
+from training.token_stats import (
+    DEFAULT_ENCODING,
+    count_export_tokens,
+    padded_tokens,
+    plan_packing,
+    tiktoken_batch_encoder,
+)
 
-    train_lengths = []
-    val_lengths = []
 
-    print("Analyzing training data...")
-    with open(train_path) as f:
-        for line in f:
-            sample = json.loads(line)
-            conv = sample.get("conversations", [])
-            tokens = count_tokens(conv)
-            train_lengths.append(tokens)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 
-    print("Analyzing validation data...")
-    with open(val_path) as f:
-        for line in f:
-            sample = json.loads(line)
-            conv = sample.get("conversations", [])
-            tokens = count_tokens(conv)
-            val_lengths.append(tokens)
 
+def print_distribution(train_lengths: list[int], val_lengths: list[int]) -> None:
+    """Print summary statistics and context-window coverage."""
     all_lengths = train_lengths + val_lengths
+    if not all_lengths:
+        print("No samples found")
+        return
 
     print("\n=== Token Length Distribution ===")
     print(f"Training samples: {len(train_lengths)}")
@@ -71,7 +54,7 @@ def main():
     # Percentiles
     sorted_lengths = sorted(all_lengths)
     for p in [50, 75, 90, 95, 99]:
-        idx = int(len(sorted_lengths) * p / 100)
+        idx = min(int(len(sorted_lengths) * p / 100), len(sorted_lengths) - 1)
         print(f"P{p}: {sorted_lengths[idx]:,}")
 
     print()
@@ -89,5 +72,71 @@ def main():
             print(f"> {threshold:,}: {len(exceeds)} samples (max: {max(exceeds):,})")
 
 
+def print_packing(
+    lengths: list[int], max_seq_length: int, batch_size: int, plan_output: Path | None
+) -> None:
+    """Compare padded batches with a packing plan; optionally save the plan."""
+    if not lengths:
+        return
+    plan = plan_packing(lengths, max_seq_length)
+    real = sum(min(length, max_seq_length) for length in lengths)
+    padded = padded_tokens(lengths, batch_size, max_seq_length)
+
+    print()
+    print(f"=== Packing into {max_seq_length:,}-token sequences (train) ===")
+    print(
+        f"Unpacked (batch size {batch_size}): {padded:,} token slots, "
+        f"{100 * (1 - real / padded):.1f}% padding"
+    )
+    print(
+        f"Packed: {plan.num_sequences:,} sequences for {len(lengths):,} samples, "
+        f"{100 * (1 - plan.utilization):.1f}% padding"
+    )
+    if plan.oversize:
+        print(f"Truncated (longer than max): {len(plan.oversize)} samples")
+
+    if plan_output is not None:
+        plan_output.write_text(json.dumps(plan.to_dict()))
+        print(f"Wrote packing plan to {plan_output}")
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Analyze SFT token lengths")
+    parser.add_argument("--train", type=Path, default=Path("data/train.jsonl"))
+    parser.add_argument("--val", type=Path, default=Path("data/val.jsonl"))
+    parser.add_argument("--encoding", default=DEFAULT_ENCODING)
+    parser.add_argument(
+        "--threads", type=int, default=None, help="Encoder threads (default: CPUs)"
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore and skip the count sidecar"
+    )
+    parser.add_argument("--max-seq-length", type=int, default=4096)
+    parser.add_argument("--batch-size", type=int, default=2)
+    parser.add_argument(
+        "--plan-output", type=Path, help="Write the train packing plan here"
+    )
+    args = parser.parse_args()
+
+    encode = None
+    if args.threads is not None:
+        encode = tiktoken_batch_encoder(args.encoding, args.threads)
+
+    def lengths(path: Path) -> list[int]:
+        if not path.exists():
+            return []
+        print(f"Analyzing {path}...")
+        return count_export_tokens(
+            path, args.encoding, encode=encode, use_cache=not args.no_cache
+        )
+
+    train_lengths = lengths(args.train)
+    val_lengths = lengths(args.val)
+    print_distribution(train_lengths, val_lengths)
+    print_packing(train_lengths, args.max_seq_length, args.batch_size, args.plan_output)
+    return 0
+
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
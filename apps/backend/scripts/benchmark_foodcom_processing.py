@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""Benchmark Food.com DAPT preprocessing: legacy row loop vs chunked pipeline.
+
+``legacy`` is the previous implementation: one ``read_csv`` of the whole
+file, ``literal_eval`` per list cell and ``iterrows`` + ``format_recipe`` per
+row (reviews: ``iterrows`` over the filtered frame). ``chunked`` is
+``write_recipes_jsonl`` / ``write_reviews_jsonl`` as shipped, run once per
+``--workers`` value. Every run's output is hashed and must match the legacy
+bytes exactly.
+
+Without ``--input-dir`` a synthetic dataset shaped like Food.com (list
+columns as Python reprs, apostrophes, occasional double quotes, non-ASCII,
+missing descriptions and reviews) is generated in a temporary directory.
+
+Usage:
+    PYTHONPATH=./src uv run python scripts/benchmark_foodcom_processing.py
+    PYTHONPATH=./src uv run python scripts/benchmark_foodcom_processing.py \\
+        --input-dir ./data/foodcom --workers 1 4 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from training.dapt.process_foodcom import (
+    MIN_REVIEW_LENGTH,
+    SUBSTITUTION_PATTERNS,
+    format_recipe,
+    safe_literal_eval,
+    write_recipes_jsonl,
+    write_reviews_jsonl,
+)
+
+
+WORDS = (
+    "chicken",
+    "garlic",
+    "mom's",
+    "jalapeño",
+    "crème fraîche",
+    "olive oil",
+    "salt",
+    "butter",
+    "basil",
+)
+
+
+@dataclass
+class RunResult:
+    """Timing and output digest of one run."""
+
+    name: str
+    seconds: float
+    records: int
+    digest: str
+
+
+def generate_dataset(directory: Path, recipes: int, seed: int = 7) -> None:
+    """Write synthetic RAW_recipes.csv and RAW_interactions.csv files."""
+    rng = random.Random(seed)
+
+    def phrase(n: int) -> list[str]:
+        # ~1% of items carry double quotes and take the literal_eval fallback
+        return [
+            " ".join(rng.choices(WORDS, k=rng.randint(1, 4)))
+            + (' "extra"' if rng.random() < 0.01 else "")
+            for _ in range(n)
+        ]
+
+    pd.DataFrame(
+        {
+            "name": [f"recipe {i} {rng.choice(WORDS)}  " for i in range(recipes)],
+            "id": range(recipes),
+            "minutes": [rng.randint(1, 240) for _ in range(recipes)],
+            "tags": [str(phrase(rng.randint(0, 12))) for _ in range(recipes)],
+            "steps": [str(phrase(rng.randint(0, 10))) for _ in range(recipes)],
+            "description": [
+                " ".join(phrase(3)) if rng.random() < 0.8 else None
+                for _ in range(recipes)
+            ],
+            "ingredients": [str(phrase(rng.randint(0, 15))) for _ in range(recipes)],
+        }
+    ).to_csv(directory / "RAW_recipes.csv", index=False)
+
+    reviews = recipes * 5
+    tips = ("I used yogurt instead of cream. ", "Substituted honey. ", "")
+    pd.DataFrame(
+        {
+            "user_id": [rng.randint(1, 10_000) for _ in range(reviews)],
+            "recipe_id": [rng.randrange(recipes) for _ in range(reviews)],
+            "rating": [rng.randint(0, 5) for _ in range(reviews)],
+            "review": [
+                rng.choice(tips) + " ".join(phrase(rng.randint(1, 8)))
+                if rng.random() < 0.97
+                else None
+                for _ in range(reviews)
+            ],
+        }
+    ).to_csv(directory / "RAW_interactions.csv", index=False)
+
+
+def legacy_recipes(input_dir: Path, output: Path) -> int:
+    """The previous whole-file ``iterrows`` recipe pipeline."""
+    recipes = pd.read_csv(input_dir / "RAW_recipes.csv")
+    for column in ("steps", "ingredients", "tags"):
+        recipes[column] = recipes[column].apply(safe_literal_eval)
+    count = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for _, row in recipes.iterrows():
+            text = format_recipe(row)
+            f.write(json.dumps({"text": text}, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def legacy_reviews(input_dir: Path, output: Path) -> int:
+    """The previous whole-file ``iterrows`` review pipeline."""
+    reviews = pd.read_csv(input_dir / "RAW_interactions.csv")
+    mask = reviews["review"].str.contains(SUBSTITUTION_PATTERNS, case=False, na=False)
+    count = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for _, row in reviews[mask].iterrows():
+            review = row.get("review", "")
+            if pd.isna(review) or len(str(review)) < MIN_REVIEW_LENGTH:
+                continue
+            text = f"Cook's Tip: {str(review).strip()}"
+            f.write(json.dumps({"text": text}, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def timed(name: str, run: Callable[[Path], int], output: Path) -> RunResult:
+    """Run ``run(output)`` and hash what it wrote."""
+    start = time.perf_counter()
+    records = run(output)
+    seconds = time.perf_counter() - start
+    digest = hashlib.sha256(output.read_bytes()).hexdigest()
+    return RunResult(name, seconds, records, digest)
+
+
+def print_report(title: str, results: list[RunResult]) -> bool:
+    """Print one table; return True if every digest matches the first run."""
+    baseline = results[0]
+    print(f"\n{title}")
+    header = f"{'run':<14} {'seconds':>9} {'speedup':>8} {'records':>9}  identical"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.name:<14} {result.seconds:>9.2f} "
+            f"{baseline.seconds / result.seconds:>7.1f}x {result.records:>9,}  "
+            f"{result.digest == baseline.digest}"
+        )
+    return all(result.digest == baseline.digest for result in results)
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Food.com preprocessing (legacy vs chunked)",
+    )
+    parser.add_argument("--input-dir", type=Path, help="Real Food.com CSV directory")
+    parser.add_argument(
+        "--recipes",
+        type=int,
+        default=50_000,
+        help="Synthetic recipes to generate (reviews = 5x)",
+    )
+    parser.add_argument("--chunksize", type=int, default=20_000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        input_dir = args.input_dir
+        if input_dir is None:
+            input_dir = workdir
+            generate_dataset(input_dir, args.recipes)
+
+        recipe_runs = [
+            timed(
+                "legacy",
+                lambda out: legacy_recipes(input_dir, out),
+                workdir / "legacy_recipes.jsonl",
+            )
+        ]
+        review_runs = [
+            timed(
+                "legacy",
+                lambda out: legacy_reviews(input_dir, out),
+                workdir / "legacy_reviews.jsonl",
+            )
+        ]
+        for workers in args.workers:
+            recipe_runs.append(
+                timed(
+                    f"chunked x{workers}",
+                    lambda out, w=workers: write_recipes_jsonl(
+                        input_dir, out, args.chunksize, w
+                    ),
+                    workdir / f"recipes_{workers}.jsonl",
+                )
+            )
+            review_runs.append(
+                timed(
+                    f"chunked x{workers}",
+                    lambda out, w=workers: write_reviews_jsonl(
+                        input_dir, out, args.chunksize, w
+                    ),
+                    workdir / f"reviews_{workers}.jsonl",
+                )
+            )
+
+    identical = print_report("Recipes", recipe_runs)
+    identical &= print_report("Reviews", review_runs)
+    if not identical:
+        print("\nERROR: chunked output differs from legacy output")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
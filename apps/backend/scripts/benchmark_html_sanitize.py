@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""Benchmark parse + sanitize + Markdown time for recipe pages per parser backend.
+
+Runs ``HTMLExtractionService._sanitize_html`` followed by
+``MarkdownConversionService.convert`` over a corpus of saved recipe pages for
+each BeautifulSoup tree builder and prints per-stage timings.
+
+Usage:
+    # Benchmark a directory of saved pages (*.html / *.htm)
+    PYTHONPATH=./src uv run python scripts/benchmark_html_sanitize.py \\
+        --corpus ~/recipe-pages
+
+    # No corpus at hand: use generated recipe pages with typical boilerplate
+    PYTHONPATH=./src uv run python scripts/benchmark_html_sanitize.py \\
+        --synthetic 200 --repeat 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from services.ai.html_extractor import SUPPORTED_HTML_PARSERS, HTMLExtractionService
+from services.ai.markdown_converter import MarkdownConversionService
+
+
+BASE_URL = "https://example.com/recipes/benchmark"
+
+
+@dataclass
+class StageTimings:
+    """Per-page timings (milliseconds) collected for one parser backend."""
+
+    sanitize_ms: list[float] = field(default_factory=list)
+    markdown_ms: list[float] = field(default_factory=list)
+
+    @property
+    def total_ms(self) -> list[float]:
+        return [s + m for s, m in zip(self.sanitize_ms, self.markdown_ms, strict=True)]
+
+
+def load_corpus(corpus_dir: Path) -> list[str]:
+    """Read every saved HTML page in ``corpus_dir``."""
+    pages = [
+        path.read_text(encoding="utf-8", errors="replace")
+        for path in sorted(corpus_dir.rglob("*"))
+        if path.suffix.lower() in {".html", ".htm"}
+    ]
+    if not pages:
+        raise SystemExit(f"No .html/.htm files found in {corpus_dir}")
+    return pages
+
+
+def build_synthetic_page(index: int) -> str:
+    """Build a recipe page shaped like a typical food blog post."""
+    ingredients = "".join(
+        f'<li class="wprm-recipe-ingredient" data-id="{i}">'
+        f"{i + 1} cups ingredient {i} <span class='notes'>(chopped)</span></li>"
+        for i in range(15)
+    )
+    steps = "".join(
+        f'<li class="wprm-recipe-instruction" style="margin:0">'
+        f"Step {i + 1}: stir the mixture and cook for {i + 2} minutes.</li>"
+        for i in range(10)
+    )
+    comments = "".join(
+        f'<div class="comment" id="c{i}"><p>Loved it! Made it {i} times.</p></div>'
+        for i in range(40)
+    )
+    related = "".join(
+        f'<a class="related-link" href="/recipe/{i}"><img src="/img/{i}.jpg"></a>'
+        for i in range(30)
+    )
+    filler = "".join(
+        f"<p>Story paragraph {i} about why this dish matters to the family.</p>"
+        for i in range(30)
+    )
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="utf-8"><title>Benchmark Recipe {index}</title>
+  <link rel="stylesheet" href="/style.css">
+  <script>window.dataLayer = [];</script>
+  <style>body {{ font-family: sans-serif; }}</style>
+</head>
+<body class="has-sidebar single-post">
+  <header><nav class="site-nav"><a href="/">Home</a></nav></header>
+  <main>
+    <article class="post">
+      <div class="entry-content">{filler}
+        <div class="wprm-recipe" itemtype="http://schema.org/Recipe">
+          <h2>Benchmark Recipe {index}</h2>
+          <ul>{ingredients}</ul>
+          <ol>{steps}</ol>
+          <div class="social-share"><button>Pin</button></div>
+        </div>
+      </div>
+      <div class="related-posts">{related}</div>
+      <section id="comments">{comments}</section>
+    </article>
+  </main>
+  <aside class="sidebar"><form><input name="email"></form></aside>
+  <footer>Footer links</footer>
+  <!-- analytics -->
+  <script src="/ads.js"></script>
+</body>
+</html>"""
+
+
+def run_backend(parser: str, pages: list[str], repeat: int) -> StageTimings:
+    """Time sanitize and Markdown conversion for every page ``repeat`` times."""
+    extractor = HTMLExtractionService(parser=parser)
+    converter = MarkdownConversionService()
+    timings = StageTimings()
+
+    for _ in range(repeat):
+        for page in pages:
+            start = time.perf_counter()
+            sanitized = extractor._sanitize_html(page, BASE_URL)
+            sanitized_at = time.perf_counter()
+            converter.convert(sanitized)
+            done = time.perf_counter()
+
+            timings.sanitize_ms.append((sanitized_at - start) * 1000)
+            timings.markdown_ms.append((done - sanitized_at) * 1000)
+
+    return timings
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def print_report(results: dict[str, StageTimings], page_count: int) -> None:
+    """Print a per-backend summary table."""
+    print(f"\nPages: {page_count}")
+    header = (
+        f"{'parser':<12} {'sanitize p50':>13} {'markdown p50':>13} "
+        f"{'total p50':>10} {'total p95':>10} {'total sum':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+
+    sums: dict[str, float] = {}
+    for parser, timings in results.items():
+        total = timings.total_ms
+        sums[parser] = sum(total)
+        print(
+            f"{parser:<12} "
+            f"{statistics.median(timings.sanitize_ms):>11.2f}ms "
+            f"{statistics.median(timings.markdown_ms):>11.2f}ms "
+            f"{statistics.median(total):>8.2f}ms "
+            f"{_percentile(total, 0.95):>8.2f}ms "
+            f"{sums[parser]:>9.0f}ms"
+        )
+
+    if "html.parser" in sums and len(sums) > 1:
+        baseline = sums["html.parser"]
+        for parser, total in sums.items():
+            if parser != "html.parser" and total > 0:
+                print(f"\n{parser} speedup vs html.parser: {baseline / total:.2f}x")
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark HTML sanitization parser backends",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument(
+        "--corpus",
+        type=Path,
+        help="Directory of saved recipe pages (*.html / *.htm)",
+    )
+    source.add_argument(
+        "--synthetic",
+        type=int,
+        default=100,
+        help="Number of generated pages when no corpus is given (default: 100)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Passes over the corpus per backend"
+    )
+    parser.add_argument(
+        "--parsers",
+        nargs="+",
+        choices=SUPPORTED_HTML_PARSERS,
+        default=list(SUPPORTED_HTML_PARSERS),
+        help="Parser backends to compare",
+    )
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus.expanduser())
+    else:
+        pages = [build_synthetic_page(i) for i in range(args.synthetic)]
+
+    results: dict[str, StageTimings] = {}
+    for backend in args.parsers:
+        try:
+            results[backend] = run_backend(backend, pages, args.repeat)
+        except Exception as exc:  # e.g. lxml missing from the environment
+            print(f"Skipping {backend}: {exc}", file=sys.stderr)
+
+    if not results:
+        return 1
+
+    print_report(results, len(pages) * args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
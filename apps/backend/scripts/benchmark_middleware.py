@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Benchmark the request middlewares: BaseHTTPMiddleware vs pure ASGI.
+
+Builds a small FastAPI app with a JSON endpoint and an SSE endpoint, wraps it
+in ``CorrelationIdMiddleware`` + ``ExceptionNormalizationMiddleware`` and
+drives it in-process through the raw ASGI interface (no server, no socket), so
+the numbers isolate middleware overhead. The ``legacy`` stack re-creates the
+previous ``BaseHTTPMiddleware`` implementations for comparison.
+
+Reported per stack:
+    * JSON requests/sec at the given concurrency
+    * SSE chunk latency: time from the endpoint yielding a chunk to the chunk
+      reaching the server's ``send`` (p50 / p95 / max)
+
+Usage:
+    PYTHONPATH=./src uv run python scripts/benchmark_middleware.py
+    PYTHONPATH=./src uv run python scripts/benchmark_middleware.py \\
+        --requests 20000 --concurrency 50 --streams 50 --chunks 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.types import ASGIApp, Message
+
+from core.error_handler import (
+    ExceptionNormalizationMiddleware,
+    global_exception_handler,
+    set_correlation_id,
+)
+from core.middleware import CorrelationIdMiddleware
+
+
+class LegacyCorrelationIdMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, for comparison."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        correlation_id = request.headers.get("X-Correlation-ID") or str(uuid.uuid4())
+        set_correlation_id(correlation_id)
+        request.state.correlation_id = correlation_id
+        response = await call_next(request)
+        response.headers["X-Correlation-ID"] = correlation_id
+        return response
+
+
+class LegacyExceptionNormalizationMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware implementation, for comparison."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        try:
+            return await call_next(request)
+        except Exception as exc:  # noqa: BLE001
+            return await global_exception_handler(request, exc)
+
+
+STACKS = {
+    "legacy": (LegacyCorrelationIdMiddleware, LegacyExceptionNormalizationMiddleware),
+    "asgi": (CorrelationIdMiddleware, ExceptionNormalizationMiddleware),
+}
+
+
+@dataclass
+class StackResult:
+    """Measurements for one middleware stack."""
+
+    requests_per_second: float = 0.0
+    chunk_latency_ms: list[float] = field(default_factory=list)
+
+
+def build_app(stack: str, chunks: int, chunk_interval: float) -> ASGIApp:
+    """Build the benchmark app wrapped in the given middleware stack."""
+    app = FastAPI()
+    correlation, normalization = STACKS[stack]
+    app.add_middleware(correlation)
+    app.add_middleware(normalization)
+
+    @app.get("/ping")
+    async def ping() -> dict[str, bool]:
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def events() -> AsyncIterator[str]:
+            for _ in range(chunks):
+                await asyncio.sleep(chunk_interval)
+                # The chunk carries its own yield timestamp
+                yield f"data: {time.perf_counter()!r}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+async def call(app: ASGIApp, path: str, on_body: list[float] | None = None) -> None:
+    """Run one GET request through ``app``; record chunk latencies if asked."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Park like a real server until the client disconnects
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        if on_body is None or message["type"] != "http.response.body":
+            return
+        body = message.get("body", b"")
+        if body.startswith(b"data: "):
+            sent_at = float(body[6:].strip())
+            on_body.append((time.perf_counter() - sent_at) * 1000)
+
+    await app(scope, receive, send)
+
+
+async def run_stack(stack: str, args: argparse.Namespace) -> StackResult:
+    """Measure JSON throughput and SSE chunk latency for one stack."""
+    app = build_app(stack, args.chunks, args.chunk_interval)
+    result = StackResult()
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await call(app, "/ping")
+
+    await asyncio.gather(*(one() for _ in range(min(200, args.requests))))  # warm up
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    result.requests_per_second = args.requests / (time.perf_counter() - start)
+
+    await asyncio.gather(
+        *(call(app, "/stream", result.chunk_latency_ms) for _ in range(args.streams))
+    )
+    return result
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def print_report(results: dict[str, StackResult]) -> None:
+    """Print a per-stack summary table."""
+    header = (
+        f"{'stack':<8} {'req/s':>10} {'chunk p50':>11} {'chunk p95':>11} "
+        f"{'chunk max':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    for stack, result in results.items():
+        latency = result.chunk_latency_ms
+        print(
+            f"{stack:<8} {result.requests_per_second:>10.0f} "
+            f"{statistics.median(latency):>9.3f}ms "
+            f"{_percentile(latency, 0.95):>9.3f}ms "
+            f"{max(latency):>9.3f}ms"
+        )
+
+    if {"legacy", "asgi"} <= results.keys():
+        legacy, asgi = results["legacy"], results["asgi"]
+        print(
+            f"\nThroughput asgi vs legacy: "
+            f"{asgi.requests_per_second / legacy.requests_per_second:.2f}x"
+        )
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark BaseHTTPMiddleware vs pure ASGI middlewares",
+    )
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--streams", type=int, default=20, help="Concurrent SSE")
+    parser.add_argument("--chunks", type=int, default=50, help="Chunks per stream")
+    parser.add_argument(
+        "--chunk-interval",
+        type=float,
+        default=0.002,
+        help="Seconds the SSE endpoint waits between chunks",
+    )
+    parser.add_argument(
+        "--stacks", nargs="+", choices=list(STACKS), default=list(STACKS)
+    )
+    args = parser.parse_args()
+
+    results = {stack: asyncio.run(run_stack(stack, args)) for stack in args.stacks}
+    print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
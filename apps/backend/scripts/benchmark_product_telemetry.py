@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Benchmark product telemetry overhead on a simulated chat turn.
+
+Each simulated turn opens an ``assistant_message`` span, emits ``--chunks``
+SSE chunks and records a product telemetry event every ``--event-every``
+chunks (tool started/completed, message started/completed), then ends the
+span. Spans go to a real OpenTelemetry SDK ``TracerProvider`` whose exporter
+sleeps ``--export-delay-ms`` per export to stand in for a network exporter.
+
+Modes:
+    * ``off``      - observability disabled (no-op span, no exporter)
+    * ``legacy``   - previous behaviour: one ``set_attribute`` per attribute,
+      every span event kept, spans exported synchronously on end
+    * ``pipeline`` - ``record_product_telemetry_event`` as shipped: one
+      ``set_attributes`` call, sampled span events, metrics via the bounded
+      background queue, spans exported by a ``BatchSpanProcessor``
+
+Reported per mode: telemetry cost per event (p50 / p95) and end-to-end turn
+time, which includes span end (and so any synchronous export).
+
+Usage:
+    PYTHONPATH=./src uv run python scripts/benchmark_product_telemetry.py
+    PYTHONPATH=./src uv run python scripts/benchmark_product_telemetry.py \\
+        --turns 500 --chunks 100 --export-delay-ms 5 \\
+        --sample-rates "assistant_tool_started=0.1,*=1"
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    SimpleSpanProcessor,
+    SpanExporter,
+    SpanExportResult,
+)
+
+from core.observability import (
+    ProductTelemetryEventName,
+    _NoOpTracer,
+    build_product_telemetry_attributes,
+    get_product_telemetry_exporter,
+    get_product_telemetry_sample_rates,
+    record_product_telemetry_event,
+    shutdown_product_telemetry_exporter,
+)
+
+
+MODES = ("off", "legacy", "pipeline")
+
+EVENT_CYCLE = (
+    ProductTelemetryEventName.ASSISTANT_TOOL_STARTED,
+    ProductTelemetryEventName.ASSISTANT_TOOL_COMPLETED,
+)
+
+
+class SlowExporter(SpanExporter):
+    """Exporter that sleeps per export call, like a network round trip."""
+
+    def __init__(self, delay_seconds: float) -> None:
+        self.delay_seconds = delay_seconds
+        self.exported = 0
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        time.sleep(self.delay_seconds)
+        self.exported += len(spans)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        return None
+
+
+def legacy_record(span: Any, **kwargs: Any) -> None:
+    """The previous ``record_product_telemetry_event`` body, for comparison."""
+    attrs = build_product_telemetry_attributes(**kwargs)
+    for key, value in attrs.items():
+        if key == "product.telemetry.event":
+            continue
+        span.set_attribute(key, value)
+    span.add_event(kwargs["event"].value, attributes=attrs)
+
+
+@dataclass
+class ModeResult:
+    """Measurements for one mode."""
+
+    event_cost_us: list[float] = field(default_factory=list)
+    turn_ms: list[float] = field(default_factory=list)
+
+
+def build_tracer(mode: str, export_delay: float) -> tuple[Any, TracerProvider | None]:
+    """Return the tracer for ``mode`` and its provider (if any)."""
+    if mode == "off":
+        return _NoOpTracer(), None
+    provider = TracerProvider()
+    exporter = SlowExporter(export_delay)
+    if mode == "legacy":
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+    return provider.get_tracer(__name__), provider
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> ModeResult:
+    """Simulate ``args.turns`` chat turns under ``mode``."""
+    tracer, provider = build_tracer(mode, args.export_delay_ms / 1000)
+    record: Callable[..., Any] = (
+        legacy_record if mode == "legacy" else record_product_telemetry_event
+    )
+    result = ModeResult()
+
+    for turn in range(args.turns):
+        turn_start = time.perf_counter()
+        with tracer.start_as_current_span("assistant_message") as span:
+            for chunk in range(args.chunks):
+                _chunk = f"data: {chunk}\n\n"  # SSE chunk emission stand-in
+                if chunk % args.event_every:
+                    continue
+                event = EVENT_CYCLE[(chunk // args.event_every) % len(EVENT_CYCLE)]
+                start = time.perf_counter()
+                record(
+                    span,
+                    event=event,
+                    feature_name="assistant",
+                    request_id=f"req-{turn}",
+                    conversation_id=f"conv-{turn}",
+                    latency_ms=chunk,
+                    tool_count=1,
+                    tool_names=["search_recipes"],
+                    streamed=True,
+                )
+                result.event_cost_us.append((time.perf_counter() - start) * 1e6)
+        result.turn_ms.append((time.perf_counter() - turn_start) * 1000)
+
+    if provider is not None:
+        provider.shutdown()
+    return result
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+def print_report(results: dict[str, ModeResult]) -> None:
+    """Print a per-mode summary table."""
+    header = (
+        f"{'mode':<9} {'event p50':>11} {'event p95':>11} "
+        f"{'turn p50':>11} {'turn p95':>11}"
+    )
+    print(header)
+    print("-" * len(header))
+    for mode, result in results.items():
+        print(
+            f"{mode:<9} "
+            f"{statistics.median(result.event_cost_us):>9.1f}us "
+            f"{_percentile(result.event_cost_us, 0.95):>9.1f}us "
+            f"{statistics.median(result.turn_ms):>9.3f}ms "
+            f"{_percentile(result.turn_ms, 0.95):>9.3f}ms"
+        )
+
+    if {"off", "pipeline"} <= results.keys():
+        off, pipeline = results["off"], results["pipeline"]
+        overhead = statistics.median(pipeline.turn_ms) - statistics.median(off.turn_ms)
+        print(f"\nPipeline overhead per turn vs off: {overhead:.3f}ms")
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark product telemetry overhead on simulated chat turns",
+    )
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--chunks", type=int, default=50, help="SSE chunks per turn")
+    parser.add_argument(
+        "--event-every",
+        type=int,
+        default=5,
+        help="Record a telemetry event every N chunks",
+    )
+    parser.add_argument(
+        "--export-delay-ms",
+        type=float,
+        default=2.0,
+        help="Simulated exporter latency per export call",
+    )
+    parser.add_argument(
+        "--sample-rates",
+        default="",
+        help="PRODUCT_TELEMETRY_SAMPLE_RATES for the pipeline mode",
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    os.environ["PRODUCT_TELEMETRY_SAMPLE_RATES"] = args.sample_rates
+    get_product_telemetry_sample_rates.cache_clear()
+    get_product_telemetry_exporter()  # start the worker outside the timings
+
+    results = {mode: run_mode(mode, args) for mode in args.modes}
+    shutdown_product_telemetry_exporter()
+    print_report(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -30,24 +30,44 @@ Usage:
 
     # Full tool outputs for long context training (8K-16K)
     uv run python scripts/export_training_data.py --output out.jsonl --full-tool-outputs
+
+    # Large exports: gzip shards of 50k samples, 8 conversion processes
+    uv run python scripts/export_training_data.py \\
+        --output train.jsonl --val-output val.jsonl \\
+        --compression gzip --shard-size 50000 --workers 8
+
+Samples are streamed from a server-side cursor and converted in a process
+pool, so memory stays flat as the table grows. The train/validation split is
+a hash of the conversation id salted with ``--seed``: reproducible without
+shuffling, and every turn of a conversation lands on the same side.
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import gzip
+import hashlib
 import json
 import logging
-import random
+import multiprocessing
+import os
 import sys
 import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from datetime import UTC, datetime, timedelta
-from typing import Literal
+from functools import partial
+from typing import IO, Any, Literal, NamedTuple
 
 from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies.db import AsyncSessionLocal
+from models.ai_training_prompt_blobs import AITrainingPromptBlob
 from models.ai_training_samples import AITrainingSample
+from services.chat_agent.training_capture import rehydrate_prompt
 
 
 logging.basicConfig(
@@ -56,6 +76,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+type Compression = Literal["none", "gzip", "zstd"]
+
+_COMPRESSION_SUFFIXES: dict[str, str] = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
 
 def _parse_raw_prompt(
     raw_prompt: str,
@@ -105,8 +130,129 @@ def _parse_raw_prompt(
     return messages, tools
 
 
-def _sample_to_chatml(sample: AITrainingSample) -> dict | None:
-    """Convert a training sample to the native API format for SFT.
+def _is_delta_encoded(sample: AITrainingSample) -> bool:
+    return sample.prompt_prefix_length is not None
+
+
+def _without_system(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    if messages and messages[0].get("role") == "system":
+        return messages[1:]
+    return messages
+
+
+def _rehydrate_sample(
+    sample_id: uuid.UUID,
+    rows: dict[uuid.UUID, AITrainingSample],
+    blobs: dict[str, str],
+    cache: dict[uuid.UUID, dict[str, Any]],
+) -> dict[str, Any]:
+    """Rebuild one delta-encoded prompt, reusing already rebuilt ancestors."""
+    if sample_id in cache:
+        return cache[sample_id]
+    row = rows[sample_id]
+    parent_messages = None
+    if row.prompt_prefix_length:
+        if row.parent_sample_id not in rows:
+            raise ValueError(f"parent of sample {sample_id} is missing")
+        parent = _rehydrate_sample(row.parent_sample_id, rows, blobs, cache)
+        parent_messages = _without_system(parent["messages"])
+    for content_hash in (row.system_prompt_hash, row.tools_hash):
+        if content_hash is not None and content_hash not in blobs:
+            raise ValueError(f"prompt blob {content_hash} is missing")
+    prompt = rehydrate_prompt(
+        row.raw_prompt,
+        system_prompt=blobs.get(row.system_prompt_hash or ""),
+        tools_json=blobs.get(row.tools_hash or ""),
+        parent_messages=parent_messages,
+        prompt_prefix_length=row.prompt_prefix_length or 0,
+    )
+    cache[sample_id] = prompt
+    return prompt
+
+
+async def _rehydrate_delta_prompts(
+    db: AsyncSession, samples: Sequence[AITrainingSample]
+) -> dict[uuid.UUID, dict[str, Any]]:
+    """Return the full prompt of every delta-encoded sample in ``samples``.
+
+    Loads the parent chains (bounded by the capture keyframe interval) and the
+    referenced system prompt / tool blobs in a few batched queries. Samples
+    whose chain is broken are left out and logged.
+    """
+    rows = {sample.id: sample for sample in samples if _is_delta_encoded(sample)}
+    if not rows:
+        return {}
+
+    missing = {r.parent_sample_id for r in rows.values() if r.prompt_prefix_length}
+    missing -= rows.keys()
+    missing.discard(None)
+    while missing:
+        result = await db.execute(
+            select(AITrainingSample).where(AITrainingSample.id.in_(missing))
+        )
+        parents = result.scalars().all()
+        rows.update({parent.id: parent for parent in parents})
+        missing = {p.parent_sample_id for p in parents if p.prompt_prefix_length}
+        missing -= rows.keys()
+        missing.discard(None)
+
+    hashes = {
+        content_hash
+        for row in rows.values()
+        for content_hash in (row.system_prompt_hash, row.tools_hash)
+        if content_hash is not None
+    }
+    blob_result = await db.execute(
+        select(AITrainingPromptBlob.content_hash, AITrainingPromptBlob.content).where(
+            AITrainingPromptBlob.content_hash.in_(hashes)
+        )
+    )
+    blobs: dict[str, str] = {row.content_hash: row.content for row in blob_result}
+
+    cache: dict[uuid.UUID, dict[str, Any]] = {}
+    prompts: dict[uuid.UUID, dict[str, Any]] = {}
+    for sample in samples:
+        if not _is_delta_encoded(sample):
+            continue
+        try:
+            prompts[sample.id] = _rehydrate_sample(sample.id, rows, blobs, cache)
+        except ValueError as exc:
+            logger.warning("Cannot rehydrate sample %s: %s", sample.id, exc)
+    return prompts
+
+
+class _ExportRow(NamedTuple):
+    """Plain (picklable) copy of the sample fields the converter needs."""
+
+    sample_id: str
+    conversation_id: str
+    raw_prompt: str
+    prompt: dict[str, Any] | None  # rehydrated prompt of delta-encoded rows
+    is_delta: bool
+    model_name: str
+    feedback: str | None
+    is_simulated: bool
+    has_tool_calls: bool
+
+
+def _export_row(
+    sample: AITrainingSample, prompt: dict[str, Any] | None = None
+) -> _ExportRow:
+    return _ExportRow(
+        sample_id=str(sample.id),
+        conversation_id=str(sample.conversation_id),
+        raw_prompt=sample.raw_prompt,
+        prompt=prompt,
+        is_delta=_is_delta_encoded(sample),
+        model_name=sample.model_name,
+        feedback=sample.user_feedback,
+        is_simulated=sample.is_simulated,
+        has_tool_calls=sample.tool_calls is not None,
+    )
+
+
+def _row_to_chatml(row: _ExportRow) -> dict | None:
+    """Convert an export row to the native API format for SFT.
 
     Output mirrors the structure pydantic-ai sends to the LLM:
 
@@ -116,10 +262,22 @@ def _sample_to_chatml(sample: AITrainingSample) -> dict | None:
     * ``tools`` — list of OpenAI-format function definitions.
     * ``metadata`` — provenance info (sample id, model, feedback, etc.).
 
+    Delta-encoded samples need their rehydrated ``prompt`` (see
+    ``_rehydrate_delta_prompts``); the stored ``raw_prompt`` only holds the
+    turn's new messages.
+
     Returns *None* for samples that cannot be parsed (e.g. legacy format
     without tool definitions).
     """
-    messages, tool_definitions = _parse_raw_prompt(sample.raw_prompt)
+    if row.prompt is not None:
+        messages = [m for m in row.prompt.get("messages", []) if isinstance(m, dict)]
+        tool_definitions = [
+            t for t in row.prompt.get("tools", []) if isinstance(t, dict)
+        ]
+    elif row.is_delta:
+        return None
+    else:
+        messages, tool_definitions = _parse_raw_prompt(row.raw_prompt)
 
     if not messages:
         return None
@@ -128,11 +286,11 @@ def _sample_to_chatml(sample: AITrainingSample) -> dict | None:
         "messages": messages,
         "tools": tool_definitions,
         "metadata": {
-            "sample_id": str(sample.id),
-            "model_name": sample.model_name,
-            "feedback": sample.user_feedback,
-            "is_simulated": sample.is_simulated,
-            "has_tool_calls": sample.tool_calls is not None,
+            "sample_id": row.sample_id,
+            "model_name": row.model_name,
+            "feedback": row.feedback,
+            "is_simulated": row.is_simulated,
+            "has_tool_calls": row.has_tool_calls,
             "has_tools": len(tool_definitions) > 0,
             "tool_count": len(tool_definitions),
         },
@@ -141,6 +299,198 @@ def _sample_to_chatml(sample: AITrainingSample) -> dict | None:
     return result
 
 
+def _sample_to_chatml(
+    sample: AITrainingSample, prompt: dict[str, Any] | None = None
+) -> dict | None:
+    """Convert a training sample to the native API format for SFT."""
+    return _row_to_chatml(_export_row(sample, prompt))
+
+
+def _is_validation(conversation_id: str, val_ratio: float, seed: int) -> bool:
+    """Deterministic split: a conversation always lands on the same side.
+
+    Hashing the conversation id (salted with ``seed``) instead of shuffling
+    needs no global view of the data, so the split can be decided while
+    streaming, and all turns of a conversation stay in one split.
+    """
+    if val_ratio <= 0:
+        return False
+    digest = hashlib.blake2b(
+        f"{seed}:{conversation_id}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest) / 2**64 < val_ratio
+
+
+def _convert_rows(
+    rows: list[_ExportRow], full_tool_outputs: bool, val_ratio: float, seed: int
+) -> list[tuple[bool, str] | None]:
+    """Convert a batch to ``(is_validation, jsonl_line)`` (None = skipped).
+
+    Runs in the worker processes, so it only takes and returns plain data.
+    """
+    converted: list[tuple[bool, str] | None] = []
+    for row in rows:
+        record = _row_to_chatml(row)
+        if record is None:
+            converted.append(None)
+            continue
+        # Add metadata flag for long context experiments
+        if full_tool_outputs:
+            record["metadata"]["full_tool_outputs"] = True
+        is_val = _is_validation(row.conversation_id, val_ratio, seed)
+        converted.append((is_val, json.dumps(record) + "\n"))
+    return converted
+
+
+class _ShardedJsonlWriter:
+    """Write JSONL lines to (optionally compressed) files of ``shard_size`` lines.
+
+    Without sharding ``path`` is used as given (plus ``.gz``/``.zst`` when
+    compressing); with sharding ``train.jsonl`` becomes ``train-00000.jsonl``,
+    ``train-00001.jsonl``, ...
+    """
+
+    def __init__(
+        self, path: str, compression: Compression, shard_size: int | None
+    ) -> None:
+        self.path = path
+        self.compression = compression
+        self.shard_size = shard_size
+        self.count = 0
+        self.paths: list[str] = []
+        self._file: IO[str] | None = None
+        self._lines_in_shard = 0
+
+    def write(self, line: str) -> None:
+        if self._file is None or (
+            self.shard_size and self._lines_in_shard >= self.shard_size
+        ):
+            self._open_next()
+        assert self._file is not None
+        self._file.write(line)
+        self._lines_in_shard += 1
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            self._open_next()  # always leave a (possibly empty) output file
+        assert self._file is not None
+        self._file.close()
+
+    def _open_next(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        path = self.path
+        if self.shard_size:
+            stem, dot, ext = path.rpartition(".jsonl")
+            index = f"-{len(self.paths):05d}"
+            path = f"{stem}{index}{dot}{ext}" if dot else f"{path}{index}"
+        path += _COMPRESSION_SUFFIXES[self.compression]
+        self.paths.append(path)
+        self._file = _open_text(path, self.compression)
+        self._lines_in_shard = 0
+
+
+class _SplitWriter:
+    """Route converted lines to the train or validation writer."""
+
+    def __init__(
+        self,
+        train_file: str,
+        val_file: str | None,
+        compression: Compression,
+        shard_size: int | None,
+    ) -> None:
+        self.train = _ShardedJsonlWriter(train_file, compression, shard_size)
+        self.val = (
+            _ShardedJsonlWriter(val_file, compression, shard_size) if val_file else None
+        )
+        self.skipped = 0
+
+    def write(self, converted: list[tuple[bool, str] | None]) -> None:
+        for item in converted:
+            if item is None:
+                self.skipped += 1
+            elif item[0] and self.val is not None:
+                self.val.write(item[1])
+            else:
+                self.train.write(item[1])
+
+    def close(self) -> None:
+        self.train.close()
+        if self.val is not None:
+            self.val.close()
+
+    @property
+    def counts(self) -> tuple[int, int]:
+        return self.train.count, self.val.count if self.val else 0
+
+    def log_summary(self) -> None:
+        if self.skipped:
+            logger.warning(
+                "Skipped %d samples with unparseable/legacy format", self.skipped
+            )
+        train_count, val_count = self.counts
+        total = train_count + val_count
+        if self.val is not None and total:
+            logger.info(
+                "Split %d samples: %d train (%.1f%%), %d val (%.1f%%)",
+                total,
+                train_count,
+                100 * train_count / total,
+                val_count,
+                100 * val_count / total,
+            )
+        paths = self.train.paths + (self.val.paths if self.val else [])
+        logger.info("Wrote %s", ", ".join(paths))
+
+
+async def _convert_in_order(
+    batches: AsyncIterator[list[_ExportRow]],
+    convert: Callable[[list[_ExportRow]], list[tuple[bool, str] | None]],
+    workers: int,
+) -> AsyncIterator[list[tuple[bool, str] | None]]:
+    """Convert batches in a process pool, yielding results in input order.
+
+    At most ``2 * workers`` batches are in flight, which bounds memory while
+    keeping every worker busy.
+    """
+    if workers <= 1:
+        async for rows in batches:
+            yield convert(rows)
+        return
+
+    loop = asyncio.get_running_loop()
+    spawn = multiprocessing.get_context("spawn")
+    pending: deque[asyncio.Future[list[tuple[bool, str] | None]]] = deque()
+    with ProcessPoolExecutor(workers, mp_context=spawn) as pool:
+        try:
+            async for rows in batches:
+                pending.append(loop.run_in_executor(pool, convert, rows))
+                while len(pending) >= 2 * workers:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+
+def _open_text(path: str, compression: Compression) -> IO[str]:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8")
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                "zstd compression needs the zstandard package "
+                "(uv pip install zstandard)"
+            ) from exc
+        stream: IO[str] = zstandard.open(path, "wt", encoding="utf-8")
+        return stream
+    return open(path, "w", encoding="utf-8")
+
+
 def _build_sample_query(
     feedback_filter: Literal["positive", "any", "all"] = "all",
     days_back: int | None = None,
@@ -218,6 +568,96 @@ def _build_sample_query(
     return stmt
 
 
+async def export_streaming(
+    train_file: str,
+    val_file: str | None = None,
+    *,
+    val_ratio: float = 0.1,
+    seed: int = 42,
+    feedback_filter: Literal["positive", "any", "all"] = "all",
+    days_back: int | None = None,
+    min_date: datetime | None = None,
+    max_date: datetime | None = None,
+    include_simulated: bool = True,
+    user_id: uuid.UUID | None = None,
+    full_tool_outputs: bool = False,
+    all_turns: bool = False,
+    batch_size: int = 500,
+    workers: int = DEFAULT_WORKERS,
+    compression: Compression = "none",
+    shard_size: int | None = None,
+) -> tuple[int, int]:
+    """Stream matching samples to JSONL with flat memory use.
+
+    Samples are read through a server-side cursor ``batch_size`` rows at a
+    time. Each batch has its delta-encoded prompts rehydrated (on a second
+    session, since the cursor holds the first connection) and is converted to
+    ChatML in a process pool. Results are written in query order, with at
+    most ``2 * workers`` batches in flight. With ``val_file`` each sample goes
+    to train or validation by a hash of its conversation id (see
+    ``_is_validation``).
+
+    Args:
+        train_file: Output path for (training) data
+        val_file: Output path for validation data; None disables the split
+        val_ratio: Fraction for validation (default 0.1 = 10%)
+        seed: Salt for the hash split
+        feedback_filter: Filter by feedback type
+        days_back: Only include samples from last N days
+        min_date: Minimum created_at date (inclusive)
+        max_date: Maximum created_at date (exclusive)
+        include_simulated: Whether to include synthetic data samples
+        user_id: Filter to specific user UUID
+        full_tool_outputs: Preserve complete tool responses for long context
+        all_turns: If True export every per-turn snapshot; if False
+            (default) keep only the last sample per conversation.
+        batch_size: Rows fetched and converted per batch
+        workers: Conversion processes; 0 or 1 converts in this process
+        compression: ``none``, ``gzip`` or ``zstd``
+        shard_size: Lines per output file; None writes a single file
+
+    Returns:
+        Tuple of (train_count, val_count)
+    """
+    if full_tool_outputs:
+        logger.info("Full tool outputs mode: preserving complete responses")
+
+    stmt = _build_sample_query(
+        feedback_filter=feedback_filter,
+        days_back=days_back,
+        min_date=min_date,
+        max_date=max_date,
+        include_simulated=include_simulated,
+        user_id=user_id,
+        all_turns=all_turns,
+    ).execution_options(yield_per=batch_size)
+
+    split_ratio = val_ratio if val_file else 0.0
+    convert = partial(
+        _convert_rows,
+        full_tool_outputs=full_tool_outputs,
+        val_ratio=split_ratio,
+        seed=seed,
+    )
+    writer = _SplitWriter(train_file, val_file, compression, shard_size)
+    try:
+        async with AsyncSessionLocal() as db, AsyncSessionLocal() as lookup_db:
+            result = await db.stream_scalars(stmt)
+
+            async def batches() -> AsyncIterator[list[_ExportRow]]:
+                async for batch in result.partitions():
+                    prompts = await _rehydrate_delta_prompts(lookup_db, batch)
+                    yield [_export_row(s, prompts.get(s.id)) for s in batch]
+
+            async for converted in _convert_in_order(batches(), convert, workers):
+                writer.write(converted)
+    finally:
+        writer.close()
+
+    writer.log_summary()
+    return writer.counts
+
+
 async def export_to_chatml(
     output_file: str,
     feedback_filter: Literal["positive", "any", "all"] = "all",
@@ -229,7 +669,7 @@ async def export_to_chatml(
     full_tool_outputs: bool = False,
     all_turns: bool = False,
 ) -> int:
-    """Export training samples to ChatML JSONL format.
+    """Export training samples to a single ChatML JSONL file.
 
     Args:
         output_file: Path to output .jsonl file
@@ -252,41 +692,18 @@ async def export_to_chatml(
     Returns:
         Number of samples exported
     """
-    if full_tool_outputs:
-        logger.info("Full tool outputs mode: preserving complete responses")
-
-    async with AsyncSessionLocal() as db:
-        stmt = _build_sample_query(
-            feedback_filter=feedback_filter,
-            days_back=days_back,
-            min_date=min_date,
-            max_date=max_date,
-            include_simulated=include_simulated,
-            user_id=user_id,
-            all_turns=all_turns,
-        )
-        result = await db.execute(stmt)
-        samples = result.scalars().all()
-
-        # Export to ChatML JSONL format
-        count = 0
-        skipped = 0
-        with open(output_file, "w") as f:
-            for sample in samples:
-                chatml_record = _sample_to_chatml(sample)
-                if chatml_record is None:
-                    skipped += 1
-                    continue
-                # Add metadata flag for long context experiments
-                if full_tool_outputs:
-                    chatml_record["metadata"]["full_tool_outputs"] = True
-                f.write(json.dumps(chatml_record) + "\n")
-                count += 1
-
-        if skipped:
-            logger.warning("Skipped %d samples with unparseable/legacy format", skipped)
-
-        return count
+    count, _ = await export_streaming(
+        output_file,
+        feedback_filter=feedback_filter,
+        days_back=days_back,
+        min_date=min_date,
+        max_date=max_date,
+        include_simulated=include_simulated,
+        user_id=user_id,
+        full_tool_outputs=full_tool_outputs,
+        all_turns=all_turns,
+    )
+    return count
 
 
 async def export_with_split(
@@ -303,7 +720,7 @@ async def export_with_split(
     seed: int = 42,
     all_turns: bool = False,
 ) -> tuple[int, int]:
-    """Export training samples with train/validation split.
+    """Export training samples with a hash-based train/validation split.
 
     Args:
         train_file: Output path for training data
@@ -316,73 +733,28 @@ async def export_with_split(
         include_simulated: Whether to include synthetic data samples
         user_id: Filter to specific user UUID
         full_tool_outputs: Preserve complete tool responses for long context
-        seed: Random seed for reproducible splits
+        seed: Salt for the reproducible hash split
         all_turns: If True export every per-turn snapshot; if False
             (default) keep only the last sample per conversation.
 
     Returns:
         Tuple of (train_count, val_count)
     """
-    if full_tool_outputs:
-        logger.info("Full tool outputs mode: preserving complete responses")
-
-    async with AsyncSessionLocal() as db:
-        stmt = _build_sample_query(
-            feedback_filter=feedback_filter,
-            days_back=days_back,
-            min_date=min_date,
-            max_date=max_date,
-            include_simulated=include_simulated,
-            user_id=user_id,
-            all_turns=all_turns,
-        )
-        result = await db.execute(stmt)
-        samples = list(result.scalars().all())
-
-    if not samples:
-        logger.warning("No samples found matching criteria")
-        return 0, 0
-
-    # Shuffle with seed for reproducibility
-    random.seed(seed)
-    random.shuffle(samples)
-
-    # Split
-    split_idx = int(len(samples) * (1 - val_ratio))
-    train_samples = samples[:split_idx]
-    val_samples = samples[split_idx:]
-
-    # Export train
-    with open(train_file, "w") as f:
-        for sample in train_samples:
-            record = _sample_to_chatml(sample)
-            if record is None:
-                continue
-            if full_tool_outputs:
-                record["metadata"]["full_tool_outputs"] = True
-            f.write(json.dumps(record) + "\n")
-
-    # Export val
-    with open(val_file, "w") as f:
-        for sample in val_samples:
-            record = _sample_to_chatml(sample)
-            if record is None:
-                continue
-            if full_tool_outputs:
-                record["metadata"]["full_tool_outputs"] = True
-            f.write(json.dumps(record) + "\n")
-
-    logger.info(
-        "Split %d samples: %d train (%.1f%%), %d val (%.1f%%)",
-        len(samples),
-        len(train_samples),
-        100 * len(train_samples) / len(samples),
-        len(val_samples),
-        100 * len(val_samples) / len(samples),
+    return await export_streaming(
+        train_file,
+        val_file,
+        val_ratio=val_ratio,
+        seed=seed,
+        feedback_filter=feedback_filter,
+        days_back=days_back,
+        min_date=min_date,
+        max_date=max_date,
+        include_simulated=include_simulated,
+        user_id=user_id,
+        full_tool_outputs=full_tool_outputs,
+        all_turns=all_turns,
     )
 
-    return len(train_samples), len(val_samples)
-
 
 def _parse_date(date_str: str | None) -> datetime | None:
     """Parse date string to datetime with UTC timezone."""
@@ -410,7 +782,7 @@ def _log_export_config(
     if args.val_output:
         logger.info("  Validation output: %s", args.val_output)
         logger.info("  Validation ratio: %.1f%%", args.val_ratio * 100)
-        logger.info("  Random seed: %d", args.seed)
+        logger.info("  Split seed: %d", args.seed)
     logger.info("  Feedback filter: %s", args.feedback)
     if args.days:
         logger.info("  Date range: last %d days", args.days)
@@ -427,6 +799,13 @@ def _log_export_config(
         logger.info("  All turns: exporting every per-turn snapshot")
     else:
         logger.info("  Dedup: keeping only the last sample per conversation")
+    logger.info(
+        "  Batch size: %d, workers: %d, compression: %s, shard size: %s",
+        args.batch_size,
+        args.workers,
+        args.compression,
+        args.shard_size or "single file",
+    )
 
 
 def _create_parser() -> argparse.ArgumentParser:
@@ -453,7 +832,7 @@ def _create_parser() -> argparse.ArgumentParser:
         "--seed",
         type=int,
         default=42,
-        help="Random seed for reproducible splits (default: 42)",
+        help="Salt for the reproducible hash split (default: 42)",
     )
     parser.add_argument(
         "--feedback",
@@ -500,6 +879,29 @@ def _create_parser() -> argparse.ArgumentParser:
             "sample per conversation for efficient SFT."
         ),
     )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Rows fetched from the cursor per batch (default: 500)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Conversion processes; 1 converts inline (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=["none", "gzip", "zstd"],
+        default="none",
+        help="Compress output files (zstd needs the zstandard package)",
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        help="Samples per output file (default: one file per split)",
+    )
     return parser
 
 
@@ -526,12 +928,12 @@ async def main() -> int:
 
     _log_export_config(args, min_date, max_date, user_id)
 
-    if args.val_output:
-        # Train/validation split mode
-        train_count, val_count = await export_with_split(
-            train_file=args.output,
-            val_file=args.val_output,
+    try:
+        train_count, val_count = await export_streaming(
+            args.output,
+            args.val_output,
             val_ratio=args.val_ratio,
+            seed=args.seed,
             feedback_filter=args.feedback,
             days_back=args.days,
             min_date=min_date,
@@ -539,9 +941,17 @@ async def main() -> int:
             include_simulated=not args.exclude_simulated,
             user_id=user_id,
             full_tool_outputs=args.full_tool_outputs,
-            seed=args.seed,
             all_turns=args.all_turns,
+            batch_size=args.batch_size,
+            workers=args.workers,
+            compression=args.compression,
+            shard_size=args.shard_size,
         )
+    except RuntimeError as exc:
+        logger.error("%s", exc)
+        return 1
+
+    if args.val_output:
         logger.info(
             "Exported %d training samples to %s, %d validation samples to %s",
             train_count,
@@ -550,19 +960,7 @@ async def main() -> int:
             args.val_output,
         )
     else:
-        # Single file mode (legacy behavior)
-        count = await export_to_chatml(
-            output_file=args.output,
-            feedback_filter=args.feedback,
-            days_back=args.days,
-            min_date=min_date,
-            max_date=max_date,
-            include_simulated=not args.exclude_simulated,
-            user_id=user_id,
-            full_tool_outputs=args.full_tool_outputs,
-            all_turns=args.all_turns,
-        )
-        logger.info("Exported %d training samples to %s", count, args.output)
+        logger.info("Exported %d training samples to %s", train_count, args.output)
 
     return 0
 
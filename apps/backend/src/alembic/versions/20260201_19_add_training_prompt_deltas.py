@@ -0,0 +1,105 @@
+"""Delta-encode training sample prompts
+
+Revision ID: 20260201_19
+Revises: 20260131_18
+Create Date: 2026-02-01
+
+Every chat turn stored the full system prompt, tool definitions and history
+in ai_training_samples.raw_prompt, so storage grew quadratically with
+conversation length. This migration adds:
+1. ai_training_prompt_blobs: system prompts and tool schemas stored once by
+   SHA-256
+2. Delta columns on ai_training_samples: the parent sample, how many of its
+   messages are reused, and the blob hashes
+
+Existing rows keep their full raw_prompt (prompt_prefix_length IS NULL).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "20260201_19"
+down_revision: str | None = "20260131_18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the prompt blob table and delta columns."""
+    op.create_table(
+        "ai_training_prompt_blobs",
+        sa.Column(
+            "content_hash",
+            sa.String(64),
+            primary_key=True,
+            comment="SHA-256 hex digest of content",
+        ),
+        sa.Column("kind", sa.String(20), nullable=False, comment="system|tools"),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+    op.add_column(
+        "ai_training_samples",
+        sa.Column(
+            "parent_sample_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("ai_training_samples.id", ondelete="CASCADE"),
+            nullable=True,
+            comment="Previous sample of the conversation this prompt extends",
+        ),
+    )
+    op.add_column(
+        "ai_training_samples",
+        sa.Column(
+            "prompt_prefix_length",
+            sa.Integer(),
+            nullable=True,
+            comment="Leading non-system messages reused from the parent sample",
+        ),
+    )
+    op.add_column(
+        "ai_training_samples",
+        sa.Column(
+            "system_prompt_hash",
+            sa.String(64),
+            sa.ForeignKey("ai_training_prompt_blobs.content_hash"),
+            nullable=True,
+            comment="Static system prompt blob; the per-turn suffix is inline",
+        ),
+    )
+    op.add_column(
+        "ai_training_samples",
+        sa.Column(
+            "tools_hash",
+            sa.String(64),
+            sa.ForeignKey("ai_training_prompt_blobs.content_hash"),
+            nullable=True,
+            comment="Tool definitions blob",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Remove delta columns and the prompt blob table.
+
+    Delta-encoded rows are not expanded back; export them first.
+    """
+    op.drop_column("ai_training_samples", "tools_hash")
+    op.drop_column("ai_training_samples", "system_prompt_hash")
+    op.drop_column("ai_training_samples", "prompt_prefix_length")
+    op.drop_column("ai_training_samples", "parent_sample_id")
+    op.drop_table("ai_training_prompt_blobs")
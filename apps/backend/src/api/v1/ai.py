@@ -33,9 +33,9 @@ from crud.ai_drafts import get_draft_by_id
 from dependencies.auth import get_current_user
 from dependencies.db import get_db
 from models.ai_drafts import AIDraft
-from models.users import User
 from schemas.ai import AIDraftFetchResponse, AIDraftResponse, AIRecipeFromUrlRequest
 from schemas.api import ApiResponse
+from schemas.auth import CurrentUser
 from services.ai.interfaces import AIExtractionService
 from services.ai.models import DraftOutcome
 from services.ai.orchestrator import get_ai_extraction_service
@@ -111,7 +111,7 @@ def _ensure_aware_utc_or_404(dt: datetime) -> datetime:
 async def extract_recipe_from_url(
     request: AIRecipeFromUrlRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     ai_service: Annotated[AIExtractionService, Depends(get_ai_extraction_service)],
 ) -> Any:
     """Extract recipe from URL using injected service and return signed deep link.
@@ -243,8 +243,9 @@ async def extract_recipe_from_url(
 async def extract_recipe_from_image(  # noqa: C901
     files: Annotated[list[UploadFile], File(description="Recipe image files")],
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     ai_service: Annotated[AIExtractionService, Depends(get_ai_extraction_service)],
+    stream: bool = False,
 ) -> Any:
     """Extract recipe from uploaded image(s) using multimodal AI.
 
@@ -252,6 +253,11 @@ async def extract_recipe_from_image(  # noqa: C901
     Gemini Flash multimodal extraction to produce a structured recipe draft.
     Returns a signed deep link for the frontend to prefill the New Recipe form.
 
+    With ``stream=true`` only the type/size checks run in the request: the
+    response returns a pending draft immediately while normalization and
+    extraction continue in the background. Follow progress (including partial
+    output) via ``GET /ai/extract-recipe-image-stream?draft_id=...``.
+
     File requirements:
     - Formats: image/jpeg, image/png only
     - Per-file limit: 8 MiB
@@ -273,7 +279,7 @@ async def extract_recipe_from_image(  # noqa: C901
             request_id=request_id,
             provider=settings.LLM_PROVIDER,
             model_name=settings.MULTIMODAL_MODEL,
-            streamed=False,
+            streamed=stream,
         )
 
         try:
@@ -291,8 +297,15 @@ async def extract_recipe_from_image(  # noqa: C901
                 content = await file.read()
                 image_data.append((content, content_type))
 
-            # Validate and normalize images
+            # Validate and normalize images (or start the background job)
             try:
+                if stream:
+                    outcome: DraftOutcome[
+                        AIDraft
+                    ] = await ai_service.start_image_extraction(
+                        image_data, db, current_user, prompt_override=None
+                    )
+                    return _pending_image_draft_response(outcome)
                 normalized_images = normalize_images(image_data)
             except ImageFormatError as e:
                 raise HTTPException(
@@ -307,9 +320,7 @@ async def extract_recipe_from_image(  # noqa: C901
 
             # Delegate orchestration to service
             # (same pattern as extract_recipe_from_url)
-            outcome: DraftOutcome[
-                AIDraft
-            ] = await ai_service.extract_recipe_from_images(
+            outcome = await ai_service.extract_recipe_from_images(
                 normalized_images, db, current_user, prompt_override=None
             )
             draft, token, success = outcome.draft, outcome.token, outcome.success
@@ -400,6 +411,27 @@ async def extract_recipe_from_image(  # noqa: C901
             ) from e
 
 
+def _pending_image_draft_response(
+    outcome: DraftOutcome[AIDraft],
+) -> ApiResponse[AIDraftResponse]:
+    """Build the immediate response for a background image extraction.
+
+    Completion telemetry is recorded by the background job itself.
+    """
+    draft = outcome.draft
+    expires_dt = _ensure_aware_utc_or_404(draft.expires_at)
+    return ApiResponse(
+        success=True,
+        data=AIDraftResponse(
+            draft_id=draft.id,
+            signed_url=f"/recipes/new?ai=1&draftId={draft.id}&token={outcome.token}",
+            expires_at=expires_dt,
+            ttl_seconds=DRAFT_TTL_SECONDS,
+        ),
+        message="Image extraction started",
+    )
+
+
 # --- Streaming (SSE) extraction endpoint ------------------------------------
 
 
@@ -414,7 +446,7 @@ async def extract_recipe_from_image(  # noqa: C901
 async def extract_recipe_stream(
     source_url: str,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     ai_service: Annotated[AIExtractionService, Depends(get_ai_extraction_service)],
     prompt_override: str | None = None,
 ) -> StreamingResponse:
@@ -437,7 +469,7 @@ async def extract_recipe_stream(
 async def extract_recipe_image_stream(
     draft_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     ai_service: Annotated[AIExtractionService, Depends(get_ai_extraction_service)],
 ) -> StreamingResponse:
     """Stream progress for image-based recipe extraction.
@@ -592,7 +624,7 @@ async def get_ai_draft(
 async def get_my_draft(
     draft_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[AIDraftFetchResponse]:
     """Return an AI draft payload to the authenticated owner.
 
@@ -5,21 +5,28 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.email import send_password_reset_email, send_verification_email
 from core.exceptions import DuplicateUserError
+from core.password_hashing import (
+    PasswordHashingBusyError,
+    get_password_hashing_executor,
+)
 from core.ratelimit import check_rate_limit
 from core.security import (
     create_access_token,
     generate_password_reset_token,
     generate_verification_token,
     get_password_hash,
+    password_needs_rehash,
     verify_email_token,
     verify_password,
     verify_password_reset_token,
 )
 from crud.user import create_user, get_user_by_email, get_user_by_username, user_crud
 from dependencies.db import DbSession
+from models.users import User
 from schemas.auth import (
     ForgotPasswordRequest,
     ForgotPasswordResponse,
@@ -41,6 +48,56 @@ PasswordForm = Annotated[OAuth2PasswordRequestForm, Depends()]
 
 _logger = logging.getLogger(__name__)
 
+# Seconds clients are asked to wait when the password hashing pool is saturated
+PASSWORD_HASH_RETRY_AFTER_SECONDS = 2
+
+
+async def _hash_password(password: str) -> str:
+    """Hash ``password`` on the password hashing pool."""
+    try:
+        return await get_password_hashing_executor().run(
+            "hash", get_password_hash, password
+        )
+    except PasswordHashingBusyError as err:
+        raise _busy_error() from err
+
+
+async def _verify_password(password: str, hashed: str) -> bool:
+    """Verify ``password`` against ``hashed`` on the password hashing pool."""
+    try:
+        return await get_password_hashing_executor().run(
+            "verify", verify_password, password, hashed
+        )
+    except PasswordHashingBusyError as err:
+        raise _busy_error() from err
+
+
+def _busy_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication service is busy. Please try again shortly.",
+        headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)},
+    )
+
+
+async def _rehash_if_needed(db: AsyncSession, user: User, password: str) -> None:
+    """Upgrade a hash made with outdated Argon2 parameters after a login.
+
+    Best effort: any failure keeps the old (still valid) hash and is retried
+    on the next successful login.
+    """
+    if not password_needs_rehash(user.hashed_password):
+        return
+    try:
+        hashed_password = await get_password_hashing_executor().run(
+            "rehash", get_password_hash, password
+        )
+        await user_crud.update_password(
+            db=db, user=user, hashed_password=hashed_password
+        )
+    except Exception as exc:
+        _logger.warning("Password rehash for user %s skipped: %s", user.id, exc)
+
 
 @router.post("/login", response_model=Token, dependencies=[Depends(check_rate_limit)])
 async def login(form_data: PasswordForm, db: DbSession) -> Token:
@@ -58,7 +115,7 @@ async def login(form_data: PasswordForm, db: DbSession) -> Token:
         # If not found by username, try email (case-insensitive)
         user = await get_user_by_email(db=db, email=form_data.username.lower())
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await _verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -73,6 +130,8 @@ async def login(form_data: PasswordForm, db: DbSession) -> Token:
             "verification link.",
         )
 
+    await _rehash_if_needed(db, user, form_data.password)
+
     access_token = create_access_token(data={"sub": str(user.id)})
     return Token(access_token=access_token, token_type="bearer")
 
@@ -107,7 +166,7 @@ async def register(payload: UserRegister, db: DbSession) -> RegisterResponse:
         )
 
     # Hash the password
-    hashed_password = get_password_hash(payload.password)
+    hashed_password = await _hash_password(payload.password)
 
     try:
         # Create user (is_verified defaults to False)
@@ -280,7 +339,7 @@ async def reset_password(
         )
 
     # Hash and update the password
-    hashed_password = get_password_hash(payload.new_password)
+    hashed_password = await _hash_password(payload.new_password)
     await user_crud.update_password(db=db, user=user, hashed_password=hashed_password)
 
     return ResetPasswordResponse(message="Password reset successfully")
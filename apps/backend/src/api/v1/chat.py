@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import time
@@ -12,7 +13,6 @@ from typing import Annotated, Any
 from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from pydantic_ai import Agent as PydanticAgent, AgentRunResultEvent
 from pydantic_ai.messages import (
@@ -36,22 +36,25 @@ from core.error_handler import get_correlation_id
 from core.observability import (
     ProductTelemetryEventName,
     build_product_telemetry_attributes,
+    emit_product_telemetry_event,
     get_current_span,
     get_tracer,
     record_product_telemetry_event,
 )
+from core.profiling import maybe_profile, record_stage, stage_timer
 from core.ratelimit import check_rate_limit
+from core.sse import SseResponse
 from crud.user_preferences import UserPreferencesCRUD
 from dependencies.auth import get_current_user
-from dependencies.db import get_db
+from dependencies.db import ReadSessions, SessionFactory, StreamSessions, get_db
 from models.chat_conversations import ChatConversation
 from models.chat_messages import ChatMessage
 from models.chat_pending_actions import ChatPendingAction
 from models.chat_tool_calls import ChatToolCall
-from models.users import User
+from schemas.auth import CurrentUser
 from schemas.chat_content import TextBlock
 from schemas.chat_streaming import (
-    ChatSseEvent,
+    ChatSseEncoder,
     ChatStreamRequest,
     ConversationListResponse,
     ConversationSummary,
@@ -60,14 +63,17 @@ from schemas.chat_streaming import (
 )
 from schemas.chat_tools import ToolCancelRequest, ToolCancelResponse, ToolResultEnvelope
 from services.chat_agent import (
-    CHAT_SYSTEM_PROMPT,
     ChatAgentDeps,
     build_datetime_instructions,
     build_user_context_instructions,
     get_chat_agent,
+    get_chat_system_prompt,
     normalize_agent_output,
 )
-from services.chat_agent.training_capture import capture_training_sample
+from services.chat_agent.training_capture import (
+    TrainingSampleCapture,
+    enqueue_training_sample,
+)
 from services.memory_update import MemoryUpdateService
 
 
@@ -185,7 +191,7 @@ def _build_training_prompt_data(
     Captures the exact information the model receives at inference time:
 
     * **System instructions** — reconstructed from the known static
-      ``CHAT_SYSTEM_PROMPT`` constant plus the dynamic datetime and
+      ``get_chat_system_prompt()`` text plus the dynamic datetime and
       user-context sections built from ``deps``.  The chat agent uses
       ``instructions=`` (not ``system_prompt=``) so system content is never
       stored in ``ModelRequest.parts``; instead we reconstruct it here from
@@ -212,7 +218,7 @@ def _build_training_prompt_data(
     # never stores system content in ModelRequest.parts.  We rebuild it from
     # the known static constant plus the same dynamic helpers the agent
     # callbacks delegate to.
-    system_parts = [CHAT_SYSTEM_PROMPT]
+    system_parts = [get_chat_system_prompt()]
     if deps is not None:
         system_parts.append(build_datetime_instructions(deps))
         system_parts.append(build_user_context_instructions(deps))
@@ -474,23 +480,22 @@ def _get_user_friendly_error_message(exc: Exception) -> str:
     return "Something went wrong. Please try again."
 
 
-async def _mark_message_as_failed(db: AsyncSession, message_id: UUID) -> None:
+async def _mark_message_as_failed(sessions: SessionFactory, message_id: UUID) -> None:
     """Mark a streaming message as failed during error cleanup.
 
     This prevents dangling placeholder messages when an error occurs mid-stream.
+    Uses a fresh session so a failed transaction elsewhere cannot block cleanup.
     Errors during cleanup are logged but not raised to avoid masking the original error.
     """
     try:
-        # If an earlier DB operation failed, the session may be in an aborted
-        # transaction state. Roll back so cleanup queries can run.
-        await db.rollback()
-        db_result = await db.execute(
-            select(ChatMessage).where(ChatMessage.id == message_id)
-        )
-        orphaned_message = db_result.scalar_one_or_none()
-        if orphaned_message and orphaned_message.message_metadata.get("streaming"):
-            orphaned_message.message_metadata = {"streaming": False, "error": True}
-            await db.commit()
+        async with sessions() as db:
+            db_result = await db.execute(
+                select(ChatMessage).where(ChatMessage.id == message_id)
+            )
+            orphaned_message = db_result.scalar_one_or_none()
+            if orphaned_message and orphaned_message.message_metadata.get("streaming"):
+                orphaned_message.message_metadata = {"streaming": False, "error": True}
+                await db.commit()
     except Exception:
         logger.exception("Failed to mark message as failed during error cleanup")
 
@@ -507,7 +512,7 @@ async def _mark_message_as_failed(db: AsyncSession, message_id: UUID) -> None:
     description="Returns a paginated list of conversations for the authenticated user.",
 )
 async def list_conversations(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = 20,
     offset: int = 0,
@@ -563,7 +568,7 @@ async def list_conversations(
 )
 async def delete_conversation(
     conversation_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """Delete a conversation and all its messages via cascade delete."""
@@ -594,7 +599,7 @@ async def delete_conversation(
 )
 async def get_message_history(
     conversation_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = 50,
     before_id: UUID | None = None,
@@ -1058,7 +1063,7 @@ def _record_tool_lifecycle_event_on_current_span(
         tool_names=[tool_name],
         streamed=True,
     )
-    get_current_span().add_event(event.value, attributes=attrs)
+    emit_product_telemetry_event(get_current_span(), attrs)
 
 
 async def _handle_agent_stream_event(  # noqa: C901
@@ -1067,7 +1072,7 @@ async def _handle_agent_stream_event(  # noqa: C901
     conversation_id: UUID,
     message_id: UUID,
     user_id: UUID,
-    db: AsyncSession,
+    sessions: SessionFactory,
     tool_calls_by_id: dict[str, _ToolCallStart],
     tool_call_order: list[int],
     request_id: str,
@@ -1078,6 +1083,9 @@ async def _handle_agent_stream_event(  # noqa: C901
         A tuple of (list of SSE event strings, optional final result, emitted blocks).
         The list may contain multiple events (e.g., tool.result + blocks.append).
         Emitted blocks are content blocks from tool results (e.g., recipe_card).
+
+    Tool results are persisted through a short-lived session from ``sessions``
+    so no connection is held between events.
     """
     if isinstance(event, FunctionToolCallEvent):
         tool_name = _extract_tool_name(event.part)
@@ -1098,16 +1106,14 @@ async def _handle_agent_stream_event(  # noqa: C901
         )
         return (
             [
-                ChatSseEvent(
-                    event="tool.started",
-                    conversation_id=conversation_id,
-                    message_id=message_id,
-                    data={
+                ChatSseEncoder(conversation_id, message_id).encode(
+                    "tool.started",
+                    {
                         "tool_call_id": event.tool_call_id,
                         "tool_name": tool_name,
                         "arguments": arguments,
                     },
-                ).to_sse()
+                )
             ],
             None,
             [],
@@ -1121,6 +1127,7 @@ async def _handle_agent_stream_event(  # noqa: C901
         finished_at = datetime.now(UTC)
         duration_ms = (finished_at - started_at).total_seconds() * 1000
 
+        record_stage("chat", "tool", duration_ms, tool_name=tool_name)
         _record_tool_lifecycle_event_on_current_span(
             event=ProductTelemetryEventName.ASSISTANT_TOOL_COMPLETED,
             request_id=request_id,
@@ -1154,44 +1161,44 @@ async def _handle_agent_stream_event(  # noqa: C901
             )
             persisted_result = {"content": str(result_content)}
 
-        db.add(
-            ChatToolCall(
-                conversation_id=conversation_id,
-                message_id=message_id,
-                user_id=user_id,
-                tool_name=tool_name,
-                arguments=arguments,
-                result=persisted_result,
-                status="success",
-                error=None,
-                started_at=started_at,
-                finished_at=finished_at,
-                call_metadata={
-                    "tool_call_id": event.tool_call_id,
-                    "source": "pydantic_ai",
-                },
+        async with sessions() as db, stage_timer("chat", "tool_persist"):
+            db.add(
+                ChatToolCall(
+                    conversation_id=conversation_id,
+                    message_id=message_id,
+                    user_id=user_id,
+                    tool_name=tool_name,
+                    arguments=arguments,
+                    result=persisted_result,
+                    status="success",
+                    error=None,
+                    started_at=started_at,
+                    finished_at=finished_at,
+                    call_metadata={
+                        "tool_call_id": event.tool_call_id,
+                        "source": "pydantic_ai",
+                    },
+                )
             )
-        )
-        await db.commit()
+            await db.commit()
 
         # Build list of SSE events to emit
         sse_events: list[str] = []
+        encoder = ChatSseEncoder(conversation_id, message_id)
 
         # Emit tool.result event with truncated content to avoid SSE payload size limits
         # The full result is already persisted to the database above
         sse_safe_result = _truncate_large_fields_for_sse(persisted_result)
         sse_events.append(
-            ChatSseEvent(
-                event="tool.result",
-                conversation_id=conversation_id,
-                message_id=message_id,
-                data={
+            encoder.encode(
+                "tool.result",
+                {
                     "tool_call_id": event.tool_call_id,
                     "tool_name": tool_name,
                     "status": "success",
                     "result": sse_safe_result,
                 },
-            ).to_sse()
+            )
         )
 
         # Extract and emit interactive blocks from tool results.
@@ -1201,14 +1208,7 @@ async def _handle_agent_stream_event(  # noqa: C901
         emitted_blocks = _extract_interactive_blocks_from_tool_result(persisted_result)
 
         for block in emitted_blocks:
-            sse_events.append(
-                ChatSseEvent(
-                    event="blocks.append",
-                    conversation_id=conversation_id,
-                    message_id=message_id,
-                    data={"blocks": [block]},
-                ).to_sse()
-            )
+            sse_events.append(encoder.encode("blocks.append", {"blocks": [block]}))
 
         return (sse_events, None, emitted_blocks)
 
@@ -1227,7 +1227,7 @@ async def _handle_agent_stream_event(  # noqa: C901
 )
 async def accept_chat_action(
     proposal_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> ToolResultEnvelope:
     """Accept (and execute) a previously proposed DB-mutating action.
@@ -1296,7 +1296,7 @@ async def accept_chat_action(
 async def cancel_chat_action(
     proposal_id: UUID,
     payload: ToolCancelRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> ToolCancelResponse:
     """Cancel a proposed DB-mutating action.
@@ -1338,58 +1338,71 @@ async def cancel_chat_action(
 
 @router.post(
     "/conversations/{conversation_id}/messages/stream",
-    response_class=StreamingResponse,
+    response_class=SseResponse,
     dependencies=[Depends(check_rate_limit)],
 )
 async def stream_chat_message(  # noqa: C901
     conversation_id: UUID,
     payload: ChatStreamRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
-) -> StreamingResponse:
-    """Stream assistant responses using the canonical SSE envelope."""
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    sessions: StreamSessions,
+    read_sessions: ReadSessions,
+) -> SseResponse:
+    """Stream assistant responses using the canonical SSE envelope.
+
+    No session is held while the model streams: setup, personalization
+    loading, each tool call, each tool-call record and the final message
+    update open their own short-lived session.
+
+    If the client disconnects, ``SseResponse`` cancels the stream: the agent
+    run stops and the placeholder message is marked as failed.
+    """
     message_id = uuid4()
     agent = get_chat_agent()
+    encoder = ChatSseEncoder(conversation_id, message_id)
+
+    async with sessions() as db:
+        with stage_timer("chat", "setup_commit"):
+            # Enforce scoping. If the conversation doesn't exist yet, create it so
+            # the client can choose the UUID and begin streaming immediately.
+            await _get_or_create_conversation(
+                db,
+                conversation_id=conversation_id,
+                user_id=current_user.id,
+                title=payload.title,
+            )
 
-    # Enforce scoping. If the conversation doesn't exist yet, create it so the
-    # client can choose the UUID and begin streaming immediately.
-    await _get_or_create_conversation(
-        db,
-        conversation_id=conversation_id,
-        user_id=current_user.id,
-        title=payload.title,
-    )
-
-    # Save the user's message to the conversation
-    user_message = ChatMessage(
-        conversation_id=conversation_id,
-        user_id=current_user.id,
-        role="user",
-        content_blocks=[{"type": "text", "text": payload.content}],
-        metadata={},
-    )
-    db.add(user_message)
+            # Save the user's message to the conversation
+            user_message = ChatMessage(
+                conversation_id=conversation_id,
+                user_id=current_user.id,
+                role="user",
+                content_blocks=[{"type": "text", "text": payload.content}],
+                metadata={},
+            )
+            db.add(user_message)
 
-    # Update conversation activity timestamp
-    await _update_conversation_activity(db, conversation_id=conversation_id)
-    await db.commit()
+            # Update conversation activity timestamp
+            await _update_conversation_activity(db, conversation_id=conversation_id)
+            await db.commit()
 
-    # Create assistant message placeholder before streaming. This ensures the
-    # chat_messages record exists before any tool calls are persisted, which
-    # satisfies the foreign key constraint on chat_tool_calls.
-    await _create_assistant_message(
-        db,
-        message_id=message_id,
-        conversation_id=conversation_id,
-        user_id=current_user.id,
-    )
+            # Create assistant message placeholder before streaming. This ensures
+            # the chat_messages record exists before any tool calls are persisted,
+            # which satisfies the foreign key constraint on chat_tool_calls.
+            await _create_assistant_message(
+                db,
+                message_id=message_id,
+                conversation_id=conversation_id,
+                user_id=current_user.id,
+            )
 
-    # Load conversation history for multi-turn context
-    message_history = await _load_conversation_history(
-        db,
-        conversation_id=conversation_id,
-        user_id=current_user.id,
-    )
+        # Load conversation history for multi-turn context
+        with stage_timer("chat", "history_load"):
+            message_history = await _load_conversation_history(
+                db,
+                conversation_id=conversation_id,
+                user_id=current_user.id,
+            )
 
     async def event_stream() -> AsyncGenerator[str, None]:  # noqa: C901
         request_id = get_correlation_id()
@@ -1405,17 +1418,15 @@ async def stream_chat_message(  # noqa: C901
         agent_result: object | None = None  # Avoid NameError if stream ends early
         # Track blocks emitted from tool results (e.g., recipe cards)
         tool_emitted_blocks: list[dict[str, Any]] = []
-        yield ChatSseEvent(
-            event="status",
-            conversation_id=conversation_id,
-            message_id=message_id,
-            data={"status": "thinking"},
-        ).to_sse()
+        yield encoder.encode("status", {"status": "thinking"})
         try:
             settings = get_settings()
             provider = settings.LLM_PROVIDER
             model_name = settings.CHAT_MODEL
-            with _tracer.start_as_current_span("assistant_message") as message_span:
+            with (
+                _tracer.start_as_current_span("assistant_message") as message_span,
+                maybe_profile("chat_turn"),
+            ):
                 record_product_telemetry_event(
                     message_span,
                     event=ProductTelemetryEventName.ASSISTANT_MESSAGE_STARTED,
@@ -1439,26 +1450,44 @@ async def stream_chat_message(  # noqa: C901
                     client_datetime_str, server_now=datetime.now(UTC)
                 )
 
-                # Load user preferences for personalization
-                user_prefs_crud = UserPreferencesCRUD()
-                user_prefs = await user_prefs_crud.get_by_user_id(db, current_user.id)
+                async with (
+                    sessions() as db,
+                    stage_timer("chat", "context_load"),
+                ):
+                    # Load user preferences for personalization
+                    user_prefs_crud = UserPreferencesCRUD()
+                    user_prefs = await user_prefs_crud.get_by_user_id(
+                        db, current_user.id
+                    )
 
-                # Load memory document content
-                memory_service = MemoryUpdateService(db)
-                memory_doc = await memory_service.get_memory_document(current_user.id)
-                memory_content = memory_doc.content if memory_doc else None
+                    # Load memory document content
+                    memory_service = MemoryUpdateService(db)
+                    memory_doc = await memory_service.get_memory_document(
+                        current_user.id
+                    )
+                    memory_content = memory_doc.content if memory_doc else None
 
                 deps = ChatAgentDeps(
-                    db=db,
                     user=current_user,
                     current_datetime=current_dt,
                     user_timezone=user_timezone,
                     user_preferences=user_prefs,
                     memory_content=memory_content,
+                    session_factory=sessions,
+                    read_session_factory=read_sessions,
                 )
+                agent_started_at = time.perf_counter()
+                first_event_seen = False
                 async for agent_event in agent.run_stream_events(
                     payload.content, deps=deps, message_history=message_history
                 ):
+                    if not first_event_seen:
+                        first_event_seen = True
+                        record_stage(
+                            "chat",
+                            "first_event",
+                            (time.perf_counter() - agent_started_at) * 1000,
+                        )
                     (
                         sse_events,
                         result,
@@ -1468,7 +1497,7 @@ async def stream_chat_message(  # noqa: C901
                         conversation_id=conversation_id,
                         message_id=message_id,
                         user_id=current_user.id,
-                        db=db,
+                        sessions=sessions,
                         tool_calls_by_id=tool_calls_by_id,
                         tool_call_order=tool_call_order,
                         request_id=request_id,
@@ -1492,6 +1521,11 @@ async def stream_chat_message(  # noqa: C901
                         tool_emitted_blocks.extend(emitted_blocks)
                     if result is not None:
                         agent_result = result  # Full result object with new_messages()
+                record_stage(
+                    "chat",
+                    "agent_run",
+                    (time.perf_counter() - agent_started_at) * 1000,
+                )
 
                 # Extract output for normalization
                 if hasattr(agent_result, "output"):
@@ -1504,36 +1538,32 @@ async def stream_chat_message(  # noqa: C901
                 message = normalize_agent_output(raw_output)
                 for block in message.blocks:
                     if isinstance(block, TextBlock):
-                        yield ChatSseEvent(
-                            event="message.delta",
-                            conversation_id=conversation_id,
-                            message_id=message_id,
-                            data={"delta": block.text},
-                        ).to_sse()
+                        yield encoder.encode("message.delta", {"delta": block.text})
                     else:
-                        yield ChatSseEvent(
-                            event="blocks.append",
-                            conversation_id=conversation_id,
-                            message_id=message_id,
-                            data={"blocks": [block.model_dump()]},
-                        ).to_sse()
+                        yield encoder.encode(
+                            "blocks.append", {"blocks": [block.model_dump()]}
+                        )
 
-                # Update assistant message with LLM + tool-emitted blocks.
-                db_result = await db.execute(
-                    select(ChatMessage).where(ChatMessage.id == message_id)
-                )
-                assistant_message = db_result.scalar_one()
-                all_blocks = [block.model_dump() for block in message.blocks]
-                all_blocks.extend(tool_emitted_blocks)
-                assistant_message.content_blocks = all_blocks
-                assistant_message.message_metadata = {"streaming": False}
-
-                # Update conversation activity timestamp
-                await _update_conversation_activity(db, conversation_id=conversation_id)
-
-                # Capture training sample before commit so flush() joins the
-                # same transaction — avoids nested-transaction conflicts with
-                # asyncpg
+                async with sessions() as db, stage_timer("chat", "finalize"):
+                    # Update assistant message with LLM + tool-emitted blocks.
+                    db_result = await db.execute(
+                        select(ChatMessage).where(ChatMessage.id == message_id)
+                    )
+                    assistant_message = db_result.scalar_one()
+                    all_blocks = [block.model_dump() for block in message.blocks]
+                    all_blocks.extend(tool_emitted_blocks)
+                    assistant_message.content_blocks = all_blocks
+                    assistant_message.message_metadata = {"streaming": False}
+
+                    # Update conversation activity timestamp
+                    await _update_conversation_activity(
+                        db, conversation_id=conversation_id
+                    )
+
+                    await db.commit()
+
+                # Training capture is written by a background queue once the
+                # reply is committed; nothing here touches the database
                 try:
                     # Build tool calls data from completed tool calls
                     tool_calls_data = None
@@ -1606,26 +1636,27 @@ async def stream_chat_message(  # noqa: C901
                         "assistant_usage", attributes=usage_event_attributes
                     )
 
-                    await capture_training_sample(
-                        db,
-                        conversation_id=conversation_id,
-                        message_id=message_id,
-                        user_id=current_user.id,
-                        raw_prompt=json.dumps(history_data),
-                        raw_response=raw_output_for_training,
-                        tool_calls=tool_calls_data,
-                        model_name=model_name,
-                        model_version=model_version,
-                        prompt_tokens=prompt_tokens,
-                        completion_tokens=completion_tokens,
-                        latency_ms=latency_ms,
-                        user=current_user,  # Pass user for synthetic detection
+                    enqueue_training_sample(
+                        TrainingSampleCapture(
+                            conversation_id=conversation_id,
+                            message_id=message_id,
+                            user_id=current_user.id,
+                            prompt=history_data,
+                            raw_response=raw_output_for_training,
+                            tool_calls=tool_calls_data,
+                            model_name=model_name,
+                            model_version=model_version,
+                            prompt_tokens=prompt_tokens,
+                            completion_tokens=completion_tokens,
+                            latency_ms=latency_ms,
+                            user=current_user,  # For synthetic detection
+                            system_prefix=get_chat_system_prompt(),
+                        )
                     )
                 except Exception as capture_exc:
                     logger.warning("Failed to capture training sample: %s", capture_exc)
-
-                await db.commit()
                 latency_ms = int((time.monotonic() - run_started_at) * 1000)
+                record_stage("chat", "total", latency_ms)
                 tool_names = sorted({tc.tool_name for tc in tool_calls_by_id.values()})
 
                 message_span.set_attribute(
@@ -1650,19 +1681,16 @@ async def stream_chat_message(  # noqa: C901
                     streamed=True,
                 )
 
-                yield ChatSseEvent(
-                    event="message.complete",
-                    conversation_id=conversation_id,
-                    message_id=message_id,
-                    data={},
-                ).to_sse()
+                yield encoder.encode("message.complete")
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away: the agent run is already cancelled, nothing more
+            # can be sent. Finish the placeholder even if cancelled again.
+            logger.info(
+                "Client disconnected from conversation %s stream", conversation_id
+            )
+            await asyncio.shield(_mark_message_as_failed(sessions, message_id))
+            raise
         except Exception as exc:
-            try:
-                # Ensure the session isn't stuck in a failed transaction before
-                # attempting cleanup writes/reads.
-                await db.rollback()
-            except Exception:
-                logger.exception("Failed to rollback session after streaming error")
             try:
                 latency_ms = int((time.monotonic() - run_started_at) * 1000)
                 with _tracer.start_as_current_span("assistant_message_error") as span:
@@ -1687,26 +1715,18 @@ async def stream_chat_message(  # noqa: C901
             except Exception:
                 logger.exception("Failed to emit assistant telemetry error attributes")
             # Mark orphaned placeholder message as failed to prevent dangling records
-            await _mark_message_as_failed(db, message_id)
+            await _mark_message_as_failed(sessions, message_id)
 
             # Provide user-friendly error messages for common API issues
             error_message = _get_user_friendly_error_message(exc)
-            yield ChatSseEvent(
-                event="error",
-                conversation_id=conversation_id,
-                message_id=message_id,
-                data={
+            yield encoder.encode(
+                "error",
+                {
                     "error_code": "assistant_error",
                     "detail": error_message,
                     "message": error_message,
                 },
-            ).to_sse()
-        finally:
-            yield ChatSseEvent(
-                event="done",
-                conversation_id=conversation_id,
-                message_id=message_id,
-                data={},
-            ).to_sse()
+            )
+        yield encoder.encode("done")
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    return SseResponse(event_stream())
@@ -13,7 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from dependencies.auth import get_current_user
 from dependencies.db import get_db
 from models.user_memory_documents import UserMemoryDocument
-from models.users import User
+from schemas.auth import CurrentUser
 from schemas.user_memory_document import (
     UserMemoryDocumentResponse,
     UserMemoryDocumentUpdate,
@@ -33,7 +33,7 @@ logger = logging.getLogger(__name__)
 )
 async def get_user_memory_document(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> UserMemoryDocument:
     """Get the current user's memory document.
 
@@ -76,7 +76,7 @@ async def get_user_memory_document(
 async def update_user_memory_document(
     update: UserMemoryDocumentUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> UserMemoryDocument:
     """Update the current user's memory document.
 
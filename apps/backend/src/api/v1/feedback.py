@@ -13,8 +13,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from dependencies.auth import get_current_user
 from dependencies.db import get_db
 from models.ai_training_samples import AITrainingSample
-from models.users import User
 from schemas.ai_training_samples import TrainingSampleFeedback
+from schemas.auth import CurrentUser
 
 
 router = APIRouter(prefix="/messages", tags=["feedback"])
@@ -27,7 +27,7 @@ async def submit_feedback(
     message_id: UUID,
     feedback: TrainingSampleFeedback,
     db: Annotated[AsyncSession, Depends(get_db)],
-    user: Annotated[User, Depends(get_current_user)],
+    user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> dict[str, str | UUID]:
     """Submit user feedback (👍/👎) for an assistant message.
 
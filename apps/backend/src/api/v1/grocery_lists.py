@@ -9,8 +9,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from crud.grocery_lists import grocery_list_crud
 from dependencies.auth import get_current_user
 from dependencies.db import get_db
-from models.users import User
 from schemas.api import ApiResponse
+from schemas.auth import CurrentUser
 from schemas.grocery_lists import GroceryListRequest, GroceryListResponse
 
 
@@ -40,7 +40,7 @@ logger = logging.getLogger(__name__)
 async def generate_grocery_list(
     request: GroceryListRequest,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[GroceryListResponse]:
     """Generate a grocery list for the authenticated user.
 
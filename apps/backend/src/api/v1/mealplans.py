@@ -13,6 +13,7 @@ from dependencies.db import get_db
 from models.meal_history import Meal
 from models.users import User
 from schemas.api import ApiResponse
+from schemas.auth import CurrentUser
 from schemas.mealplans import (
     DayPlanOut,
     MarkCookedIn,
@@ -118,7 +119,7 @@ def _apply_cooked_patch(meal: Meal, patch: MealEntryPatch) -> None:
 )
 async def get_weekly_meal_plan(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     start: date | None = None,
 ) -> ApiResponse[WeeklyMealPlanOut]:
     """Return the weekly meal plan for the authenticated user."""
@@ -182,7 +183,7 @@ async def get_weekly_meal_plan(
 async def replace_weekly_plan(
     payload: list[MealEntryIn],
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     start: date | None = None,
 ) -> ApiResponse[WeeklyMealPlanOut]:
     """Replace the given week's entries with provided entries for the user.
@@ -255,7 +256,7 @@ async def replace_weekly_plan(
 async def create_meal_entry(
     entry: MealEntryIn,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[MealEntryOut]:
     """Create a new meal plan entry for the authenticated user."""
 
@@ -308,7 +309,7 @@ async def update_meal_entry(
     meal_id: UUID,
     patch: MealEntryPatch,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[MealEntryOut]:
     """Update an existing meal plan entry (basic field updates)."""
     result = await db.execute(select(Meal).where(Meal.id == meal_id))
@@ -342,7 +343,7 @@ async def update_meal_entry(
 async def delete_meal_entry(
     meal_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[dict[str, Any]]:
     """Delete a meal entry."""
     result = await db.execute(select(Meal).where(Meal.id == meal_id))
@@ -369,7 +370,7 @@ async def delete_meal_entry(
 async def mark_meal_cooked(
     meal_id: UUID,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     payload: MarkCookedIn | None = None,
 ) -> ApiResponse[MealEntryOut]:
     """Mark a meal as cooked (sets was_cooked and cooked_at)."""
@@ -28,8 +28,8 @@ from dependencies.db import get_db
 from models.ingredient_names import Ingredient
 from models.recipe_ingredients import RecipeIngredient
 from models.recipes_names import Recipe
-from models.users import User
 from schemas.api import ApiResponse
+from schemas.auth import CurrentUser
 from schemas.recipes import (
     IngredientIn,
     RecipeCategory,
@@ -70,7 +70,7 @@ router = APIRouter(prefix="/recipes", tags=["recipes"])
 async def create_recipe(
     recipe_data: RecipeCreate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     force: bool = False,
 ) -> ApiResponse[RecipeOut]:
     """Create a new recipe with ingredients.
@@ -523,7 +523,7 @@ def _apply_scalar_updates(recipe: Recipe, recipe_data: RecipeUpdate) -> None:
 
 
 def _build_recipe_filters(
-    current_user: User,
+    current_user: CurrentUser,
     query: str | None,
     max_total_time: int | None,
     category: RecipeCategory | None,
@@ -617,7 +617,7 @@ def _build_full_response(
 )
 async def list_recipes(
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     query: str | None = None,
     difficulty: RecipeDifficulty | None = None,
     max_total_time: int | None = None,
@@ -691,7 +691,7 @@ async def list_recipes(
 async def get_recipe(
     recipe_id: UUIDType,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[RecipeOut]:
     stmt = (
         select(Recipe)
@@ -732,7 +732,7 @@ async def update_recipe(
     recipe_id: UUIDType,
     recipe_data: RecipeUpdate,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[RecipeOut]:
     # Load existing recipe with ingredients
     stmt = (
@@ -824,7 +824,7 @@ async def update_recipe(
 async def delete_recipe(
     recipe_id: UUIDType,
     db: Annotated[AsyncSession, Depends(get_db)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
 ) -> ApiResponse[None]:
     stmt = select(Recipe).where(Recipe.id == recipe_id)
     result = await db.execute(stmt)
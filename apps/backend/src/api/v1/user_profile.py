@@ -8,7 +8,7 @@ from crud.user import user_crud
 from crud.user_preferences import user_preferences_crud
 from dependencies.auth import get_current_user
 from dependencies.db import get_db
-from models.users import User
+from schemas.auth import CurrentUser
 from schemas.user_preferences import (
     UserPreferencesCreate,
     UserPreferencesResponse,
@@ -23,7 +23,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/me", response_model=UserProfileResponse)
 async def get_current_user_profile(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserProfileResponse:
     """Get current user's profile with preferences."""
@@ -43,7 +43,7 @@ async def get_current_user_profile(
 @router.patch("/me", response_model=UserProfileResponse)
 async def update_current_user_profile(
     profile_update: UserProfileUpdate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserProfileResponse:
     """Update current user's profile information."""
@@ -55,8 +55,15 @@ async def update_current_user_profile(
                 status_code=status.HTTP_400_BAD_REQUEST, detail="Username already taken"
             )
 
+    # The dependency returns a cached snapshot; update the ORM row
+    db_user = await user_crud.get_by_id(db, current_user.id)
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
+        )
+
     # Update user profile
-    updated_user = await user_crud.update(db, current_user, profile_update)
+    updated_user = await user_crud.update(db, db_user, profile_update)
 
     # Get user preferences
     preferences = await user_preferences_crud.get_or_create(db, updated_user.id)
@@ -73,7 +80,7 @@ async def update_current_user_profile(
 
 @router.get("/me/preferences", response_model=UserPreferencesResponse)
 async def get_current_user_preferences(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserPreferencesResponse:
     """Get current user's preferences."""
@@ -84,7 +91,7 @@ async def get_current_user_preferences(
 @router.patch("/me/preferences", response_model=UserPreferencesResponse)
 async def update_current_user_preferences(
     preferences_update: UserPreferencesUpdate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserPreferencesResponse:
     """Update current user's preferences."""
@@ -108,7 +115,7 @@ async def update_current_user_preferences(
 @router.post("/me/preferences", response_model=UserPreferencesResponse)
 async def create_current_user_preferences(
     preferences_create: UserPreferencesCreate,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserPreferencesResponse:
     """Create or replace current user's preferences."""
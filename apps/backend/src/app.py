@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -18,7 +19,12 @@ from core.error_handler import (
     setup_logging,
 )
 from core.middleware import CorrelationIdMiddleware
+from core.observability import shutdown_product_telemetry_exporter
+from core.password_hashing import shutdown_password_hashing_executor
 from core.scheduler import scheduler_lifespan
+from dependencies.db import dispose_engines
+from services.chat_agent.training_capture import shutdown_training_capture_queue
+from services.flavor_pairs import load_flavor_pair_index
 
 
 settings = get_settings()
@@ -51,8 +57,16 @@ def validate_cors_origins(origins: list[str]) -> list[str]:
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     """Application lifespan with background scheduler."""
-    async with scheduler_lifespan():
-        yield
+    # Load before the chat agent is built so it registers the pairing tool
+    await asyncio.to_thread(load_flavor_pair_index)
+    try:
+        async with scheduler_lifespan():
+            yield
+    finally:
+        shutdown_password_hashing_executor()
+        shutdown_product_telemetry_exporter()
+        await shutdown_training_capture_queue()
+        await dispose_engines()
 
 
 app = FastAPI(
@@ -25,6 +25,24 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30  # in minutes
 
+    # Password hashing pool (Argon2 runs off the event loop)
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 32  # waiters beyond this get a 503
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS: float = 5.0
+
+    # Opt-in request profiling (core/profiling.py); 0 disables sampling
+    PROFILE_SAMPLE_EVERY_N: int = 0
+    PROFILER: Literal["cprofile", "pyinstrument"] = "cprofile"
+    PROFILE_DIR: str = "profiles"
+
+    # SSE keep-alive comment interval for streaming endpoints; 0 disables
+    SSE_HEARTBEAT_SECONDS: float = 15.0
+
+    # Flavor pairing index for the chat agent (training/dapt/extract_flavor_pairs.py
+    # --index-output); unset disables the suggest_flavor_pairings tool's data
+    FLAVOR_PAIRS_PATH: str | None = None
+
     # CORS
     # Accept list or CSV/JSON string from env; normalized to list[str] by validators
     CORS_ORIGINS: list[str] | str = [
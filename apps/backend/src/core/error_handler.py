@@ -20,8 +20,7 @@ from fastapi.responses import JSONResponse
 from pydantic import ValidationError
 from sqlalchemy.exc import IntegrityError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.config import get_settings
 from core.exceptions import DuplicateUserError, UserNotFoundError
@@ -213,20 +212,41 @@ class StructuredLogger:
 structured_logger = StructuredLogger(__name__)
 
 
-class ExceptionNormalizationMiddleware(BaseHTTPMiddleware):
+class ExceptionNormalizationMiddleware:
     """Catch any uncaught Exception and delegate to global_exception_handler.
 
     This avoids touching private middleware_stack internals and guarantees
     a final safety net consistent with centralized error handling.
+
+    Plain ASGI rather than ``BaseHTTPMiddleware``: streaming responses are not
+    relayed through an extra task. An exception raised after the response has
+    started (e.g. mid-stream) cannot be turned into a new response and is
+    re-raised for the server to close the connection.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def track_response_start(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, track_response_start)
         except Exception as exc:  # noqa: BLE001
-            return await global_exception_handler(request, exc)
+            if response_started:
+                raise
+            response = await global_exception_handler(Request(scope, receive), exc)
+            await response(scope, receive, send)
 
 
 def _build_error_response(
@@ -1,15 +1,17 @@
 """Middleware for request correlation ID tracking."""
 
 import uuid
-from collections.abc import Awaitable, Callable
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from core.error_handler import set_correlation_id
 
 
-class CorrelationIdMiddleware(BaseHTTPMiddleware):
+CORRELATION_ID_HEADER = "X-Correlation-ID"
+
+
+class CorrelationIdMiddleware:
     """Middleware to generate and track correlation IDs for requests.
 
     This middleware:
@@ -17,29 +19,36 @@ class CorrelationIdMiddleware(BaseHTTPMiddleware):
     - Sets the correlation ID in the request context
     - Adds correlation ID to response headers
     - Enables request tracing across the application
+
+    Implemented as plain ASGI (not ``BaseHTTPMiddleware``) so the endpoint runs
+    in the caller's task and streamed bodies (chat SSE, extraction progress)
+    pass straight through without an extra task and memory stream per request.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
-    ) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request with correlation ID."""
-        # Check if correlation ID is provided in request headers
-        correlation_id = request.headers.get("X-Correlation-ID")
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        # Generate new correlation ID if not provided
+        # Use the caller's correlation ID or generate a new one
+        correlation_id = Headers(scope=scope).get(CORRELATION_ID_HEADER)
         if not correlation_id:
             correlation_id = str(uuid.uuid4())
 
         # Set correlation ID in context for the request
         set_correlation_id(correlation_id)
 
-        # Add correlation ID to request state for access in endpoints
-        request.state.correlation_id = correlation_id
-
-        # Process the request
-        response = await call_next(request)
+        # Expose it as request.state.correlation_id for endpoints
+        scope.setdefault("state", {})["correlation_id"] = correlation_id
 
-        # Add correlation ID to response headers
-        response.headers["X-Correlation-ID"] = correlation_id
+        async def send_with_correlation_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers[CORRELATION_ID_HEADER] = correlation_id
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_with_correlation_id)
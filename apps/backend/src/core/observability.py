@@ -32,6 +32,18 @@ For production (Azure):
 - Set APPLICATIONINSIGHTS_CONNECTION_STRING to your App Insights connection string
 - Traces, metrics, and logs will be exported to Azure Monitor
 - Use Azure Monitor workspaces for retention and compliance
+
+Product telemetry cost:
+- ``record_product_telemetry_event`` runs on the request path (including between
+  SSE chunks), so it only does in-memory work: one ``set_attributes`` call, one
+  span event, and a non-blocking put onto the product telemetry queue
+- Span events can be sampled per event type with PRODUCT_TELEMETRY_SAMPLE_RATES
+  (e.g. ``assistant_tool_started=0.1,*=1``); failures are always kept
+- ``ProductTelemetryExporter`` drains that bounded queue on a background thread
+  into the ``product.telemetry.*`` metrics; when the queue is full events are
+  dropped (and counted) rather than slowing the request
+- Spans are exported by batch processors (bounded by the standard OTEL_BSP_*
+  variables), never synchronously on span end
 """
 
 from __future__ import annotations
@@ -39,6 +51,9 @@ from __future__ import annotations
 import importlib.metadata as importlib_metadata
 import logging
 import os
+import queue
+import random
+import threading
 from collections.abc import Iterator
 from contextlib import contextmanager
 from enum import StrEnum
@@ -58,6 +73,8 @@ _ENV_ENABLE_OBSERVABILITY = "ENABLE_OBSERVABILITY"
 _ENV_APP_INSIGHTS_CONN_STRING = "APPLICATIONINSIGHTS_CONNECTION_STRING"
 _ENV_OTEL_SERVICE_NAME = "OTEL_SERVICE_NAME"
 _ENV_OTEL_TRACES_EXPORTER = "OTEL_TRACES_EXPORTER"
+_ENV_PRODUCT_TELEMETRY_SAMPLE_RATES = "PRODUCT_TELEMETRY_SAMPLE_RATES"
+_ENV_PRODUCT_TELEMETRY_QUEUE_SIZE = "PRODUCT_TELEMETRY_QUEUE_SIZE"
 
 # Default service name for OpenTelemetry
 _DEFAULT_SERVICE_NAME = "pantrypilot-backend"
@@ -96,6 +113,17 @@ def _safe_telemetry_value(value: object) -> bool | float | int | str:
     return str(value)
 
 
+@lru_cache(maxsize=256)
+def _base_product_telemetry_attributes(
+    event: ProductTelemetryEventName, feature_name: str
+) -> dict[str, bool | float | int | str]:
+    """Constant attributes for an event/feature pair (copied, never mutated)."""
+    return {
+        "product.telemetry.event": event.value,
+        "product.telemetry.feature_name": feature_name,
+    }
+
+
 def build_product_telemetry_attributes(
     *,
     event: ProductTelemetryEventName,
@@ -113,11 +141,8 @@ def build_product_telemetry_attributes(
     cancelled: bool | None = None,
 ) -> dict[str, bool | float | int | str]:
     """Build a bounded metadata-only product telemetry attribute payload."""
-    attrs: dict[str, bool | float | int | str] = {
-        "product.telemetry.event": event.value,
-        "product.telemetry.feature_name": feature_name,
-        "product.telemetry.request_id": request_id or get_correlation_id(),
-    }
+    attrs = dict(_base_product_telemetry_attributes(event, feature_name))
+    attrs["product.telemetry.request_id"] = request_id or get_correlation_id()
 
     optional: dict[str, object | None] = {
         "product.telemetry.conversation_id": conversation_id,
@@ -162,7 +187,9 @@ def record_product_telemetry_event(
 
     The lifecycle event name is recorded via ``span.add_event(...)`` so multiple
     events can be attached to the same span without later writes overwriting the
-    original ``product.telemetry.event`` value.
+    original ``product.telemetry.event`` value. Span attributes are always set;
+    the span event is subject to per-event sampling (see
+    ``emit_product_telemetry_event``).
     """
     attrs = build_product_telemetry_attributes(
         event=event,
@@ -180,15 +207,204 @@ def record_product_telemetry_event(
         cancelled=cancelled,
     )
 
-    for key, value in attrs.items():
-        if key == "product.telemetry.event":
-            continue
-        span.set_attribute(key, value)
+    span_attrs = {k: v for k, v in attrs.items() if k != "product.telemetry.event"}
+    set_attributes = getattr(span, "set_attributes", None)
+    if set_attributes is not None:
+        set_attributes(span_attrs)
+    else:
+        for key, value in span_attrs.items():
+            span.set_attribute(key, value)
 
-    span.add_event(event.value, attributes=attrs)
+    emit_product_telemetry_event(span, attrs)
     return attrs
 
 
+def emit_product_telemetry_event(
+    span: Any, attrs: dict[str, bool | float | int | str]
+) -> bool:
+    """Add a prebuilt product telemetry event to ``span`` and the metrics queue.
+
+    The span event is sampled per event type; the metrics queue sees every event
+    so product counters stay exact. Returns whether the span event was added.
+    Nothing is recorded, and the exporter thread is never started, while
+    observability is disabled.
+    """
+    if not _is_observability_enabled():
+        return False
+    event = str(attrs["product.telemetry.event"])
+    get_product_telemetry_exporter().submit(attrs)
+    if not _sample_product_telemetry_event(
+        event, attrs.get("product.telemetry.success")
+    ):
+        return False
+    span.add_event(event, attributes=attrs)
+    return True
+
+
+@lru_cache
+def get_product_telemetry_sample_rates() -> dict[str, float]:
+    """Parse PRODUCT_TELEMETRY_SAMPLE_RATES (``event=rate,...``; ``*`` = default)."""
+    rates: dict[str, float] = {}
+    for entry in os.getenv(_ENV_PRODUCT_TELEMETRY_SAMPLE_RATES, "").split(","):
+        name, sep, raw_rate = entry.partition("=")
+        if not entry.strip():
+            continue
+        try:
+            if not sep:
+                raise ValueError(entry)
+            rates[name.strip()] = min(1.0, max(0.0, float(raw_rate)))
+        except ValueError:
+            logger.warning("Ignoring invalid product telemetry sample rate %r", entry)
+    return rates
+
+
+def _sample_product_telemetry_event(event: str, success: object) -> bool:
+    if success is False:
+        return True  # Failures are rare and always worth keeping
+    rates = get_product_telemetry_sample_rates()
+    rate = rates.get(event, rates.get("*", 1.0))
+    return rate >= 1.0 or random.random() < rate
+
+
+class ProductTelemetryExporter:
+    """Feed product telemetry events into OpenTelemetry metrics off-thread.
+
+    ``submit`` is a non-blocking put onto a bounded queue; a daemon thread
+    drains it in batches and records ``product.telemetry.events`` (counter) and
+    ``product.telemetry.latency`` (ms histogram) with low-cardinality
+    attributes only (event, feature, success, provider, model). Events arriving
+    while the queue is full are dropped and counted in
+    ``product.telemetry.dropped``.
+    """
+
+    _METRIC_KEYS = {
+        "product.telemetry.event": "event",
+        "product.telemetry.feature_name": "feature_name",
+        "product.telemetry.success": "success",
+        "product.telemetry.provider": "provider",
+        "product.telemetry.model_name": "model_name",
+    }
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 2048,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        meter: Any | None = None,
+    ) -> None:
+        meter = meter or get_meter(__name__)
+        self._events = meter.create_counter(
+            "product.telemetry.events", description="Product telemetry events"
+        )
+        self._latency_ms = meter.create_histogram(
+            "product.telemetry.latency",
+            unit="ms",
+            description="Latency reported with product telemetry events",
+        )
+        self._dropped = meter.create_counter(
+            "product.telemetry.dropped",
+            description="Product telemetry events dropped because the queue was full",
+        )
+        self._queue: queue.Queue[dict[str, bool | float | int | str] | None] = (
+            queue.Queue(maxsize=max_queue_size)
+        )
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._worker: threading.Thread | None = None
+        self.dropped = 0
+
+    def submit(self, attrs: dict[str, bool | float | int | str]) -> bool:
+        """Queue ``attrs`` for metric export without blocking."""
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(attrs)
+        except queue.Full:
+            self.dropped += 1
+            self._dropped.add(1)
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Record every queued event now (used at shutdown and in tests)."""
+        self._record(self._drain(block=False))
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Stop the worker after it has recorded the queued events."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None:
+            try:
+                self._queue.put(None, timeout=timeout)
+            except queue.Full:
+                pass
+            worker.join(timeout)
+        self.flush()
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="product-telemetry", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(block=True)
+            stop = None in batch
+            self._record(batch)
+            if stop:
+                return
+
+    def _drain(
+        self, *, block: bool
+    ) -> list[dict[str, bool | float | int | str] | None]:
+        batch: list[dict[str, bool | float | int | str] | None] = []
+        try:
+            if block:
+                batch.append(self._queue.get(timeout=self._flush_interval))
+            while len(batch) < self._batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _record(self, batch: list[dict[str, bool | float | int | str] | None]) -> None:
+        for attrs in batch:
+            if attrs is None:
+                continue
+            try:
+                metric_attrs = {
+                    name: attrs[key]
+                    for key, name in self._METRIC_KEYS.items()
+                    if key in attrs
+                }
+                self._events.add(1, metric_attrs)
+                latency = attrs.get("product.telemetry.latency_ms")
+                if latency is not None:
+                    self._latency_ms.record(latency, metric_attrs)
+            except Exception:  # pragma: no cover - never let telemetry crash
+                logger.exception("Failed to record product telemetry metrics")
+
+
+@lru_cache
+def get_product_telemetry_exporter() -> ProductTelemetryExporter:
+    """Return the process-wide product telemetry exporter."""
+    max_queue_size = int(os.getenv(_ENV_PRODUCT_TELEMETRY_QUEUE_SIZE, "2048"))
+    return ProductTelemetryExporter(max_queue_size=max_queue_size)
+
+
+def shutdown_product_telemetry_exporter() -> None:
+    """Flush and stop the exporter if it was created (application shutdown)."""
+    if get_product_telemetry_exporter.cache_info().currsize:
+        get_product_telemetry_exporter().shutdown()
+        get_product_telemetry_exporter.cache_clear()
+
+
 def _is_observability_enabled() -> bool:
     """Check if observability is enabled via environment variable.
 
@@ -254,10 +470,11 @@ def _configure_console_trace_exporter(service_name: str) -> None:
     from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
     from opentelemetry.sdk.resources import Resource
     from opentelemetry.sdk.trace import TracerProvider
-    from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 
     provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
-    provider.add_span_processor(SimpleSpanProcessor(ConsoleSpanExporter()))
+    # Batch (bounded by OTEL_BSP_*) so printing spans never blocks a request
+    provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
     trace.set_tracer_provider(provider)
     FastAPIInstrumentor().instrument(excluded_urls=EXCLUDED_URLS)
 
@@ -415,6 +632,25 @@ def get_tracer(name: str) -> Any:
         return _NoOpTracer()
 
 
+def get_meter(name: str) -> Any:
+    """Get an OpenTelemetry meter for custom metrics.
+
+    Mirrors ``get_tracer``: instruments created from the returned meter are
+    no-ops when OpenTelemetry is not installed or no meter provider has been
+    configured, so callers can record unconditionally.
+
+    Args:
+        name: The name of the meter, typically __name__ of the calling module.
+    """
+    try:
+        from opentelemetry import metrics
+
+        return metrics.get_meter(name)
+    except ImportError:
+        logger.debug("OpenTelemetry not available; returning no-op meter")
+        return _NoOpMeter()
+
+
 def get_current_span() -> Any:
     """Return the active OpenTelemetry span or a no-op span."""
     try:
@@ -461,6 +697,9 @@ class _NoOpSpan:
     def set_attribute(self, key: str, value: object) -> None:
         """No-op attribute setter."""
 
+    def set_attributes(self, attributes: dict[str, object]) -> None:
+        """No-op bulk attribute setter."""
+
     def add_event(self, name: str, attributes: dict[str, object] | None = None) -> None:
         """No-op event adder."""
 
@@ -472,3 +711,28 @@ class _NoOpSpan:
 
     def end(self) -> None:
         """No-op span end."""
+
+
+class _NoOpInstrument:
+    """A no-op metric instrument for when OpenTelemetry is not available."""
+
+    def add(self, amount: float, attributes: dict[str, object] | None = None) -> None:
+        """No-op counter increment."""
+
+    def record(
+        self, amount: float, attributes: dict[str, object] | None = None
+    ) -> None:
+        """No-op histogram/gauge record."""
+
+
+class _NoOpMeter:
+    """A no-op meter for when OpenTelemetry is not available."""
+
+    def create_counter(self, name: str, **kwargs: object) -> _NoOpInstrument:
+        return _NoOpInstrument()
+
+    def create_up_down_counter(self, name: str, **kwargs: object) -> _NoOpInstrument:
+        return _NoOpInstrument()
+
+    def create_histogram(self, name: str, **kwargs: object) -> _NoOpInstrument:
+        return _NoOpInstrument()
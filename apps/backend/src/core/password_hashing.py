@@ -0,0 +1,160 @@
+"""Bounded executor for Argon2 password hashing and verification.
+
+Argon2id is deliberately slow and memory hard: every hash or verify costs tens
+of milliseconds of CPU. Run inline in an ``async def`` endpoint it blocks the
+event loop, so a login burst stalls every chat stream served by that worker.
+
+``PasswordHashingExecutor`` runs that work on a dedicated thread (or process)
+pool instead. argon2-cffi releases the GIL while hashing, so threads give real
+parallelism. Admission control keeps bursts bounded: at most ``workers`` calls
+run at once, at most ``max_queue`` wait for a slot, and a waiter gives up after
+``queue_timeout`` seconds. Rejected calls raise ``PasswordHashingBusyError``,
+which the auth routes map to 503 so clients back off instead of piling up.
+
+Metrics (OpenTelemetry, no-op when not configured):
+    * ``password_hash.queue_wait`` (ms histogram) time spent waiting for a slot
+    * ``password_hash.duration`` (ms histogram) time spent hashing/verifying
+    * ``password_hash.queued`` (up/down counter) callers currently waiting
+    * ``password_hash.rejected`` (counter) calls turned away by admission control
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from typing import Any, Literal
+
+from core.config import get_settings
+from core.observability import get_meter
+
+
+logger = logging.getLogger(__name__)
+_meter = get_meter(__name__)
+
+_queue_wait_ms = _meter.create_histogram(
+    "password_hash.queue_wait",
+    unit="ms",
+    description="Time password hashing calls wait for a pool slot",
+)
+_duration_ms = _meter.create_histogram(
+    "password_hash.duration",
+    unit="ms",
+    description="Time spent hashing or verifying a password",
+)
+_queued = _meter.create_up_down_counter(
+    "password_hash.queued",
+    description="Password hashing calls waiting for a pool slot",
+)
+_rejected = _meter.create_counter(
+    "password_hash.rejected",
+    description="Password hashing calls rejected by admission control",
+)
+
+
+class PasswordHashingBusyError(Exception):
+    """Raised when the hashing pool is saturated and a call is turned away."""
+
+
+class PasswordHashingExecutor:
+    """Runs password hashing callables on a bounded pool with admission control."""
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_queue: int = 32,
+        queue_timeout: float = 5.0,
+        kind: Literal["thread", "process"] = "thread",
+    ) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.kind = kind
+        self._slots = asyncio.Semaphore(workers)
+        self._waiting = 0
+        self._pool: Executor | None = None
+
+    @property
+    def waiting(self) -> int:
+        """Callers currently queued for a pool slot."""
+        return self._waiting
+
+    async def run[T](self, operation: str, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` on the pool once a slot is free.
+
+        Args:
+            operation: Low-cardinality label for metrics (e.g. "verify")
+            fn: Hashing callable; must be picklable for the process pool
+
+        Raises:
+            PasswordHashingBusyError: If the queue is full or the wait times out
+        """
+        attributes = {"operation": operation}
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            self._reject(operation, "queue_full")
+
+        queued_at = time.monotonic()
+        self._waiting += 1
+        _queued.add(1, attributes)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except TimeoutError:
+            self._reject(operation, "queue_timeout")
+        finally:
+            self._waiting -= 1
+            _queued.add(-1, attributes)
+
+        started_at = time.monotonic()
+        _queue_wait_ms.record((started_at - queued_at) * 1000, attributes)
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_pool(), partial(fn, *args))
+        finally:
+            self._slots.release()
+            _duration_ms.record((time.monotonic() - started_at) * 1000, attributes)
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (it is recreated on next use)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._pool
+
+    def _reject(self, operation: str, reason: str) -> None:
+        _rejected.add(1, {"operation": operation, "reason": reason})
+        logger.warning(
+            "Password hashing %s rejected (%s); %d callers waiting",
+            operation,
+            reason,
+            self._waiting,
+        )
+        raise PasswordHashingBusyError(reason)
+
+
+@lru_cache
+def get_password_hashing_executor() -> PasswordHashingExecutor:
+    """Return the process-wide password hashing executor."""
+    settings = get_settings()
+    return PasswordHashingExecutor(
+        workers=settings.PASSWORD_HASH_WORKERS,
+        max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+        queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS,
+        kind=settings.PASSWORD_HASH_EXECUTOR,
+    )
+
+
+def shutdown_password_hashing_executor() -> None:
+    """Stop the shared executor's pool (called on application shutdown)."""
+    get_password_hashing_executor().shutdown()
@@ -0,0 +1,210 @@
+"""Stage timing and opt-in sampling profiler for hot request paths.
+
+``stage_timer`` measures one named stage of a pipeline (e.g. the chat turn's
+history load or a tool call) and records it in the ``pipeline.stage.duration``
+histogram (ms) with ``pipeline``/``stage`` attributes plus any extra
+low-cardinality attributes. It works as a (sync or async) context manager and
+as a decorator for sync or async functions; ``record_stage`` records a duration measured
+elsewhere (e.g. time to first model event).
+
+``maybe_profile`` samples whole requests: with ``PROFILE_SAMPLE_EVERY_N=N`` every
+Nth request entering it is profiled with cProfile (or pyinstrument, when
+installed and ``PROFILER=pyinstrument``) and the result is written under
+``PROFILE_DIR``. Both are off the hot path when disabled: a counter increment.
+
+NOTE: The request counter is per process; with several workers each samples
+its own every Nth request.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import functools
+import inspect
+import itertools
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from core.config import get_settings
+from core.observability import get_meter
+
+
+logger = logging.getLogger(__name__)
+
+_meter = get_meter(__name__)
+_stage_duration_ms = _meter.create_histogram(
+    "pipeline.stage.duration",
+    unit="ms",
+    description="Time spent in one stage of a request pipeline",
+)
+
+_request_counter = itertools.count(1)
+
+
+def record_stage(
+    pipeline: str, stage: str, duration_ms: float, **attributes: str | bool | int
+) -> None:
+    """Record a stage duration measured by the caller."""
+    _stage_duration_ms.record(
+        duration_ms, {"pipeline": pipeline, "stage": stage, **attributes}
+    )
+
+
+class stage_timer:  # noqa: N801 - used like a function/contextlib helper
+    """Time a pipeline stage into the ``pipeline.stage.duration`` histogram.
+
+    Example:
+        with stage_timer("chat", "history_load"):
+            history = await _load_conversation_history(...)
+
+        async with sessions() as db, stage_timer("chat", "finalize"):
+            ...
+
+        @stage_timer("chat", "normalize")
+        def normalize(...): ...
+
+    The recorded attributes include ``outcome`` (``ok``/``error``) so failed
+    stages do not skew the success latency.
+    """
+
+    def __init__(
+        self, pipeline: str, stage: str, **attributes: str | bool | int
+    ) -> None:
+        self.pipeline = pipeline
+        self.stage = stage
+        self.attributes = attributes
+        self.duration_ms: float | None = None
+        self._start = 0.0
+
+    def __enter__(self) -> stage_timer:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.duration_ms = (time.perf_counter() - self._start) * 1000
+        record_stage(
+            self.pipeline,
+            self.stage,
+            self.duration_ms,
+            outcome="error" if exc_type else "ok",
+            **self.attributes,
+        )
+
+    async def __aenter__(self) -> stage_timer:
+        return self.__enter__()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+    def __call__[**P, R](self, fn: Callable[P, R]) -> Callable[P, R]:
+        """Use as a decorator; each call is timed with a fresh timer."""
+        pipeline, stage, attributes = self.pipeline, self.stage, self.attributes
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: P.args, **kwargs: P.kwargs) -> Any:
+                with stage_timer(pipeline, stage, **attributes):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with stage_timer(pipeline, stage, **attributes):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+
+def _profile_path(name: str, suffix: str) -> Path:
+    directory = Path(get_settings().PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+    return directory / f"{name}-{stamp}.{suffix}"
+
+
+def _start_cprofile(name: str) -> Callable[[], Path]:
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def stop() -> Path:
+        profiler.disable()
+        path = _profile_path(name, "prof")
+        profiler.dump_stats(path)
+        return path
+
+    return stop
+
+
+def _start_pyinstrument(name: str) -> Callable[[], Path]:
+    from pyinstrument import Profiler
+
+    profiler = Profiler(async_mode="enabled")
+    profiler.start()
+
+    def stop() -> Path:
+        profiler.stop()
+        path = _profile_path(name, "html")
+        path.write_text(profiler.output_html())
+        return path
+
+    return stop
+
+
+def _profiler_starter() -> Callable[[str], Callable[[], Path]]:
+    if get_settings().PROFILER == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+
+            return _start_pyinstrument
+        except ImportError:
+            logger.warning("pyinstrument is not installed; profiling with cProfile")
+    return _start_cprofile
+
+
+@contextmanager
+def maybe_profile(name: str) -> Iterator[None]:
+    """Profile every Nth entry (``PROFILE_SAMPLE_EVERY_N``) and dump the result.
+
+    cProfile observes the whole thread, so for async code the dump also
+    contains whatever else the event loop ran in that window; pyinstrument's
+    async mode attributes awaited time to the profiled task instead. Only one
+    profiler can run per thread, so a sample overlapping another is skipped.
+    Profiling failures are logged and never break the request.
+    """
+    every_n = get_settings().PROFILE_SAMPLE_EVERY_N
+    if every_n <= 0 or next(_request_counter) % every_n:
+        yield
+        return
+
+    try:
+        stop = _profiler_starter()(name)
+    except Exception as exc:
+        logger.warning("Skipping %s profile: %s", name, exc)
+        yield
+        return
+
+    try:
+        yield
+    finally:
+        try:
+            logger.info("Wrote %s profile to %s", name, stop())
+        except Exception:
+            logger.exception("Failed to write %s profile", name)
@@ -4,12 +4,17 @@ Manages scheduled jobs for:
 - AI-generated chat title generation (every 10 minutes)
 - 90-day chat message retention cleanup (daily at 3 AM UTC)
 - 1-hour AI draft expiration cleanup (every 15 minutes)
+- Weather cache pre-warm for recently active users (every 15 minutes)
 """
 
+import asyncio
 import logging
-from collections.abc import AsyncGenerator
+from collections import defaultdict
+from collections.abc import AsyncGenerator, Sequence
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
+from typing import Any
+from uuid import UUID
 
 from apscheduler.schedulers.asyncio import (  # type: ignore[import-untyped]
     AsyncIOScheduler,
@@ -18,40 +23,43 @@ from apscheduler.triggers.cron import CronTrigger  # type: ignore[import-untyped
 from apscheduler.triggers.interval import (  # type: ignore[import-untyped]
     IntervalTrigger,
 )
-from sqlalchemy import func, select
+from sqlalchemy import Row, bindparam, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from crud.ai_drafts import cleanup_expired_drafts
-from dependencies.db import AsyncSessionLocal
+from dependencies.db import SchedulerSessionLocal, scheduler_engine
 from models.chat_conversations import ChatConversation
 from models.chat_messages import ChatMessage
 from services.chat_retention import enforce_chat_message_retention
 from services.chat_title_generator import generate_conversation_title
+from services.weather import (
+    WEATHER_PREWARM_INTERVAL,
+    get_weather_cache,
+    prewarm_weather_cache,
+)
 
 
 logger = logging.getLogger(__name__)
 
 scheduler: AsyncIOScheduler | None = None
 
+# Title generation: conversations with at least TITLE_MIN_MESSAGES messages are
+# titled from their first TITLE_CONTEXT_MESSAGES, TITLE_BATCH_SIZE per bulk
+# update, with at most TITLE_CONCURRENCY LLM calls in flight
+TITLE_MIN_MESSAGES = 4
+TITLE_CONTEXT_MESSAGES = 6
+TITLE_BATCH_SIZE = 50
+TITLE_CONCURRENCY = 4
+# Advisory lock keys for scheduled jobs (arbitrary, unique per job)
+TITLE_GENERATION_LOCK_ID = 0x7469746C
+WEATHER_PREWARM_LOCK_ID = 0x77656174
 
-async def _process_conversation_for_title(
-    db: AsyncSession, conversation: ChatConversation
-) -> str | None:
-    """Process a single conversation to generate its title.
 
-    Returns the generated title or None if generation failed.
-    """
-    # Fetch first 6 messages for title generation (3 exchanges)
-    messages_query = (
-        select(ChatMessage)
-        .where(ChatMessage.conversation_id == conversation.id)
-        .order_by(ChatMessage.created_at)
-        .limit(6)
-    )
-    messages_result = await db.execute(messages_query)
-    messages = messages_result.scalars().all()
+def _title_messages(messages: Sequence[Row[Any]]) -> list[dict[str, str]]:
+    """Extract role/text dicts from a conversation's first messages.
 
-    # Extract text from content_blocks with validation
+    Messages with invalid ``content_blocks`` or no text are skipped.
+    """
     message_dicts = []
     for msg in messages:
         text_parts = []
@@ -79,6 +87,53 @@ async def _process_conversation_for_title(
                     "content": " ".join(text_parts),
                 }
             )
+    return message_dicts
+
+
+async def _fetch_title_messages(
+    db: AsyncSession, conversation_ids: list[UUID]
+) -> dict[UUID, list[Row[Any]]]:
+    """Fetch the first messages of every conversation in one query.
+
+    A ``row_number()`` window over each conversation's messages keeps the
+    first ``TITLE_CONTEXT_MESSAGES`` (3 exchanges) per conversation.
+    """
+    ranked = (
+        select(
+            ChatMessage.id,
+            ChatMessage.conversation_id,
+            ChatMessage.role,
+            ChatMessage.content_blocks,
+            func.row_number()
+            .over(
+                partition_by=ChatMessage.conversation_id,
+                order_by=(ChatMessage.created_at, ChatMessage.id),
+            )
+            .label("position"),
+        )
+        .where(ChatMessage.conversation_id.in_(conversation_ids))
+        .subquery()
+    )
+    result = await db.execute(
+        select(ranked)
+        .where(ranked.c.position <= TITLE_CONTEXT_MESSAGES)
+        .order_by(ranked.c.conversation_id, ranked.c.position)
+    )
+
+    messages: dict[UUID, list[Row[Any]]] = defaultdict(list)
+    for row in result.all():
+        messages[row.conversation_id].append(row)
+    return messages
+
+
+async def _process_conversation_for_title(
+    conversation: Row[Any], messages: Sequence[Row[Any]]
+) -> str | None:
+    """Generate a title for a single conversation from its first messages.
+
+    Returns the generated title or None if generation was skipped.
+    """
+    message_dicts = _title_messages(messages)
 
     # Skip if not enough valid messages
     if len(message_dicts) < 2:
@@ -98,70 +153,138 @@ async def _process_conversation_for_title(
     return title
 
 
+async def _generate_batch_titles(conversations: Sequence[Row[Any]]) -> int:
+    """Generate and store titles for one batch of conversations.
+
+    Messages are fetched with a single query, titles are generated
+    concurrently (at most ``TITLE_CONCURRENCY`` LLM calls at once) without
+    holding a database connection, and the results are written with one
+    bulk UPDATE.
+
+    Returns:
+        Number of titles stored
+    """
+    async with SchedulerSessionLocal() as db:
+        messages = await _fetch_title_messages(
+            db, [conversation.id for conversation in conversations]
+        )
+
+    semaphore = asyncio.Semaphore(TITLE_CONCURRENCY)
+
+    async def generate(conversation: Row[Any]) -> dict[str, Any] | None:
+        async with semaphore:
+            try:
+                title = await _process_conversation_for_title(
+                    conversation, messages.get(conversation.id, [])
+                )
+            except Exception as e:
+                conv_id = conversation.id
+                logger.error(
+                    f"Failed to generate title for conversation {conv_id}: {e}"
+                )
+                return None
+        if title is None:
+            return None
+        logger.info(f"Generated title for conversation {conversation.id}: {title}")
+        return {
+            "conversation_id": conversation.id,
+            "new_title": title,
+            "titled_at": datetime.now(UTC),
+        }
+
+    results = await asyncio.gather(*(generate(c) for c in conversations))
+    updates = [update for update in results if update is not None]
+    if not updates:
+        return 0
+
+    async with SchedulerSessionLocal() as db:
+        # Executemany; rows titled in the meantime are left untouched
+        table = ChatConversation.__table__
+        await db.execute(
+            update(table)
+            .where(
+                table.c.id == bindparam("conversation_id"),
+                table.c.title_updated_at.is_(None),
+            )
+            .values(
+                title=bindparam("new_title"),
+                title_updated_at=bindparam("titled_at"),
+            ),
+            updates,
+        )
+        await db.commit()
+    return len(updates)
+
+
+@asynccontextmanager
+async def _job_lock(lock_id: int) -> AsyncGenerator[bool, None]:
+    """Hold a PostgreSQL advisory lock for the duration of a job.
+
+    Yields whether the lock was acquired, so only one app instance runs the
+    job at a time. The lock lives on a dedicated connection and is released
+    on exit (or when the connection drops). Other databases always acquire.
+    """
+    if scheduler_engine.dialect.name != "postgresql":
+        yield True
+        return
+
+    async with scheduler_engine.connect() as conn:
+        acquired = bool(await conn.scalar(select(func.pg_try_advisory_lock(lock_id))))
+        await conn.commit()
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                await conn.execute(select(func.pg_advisory_unlock(lock_id)))
+                await conn.commit()
+
+
 async def run_title_generation() -> None:
     """Scheduled job: generate AI titles for conversations with 2+ exchanges.
 
     Only processes conversations where title_updated_at is NULL
     (meaning title has never been AI-generated) and have at least 4 messages.
+    Conversations are handled in batches of ``TITLE_BATCH_SIZE``; see
+    ``_generate_batch_titles``. An advisory lock skips the run while another
+    instance is still generating titles.
     """
     logger.info("Starting scheduled title generation job")
     try:
-        async with AsyncSessionLocal() as db:
-            # Optimized query: JOIN conversations with message count to avoid N+1
-            # Find conversations needing titles with message count >= 4
-            query = (
-                select(ChatConversation, func.count(ChatMessage.id))
-                .join(
-                    ChatMessage,
-                    ChatConversation.id == ChatMessage.conversation_id,
-                    isouter=False,
+        async with _job_lock(TITLE_GENERATION_LOCK_ID) as acquired:
+            if not acquired:
+                logger.info("Title generation already running elsewhere, skipping")
+                return
+
+            async with SchedulerSessionLocal() as db:
+                # JOIN conversations with message count to avoid N+1
+                # Find conversations needing titles with message count >= 4
+                query = (
+                    select(
+                        ChatConversation.id,
+                        ChatConversation.title,
+                        ChatConversation.created_at,
+                    )
+                    .join(
+                        ChatMessage,
+                        ChatConversation.id == ChatMessage.conversation_id,
+                        isouter=False,
+                    )
+                    .where(ChatConversation.title_updated_at.is_(None))
+                    .group_by(ChatConversation.id)
+                    .having(func.count(ChatMessage.id) >= TITLE_MIN_MESSAGES)
                 )
-                .where(ChatConversation.title_updated_at.is_(None))
-                .group_by(ChatConversation.id)
-                .having(func.count(ChatMessage.id) >= 4)
-            )
-            result = await db.execute(query)
-            conversations_with_count = result.all()
+                result = await db.execute(query)
+                conversations = result.all()
 
-            logger.info(
-                f"Found {len(conversations_with_count)} conversations needing titles"
-            )
+            logger.info(f"Found {len(conversations)} conversations needing titles")
 
             generated_count = 0
-            batch_size = 50  # Process in batches to manage memory
+            for start in range(0, len(conversations), TITLE_BATCH_SIZE):
+                batch = conversations[start : start + TITLE_BATCH_SIZE]
+                generated_count += await _generate_batch_titles(batch)
+                logger.info(f"Batch committed: {generated_count} titles so far")
 
-            for idx, (conversation, _msg_count) in enumerate(
-                conversations_with_count, start=1
-            ):
-                try:
-                    # Generate title using helper function
-                    title = await _process_conversation_for_title(db, conversation)
-
-                    if title is None:
-                        continue
-
-                    # Update conversation with generated title
-                    conversation.title = title
-                    conversation.title_updated_at = datetime.now(UTC)
-                    generated_count += 1
-                    conv_id = conversation.id
-                    logger.info(f"Generated title for conversation {conv_id}: {title}")
-
-                    # Batch commit every batch_size conversations
-                    if idx % batch_size == 0:
-                        await db.commit()
-                        logger.info(f"Batch committed: {generated_count} titles so far")
-
-                except Exception as e:
-                    conv_id = conversation.id
-                    logger.error(
-                        f"Failed to generate title for conversation {conv_id}: {e}"
-                    )
-                    continue
-
-            # Final commit for remaining conversations
             if generated_count > 0:
-                await db.commit()
                 logger.info(
                     f"Title generation completed: {generated_count} titles generated"
                 )
@@ -178,7 +301,7 @@ async def run_chat_cleanup() -> None:
     """Scheduled job: enforce 90-day chat message retention."""
     logger.info("Starting scheduled chat message cleanup")
     try:
-        async with AsyncSessionLocal() as db:
+        async with SchedulerSessionLocal() as db:
             deleted = await enforce_chat_message_retention(db)
             logger.info(f"Chat cleanup completed: {deleted} messages deleted")
     except Exception as e:
@@ -188,7 +311,7 @@ async def run_chat_cleanup() -> None:
 async def run_draft_cleanup() -> None:
     """Scheduled job: clean up expired AI drafts (1-hour TTL)."""
     try:
-        async with AsyncSessionLocal() as db:
+        async with SchedulerSessionLocal() as db:
             deleted = await cleanup_expired_drafts(db)
             if deleted > 0:
                 logger.info(f"AI draft cleanup: {deleted} drafts deleted")
@@ -196,6 +319,34 @@ async def run_draft_cleanup() -> None:
         logger.error(f"AI draft cleanup failed: {e}", exc_info=True)
 
 
+async def run_weather_prewarm() -> None:
+    """Scheduled job: refresh forecasts for users active in the last day.
+
+    With a shared forecast store one instance warms it for every worker, so an
+    advisory lock skips the run while another instance is pre-warming. Without
+    one each process caches in memory and must warm its own cache.
+    """
+    try:
+        if get_weather_cache().backend is None:
+            await _prewarm_weather()
+            return
+
+        async with _job_lock(WEATHER_PREWARM_LOCK_ID) as acquired:
+            if not acquired:
+                logger.info("Weather pre-warm already running elsewhere, skipping")
+                return
+            await _prewarm_weather()
+    except Exception as e:
+        logger.error(f"Weather pre-warm failed: {e}", exc_info=True)
+
+
+async def _prewarm_weather() -> None:
+    async with SchedulerSessionLocal() as db:
+        warmed = await prewarm_weather_cache(db)
+        if warmed > 0:
+            logger.info(f"Weather pre-warm: {warmed} locations refreshed")
+
+
 def setup_scheduler() -> AsyncIOScheduler:
     """Initialize APScheduler with all background jobs.
 
@@ -203,6 +354,7 @@ def setup_scheduler() -> AsyncIOScheduler:
     - Title generation: Every 10 minutes
     - Chat cleanup: Daily at 3:00 AM UTC (90-day retention)
     - Draft cleanup: Every 15 minutes (1-hour expiration)
+    - Weather pre-warm: Every 15 minutes (users active in the last day)
     """
     global scheduler
     scheduler = AsyncIOScheduler(timezone="UTC")
@@ -214,6 +366,8 @@ def setup_scheduler() -> AsyncIOScheduler:
         id="generate_chat_titles",
         name="AI chat title generation",
         replace_existing=True,
+        max_instances=1,
+        coalesce=True,
     )
 
     # 90-day chat cleanup - daily at 3:00 AM UTC
@@ -234,9 +388,21 @@ def setup_scheduler() -> AsyncIOScheduler:
         replace_existing=True,
     )
 
+    # Weather pre-warm - keeps active users' forecasts fresh in the cache
+    scheduler.add_job(
+        run_weather_prewarm,
+        trigger=IntervalTrigger(seconds=int(WEATHER_PREWARM_INTERVAL.total_seconds())),
+        id="prewarm_weather_cache",
+        name="Weather cache pre-warm",
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True,
+    )
+
     logger.info(
         "Scheduler configured: title generation (10 min), "
-        "chat cleanup (daily 3 AM), draft cleanup (15 min)"
+        "chat cleanup (daily 3 AM), draft cleanup (15 min), "
+        "weather pre-warm (15 min)"
     )
     return scheduler
 
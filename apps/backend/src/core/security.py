@@ -5,7 +5,7 @@ from uuid import UUID
 
 import jwt
 from argon2 import PasswordHasher
-from argon2.exceptions import HashingError, VerifyMismatchError
+from argon2.exceptions import HashingError, InvalidHashError, VerifyMismatchError
 from fastapi import HTTPException, status
 from itsdangerous import BadSignature, SignatureExpired, URLSafeTimedSerializer
 from jwt.exceptions import ExpiredSignatureError, InvalidSignatureError, PyJWTError
@@ -36,15 +36,14 @@ PASSWORD_RESET_EXPIRATION = 3600  # 1 hour
 def create_access_token(
     data: dict[str, Any], expires_delta: timedelta | None = None
 ) -> str:
-    """Encodes a JWT with `sub` (subject) and expiry"""
+    """Encodes a JWT with `sub` (subject), issue time and expiry"""
     to_encode = data.copy()
+    issued_at = datetime.now(UTC)
     if expires_delta:
-        expire = datetime.now(UTC) + expires_delta
+        expire = issued_at + expires_delta
     else:
-        expire = datetime.now(UTC) + timedelta(
-            minutes=_settings().ACCESS_TOKEN_EXPIRE_MINUTES
-        )
-    to_encode.update({"exp": expire})
+        expire = issued_at + timedelta(minutes=_settings().ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": issued_at})
     s = _settings()
     encoded_jwt = jwt.encode(to_encode, s.SECRET_KEY, algorithm=s.ALGORITHM)
     return encoded_jwt
@@ -74,6 +73,17 @@ def get_password_hash(password: str) -> str:
     return _password_hasher.hash(password)
 
 
+def password_needs_rehash(hashed: str) -> bool:
+    """Return True if ``hashed`` was made with outdated Argon2 parameters.
+
+    Unparseable hashes return False; they fail verification anyway.
+    """
+    try:
+        return _password_hasher.check_needs_rehash(hashed)
+    except (InvalidHashError, ValueError):
+        return False
+
+
 def decode_token(token: str) -> TokenData:
     """Decode and validate a JWT, returning TokenData or raising 401.
 
@@ -102,9 +112,11 @@ def decode_token(token: str) -> TokenData:
             detail="Token missing subject",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    iat = payload.get("iat")
     return TokenData(
         sub=str(sub),
         scopes=list(scopes) if isinstance(scopes, list) else [],
+        iat=int(iat) if isinstance(iat, int | float) else None,
     )
 
 
@@ -0,0 +1,197 @@
+"""Server-Sent Events response with coalescing, heartbeats and disconnect handling.
+
+``SseResponse`` replaces ``StreamingResponse(..., media_type="text/event-stream")``
+for long-running streams such as the chat agent:
+
+* The body iterator runs in a producer task that feeds a bounded queue
+  (``max_pending`` frames). A slow client fills the queue and the producer
+  blocks on it, so the agent run is paced by the client instead of buffering
+  without limit.
+* The writer drains every frame already queued into one ``send`` call, so
+  events produced back to back (``tool.result`` + ``blocks.append``, the final
+  deltas) cost one socket write instead of one each.
+* When nothing has been written for ``heartbeat_interval`` seconds a
+  ``: keep-alive`` comment frame is sent; proxies and load balancers keep the
+  connection open while a tool call or the model is slow. EventSource clients
+  ignore comment frames.
+* The client disconnect is always watched (Starlette only does this for ASGI
+  servers older than spec 2.4). On disconnect, or when a write fails, the
+  producer is cancelled and the body generator closed, which cancels the work
+  behind it; generators can catch ``CancelledError``/``GeneratorExit`` to clean
+  up but must not yield afterwards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Mapping
+from typing import Final
+
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.types import Receive, Scope, Send
+
+from core.config import get_settings
+from core.observability import get_meter
+
+
+logger = logging.getLogger(__name__)
+
+_meter = get_meter(__name__)
+_disconnects = _meter.create_counter(
+    "sse.client.disconnects",
+    description="SSE streams ended early because the client went away",
+)
+_frames_per_write = _meter.create_histogram(
+    "sse.frames_per_write",
+    description="SSE frames coalesced into a single socket write",
+)
+
+HEARTBEAT_FRAME: Final = b": keep-alive\n\n"
+SSE_HEADERS: Final = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+class _End:
+    """Queue sentinel: the body iterator is exhausted."""
+
+
+class _Failed:
+    """Queue sentinel carrying the body iterator's exception."""
+
+    def __init__(self, exc: Exception) -> None:
+        self.exc = exc
+
+
+type _Item = bytes | _End | _Failed
+
+
+class SseResponse(StreamingResponse):
+    """Stream ``text/event-stream`` frames from an async iterator.
+
+    Example:
+        return SseResponse(event_stream())
+    """
+
+    media_type = "text/event-stream"
+
+    def __init__(
+        self,
+        content: AsyncIterable[str | bytes],
+        *,
+        heartbeat_interval: float | None = None,
+        max_pending: int = 64,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        background: BackgroundTask | None = None,
+    ) -> None:
+        super().__init__(
+            content,
+            status_code=status_code,
+            headers={**SSE_HEADERS, **(headers or {})},
+            background=background,
+        )
+        if heartbeat_interval is None:
+            heartbeat_interval = get_settings().SSE_HEARTBEAT_SECONDS
+        # 0 disables heartbeats
+        self.heartbeat_interval = heartbeat_interval or None
+        self.max_pending = max_pending
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await super().__call__(scope, receive, send)
+            return
+
+        streamer = asyncio.create_task(self._stream_until_write_fails(send))
+        watcher = asyncio.create_task(self.listen_for_disconnect(receive))
+        try:
+            await asyncio.wait({streamer, watcher}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            streamer.cancel()
+            watcher.cancel()
+            await asyncio.wait({streamer, watcher})
+
+        if streamer.cancelled() or not streamer.result():
+            _disconnects.add(1)
+            logger.info("SSE client disconnected; stream cancelled")
+        if self.background is not None:
+            await self.background()
+
+    async def _stream_until_write_fails(self, send: Send) -> bool:
+        """Stream the body; return False if the client went away mid-stream."""
+        try:
+            await self.stream_response(send)
+        except OSError:
+            return False
+        return True
+
+    async def stream_response(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        queue: asyncio.Queue[_Item] = asyncio.Queue(self.max_pending)
+        producer = asyncio.create_task(self._produce(queue))
+        try:
+            while await self._write_pending(queue, send):
+                pass
+        finally:
+            producer.cancel()
+            await asyncio.wait({producer})
+
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _write_pending(self, queue: asyncio.Queue[_Item], send: Send) -> bool:
+        """Send everything queued as one write; return False at end of stream."""
+        try:
+            async with asyncio.timeout(self.heartbeat_interval):
+                item = await queue.get()
+        except TimeoutError:
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": HEARTBEAT_FRAME,
+                    "more_body": True,
+                }
+            )
+            return True
+
+        frames: list[bytes] = []
+        while isinstance(item, bytes):
+            frames.append(item)
+            if queue.empty():
+                break
+            item = queue.get_nowait()
+
+        if frames:
+            _frames_per_write.record(len(frames))
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": b"".join(frames),
+                    "more_body": True,
+                }
+            )
+        if isinstance(item, _Failed):
+            raise item.exc
+        return not isinstance(item, _End)
+
+    async def _produce(self, queue: asyncio.Queue[_Item]) -> None:
+        try:
+            async for chunk in self.body_iterator:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode(self.charset)
+                await queue.put(bytes(chunk))
+        except Exception as exc:
+            await queue.put(_Failed(exc))
+        else:
+            await queue.put(_End())
+        finally:
+            # Closing here (in the task that iterated it) lets the generator's
+            # cleanup run in its own context when the stream is cancelled
+            aclose = getattr(self.body_iterator, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,111 @@
+"""Short-lived cache of authenticated user snapshots.
+
+``get_current_user`` runs on every authenticated request, including each chat
+turn and each tool-driven action. Caching the resolved ``CurrentUser`` for a
+few seconds lets most of those requests skip the ``users`` lookup.
+
+Entries are keyed on ``(user_id, token iat)`` so every issued token resolves
+its user at least once. Writes that change what the snapshot holds (profile
+updates, verification, password or admin changes) call
+``invalidate_cached_user``; the TTL bounds staleness for changes made
+elsewhere.
+
+NOTE: Like the weather and URL caches this is an in-memory, per-process
+cache. Invalidation only reaches the worker that made the change; other
+workers pick it up once their entry expires.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+from uuid import UUID
+
+from schemas.auth import CurrentUser
+
+
+USER_CACHE_TTL_SECONDS = 30.0
+USER_CACHE_MAX_ENTRIES = 10_000
+
+type UserCacheKey = tuple[UUID, int | None]
+
+
+class UserCache:
+    """LRU cache of ``CurrentUser`` snapshots with a fixed TTL."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = USER_CACHE_TTL_SECONDS,
+        max_entries: int = USER_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[UserCacheKey, tuple[float, CurrentUser]] = (
+            OrderedDict()
+        )
+        # Bumped on every invalidation. A lookup that started before an
+        # invalidation must not store the (possibly stale) row it read.
+        self._epoch = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def epoch(self) -> int:
+        """Invalidation counter; pass it back to ``set``."""
+        return self._epoch
+
+    def get(self, key: UserCacheKey) -> CurrentUser | None:
+        """Return the cached snapshot for ``key`` if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, user = entry
+        if self._clock() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return user
+
+    def set(self, key: UserCacheKey, user: CurrentUser, epoch: int) -> None:
+        """Store ``user`` unless an invalidation happened since ``epoch``."""
+        if epoch != self._epoch:
+            return
+        self._entries[key] = (self._clock() + self.ttl_seconds, user)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: UUID) -> None:
+        """Drop every cached snapshot of ``user_id``."""
+        self._epoch += 1
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached snapshot (primarily for tests)."""
+        self._epoch += 1
+        self._entries.clear()
+
+
+@lru_cache
+def get_user_cache() -> UserCache:
+    """Return the process-wide authenticated user cache."""
+    return UserCache()
+
+
+def invalidate_cached_user(user_id: UUID) -> None:
+    """Forget cached snapshots of ``user_id`` after it was modified."""
+    get_user_cache().invalidate(user_id)
+
+
+def clear_user_cache() -> None:
+    """Clear the shared user cache.
+
+    Tests should use this instead of reaching into the cache instance.
+    """
+    get_user_cache().clear()
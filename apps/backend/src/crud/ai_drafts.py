@@ -84,6 +84,37 @@ async def get_draft_by_id(
     return result.scalar_one_or_none()
 
 
+async def update_draft_payload(
+    db: AsyncSession,
+    draft_id: UUID,
+    draft_type: str,
+    payload: dict[str, Any],
+) -> AIDraft | None:
+    """Replace the type and payload of an existing AI draft.
+
+    Used to settle placeholder drafts created before a background extraction
+    finishes. The expiry is left unchanged.
+
+    Args:
+        db: Database session
+        draft_id: Draft ID to update
+        draft_type: New draft type
+        payload: New JSON payload
+
+    Returns:
+        Updated AIDraft instance or None if the draft no longer exists
+    """
+    draft = await get_draft_by_id(db, draft_id)
+    if draft is None:
+        return None
+
+    draft.type = draft_type
+    draft.payload = payload
+    # As with create_draft, the caller is responsible for committing
+    await db.flush()
+    return draft
+
+
 async def delete_draft(
     db: AsyncSession, draft_id: UUID, user_id: UUID | None = None
 ) -> bool:
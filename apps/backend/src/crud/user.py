@@ -5,6 +5,7 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import DuplicateUserError
+from core.user_cache import invalidate_cached_user
 from models.users import User
 from schemas.user_preferences import UserProfileUpdate
 
@@ -73,6 +74,7 @@ class UserCRUD:
             await db.rollback()
             raise DuplicateUserError from exc
 
+        invalidate_cached_user(db_user.id)
         return db_user
 
     async def set_verified(self, db: AsyncSession, user: User) -> User:
@@ -84,6 +86,7 @@ class UserCRUD:
         except Exception:
             await db.rollback()
             raise
+        invalidate_cached_user(user.id)
         return user
 
     async def update_password(
@@ -97,6 +100,7 @@ class UserCRUD:
         except Exception:
             await db.rollback()
             raise
+        invalidate_cached_user(user.id)
         return user
 
 
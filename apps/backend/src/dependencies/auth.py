@@ -9,9 +9,10 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.exc import SQLAlchemyError
 
 from core.security import decode_token
+from core.user_cache import get_user_cache
 from crud.user import get_user_by_id
 from dependencies.db import DbSession
-from models.users import User
+from schemas.auth import CurrentUser
 
 
 # --------------------------------------------------------------------------- #
@@ -39,10 +40,14 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 async def get_current_user(
     db: DbSession,
     token: Annotated[str, Depends(oauth2_scheme)],
-) -> User:
+) -> CurrentUser:
     """
     Resolve the currently authenticated user from a JWT.
 
+    Returns an immutable snapshot served from a short-lived cache keyed on
+    (user_id, token iat), so most requests skip the ``users`` lookup. Routes
+    that modify the user must load the ORM row themselves.
+
     Raises
     ------
     HTTPException(401)
@@ -66,6 +71,13 @@ async def get_current_user(
         LOGGER.debug("Token 'sub' is not a valid UUID", exc_info=exc)
         raise unauthorized() from exc
 
+    cache = get_user_cache()
+    cache_key = (user_id, token_data.iat)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    epoch = cache.epoch
+
     # Pull the user from the DB
     try:
         user = await get_user_by_id(db, user_id)
@@ -78,7 +90,9 @@ async def get_current_user(
         LOGGER.debug("User not found for sub=%s", sub)
         raise unauthorized()
 
-    return user
+    snapshot = CurrentUser.model_validate(user)
+    cache.set(cache_key, snapshot, epoch)
+    return snapshot
 
 
 # --------------------------------------------------------------------------- #
@@ -113,7 +127,7 @@ def not_found(detail: str = "Resource not found") -> HTTPException:
 
 def check_resource_access[ResourceT](
     resource: ResourceT | None,
-    current_user: User,
+    current_user: CurrentUser,
     *,
     allow_admin_override: bool = True,
     not_found_message: str = "Resource not found",
@@ -161,7 +175,7 @@ def check_resource_access[ResourceT](
 
 def check_resource_write_access[ResourceT](
     resource: ResourceT | None,
-    current_user: User,
+    current_user: CurrentUser,
     *,
     allow_admin_override: bool = True,
     not_found_message: str = "Resource not found",
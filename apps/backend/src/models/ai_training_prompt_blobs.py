@@ -0,0 +1,35 @@
+"""Content-addressed store for prompt parts shared by many training samples."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class AITrainingPromptBlob(Base):
+    """A system prompt or tool schema list, stored once by its SHA-256.
+
+    Delta-encoded ``AITrainingSample`` rows reference these by hash instead of
+    repeating the (multi-KB) static system prompt and tool definitions on
+    every turn. Rows are immutable; identical content always maps to the
+    same hash.
+    """
+
+    __tablename__ = "ai_training_prompt_blobs"
+
+    content_hash: Mapped[str] = mapped_column(
+        String(64), primary_key=True, comment="SHA-256 hex digest of content"
+    )
+    kind: Mapped[str] = mapped_column(
+        String(20), nullable=False, comment="system|tools"
+    )
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
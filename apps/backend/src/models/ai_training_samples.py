@@ -53,7 +53,38 @@ class AITrainingSample(Base):
     raw_prompt: Mapped[str] = mapped_column(
         Text,
         nullable=False,
-        comment="Full prompt sent to LLM including system messages and context",
+        comment=(
+            "Full prompt sent to LLM including system messages and context; "
+            "for delta-encoded rows only the messages added since the parent"
+        ),
+    )
+
+    # Delta encoding (NULL prompt_prefix_length = raw_prompt is the full prompt).
+    # See services.chat_agent.training_capture.rehydrate_prompt. A sample's
+    # prompt cannot be rebuilt without its parent, so deletes cascade down the
+    # chain instead of leaving half-encoded orphans.
+    parent_sample_id: Mapped[uuid.UUID | None] = mapped_column(
+        PG_UUID(as_uuid=True),
+        ForeignKey("ai_training_samples.id", ondelete="CASCADE"),
+        nullable=True,
+        comment="Previous sample of the conversation this prompt extends",
+    )
+    prompt_prefix_length: Mapped[int | None] = mapped_column(
+        Integer,
+        nullable=True,
+        comment="Leading non-system messages reused from the parent sample",
+    )
+    system_prompt_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        ForeignKey("ai_training_prompt_blobs.content_hash"),
+        nullable=True,
+        comment="Static system prompt blob; the per-turn suffix is inline",
+    )
+    tools_hash: Mapped[str | None] = mapped_column(
+        String(64),
+        ForeignKey("ai_training_prompt_blobs.content_hash"),
+        nullable=True,
+        comment="Tool definitions blob",
     )
     raw_response: Mapped[str] = mapped_column(
         Text, nullable=False, comment="Raw LLM output before parsing"
@@ -139,6 +139,14 @@ class RecipeExtractionResult(RecipeCreate):
     )
 
 
+class PartialRecipeSummary(BaseModel):
+    """Shape of the recipe read so far during a streamed extraction."""
+
+    title: str | None = Field(None, description="Recipe title once read")
+    ingredient_count: int = Field(0, ge=0, description="Ingredients read so far")
+    instruction_count: int = Field(0, ge=0, description="Instructions read so far")
+
+
 class SSEEvent(BaseModel):
     """Structured Server-Sent Event payload for extraction streaming.
 
@@ -166,6 +174,9 @@ class SSEEvent(BaseModel):
     error_code: str | None = Field(
         None, description="Stable machine readable error code for analytics"
     )
+    partial: PartialRecipeSummary | None = Field(
+        None, description="Partial structured output (status 'partial' only)"
+    )
 
     def to_sse(self) -> str:  # pragma: no cover - trivial
         return f"data: {self.model_dump_json()}\n\n"
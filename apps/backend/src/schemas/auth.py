@@ -1,4 +1,7 @@
-from pydantic import BaseModel, EmailStr, Field
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 
 class Token(BaseModel):
@@ -15,6 +18,29 @@ class TokenData(BaseModel):
         default_factory=list,
         description="Scopes/permissions associated with the token",
     )
+    iat: int | None = Field(
+        default=None,
+        description="Issued-at time (epoch seconds); absent on older tokens",
+    )
+
+
+class CurrentUser(BaseModel):
+    """Immutable snapshot of the authenticated user.
+
+    Returned by ``get_current_user`` instead of the ORM row so it can be
+    cached across requests. Load the ``User`` row when it must be modified.
+    """
+
+    model_config = ConfigDict(frozen=True, from_attributes=True)
+
+    id: UUID
+    username: str
+    email: str
+    first_name: str | None = None
+    last_name: str | None = None
+    is_admin: bool = False
+    is_verified: bool = False
+    created_at: datetime | None = None
 
 
 class LoginResponse(Token):
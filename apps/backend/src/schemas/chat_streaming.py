@@ -2,14 +2,31 @@
 
 from __future__ import annotations
 
-from typing import Any, Literal
+from typing import Any, Literal, get_args
 from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, Field
+from pydantic_core import to_json
 
 
 MAX_SSE_EVENT_BYTES: int = 16_384
 
+ChatSseEventName = Literal[
+    "status",
+    "message.delta",
+    "message.complete",
+    "blocks.append",
+    "tool.started",
+    "tool.proposed",
+    "tool.canceled",
+    "tool.result",
+    "memory.updated",
+    "summary.updated",
+    "error",
+    "done",
+]
+_CHAT_SSE_EVENT_NAMES = frozenset(get_args(ChatSseEventName))
+
 
 class ChatSseEvent(BaseModel):
     """Canonical SSE envelope for chat assistant streaming.
@@ -18,20 +35,7 @@ class ChatSseEvent(BaseModel):
     structured data instead of raw payload dumps.
     """
 
-    event: Literal[
-        "status",
-        "message.delta",
-        "message.complete",
-        "blocks.append",
-        "tool.started",
-        "tool.proposed",
-        "tool.canceled",
-        "tool.result",
-        "memory.updated",
-        "summary.updated",
-        "error",
-        "done",
-    ]
+    event: ChatSseEventName
     conversation_id: UUID
     message_id: UUID | None = None
     data: dict[str, Any] = Field(default_factory=dict)
@@ -41,11 +45,41 @@ class ChatSseEvent(BaseModel):
     def to_sse(self) -> str:
         """Serialize event to SSE format with size validation."""
         payload = self.model_dump_json()
-        if len(payload.encode("utf-8")) > MAX_SSE_EVENT_BYTES:
-            raise ValueError(
-                "SSE payload exceeded MAX_SSE_EVENT_BYTES; avoid large HTML or "
-                "scraped content."
-            )
+        _check_sse_payload_size(payload)
+        return f"data: {payload}\n\n"
+
+
+def _check_sse_payload_size(payload: str) -> None:
+    if len(payload.encode("utf-8")) > MAX_SSE_EVENT_BYTES:
+        raise ValueError(
+            "SSE payload exceeded MAX_SSE_EVENT_BYTES; avoid large HTML or "
+            "scraped content."
+        )
+
+
+class ChatSseEncoder:
+    """Encode one message's SSE events without building a model per event.
+
+    Produces exactly ``ChatSseEvent(...).to_sse()`` but pre-renders the
+    envelope (ids) once per stream and serializes ``data`` directly with
+    pydantic-core, skipping per-event model validation on the hot path.
+    """
+
+    def __init__(self, conversation_id: UUID, message_id: UUID | None) -> None:
+        message_json = f'"{message_id}"' if message_id is not None else "null"
+        self._ids = (
+            f',"conversation_id":"{conversation_id}","message_id":{message_json}'
+        )
+
+    def encode(
+        self, event: ChatSseEventName, data: dict[str, Any] | None = None
+    ) -> str:
+        """Return the ``data: ...`` frame for ``event``."""
+        if event not in _CHAT_SSE_EVENT_NAMES:
+            raise ValueError(f"Unknown chat SSE event {event!r}")
+        body = to_json(data or {}).decode()
+        payload = f'{{"event":"{event}"{self._ids},"data":{body}}}'
+        _check_sse_payload_size(payload)
         return f"data: {payload}\n\n"
 
 
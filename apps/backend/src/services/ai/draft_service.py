@@ -29,13 +29,19 @@ import crud.ai_drafts as crud_ai_drafts
 from core.observability import get_tracer, set_span_error_status
 from core.security import create_draft_token as core_create_draft_token
 from models.ai_drafts import AIDraft
-from models.users import User
 from schemas.ai import ExtractionNotFound
+from schemas.auth import CurrentUser
 
 
 logger = logging.getLogger(__name__)
 _tracer = get_tracer(__name__)
 
+# Draft types; a pending draft is settled into one of the other two once a
+# background extraction finishes.
+SUCCESS_DRAFT_TYPE = "recipe_suggestion"
+FAILURE_DRAFT_TYPE = "recipe_suggestion_failure"
+PENDING_DRAFT_TYPE = "recipe_suggestion_pending"
+
 
 class _FailureDraftStub:
     """Small test-friendly stub used only as a defensive fallback when the
@@ -68,7 +74,7 @@ async def _maybe_call(fn: Callable[..., Any] | None, *args: Any, **kwargs: Any)
 
 async def create_success_draft(
     db: AsyncSession,
-    current_user: User,
+    current_user: CurrentUser,
     source_url: str,
     generated_recipe: Any,
     prompt_override: str | None = None,
@@ -81,7 +87,7 @@ async def create_success_draft(
     with _tracer.start_as_current_span("recipe_draft.create") as span:
         _set_draft_span_attributes(
             span,
-            draft_type="recipe_suggestion",
+            draft_type=SUCCESS_DRAFT_TYPE,
             source_url=source_url,
             prompt_override=prompt_override,
             payload=payload,
@@ -92,7 +98,7 @@ async def create_success_draft(
                     crud_ai_drafts.create_draft,
                     db=db,
                     user_id=current_user.id,
-                    draft_type="recipe_suggestion",
+                    draft_type=SUCCESS_DRAFT_TYPE,
                     payload=payload,
                     source_url=source_url,
                     prompt_used=prompt_override,
@@ -132,7 +138,7 @@ async def create_success_draft(
 
 async def create_failure_draft(
     db: AsyncSession,
-    current_user: User,
+    current_user: CurrentUser,
     source_url: str,
     extraction_not_found: ExtractionNotFound,
     prompt_override: str | None = None,
@@ -142,16 +148,12 @@ async def create_failure_draft(
     Payload always includes an optional structured `detail`. User-facing message
     selection is deferred to orchestrator / API mapping layers.
     """
-    payload: dict[str, Any] = {"error": "extraction_not_found"}
-    try:
-        payload["detail"] = extraction_not_found.model_dump()
-    except Exception:  # pragma: no cover - defensive
-        payload["detail"] = str(extraction_not_found)
+    payload = _failure_payload(extraction_not_found)
 
     with _tracer.start_as_current_span("recipe_draft.create") as span:
         _set_draft_span_attributes(
             span,
-            draft_type="recipe_suggestion_failure",
+            draft_type=FAILURE_DRAFT_TYPE,
             source_url=source_url,
             prompt_override=prompt_override,
             payload=payload,
@@ -163,7 +165,7 @@ async def create_failure_draft(
                     crud_ai_drafts.create_draft,
                     db=db,
                     user_id=current_user.id,
-                    draft_type="recipe_suggestion_failure",
+                    draft_type=FAILURE_DRAFT_TYPE,
                     payload=payload,
                     source_url=source_url,
                     prompt_used=prompt_override,
@@ -204,6 +206,89 @@ async def create_failure_draft(
             raise
 
 
+async def create_pending_draft(
+    db: AsyncSession,
+    current_user: CurrentUser,
+    source_url: str,
+    prompt_override: str | None = None,
+) -> AIDraft:
+    """Create a placeholder draft for an extraction that is still running.
+
+    The draft id is handed to the client straight away; the payload is
+    replaced by `finalize_pending_draft` when the extraction finishes.
+    """
+    payload: dict[str, Any] = {"status": "pending"}
+    with _tracer.start_as_current_span("recipe_draft.create") as span:
+        _set_draft_span_attributes(
+            span,
+            draft_type=PENDING_DRAFT_TYPE,
+            source_url=source_url,
+            prompt_override=prompt_override,
+            payload=payload,
+        )
+        try:
+            draft = await crud_ai_drafts.create_draft(
+                db=db,
+                user_id=current_user.id,
+                draft_type=PENDING_DRAFT_TYPE,
+                payload=payload,
+                source_url=source_url,
+                prompt_used=prompt_override,
+                ttl_hours=1,
+            )
+            span.set_attribute("recipe_draft.status", "created")
+            return draft
+        except Exception as exc:
+            span.set_attribute("recipe_draft.status", "error")
+            span.record_exception(exc)
+            set_span_error_status(span, exc)
+            raise
+
+
+async def finalize_pending_draft(
+    db: AsyncSession,
+    draft_id: UUID,
+    generated_recipe: Any | None = None,
+    extraction_not_found: ExtractionNotFound | None = None,
+) -> AIDraft | None:
+    """Settle a pending draft with the extraction outcome.
+
+    Pass ``generated_recipe`` on success, ``extraction_not_found`` otherwise.
+    Returns None when the draft expired or was deleted in the meantime.
+    """
+    if generated_recipe is not None:
+        draft_type, payload = SUCCESS_DRAFT_TYPE, _normalize_payload(generated_recipe)
+    else:
+        draft_type = FAILURE_DRAFT_TYPE
+        payload = _failure_payload(
+            extraction_not_found or ExtractionNotFound(reason="No recipe found")
+        )
+
+    with _tracer.start_as_current_span("recipe_draft.finalize") as span:
+        span.set_attribute("recipe_draft.type", draft_type)
+        span.set_attribute("recipe_draft.failure", draft_type == FAILURE_DRAFT_TYPE)
+        draft = await crud_ai_drafts.update_draft_payload(
+            db, draft_id, draft_type, payload
+        )
+        span.set_attribute(
+            "recipe_draft.status", "finalized" if draft is not None else "missing"
+        )
+        return draft
+
+
+def is_pending_draft(draft: Any) -> bool:
+    """Return True while a draft still awaits its background extraction."""
+    return getattr(draft, "type", None) == PENDING_DRAFT_TYPE
+
+
+def is_failure_draft(draft: Any) -> bool:
+    """Return True for drafts recording a failed extraction."""
+    payload = getattr(draft, "payload", None)
+    return getattr(draft, "type", None) == FAILURE_DRAFT_TYPE or (
+        isinstance(payload, dict) and "error" in payload
+    )
+
+
 def create_draft_token(
     draft_id: UUID, user_id: UUID, exp_delta: timedelta | None = None
 ) -> str:
@@ -213,6 +298,15 @@ def create_draft_token(
     return core_create_draft_token(draft_id, user_id, exp_delta)
 
 
+def _failure_payload(extraction_not_found: ExtractionNotFound) -> dict[str, Any]:
+    payload: dict[str, Any] = {"error": "extraction_not_found"}
+    try:
+        payload["detail"] = extraction_not_found.model_dump()
+    except Exception:  # pragma: no cover - defensive
+        payload["detail"] = str(extraction_not_found)
+    return payload
+
+
 def _normalize_payload(obj: Any) -> dict[str, Any]:
     """Convert generated recipe or other objects to a JSON-serializable dict.
 
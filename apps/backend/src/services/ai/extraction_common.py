@@ -9,14 +9,17 @@ from __future__ import annotations
 
 from datetime import timedelta
 from typing import Any
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.users import User
+from schemas.auth import CurrentUser
 from services.ai.draft_service import (
     create_draft_token,
     create_failure_draft,
+    create_pending_draft,
     create_success_draft,
+    finalize_pending_draft,
 )
 from services.ai.interfaces import DraftServiceProtocol
 
@@ -38,7 +41,7 @@ class DraftManager:
     async def create_success_draft(
         self,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         source_url: str,
         generated_recipe: Any,
         prompt_override: str | None = None,
@@ -54,7 +57,7 @@ class DraftManager:
     async def create_failure_draft(
         self,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         source_url: str,
         extraction_not_found: Any,
         prompt_override: str | None = None,
@@ -67,6 +70,34 @@ class DraftManager:
             db, current_user, source_url, extraction_not_found, prompt_override
         )
 
+    async def create_pending_draft(
+        self,
+        db: AsyncSession,
+        current_user: CurrentUser,
+        source_url: str,
+        prompt_override: str | None = None,
+    ) -> Any:
+        if self._svc is not None:
+            return await self._svc.create_pending_draft(
+                db, current_user, source_url, prompt_override
+            )
+        return await create_pending_draft(db, current_user, source_url, prompt_override)
+
+    async def finalize_pending_draft(
+        self,
+        db: AsyncSession,
+        draft_id: UUID,
+        generated_recipe: Any | None = None,
+        extraction_not_found: Any | None = None,
+    ) -> Any:
+        if self._svc is not None:
+            return await self._svc.finalize_pending_draft(
+                db, draft_id, generated_recipe, extraction_not_found
+            )
+        return await finalize_pending_draft(
+            db, draft_id, generated_recipe, extraction_not_found
+        )
+
     def create_draft_token(
         self, draft_id: Any, user_id: Any, exp_delta: timedelta | None = None
     ) -> str:
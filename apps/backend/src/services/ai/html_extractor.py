@@ -1,21 +1,168 @@
 """HTML extraction and sanitization service."""
 
+import codecs
+import importlib.util
 import ipaddress
 import logging
 import re
 import socket
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from typing import Any
 from urllib.parse import urljoin, urlparse
 
 import httpx
 from bs4 import BeautifulSoup
-from bs4.element import Comment, NavigableString
+from bs4.element import Comment, NavigableString, PageElement, Tag
 from fastapi import HTTPException, status
 
+from services.ai.structured_data import StructuredDataCapture, StructuredRecipe
+from services.ai.url_cache import CachedPage, CacheValidators, UrlContentCache
+
 
 logger = logging.getLogger(__name__)
 
 type IPAddress = ipaddress.IPv4Address | ipaddress.IPv6Address
 
+# Number of leading body bytes buffered before the rest of the page is streamed.
+# Content-type sniffing and anti-bot challenge detection only look at this prefix.
+SNIFF_BYTES = 2000
+
+_HTML_SIGNATURES = ("<!doctype html", "<html", "<head", "<body")
+
+# BeautifulSoup tree builders the sanitizer knows how to drive.
+SUPPORTED_HTML_PARSERS = ("lxml", "html.parser")
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_CLASS_SUBSTRING_SELECTOR_RE = re.compile(r"""\[class\*=['"]([^'"]+)['"]\]""")
+_UNSAFE_URL_SCHEMES = ("javascript", "vbscript", "file")
+# Containers that broad boilerplate selectors must never remove.
+_STRUCTURAL_TAGS = {"html", "body", "main", "article"}
+
+
+def _default_html_parser() -> str:
+    """Prefer the C-backed lxml tree builder, falling back to html.parser."""
+    if importlib.util.find_spec("lxml") is None:
+        logger.debug("lxml not available; sanitizing with html.parser")
+        return "html.parser"
+    return "lxml"
+
+
+DEFAULT_HTML_PARSER = _default_html_parser()
+
+
+class SanitizedHTML(str):
+    """Sanitized page HTML that also carries the page's schema.org recipe.
+
+    Behaves exactly like ``str`` for existing callers. The recipe is captured
+    from the raw document because JSON-LD scripts and microdata attributes do
+    not survive sanitization.
+    """
+
+    structured_recipe: StructuredRecipe | None
+
+    def __new__(
+        cls, html: str, structured_recipe: StructuredRecipe | None = None
+    ) -> "SanitizedHTML":
+        instance = super().__new__(cls, html)
+        instance.structured_recipe = structured_recipe
+        return instance
+
+
+@dataclass(frozen=True)
+class _BoilerplateMatcher:
+    """Pure-Python matcher compiled from simple boilerplate CSS selectors.
+
+    Supports ``.class``, ``#id`` and ``[class*='substring']``, which is all
+    ``BOILERPLATE_SELECTORS`` uses. Matching in Python lets boilerplate removal
+    share the single pruning traversal instead of running soupsieve over the
+    whole document.
+    """
+
+    classes: frozenset[str]
+    ids: frozenset[str]
+    class_substrings: tuple[str, ...]
+
+    @classmethod
+    def from_selectors(cls, selectors: Iterable[str]) -> "_BoilerplateMatcher":
+        classes: set[str] = set()
+        ids: set[str] = set()
+        substrings: list[str] = []
+        for selector in selectors:
+            substring = _CLASS_SUBSTRING_SELECTOR_RE.fullmatch(selector)
+            if substring:
+                substrings.append(substring.group(1))
+            elif selector.startswith("."):
+                classes.add(selector[1:])
+            elif selector.startswith("#"):
+                ids.add(selector[1:])
+            else:
+                raise ValueError(f"Unsupported boilerplate selector: {selector}")
+        return cls(frozenset(classes), frozenset(ids), tuple(substrings))
+
+    def matches(self, tag: Tag) -> bool:
+        class_value = tag.get("class")
+        class_tokens: list[str]
+        if isinstance(class_value, list):
+            class_tokens = list(class_value)
+        elif isinstance(class_value, str):
+            class_tokens = class_value.split()
+        else:
+            class_tokens = []
+
+        if class_tokens:
+            if not self.classes.isdisjoint(class_tokens):
+                return True
+            class_attr = " ".join(class_tokens)
+            if any(sub in class_attr for sub in self.class_substrings):
+                return True
+
+        return tag.get("id") in self.ids
+
+
+class _StreamingSoupParser:
+    """Builds a BeautifulSoup tree from page text fed chunk by chunk.
+
+    With lxml, each chunk goes straight into an ``lxml.etree.HTMLParser``, so
+    the page is parsed while it downloads and no full copy of the text is
+    kept; ``close`` loads the finished lxml tree into BeautifulSoup.
+    html.parser has no incremental API, so its text is buffered and parsed
+    once on ``close``.
+    """
+
+    def __init__(self, parser: str) -> None:
+        self._parser = parser
+        self._chunks: list[str] = []
+        self._fed = False
+        self._feed_parser: Any = None
+        if parser == "lxml":
+            from lxml import etree  # type: ignore[import-untyped]
+
+            self._feed_parser = etree.HTMLParser()
+
+    def feed(self, text: str) -> None:
+        """Parse the next decoded chunk of the document."""
+        if not text:
+            return
+        self._fed = True
+        if self._feed_parser is None:
+            self._chunks.append(text)
+        else:
+            self._feed_parser.feed(text)
+
+    def close(self) -> BeautifulSoup:
+        """Finish parsing and return the document tree."""
+        if self._feed_parser is None:
+            return BeautifulSoup("".join(self._chunks), self._parser)
+        if not self._fed:
+            return BeautifulSoup("", self._parser)
+
+        from lxml import etree
+
+        root = self._feed_parser.close()
+        html = etree.tostring(root, encoding="unicode", method="html")
+        return BeautifulSoup(html, self._parser)
+
 
 def _is_blocked_ip_address(ip: IPAddress) -> bool:
     """Return True when an IP address should be blocked for outbound fetches.
@@ -39,15 +186,19 @@ def _is_blocked_ip_address(ip: IPAddress) -> bool:
     )
 
 
-def _is_bot_protection_challenge(response: httpx.Response) -> bool:
-    """Detect common anti-bot challenge responses from recipe sites."""
+def _is_bot_protection_challenge(response: httpx.Response, body_prefix: str) -> bool:
+    """Detect common anti-bot challenge responses from recipe sites.
+
+    Only the already-received ``body_prefix`` is inspected so a streamed
+    response never has to be read in full to recognise a challenge page.
+    """
     if response.status_code not in {403, 429, 503}:
         return False
 
     cf_mitigated = response.headers.get("cf-mitigated", "").lower()
     server = response.headers.get("server", "").lower()
     content_type = response.headers.get("content-type", "").lower()
-    body = response.text[:2000].lower()
+    body = body_prefix[:SNIFF_BYTES].lower()
 
     if cf_mitigated == "challenge":
         return True
@@ -65,6 +216,36 @@ def _is_bot_protection_challenge(response: httpx.Response) -> bool:
     return False
 
 
+def _next_outside(node: PageElement) -> PageElement | None:
+    """Return the first node in document order after ``node``'s subtree."""
+    current: PageElement | None = node
+    while current is not None:
+        if current.next_sibling is not None:
+            return current.next_sibling
+        current = current.parent
+    return None
+
+
+def _record_validators(response: httpx.Response, validators: CacheValidators) -> bool:
+    """Copy cache headers into ``validators``; True when the page is unchanged."""
+    sent_conditional = bool(validators.etag or validators.last_modified)
+    validators.etag = response.headers.get("etag") or validators.etag
+    validators.last_modified = (
+        response.headers.get("last-modified") or validators.last_modified
+    )
+    validators.cacheable = (
+        "no-store" not in response.headers.get("cache-control", "").lower()
+    )
+    validators.not_modified = sent_conditional and response.status_code == 304
+    return validators.not_modified
+
+
+def _looks_like_html(body_prefix: str) -> bool:
+    """Return True when the start of a body looks like an HTML document."""
+    head = body_prefix[:SNIFF_BYTES].lstrip().lower()
+    return head.startswith(_HTML_SIGNATURES)
+
+
 class HTMLExtractionService:
     """Service for fetching and sanitizing HTML content from recipe URLs."""
 
@@ -146,19 +327,45 @@ class HTMLExtractionService:
         "data-*",
     }
 
-    def __init__(self, timeout: int = 30, max_size: int = 5 * 1024 * 1024):
+    def __init__(
+        self,
+        timeout: int = 30,
+        max_size: int = 5 * 1024 * 1024,
+        parser: str | None = None,
+        cache: UrlContentCache | None = None,
+    ):
         """Initialize the HTML extraction service.
 
         Args:
             timeout: Request timeout in seconds
             max_size: Maximum response size in bytes (5MB default)
+            parser: BeautifulSoup tree builder ("lxml" or "html.parser");
+                defaults to lxml when it is installed
+            cache: Shared page cache; when set, sanitized pages are reused
+                across callers and revalidated with conditional requests
         """
+        parser = parser or DEFAULT_HTML_PARSER
+        if parser not in SUPPORTED_HTML_PARSERS:
+            raise ValueError(
+                f"Unsupported HTML parser {parser!r}; "
+                f"expected one of {SUPPORTED_HTML_PARSERS}"
+            )
         self.timeout = timeout
         self.max_size = max_size
+        self.parser = parser
+        self.cache = cache
+        self._boilerplate_matcher = _BoilerplateMatcher.from_selectors(
+            self.BOILERPLATE_SELECTORS
+        )
+
+    def _build_request_headers(
+        self, validators: CacheValidators | None = None
+    ) -> dict[str, str]:
+        """Build outbound headers for recipe page fetches.
 
-    def _build_request_headers(self) -> dict[str, str]:
-        """Build outbound headers for recipe page fetches."""
-        return {
+        Stored cache validators turn the request into a conditional GET.
+        """
+        headers = {
             "User-Agent": (
                 "Mozilla/5.0 (compatible; PantryPilot-RecipeBot/1.0; "
                 "+https://github.com/bostdiek/PantryPilot)"
@@ -171,30 +378,90 @@ class HTMLExtractionService:
             "DNT": "1",
             "Connection": "keep-alive",
         }
-
-    async def fetch_and_sanitize(self, url: str) -> str:
+        if validators is not None:
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
+        return headers
+
+    async def fetch_and_sanitize(self, url: str) -> SanitizedHTML:
         """Fetch HTML from URL and return sanitized content.
 
         Args:
             url: The URL to fetch
 
         Returns:
-            Clean, sanitized HTML content
+            Clean, sanitized HTML content carrying any schema.org recipe data
 
         Raises:
             HTTPException: If URL is invalid or fetch fails
         """
+        if self.cache is not None:
+            page = await self.fetch_cached_page(url)
+            return page.sanitized_html
+
         # Validate URL
         self._validate_url(url)
 
-        # Fetch HTML content
-        html_content = await self._fetch_html(url)
-
-        # Parse and sanitize
-        sanitized_content = self._sanitize_html(html_content, url)
+        # Fetch, parsing the page as it streams in, then sanitize
+        sanitized_content = await self._fetch_and_parse(url)
+        assert sanitized_content is not None  # only None for a 304
 
         return sanitized_content
 
+    async def fetch_cached_page(self, url: str) -> CachedPage:
+        """Return the cached page for ``url``, fetching or revalidating it.
+
+        Args:
+            url: The URL to fetch
+
+        Returns:
+            Cache entry holding the sanitized HTML (and any stored Markdown)
+
+        Raises:
+            HTTPException: If URL is invalid or fetch fails
+            RuntimeError: If the service was created without a cache
+        """
+        if self.cache is None:
+            raise RuntimeError("HTMLExtractionService was created without a cache")
+        return await self.cache.get_or_fetch(
+            url,
+            self._fetch_and_sanitize_conditional,
+            variant=f"{self.max_size}:{self.timeout}",
+        )
+
+    async def _fetch_and_sanitize_conditional(
+        self, url: str, validators: CacheValidators
+    ) -> SanitizedHTML | None:
+        """Fetch with cache validators; returns None when the page is unchanged."""
+        self._validate_url(url)
+        return await self._fetch_and_parse(url, validators)
+
+    async def _fetch_and_parse(
+        self, url: str, validators: CacheValidators | None = None
+    ) -> SanitizedHTML | None:
+        """Download ``url``, feeding each decoded chunk to the parser on arrival.
+
+        The document tree is built while the body streams in; sanitization
+        runs on that tree once the download ends.
+
+        Returns:
+            Sanitized HTML, or None when the server answered 304 Not Modified
+        """
+        parser = _StreamingSoupParser(self.parser)
+        async for chunk in self._iter_html_chunks(url, validators):
+            parser.feed(chunk)
+        if validators is not None and validators.not_modified:
+            return None
+
+        try:
+            soup = parser.close()
+        except Exception as e:
+            logger.warning(f"Failed to parse HTML: {e}")
+            return SanitizedHTML("")
+        return self._sanitize_soup(soup, url)
+
     def _validate_url(self, url: str) -> None:
         """Validate that the URL is safe to fetch.
 
@@ -262,19 +529,28 @@ class HTMLExtractionService:
                     ),
                 )
 
-    async def _fetch_html(self, url: str) -> str:
-        """Fetch HTML content from the URL.
+    async def _iter_html_chunks(
+        self, url: str, validators: CacheValidators | None = None
+    ) -> AsyncIterator[str]:
+        """Stream decoded HTML text from the URL chunk by chunk.
+
+        The body is never buffered in full: the download is aborted as soon
+        as it crosses ``max_size`` and text is decoded incrementally as bytes
+        arrive, so callers can start consuming the page early.
 
         Args:
             url: URL to fetch
+            validators: Cache validators to send as a conditional request;
+                updated in place from the response. Nothing is yielded when
+                the server answers 304 Not Modified.
 
-        Returns:
-            Raw HTML content
+        Yields:
+            Decoded HTML text chunks in document order
 
         Raises:
-            HTTPException: If fetch fails
+            HTTPException: If fetch fails or the response is rejected
         """
-        headers = self._build_request_headers()
+        headers = self._build_request_headers(validators)
 
         try:
             # Disable automatic redirects so we can inspect each location for SSRF
@@ -284,8 +560,15 @@ class HTMLExtractionService:
                 limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
             ) as client:
                 response = await self._fetch_with_safe_redirects(client, url, headers)
-                self._validate_http_response(response)
-                return response.text
+                try:
+                    if validators is not None and _record_validators(
+                        response, validators
+                    ):
+                        return
+                    async for chunk in self._read_html_body(response):
+                        yield chunk
+                finally:
+                    await response.aclose()
 
         except httpx.HTTPStatusError as e:
             raise HTTPException(
@@ -319,8 +602,11 @@ class HTMLExtractionService:
         url: str,
         headers: dict[str, str],
     ) -> httpx.Response:
-        """Fetch a URL and manually follow a small number of validated redirects."""
-        response = await client.get(url, headers=headers)
+        """Open a streamed response, manually following validated redirects.
+
+        The returned response body has not been read; callers must close it.
+        """
+        response = await self._open_stream(client, url, headers)
         redirects_remaining = 5
 
         while response.is_redirect and redirects_remaining > 0:
@@ -329,15 +615,89 @@ class HTMLExtractionService:
                 break
 
             next_url = urljoin(str(response.url), loc)
+            await response.aclose()
             self._validate_url(next_url)
-            response = await client.get(next_url, headers=headers)
+            response = await self._open_stream(client, next_url, headers)
             redirects_remaining -= 1
 
         return response
 
-    def _validate_http_response(self, response: httpx.Response) -> None:
-        """Validate the fetched HTTP response before returning its HTML."""
-        if _is_bot_protection_challenge(response):
+    async def _open_stream(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: dict[str, str],
+    ) -> httpx.Response:
+        """Send a GET request without reading the response body."""
+        request = client.build_request("GET", url, headers=headers)
+        return await client.send(request, stream=True)
+
+    async def _read_html_body(self, response: httpx.Response) -> AsyncIterator[str]:
+        """Validate a streamed response and yield its body as decoded text.
+
+        A declared Content-Length over ``max_size`` is rejected before any
+        body bytes are read. The first ``SNIFF_BYTES`` are buffered so
+        challenge markers and the content type can be checked before the rest
+        of the body is pulled.
+        """
+        self._enforce_declared_size(response)
+        byte_stream = response.aiter_bytes()
+        decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(
+            errors="replace"
+        )
+
+        head = b""
+        async for chunk in byte_stream:
+            head += chunk
+            if len(head) >= SNIFF_BYTES:
+                break
+
+        received = len(head)
+        self._enforce_size_limit(received)
+        head_text = decoder.decode(head)
+        self._validate_http_response(response, head_text)
+
+        if head_text:
+            yield head_text
+
+        async for chunk in byte_stream:
+            received += len(chunk)
+            self._enforce_size_limit(received)
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def _enforce_declared_size(self, response: httpx.Response) -> None:
+        """Reject a response whose Content-Length already exceeds ``max_size``."""
+        declared_size = response.headers.get("content-length", "")
+        if declared_size.isdigit() and int(declared_size) > self.max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Response too large: {declared_size} bytes",
+            )
+
+    def _enforce_size_limit(self, received: int) -> None:
+        """Abort the download once more than ``max_size`` bytes arrived."""
+        if received > self.max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Response too large: exceeded {self.max_size} bytes",
+            )
+
+    def _validate_http_response(
+        self, response: httpx.Response, body_prefix: str
+    ) -> None:
+        """Validate response headers and the first body bytes before streaming.
+
+        Args:
+            response: Streamed response whose body has not been fully read
+            body_prefix: Decoded text of the first received body bytes
+        """
+        if _is_bot_protection_challenge(response, body_prefix):
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=(
@@ -348,22 +708,26 @@ class HTMLExtractionService:
 
         response.raise_for_status()
 
-        if len(response.content) > self.max_size:
-            raise HTTPException(
-                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"Response too large: {len(response.content)} bytes",
-            )
-
         content_type = response.headers.get("content-type", "").lower()
-        if "html" not in content_type:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=f"Expected HTML content, got: {content_type}",
-            )
+        if "html" in content_type:
+            return
+        # Servers that omit the header still get through when the body sniffs
+        # as HTML; an explicit non-HTML type is always rejected.
+        if not content_type and _looks_like_html(body_prefix):
+            return
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Expected HTML content, got: {content_type}",
+        )
 
-    def _sanitize_html(self, html: str, base_url: str) -> str:
+    def _sanitize_html(self, html: str, base_url: str) -> SanitizedHTML:
         """Sanitize HTML content and extract recipe-relevant sections.
 
+        The document is parsed once; pruning, recipe-container extraction and
+        the final attribute/text/URL cleanup each walk the tree a single time.
+        schema.org recipe markup is read along the way, before the scripts and
+        attributes that carry it are stripped.
+
         Args:
             html: Raw HTML content
             base_url: Base URL for resolving relative links
@@ -372,189 +736,191 @@ class HTMLExtractionService:
             Sanitized HTML focused on recipe content
         """
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, self.parser)
         except Exception as e:
             logger.warning(f"Failed to parse HTML: {e}")
-            return ""
-
-        # Remove unwanted elements completely
-        for tag_name in self.UNWANTED_TAGS:
-            for tag in soup.find_all(tag_name):
-                tag.decompose()
+            return SanitizedHTML("")
 
-        # Remove comments
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
+        return self._sanitize_soup(soup, base_url)
 
-        # Remove boilerplate elements to reduce token count
-        self._remove_boilerplate(soup)
+    def _sanitize_soup(self, soup: BeautifulSoup, base_url: str) -> SanitizedHTML:
+        """Sanitize an already-parsed document (see ``_sanitize_html``)."""
+        # Remove unwanted tags, comments and boilerplate in one traversal
+        capture = StructuredDataCapture()
+        self._prune_tree(soup, capture)
+        structured_recipe = self._read_structured_recipe(capture)
 
         # Try to find recipe-specific content
+        root: Tag = soup
         recipe_content = self._extract_recipe_content(soup)
+        if recipe_content is not None:
+            root = recipe_content
+
+        # Clean attributes, whitespace and relative URLs in one traversal
+        for node in [root, *root.descendants]:
+            if isinstance(node, NavigableString):
+                self._clean_text_node(node)
+            elif isinstance(node, Tag):
+                self._clean_tag_attributes(node)
+                self._resolve_tag_urls(node, base_url)
+
+        return SanitizedHTML(str(root), structured_recipe)
+
+    def _read_structured_recipe(
+        self, capture: StructuredDataCapture
+    ) -> StructuredRecipe | None:
+        """Parse schema.org recipe markup; failures never break sanitization."""
+        try:
+            return capture.recipe()
+        except Exception as e:
+            logger.debug("Ignoring unparseable recipe structured data: %s", e)
+            return None
 
-        if recipe_content:
-            soup = recipe_content
-
-        # Clean up remaining tags and attributes
-        self._clean_attributes(soup)
+    def _prune_tree(
+        self, soup: BeautifulSoup, capture: StructuredDataCapture | None = None
+    ) -> None:
+        """Drop unwanted tags, comments and boilerplate in a single walk.
 
-        # Clean up text content
-        self._clean_text_content(soup)
+        Removed subtrees are skipped rather than visited, so the cost is one
+        pass over the nodes that survive.
 
-        # Convert relative URLs to absolute
-        self._resolve_urls(soup, base_url)
+        Args:
+            soup: BeautifulSoup object to prune in place
+            capture: When given, sees every tag before removal so recipe
+                structured data can be read
+        """
+        node: PageElement | None = soup.contents[0] if soup.contents else None
+        while node is not None:
+            if capture is not None and isinstance(node, Tag):
+                capture.observe(node)
+            remove = isinstance(node, Comment) or (
+                isinstance(node, Tag)
+                and (node.name in self.UNWANTED_TAGS or self._is_boilerplate(node))
+            )
+            if not remove:
+                node = node.next_element
+                continue
 
-        return str(soup)
+            following = _next_outside(node)
+            if isinstance(node, Tag):
+                node.decompose()
+            else:
+                node.extract()
+            node = following
 
-    def _extract_recipe_content(self, soup: BeautifulSoup) -> BeautifulSoup | None:
+    def _extract_recipe_content(self, soup: BeautifulSoup) -> Tag | None:
         """Try to extract recipe-specific content from the page.
 
+        The first match is detached from the document and returned as-is, so
+        the caller keeps working on the already-parsed tree.
+
         Args:
             soup: BeautifulSoup object
 
         Returns:
-            BeautifulSoup object with recipe content, or None
+            Detached tag holding the recipe content, or None
         """
         for selector in self.RECIPE_SELECTORS:
-            elements = soup.select(selector)
-            if elements:
-                # Return a new BeautifulSoup fragment created from the string
-                # representation of the matched element. This avoids trying to
-                # move an element from one tree to another which can raise
-                # "element is not part of a tree" errors when the element
-                # already belongs to a parsed document.
-                try:
-                    fragment = BeautifulSoup(str(elements[0]), "html.parser")
-                    return fragment
-                except Exception:
-                    # Fallback to returning None so the caller will use the
-                    # full document instead of a broken fragment.
-                    return None
+            element = soup.select_one(selector)
+            if element is not None:
+                return element.extract()
 
         return None
 
-    def _remove_boilerplate(self, soup: BeautifulSoup) -> None:
-        """Remove boilerplate elements like ads, related posts, social buttons.
+    def _is_boilerplate(self, tag: Tag) -> bool:
+        """Return True when a tag matches ``BOILERPLATE_SELECTORS``.
 
-        Args:
-            soup: BeautifulSoup object to clean
+        Broad substring selectors like [class*='sidebar'] can match structural
+        containers (for example <body class="has-sidebar">) and would wipe the
+        entire document, so root/content wrappers are always preserved.
         """
-        # Combine selectors so the DOM is only traversed once
-        combined_selector = ",".join(self.BOILERPLATE_SELECTORS)
-        try:
-            for element in soup.select(combined_selector):
-                # Broad substring selectors like [class*='sidebar'] can match
-                # structural containers (for example <body class="has-sidebar">)
-                # and wipe the entire document. Preserve root/content wrappers.
-                if element.name in {"html", "body", "main", "article"}:
-                    continue
-                element.decompose()
-        except Exception as e:
-            # Log and continue if selector processing fails
-            logger.debug(
-                "Failed to remove boilerplate elements with combined selectors: %s",
-                e,
-            )
+        if tag.name in _STRUCTURAL_TAGS:
+            return False
+        return self._boilerplate_matcher.matches(tag)
 
-    def _clean_attributes(self, soup: BeautifulSoup) -> None:
-        """Remove unwanted attributes from all tags.
+    def _clean_tag_attributes(self, tag: Tag) -> None:
+        """Keep only safe attributes on a single tag.
 
         Args:
-            soup: BeautifulSoup object to clean
+            tag: Tag to clean in place
         """
-        for tag in soup.find_all():
-            # Keep only safe attributes and filter unsafe URI schemes
-            attrs_to_keep = {}
-            for attr, value in tag.attrs.items():
-                name = attr.lower()
-                if name not in ("href", "src", "alt", "title"):
-                    continue
+        # Keep only safe attributes and filter unsafe URI schemes
+        attrs_to_keep = {}
+        for attr, value in tag.attrs.items():
+            name = attr.lower()
+            if name not in ("href", "src", "alt", "title"):
+                continue
 
-                # Only handle string values (skip lists/dicts)
-                if not isinstance(value, str):
-                    continue
+            # Only handle string values (skip lists/dicts)
+            if not isinstance(value, str):
+                continue
 
-                # Parse scheme and reject unsafe ones
-                parsed = urlparse(value)
-                scheme = (parsed.scheme or "").lower()
-                if scheme in ("javascript", "vbscript", "file"):
-                    # drop attribute entirely
-                    continue
+            # Parse scheme and reject unsafe ones
+            parsed = urlparse(value)
+            scheme = (parsed.scheme or "").lower()
+            if scheme in _UNSAFE_URL_SCHEMES:
+                # drop attribute entirely
+                continue
 
-                if scheme == "data":
-                    # Limit data: URIs to images only and small size (naive check)
-                    # Example: data:image/png;base64,...
-                    if not parsed.path.startswith("image/"):
-                        continue
+            if scheme == "data":
+                # Limit data: URIs to images only and small size (naive check)
+                # Example: data:image/png;base64,...
+                if not parsed.path.startswith("image/"):
+                    continue
 
-                # Accept http/https, data:image/* and schemeless (relative) URLs
-                attrs_to_keep[attr] = value
+            # Accept http/https, data:image/* and schemeless (relative) URLs
+            attrs_to_keep[attr] = value
 
-            tag.attrs.clear()
-            tag.attrs.update(attrs_to_keep)
+        tag.attrs.clear()
+        tag.attrs.update(attrs_to_keep)
 
-    def _clean_text_content(self, soup: BeautifulSoup) -> None:
-        """Clean up text content within the HTML.
+    def _clean_text_node(self, node: NavigableString) -> None:
+        """Collapse excessive whitespace in a single text node.
 
         Args:
-            soup: BeautifulSoup object to clean
+            node: Text node to clean in place
         """
-        # Remove excessive whitespace. Operate only on NavigableString nodes
-        # that are still attached to the parse tree to avoid errors like
-        # "Cannot replace one element with another when the element to be
-        # replaced is not part of a tree."
-
-        for node in list(soup.descendants):
-            # We only care about text nodes
-            if not isinstance(node, NavigableString):
-                continue
+        text = node.string
+        if not text:
+            return
 
-            text = node.string
-            if not text:
-                continue
+        cleaned = _WHITESPACE_RE.sub(" ", text).strip()
+        if cleaned == text:
+            return
 
-            cleaned = re.sub(r"\s+", " ", text).strip()
-            if cleaned == text:
-                continue
+        # Ensure the node still has a parent (is in the tree) before
+        # attempting to replace it. Some fragments or extracted nodes may
+        # not be attached, and replace_with would raise in that case.
+        if getattr(node, "parent", None) is None:
+            return
 
-            # Ensure the node still has a parent (is in the tree) before
-            # attempting to replace it. Some fragments or extracted nodes may
-            # not be attached, and replace_with would raise in that case.
-            parent = getattr(node, "parent", None)
-            if parent is None:
-                # Skip orphaned text nodes
-                continue
+        try:
+            node.replace_with(cleaned)
+        except Exception as e:
+            # Log and skip any node we can't replace safely
+            logger.debug("Skipping text node replacement due to: %s", e)
 
-            try:
-                node.replace_with(cleaned)
-            except Exception as e:
-                # Log and skip any node we can't replace safely
-                logger.debug("Skipping text node replacement due to: %s", e)
+    def _resolve_tag_urls(self, tag: Tag, base_url: str) -> None:
+        """Resolve link and source URLs on a single tag.
 
-    def _resolve_urls(self, soup: BeautifulSoup, base_url: str) -> None:
-        """Convert relative URLs to absolute URLs.
+        Only anchor ``href`` values and any ``src`` value are rewritten;
+        results with unsafe schemes are dropped.
 
         Args:
-            soup: BeautifulSoup object
+            tag: Tag to update in place
             base_url: Base URL for resolution
         """
-        # Resolve href attributes
-        for link in soup.find_all("a", href=True):
-            href = link["href"]
-            if isinstance(href, str):
-                new = urljoin(base_url, href)
-                # Reject javascript/vbscript/file schemes if they slipped through
-                if urlparse(new).scheme.lower() in ("javascript", "vbscript", "file"):
-                    del link["href"]
-                else:
-                    link["href"] = new
-
-        # Resolve src attributes (images, etc.)
-        for element in soup.find_all(src=True):
-            src = element["src"]
-            if isinstance(src, str):
-                new = urljoin(base_url, src)
-                if urlparse(new).scheme.lower() in ("javascript", "vbscript", "file"):
-                    del element["src"]
-                else:
-                    element["src"] = new
+        attrs = ["src"]
+        if tag.name == "a":
+            attrs.append("href")
+
+        for attr in attrs:
+            value = tag.attrs.get(attr)
+            if not isinstance(value, str):
+                continue
+            new = urljoin(base_url, value)
+            # Reject javascript/vbscript/file schemes if they slipped through
+            if urlparse(new).scheme.lower() in _UNSAFE_URL_SCHEMES:
+                del tag[attr]
+            else:
+                tag[attr] = new
@@ -0,0 +1,117 @@
+"""In-process registry of background image extraction jobs.
+
+``POST /ai/extract-recipe-from-image?stream=true`` starts a job and returns the
+pending draft id straight away. The SSE endpoint then subscribes to the job;
+subscribers that connect late first replay the events published so far, so no
+stage transition is lost between the upload answer and the stream request.
+
+NOTE: Jobs live in the worker process that accepted the upload. A stream
+request served by another worker finds no job here and falls back to polling
+the draft row (see ``ImageOrchestrator``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from schemas.ai import SSEEvent
+
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs stay subscribable this long so a slow client still gets the
+# full event history instead of falling back to the database.
+IMAGE_JOB_RETENTION_SECONDS = 300
+
+_TERMINAL_STATUSES = frozenset({"complete", "error"})
+
+
+@dataclass
+class ImageExtractionJob:
+    """Event history and live subscribers of one background extraction."""
+
+    draft_id: UUID
+    user_id: UUID
+    events: list[SSEEvent] = field(default_factory=list)
+    task: asyncio.Task[None] | None = None
+    _updated: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.events) and self.events[-1].status in _TERMINAL_STATUSES
+
+    def publish(self, event: SSEEvent) -> None:
+        """Append an event and wake subscribers; ignored once finished."""
+        if self.finished:
+            return
+        self.events.append(event)
+        self._updated.set()
+
+    async def subscribe(self) -> AsyncIterator[SSEEvent]:
+        """Yield every event from the start, then live ones until terminal."""
+        index = 0
+        while True:
+            while index < len(self.events):
+                event = self.events[index]
+                index += 1
+                yield event
+                if event.status in _TERMINAL_STATUSES:
+                    return
+            # Safe to clear: events are checked by index, not by the flag
+            self._updated.clear()
+            await self._updated.wait()
+
+
+type ImageJobRunner = Callable[[ImageExtractionJob], Awaitable[None]]
+
+_jobs: dict[UUID, ImageExtractionJob] = {}
+
+
+def get_image_job(draft_id: UUID) -> ImageExtractionJob | None:
+    """Return the job for ``draft_id`` if it runs (or ran) in this process."""
+    return _jobs.get(draft_id)
+
+
+def start_image_job(
+    draft_id: UUID, user_id: UUID, run: ImageJobRunner
+) -> ImageExtractionJob:
+    """Register a job for ``draft_id`` and run ``run(job)`` in the background."""
+    job = ImageExtractionJob(draft_id=draft_id, user_id=user_id)
+    _jobs[draft_id] = job
+    # The registry holds the task reference so it is not garbage collected
+    job.task = asyncio.create_task(_run_job(job, run))
+    return job
+
+
+async def _run_job(job: ImageExtractionJob, run: ImageJobRunner) -> None:
+    try:
+        await run(job)
+    except Exception:
+        logger.exception("Image extraction job %s failed", job.draft_id)
+    finally:
+        if not job.finished:
+            job.publish(
+                SSEEvent.terminal_error(
+                    step="internal",
+                    detail="Image extraction stopped unexpectedly",
+                    error_code="internal_error",
+                )
+            )
+        asyncio.get_running_loop().call_later(
+            IMAGE_JOB_RETENTION_SECONDS, _jobs.pop, job.draft_id, None
+        )
+
+
+def clear_image_jobs() -> None:
+    """Cancel and forget every job.
+
+    Tests should use this instead of reaching into the registry.
+    """
+    for job in _jobs.values():
+        if job.task is not None:
+            job.task.cancel()
+    _jobs.clear()
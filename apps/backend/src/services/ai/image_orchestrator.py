@@ -1,26 +1,110 @@
-"""Image-specific orchestrator for recipe extraction from uploaded photos."""
+"""Image-specific orchestrator for recipe extraction from uploaded photos.
+
+Two modes are supported:
+
+* ``extract_recipe_from_images`` runs the whole pipeline inside the request
+  (used by the synchronous upload fallback).
+* ``start_image_extraction`` validates the upload, stores a pending draft and
+  runs normalization, the streamed multimodal agent call and conversion as a
+  background job (see ``services.ai.image_jobs``). ``stream_extraction_progress``
+  relays the job's real stage transitions and partial output over SSE.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import time
 from collections.abc import AsyncGenerator
 from datetime import timedelta
 from typing import Any
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.observability import get_tracer, set_span_error_status
-from models.users import User
+from core.config import get_settings
+from core.observability import (
+    ProductTelemetryEventName,
+    get_tracer,
+    record_product_telemetry_event,
+    set_span_error_status,
+)
+from dependencies.db import AsyncSessionLocal, StreamSessionLocal
+from schemas.ai import ExtractionNotFound, PartialRecipeSummary, SSEEvent
+from schemas.auth import CurrentUser
+from services.ai.draft_service import is_failure_draft, is_pending_draft
 from services.ai.extraction_common import DraftManager
+from services.ai.image_jobs import ImageExtractionJob, get_image_job, start_image_job
 from services.ai.interfaces import (
     AIAgentProtocol,
     AIExtractionService,
     RecipeConverterProtocol,
 )
 from services.ai.models import DraftOutcome
+from services.images.normalize import (
+    ImageValidationError,
+    normalize_images,
+    validate_images,
+)
 
 
 _tracer = get_tracer(__name__)
 
+IMAGE_SOURCE_URL = "image_upload"
+
+# Streams served by a worker that does not own the job poll the draft row
+IMAGE_DRAFT_POLL_INTERVAL_SECONDS = 1.0
+IMAGE_DRAFT_POLL_TIMEOUT_SECONDS = 180.0
+
+# Progress band covered by partial output while the agent is generating
+_AI_CALL_PROGRESS = 0.3
+_CONVERT_PROGRESS = 0.9
+
+
+class _PartialProgress:
+    """Turns partial agent outputs into ``partial`` SSE events.
+
+    Only changes in the recipe's shape produce an event, and a human-readable
+    detail is attached only when a new section (title, ingredients,
+    instructions) first appears.
+    """
+
+    def __init__(self) -> None:
+        self._last = PartialRecipeSummary.model_validate({})
+
+    def event_for(self, output: Any) -> SSEEvent | None:
+        if output is None or isinstance(output, ExtractionNotFound):
+            return None
+        summary = PartialRecipeSummary(
+            title=getattr(output, "title", None) or None,
+            ingredient_count=len(getattr(output, "ingredients", None) or []),
+            instruction_count=len(getattr(output, "instructions", None) or []),
+        )
+        if summary == self._last:
+            return None
+        detail = self._transition_detail(summary)
+        self._last = summary
+        items = summary.ingredient_count + summary.instruction_count
+        return SSEEvent.model_validate(
+            {
+                "status": "partial",
+                "step": "ai_call",
+                "progress": min(
+                    _CONVERT_PROGRESS - 0.05, _AI_CALL_PROGRESS + 0.02 * items
+                ),
+                "detail": detail,
+                "partial": summary,
+            }
+        )
+
+    def _transition_detail(self, summary: PartialRecipeSummary) -> str | None:
+        if summary.title and not self._last.title:
+            return f"Found recipe: {summary.title}"
+        if summary.ingredient_count and not self._last.ingredient_count:
+            return "Reading ingredients..."
+        if summary.instruction_count and not self._last.instruction_count:
+            return "Reading instructions..."
+        return None
+
 
 class ImageOrchestrator(AIExtractionService):
     def __init__(
@@ -38,7 +122,7 @@ class ImageOrchestrator(AIExtractionService):
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[Any]:
         # Image orchestrator does not implement URL extraction
@@ -48,7 +132,7 @@ class ImageOrchestrator(AIExtractionService):
         self,
         normalized_images: list[bytes],
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[Any]:
         with _tracer.start_as_current_span("ai_recipe_extract.image") as span:
@@ -129,20 +213,197 @@ class ImageOrchestrator(AIExtractionService):
                 set_span_error_status(span, exc)
                 raise
 
+    async def start_image_extraction(
+        self,
+        image_files: list[tuple[bytes, str]],
+        db: AsyncSession,
+        current_user: CurrentUser,
+        prompt_override: str | None = None,
+    ) -> DraftOutcome[Any]:
+        """Store a pending draft and run the extraction pipeline in the background.
+
+        Raises:
+            ImageValidationError: If the uploads fail the type or size checks
+        """
+        validate_images(image_files)
+        draft = await self.draft_manager.create_pending_draft(
+            db, current_user, IMAGE_SOURCE_URL, prompt_override
+        )
+        # The job settles the draft from its own session, so the row must be
+        # committed before the job can possibly finish.
+        await db.commit()
+        token = self.draft_manager.create_draft_token(
+            draft.id, current_user.id, timedelta(hours=1)
+        )
+
+        async def run(job: ImageExtractionJob) -> None:
+            await self._run_image_job(job, image_files, prompt_override)
+
+        start_image_job(draft.id, current_user.id, run)
+        return DraftOutcome(draft, token, True, message="pending")
+
+    async def _run_image_job(
+        self,
+        job: ImageExtractionJob,
+        image_files: list[tuple[bytes, str]],
+        prompt_override: str | None,
+    ) -> None:
+        started_at = time.monotonic()
+        settings = get_settings()
+        with _tracer.start_as_current_span("ai_recipe_extract.image") as span:
+            span.set_attribute("ai_recipe.source_type", "image")
+            span.set_attribute("ai_recipe.streamed", True)
+            span.set_attribute("ai_recipe.image_count", len(image_files))
+            span.set_attribute(
+                "ai_recipe.prompt_override_used", prompt_override is not None
+            )
+            error_type = await self._run_image_pipeline(
+                job, image_files, prompt_override, span
+            )
+            record_product_telemetry_event(
+                span,
+                event=ProductTelemetryEventName.IMAGE_IMPORT_FAILED
+                if error_type
+                else ProductTelemetryEventName.IMAGE_IMPORT_COMPLETED,
+                feature_name="image_import",
+                provider=settings.LLM_PROVIDER,
+                model_name=settings.MULTIMODAL_MODEL,
+                success=error_type is None,
+                latency_ms=int((time.monotonic() - started_at) * 1000),
+                error_type=error_type,
+                streamed=True,
+            )
+
+    async def _run_image_pipeline(
+        self,
+        job: ImageExtractionJob,
+        image_files: list[tuple[bytes, str]],
+        prompt_override: str | None,
+        span: Any,
+    ) -> str | None:
+        """Run normalize -> streamed agent call -> convert for one job.
+
+        The pending draft is settled before each terminal event is published,
+        so a client reacting to ``complete`` always reads the final payload.
+        Returns None on success, otherwise the failure's error code.
+        """
+        job.publish(
+            SSEEvent.model_validate(
+                {"status": "started", "step": "started", "progress": 0.0}
+            )
+        )
+        job.publish(
+            SSEEvent.model_validate(
+                {
+                    "status": "processing",
+                    "step": "normalize",
+                    "progress": 0.1,
+                    "detail": f"Preparing {len(image_files)} photo(s)...",
+                }
+            )
+        )
+        try:
+            # PIL decode/resize/re-encode is CPU bound; keep it off the loop
+            normalized = await asyncio.to_thread(normalize_images, image_files)
+        except ImageValidationError as e:
+            return await self._fail_job(job, span, "normalize", "invalid_image", e)
+
+        job.publish(
+            SSEEvent.model_validate(
+                {
+                    "status": "ai_call",
+                    "step": "ai_call",
+                    "progress": _AI_CALL_PROGRESS,
+                    "detail": "Reading the recipe from your photo(s)...",
+                }
+            )
+        )
+        partial_progress = _PartialProgress()
+
+        async def on_partial(output: Any) -> None:
+            event = partial_progress.event_for(output)
+            if event is not None:
+                job.publish(event)
+
+        try:
+            extraction_result = await self.ai_agent.stream_image_extraction_agent(
+                normalized, on_partial, prompt_override
+            )
+        except Exception as e:
+            return await self._fail_job(job, span, "ai_call", "agent_error", e)
+
+        if isinstance(extraction_result, ExtractionNotFound):
+            await self._settle_draft(job, extraction_not_found=extraction_result)
+            span.set_attribute("ai_recipe.extraction_status", "not_found")
+            span.set_attribute("ai_recipe.result_type", "failure_draft")
+            job.publish(SSEEvent.terminal_success(draft_id=job.draft_id, success=False))
+            return "not_found"
+
+        job.publish(
+            SSEEvent.model_validate(
+                {
+                    "status": "converting",
+                    "step": "convert_schema",
+                    "progress": _CONVERT_PROGRESS,
+                }
+            )
+        )
+        try:
+            generated_recipe = self.recipe_converter.convert_to_recipe_create(
+                extraction_result, IMAGE_SOURCE_URL
+            )
+        except Exception as e:
+            return await self._fail_job(
+                job, span, "convert_schema", "convert_failed", e
+            )
+
+        await self._settle_draft(job, generated_recipe=generated_recipe)
+        span.set_attribute("ai_recipe.extraction_status", "success")
+        span.set_attribute("ai_recipe.result_type", "draft")
+        job.publish(SSEEvent.terminal_success(draft_id=job.draft_id, success=True))
+        return None
+
+    async def _fail_job(
+        self,
+        job: ImageExtractionJob,
+        span: Any,
+        step: str,
+        error_code: str,
+        exc: Exception,
+    ) -> str:
+        span.set_attribute("ai_recipe.extraction_status", error_code)
+        span.record_exception(exc)
+        set_span_error_status(span, exc)
+        await self._settle_draft(
+            job, extraction_not_found=ExtractionNotFound(reason=f"{error_code}: {exc}")
+        )
+        span.set_attribute("ai_recipe.result_type", "failure_draft")
+        job.publish(
+            SSEEvent.terminal_error(step=step, detail=str(exc), error_code=error_code)
+        )
+        return error_code
+
+    async def _settle_draft(
+        self,
+        job: ImageExtractionJob,
+        generated_recipe: Any | None = None,
+        extraction_not_found: ExtractionNotFound | None = None,
+    ) -> None:
+        # The request session that created the draft is closed by now
+        async with AsyncSessionLocal() as session:
+            await self.draft_manager.finalize_pending_draft(
+                session, job.draft_id, generated_recipe, extraction_not_found
+            )
+            await session.commit()
+
     def stream_extraction_progress(
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> AsyncGenerator[str, None]:
-        # Provide a minimal staged Server-Sent Events generator for image
-        # extraction so clients can monitor progress similar to URL
-        # extraction. This is intentionally lightweight: the real
-        # normalization/AI work currently happens synchronously in the POST
-        # endpoint; this generator acts as a small replayer of stages and
-        # verifies draft ownership when given a draft UUID as the
-        # `source_url` parameter.
+        # `source_url` carries the draft id returned by the upload endpoint
         async def _gen() -> AsyncGenerator[str, None]:
             with _tracer.start_as_current_span(
                 "ai_recipe_extract.image.stream"
@@ -160,13 +421,10 @@ class ImageOrchestrator(AIExtractionService):
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         span: Any,
     ) -> AsyncGenerator[str, None]:
-        from uuid import UUID
-
         from crud.ai_drafts import get_draft_by_id
-        from schemas.ai import SSEEvent
 
         # Interpret source_url as draft id (UUID) for image streaming
         try:
@@ -212,34 +470,61 @@ class ImageOrchestrator(AIExtractionService):
             ).to_sse()
             return
 
-        # Emit a small sequence of staged events. These are best-effort
-        # progress markers and do not reflect live AI tokens.
-        yield SSEEvent.model_validate(
-            {"status": "started", "step": "started", "progress": 0.0}
-        ).to_sse()
+        # The rest of the stream can take minutes; end the request session's
+        # transaction so its pooled connection is not pinned while we wait
+        await db.commit()
 
-        yield SSEEvent.model_validate(
-            {"status": "processing", "step": "normalize", "progress": 0.1}
-        ).to_sse()
-
-        yield SSEEvent.model_validate(
-            {"status": "ai_call", "step": "ai_call", "progress": 0.5}
-        ).to_sse()
+        job = get_image_job(draft_uuid)
+        if job is not None:
+            span.set_attribute("ai_recipe.stream_source", "job")
+            async for event in job.subscribe():
+                yield event.to_sse()
+            return
 
-        yield SSEEvent.model_validate(
-            {"status": "converting", "step": "convert_schema", "progress": 0.75}
-        ).to_sse()
+        if is_pending_draft(draft):
+            # Job runs in another worker: follow the draft row instead
+            span.set_attribute("ai_recipe.stream_source", "poll")
+            yield SSEEvent.model_validate(
+                {"status": "ai_call", "step": "ai_call", "progress": _AI_CALL_PROGRESS}
+            ).to_sse()
+            settled = await self._wait_for_draft(draft_uuid)
+            if settled is None:
+                span.set_attribute("ai_recipe.extraction_status", "timeout")
+                yield SSEEvent.terminal_error(
+                    step="ai_call",
+                    detail="Image extraction is taking too long",
+                    error_code="timeout",
+                ).to_sse()
+                return
+            draft = settled
 
-        # Terminal event: success if payload exists on draft, failure otherwise
-        success = bool(getattr(draft, "payload", None))
+        # Finished draft (e.g. from the synchronous upload): report its outcome
+        span.set_attribute("ai_recipe.stream_source", "draft")
+        success = bool(getattr(draft, "payload", None)) and not is_failure_draft(draft)
         span.set_attribute(
             "ai_recipe.extraction_status", "success" if success else "not_found"
         )
         span.set_attribute(
             "ai_recipe.result_type", "draft" if success else "failure_draft"
         )
-        yield (
-            SSEEvent.terminal_success(
-                draft_id=str(draft_uuid), success=success
-            ).to_sse()
-        )
+        yield SSEEvent.terminal_success(
+            draft_id=str(draft_uuid), success=success
+        ).to_sse()
+
+    @staticmethod
+    async def _wait_for_draft(draft_uuid: UUID) -> Any | None:
+        """Poll a pending draft until it is settled; None on timeout.
+
+        Each poll opens its own short-lived streaming-pool session so no
+        connection is held between polls.
+        """
+        from crud.ai_drafts import get_draft_by_id
+
+        deadline = time.monotonic() + IMAGE_DRAFT_POLL_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(IMAGE_DRAFT_POLL_INTERVAL_SECONDS)
+            async with StreamSessionLocal() as session:
+                draft = await get_draft_by_id(session, draft_uuid, None)
+            if draft is not None and not is_pending_draft(draft):
+                return draft
+        return None
@@ -7,7 +7,7 @@ and remove the need for dynamic function resolution and mock detection logic.
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from collections.abc import AsyncGenerator
+from collections.abc import AsyncGenerator, Awaitable, Callable
 from datetime import timedelta
 from typing import Any, Protocol
 from uuid import UUID
@@ -15,11 +15,14 @@ from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.ai_drafts import AIDraft
-from models.users import User
 from schemas.ai import ExtractionNotFound, RecipeExtractionResult
+from schemas.auth import CurrentUser
 from services.ai.models import DraftOutcome
 
 
+type PartialOutputCallback = Callable[[Any], Awaitable[None]]
+
+
 class HTMLExtractorProtocol(Protocol):
     """Protocol for HTML extraction and sanitization."""
 
@@ -51,6 +54,19 @@ class AIAgentProtocol(Protocol):
         """
         ...
 
+    async def stream_image_extraction_agent(
+        self,
+        images: list[bytes],
+        on_partial: PartialOutputCallback,
+        prompt_override: str | None = None,
+    ) -> RecipeExtractionResult | ExtractionNotFound:
+        """Run the image agent with streamed structured output.
+
+        ``on_partial`` is awaited with each partially validated output while
+        the model is still generating; the final output is returned.
+        """
+        ...
+
 
 class RecipeConverterProtocol(Protocol):
     """Protocol for converting extraction results to recipe schemas."""
@@ -68,7 +84,7 @@ class DraftServiceProtocol(Protocol):
     async def create_success_draft(
         self,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         source_url: str,
         generated_recipe: Any,
         prompt_override: str | None = None,
@@ -79,7 +95,7 @@ class DraftServiceProtocol(Protocol):
     async def create_failure_draft(
         self,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         source_url: str,
         extraction_not_found: ExtractionNotFound,
         prompt_override: str | None = None,
@@ -93,6 +109,26 @@ class DraftServiceProtocol(Protocol):
         """
         ...
 
+    async def create_pending_draft(
+        self,
+        db: AsyncSession,
+        current_user: CurrentUser,
+        source_url: str,
+        prompt_override: str | None = None,
+    ) -> AIDraft:
+        """Create a placeholder draft for an extraction running in the background."""
+        ...
+
+    async def finalize_pending_draft(
+        self,
+        db: AsyncSession,
+        draft_id: UUID,
+        generated_recipe: Any | None = None,
+        extraction_not_found: ExtractionNotFound | None = None,
+    ) -> AIDraft | None:
+        """Settle a pending draft with the extraction outcome."""
+        ...
+
     def create_draft_token(
         self, draft_id: UUID, user_id: UUID, exp_delta: timedelta | None = None
     ) -> str:
@@ -127,7 +163,7 @@ class AIExtractionService(ABC):
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[AIDraft]:
         """Extract recipe from URL and create draft (returns DraftOutcome)."""
@@ -138,7 +174,7 @@ class AIExtractionService(ABC):
         self,
         normalized_images: list[bytes],
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[AIDraft]:
         """Extract recipe from images and create draft (returns DraftOutcome).
@@ -154,12 +190,36 @@ class AIExtractionService(ABC):
         """
         ...
 
+    @abstractmethod
+    async def start_image_extraction(
+        self,
+        image_files: list[tuple[bytes, str]],
+        db: AsyncSession,
+        current_user: CurrentUser,
+        prompt_override: str | None = None,
+    ) -> DraftOutcome[AIDraft]:
+        """Start image extraction in the background and return a pending draft.
+
+        Progress is then followed through ``stream_extraction_progress`` with
+        the draft id.
+
+        Args:
+            image_files: Raw (image_bytes, content_type) uploads
+            db: Database session
+            current_user: Authenticated user
+            prompt_override: Optional custom prompt
+
+        Returns:
+            DraftOutcome containing the pending draft and its token
+        """
+        ...
+
     @abstractmethod
     def stream_extraction_progress(
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> AsyncGenerator[str, None]:
         """Return an async generator that will stream extraction progress.
@@ -185,7 +245,7 @@ class StreamingStageProtocol(Protocol):
         generated_recipe: Any,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None,
     ) -> dict[str, Any]:
         """Create success draft for streaming."""
@@ -196,7 +256,7 @@ class StreamingStageProtocol(Protocol):
         extraction_not_found: ExtractionNotFound,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None,
     ) -> dict[str, Any]:
         """Create failure draft for streaming."""
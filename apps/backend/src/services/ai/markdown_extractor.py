@@ -6,6 +6,7 @@ import logging
 
 from services.ai.html_extractor import HTMLExtractionService
 from services.ai.markdown_converter import MarkdownConversionService
+from services.ai.url_cache import UrlContentCache
 
 
 logger = logging.getLogger(__name__)
@@ -20,10 +21,12 @@ class MarkdownExtractionService:
         markdown_converter: MarkdownConversionService | None = None,
         timeout: int = 30,
         max_size: int = 5 * 1024 * 1024,
+        cache: UrlContentCache | None = None,
     ) -> None:
         self.html_extractor = html_extractor or HTMLExtractionService(
             timeout=timeout,
             max_size=max_size,
+            cache=cache,
         )
         self.markdown_converter = markdown_converter or MarkdownConversionService()
 
@@ -41,6 +44,9 @@ class MarkdownExtractionService:
         """
         logger.debug("Fetching URL as Markdown: %s", url)
 
+        if self.html_extractor.cache is not None:
+            return await self._fetch_cached_markdown(url, self.html_extractor.cache)
+
         # Stage 1: Fetch and sanitize HTML (reuses security patterns)
         sanitized_html = await self.html_extractor.fetch_and_sanitize(url)
 
@@ -58,3 +64,18 @@ class MarkdownExtractionService:
         )
 
         return markdown
+
+    async def _fetch_cached_markdown(self, url: str, cache: UrlContentCache) -> str:
+        """Serve Markdown from the shared page cache, converting at most once."""
+        page = await self.html_extractor.fetch_cached_page(url)
+        if page.markdown is not None:
+            logger.debug("Markdown cache hit: %s", url)
+            return page.markdown
+
+        if not page.sanitized_html:
+            logger.warning("Empty content from URL: %s", url)
+            return ""
+
+        markdown = self.markdown_converter.convert(page.sanitized_html)
+        cache.attach_markdown(page, markdown)
+        return markdown
@@ -6,16 +6,19 @@ import logging
 from collections.abc import AsyncGenerator
 from datetime import timedelta
 from typing import Any
+from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.users import User
 from schemas.ai import SSEEvent
+from schemas.auth import CurrentUser
 from services.ai.agents import convert_to_recipe_create, create_recipe_agent
 from services.ai.draft_service import (
     create_draft_token,
     create_failure_draft,
+    create_pending_draft,
     create_success_draft,
+    finalize_pending_draft,
 )
 from services.ai.extraction_common import DraftManager
 from services.ai.html_extractor import HTMLExtractionService
@@ -25,20 +28,26 @@ from services.ai.interfaces import (
     AIExtractionService,
     DraftServiceProtocol,
     HTMLExtractorProtocol,
+    PartialOutputCallback,
     RecipeConverterProtocol,
 )
 from services.ai.models import DraftOutcome
+from services.ai.url_cache import get_url_content_cache
 from services.ai.url_orchestrator import UrlOrchestrator
 
 
 logger = logging.getLogger(__name__)
 
+# Minimum spacing between partial outputs re-validated while the image agent
+# streams; keeps validation cost and SSE traffic bounded on long responses.
+PARTIAL_OUTPUT_DEBOUNCE_SECONDS = 0.25
+
 
 class HTMLExtractorAdapter(HTMLExtractorProtocol):
     """Adapter over `HTMLExtractionService` implementing protocol."""
 
     def __init__(self) -> None:
-        self._svc = HTMLExtractionService()
+        self._svc = HTMLExtractionService(cache=get_url_content_cache())
 
     async def fetch_sanitized_html(self, url: str) -> str:  # noqa: D401
         return await self._svc.fetch_and_sanitize(url)
@@ -71,10 +80,40 @@ class AIAgentAdapter(AIAgentProtocol):
         self, images: list[bytes], prompt_override: str | None = None
     ) -> Any:  # noqa: D401, ANN401 (external lib returns Any)
         """Run AI agent to extract recipe from image(s) using BinaryContent."""
-        from pydantic_ai.messages import BinaryContent
+        result: Any = await self._get_image_agent().run(
+            self._image_messages(images, prompt_override)
+        )
+        # pydantic-ai returns object with .output or .data; normalize
+        return getattr(result, "output", None) or getattr(result, "data", None)
 
+    async def stream_image_extraction_agent(
+        self,
+        images: list[bytes],
+        on_partial: PartialOutputCallback,
+        prompt_override: str | None = None,
+    ) -> Any:  # noqa: ANN401 (external lib returns Any)
+        """Run the image agent, reporting partially validated outputs."""
+        agent = self._get_image_agent()
+        async with agent.run_stream(
+            self._image_messages(images, prompt_override)
+        ) as result:
+            async for partial in result.stream_output(
+                debounce_by=PARTIAL_OUTPUT_DEBOUNCE_SECONDS
+            ):
+                await on_partial(partial)
+            return await result.get_output()
+
+    def _get_image_agent(self) -> Any:
         from services.ai.agents import create_image_recipe_agent
 
+        if self._image_agent is None:  # Lazy creation
+            self._image_agent = create_image_recipe_agent()
+        return self._image_agent
+
+    @staticmethod
+    def _image_messages(images: list[bytes], prompt_override: str | None) -> list[Any]:
+        from pydantic_ai.messages import BinaryContent
+
         prompt_text = prompt_override or (
             "Extract the complete recipe information from the provided image(s). "
             "Include all ingredients, instructions, times, and other details "
@@ -85,13 +124,7 @@ class AIAgentAdapter(AIAgentProtocol):
         messages: list[str | BinaryContent] = [prompt_text]
         for img_bytes in images:
             messages.append(BinaryContent(data=img_bytes, media_type="image/jpeg"))
-
-        if self._image_agent is None:  # Lazy creation
-            self._image_agent = create_image_recipe_agent()
-
-        result: Any = await self._image_agent.run(messages)
-        # pydantic-ai returns object with .output or .data; normalize
-        return getattr(result, "output", None) or getattr(result, "data", None)
+        return messages
 
 
 class RecipeConverterAdapter(RecipeConverterProtocol):
@@ -109,7 +142,7 @@ class DraftServiceAdapter(DraftServiceProtocol):
     async def create_success_draft(
         self,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         source_url: str,
         generated_recipe: Any,
         prompt_override: str | None = None,
@@ -121,7 +154,7 @@ class DraftServiceAdapter(DraftServiceProtocol):
     async def create_failure_draft(
         self,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         source_url: str,
         extraction_not_found: Any,
         prompt_override: str | None = None,
@@ -130,6 +163,26 @@ class DraftServiceAdapter(DraftServiceProtocol):
             db, current_user, source_url, extraction_not_found, prompt_override
         )
 
+    async def create_pending_draft(
+        self,
+        db: AsyncSession,
+        current_user: CurrentUser,
+        source_url: str,
+        prompt_override: str | None = None,
+    ) -> Any:
+        return await create_pending_draft(db, current_user, source_url, prompt_override)
+
+    async def finalize_pending_draft(
+        self,
+        db: AsyncSession,
+        draft_id: UUID,
+        generated_recipe: Any | None = None,
+        extraction_not_found: Any | None = None,
+    ) -> Any:
+        return await finalize_pending_draft(
+            db, draft_id, generated_recipe, extraction_not_found
+        )
+
     def create_draft_token(
         self, draft_id: Any, user_id: Any, exp_delta: timedelta | None = None
     ) -> str:
@@ -173,7 +226,7 @@ class Orchestrator(AIExtractionService):
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[Any]:
         return await self._url.extract_recipe_from_url(
@@ -184,18 +237,29 @@ class Orchestrator(AIExtractionService):
         self,
         normalized_images: list[bytes],
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[Any]:
         return await self._image.extract_recipe_from_images(
             normalized_images, db, current_user, prompt_override
         )
 
+    async def start_image_extraction(
+        self,
+        image_files: list[tuple[bytes, str]],
+        db: AsyncSession,
+        current_user: CurrentUser,
+        prompt_override: str | None = None,
+    ) -> DraftOutcome[Any]:
+        return await self._image.start_image_extraction(
+            image_files, db, current_user, prompt_override
+        )
+
     def stream_extraction_progress(
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> AsyncGenerator[str, None]:
         # Route to the appropriate orchestrator based on the form of
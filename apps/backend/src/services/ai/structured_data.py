@@ -0,0 +1,606 @@
+"""schema.org Recipe structured data parsing (JSON-LD and microdata).
+
+Most recipe sites embed a schema.org ``Recipe`` object for search engines. When
+it carries the core fields the URL pipeline builds the extraction result from
+it directly and skips the LLM; partial data is laid over the LLM output so the
+model only supplies what the page left out.
+"""
+
+from __future__ import annotations
+
+import html
+import json
+import logging
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from bs4.element import Tag
+
+from schemas.ai import RecipeExtractionResult
+from schemas.recipes import IngredientIn, IngredientPrepIn, RecipeCategory
+
+
+logger = logging.getLogger(__name__)
+
+type StructuredSource = Literal["json-ld", "microdata"]
+
+# Confidence reported for recipes built purely from page structured data
+STRUCTURED_DATA_CONFIDENCE = 0.9
+
+_MAX_SEARCH_DEPTH = 6
+_MAX_TITLE_LENGTH = 255
+_MAX_DESCRIPTION_LENGTH = 2000
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+_ISO_DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+(?:\.\d+)?)D)?"
+    r"(?:T(?:(?P<hours>\d+(?:\.\d+)?)H)?(?:(?P<minutes>\d+(?:\.\d+)?)M)?"
+    r"(?:(?P<seconds>\d+(?:\.\d+)?)S)?)?$",
+    re.IGNORECASE,
+)
+_NUMBER_RE = re.compile(r"\d+")
+_YIELD_RANGE_RE = re.compile(r"(\d+)\s*(?:-|–|to)\s*(\d+)")
+_OVEN_TEMP_RE = re.compile(r"(\d{3})\s*°?\s*(?:degrees\s*)?F\b", re.IGNORECASE)
+
+_UNICODE_FRACTIONS = {
+    "½": 0.5,
+    "⅓": 1 / 3,
+    "⅔": 2 / 3,
+    "¼": 0.25,
+    "¾": 0.75,
+    "⅛": 0.125,
+    "⅜": 0.375,
+    "⅝": 0.625,
+    "⅞": 0.875,
+}
+_FRACTION_CHARS = "".join(_UNICODE_FRACTIONS)
+# Leading "1", "1 1/2", "1½" or "½", optionally followed by a "-2" / "to 2" range
+_QUANTITY_RE = re.compile(
+    rf"^(?P<whole>\d+(?:\.\d+)?)?\s*"
+    rf"(?:(?P<num>\d+)\s*/\s*(?P<den>\d+)|(?P<uni>[{_FRACTION_CHARS}]))?"
+    rf"(?:\s*(?:-|–|to)\s*[\d{_FRACTION_CHARS}/.]+)?\s+"
+)
+
+# Unit spellings mapped to the canonical units the extraction prompt asks for
+_UNIT_ALIASES = {
+    "cup": "cup",
+    "cups": "cup",
+    "c": "cup",
+    "tablespoon": "tbsp",
+    "tablespoons": "tbsp",
+    "tbsp": "tbsp",
+    "tbsps": "tbsp",
+    "tbs": "tbsp",
+    "teaspoon": "tsp",
+    "teaspoons": "tsp",
+    "tsp": "tsp",
+    "tsps": "tsp",
+    "pound": "pound",
+    "pounds": "pound",
+    "lb": "pound",
+    "lbs": "pound",
+    "ounce": "ounce",
+    "ounces": "ounce",
+    "oz": "ounce",
+    "gram": "gram",
+    "grams": "gram",
+    "g": "gram",
+    "kilogram": "kilogram",
+    "kilograms": "kilogram",
+    "kg": "kilogram",
+    "milliliter": "ml",
+    "milliliters": "ml",
+    "ml": "ml",
+    "liter": "liter",
+    "liters": "liter",
+    "l": "liter",
+    "can": "can",
+    "cans": "can",
+    "clove": "clove",
+    "cloves": "clove",
+    "pinch": "pinch",
+    "package": "package",
+    "packages": "package",
+    "stick": "stick",
+    "sticks": "stick",
+}
+
+_PREP_METHODS = {
+    "chopped",
+    "diced",
+    "minced",
+    "sliced",
+    "grated",
+    "shredded",
+    "peeled",
+    "crushed",
+    "cubed",
+    "julienned",
+    "halved",
+    "quartered",
+    "melted",
+    "softened",
+    "beaten",
+    "zested",
+    "juiced",
+    "trimmed",
+    "rinsed",
+    "drained",
+    "toasted",
+    "sifted",
+}
+_SIZE_DESCRIPTORS = {
+    "finely",
+    "coarsely",
+    "roughly",
+    "thinly",
+    "thickly",
+    "large",
+    "small",
+    "medium",
+}
+
+# Whole-word phrases (apostrophes dropped), checked in order: more specific
+# entries come first so "shepherd's pie" is not read as a dessert
+_CATEGORY_KEYWORDS: tuple[tuple[RecipeCategory, tuple[str, ...]], ...] = (
+    (
+        RecipeCategory.DINNER,
+        ("pot pie", "shepherds pie", "cottage pie", "meat pie", "savory pie"),
+    ),
+    (RecipeCategory.BREAKFAST, ("breakfast", "brunch")),
+    (
+        RecipeCategory.DESSERT,
+        (
+            "dessert",
+            "desserts",
+            "cake",
+            "cakes",
+            "cupcakes",
+            "cookie",
+            "cookies",
+            "pie",
+            "pies",
+            "sweets",
+        ),
+    ),
+    (
+        RecipeCategory.APPETIZER,
+        (
+            "appetizer",
+            "appetizers",
+            "starter",
+            "starters",
+            "hors doeuvre",
+            "hors doeuvres",
+        ),
+    ),
+    (RecipeCategory.SNACK, ("snack", "snacks")),
+    (RecipeCategory.LUNCH, ("lunch",)),
+    (
+        RecipeCategory.DINNER,
+        ("dinner", "main", "mains", "entree", "entrée", "supper"),
+    ),
+)
+_APOSTROPHES_RE = re.compile(r"['’]")
+_WORD_RE = re.compile(r"\w+")
+
+
+@dataclass(frozen=True)
+class StructuredRecipe:
+    """Recipe fields recovered from a page's schema.org markup."""
+
+    source: StructuredSource
+    title: str | None = None
+    description: str | None = None
+    ingredients: tuple[IngredientIn, ...] = ()
+    instructions: tuple[str, ...] = ()
+    prep_time_minutes: int | None = None
+    cook_time_minutes: int | None = None
+    total_time_minutes: int | None = None
+    serving_min: int | None = None
+    serving_max: int | None = None
+    category: RecipeCategory | None = None
+    ethnicity: str | None = None
+    oven_temperature_f: int | None = None
+
+    @property
+    def missing_fields(self) -> list[str]:
+        """Required fields the page did not provide."""
+        missing: list[str] = []
+        if not self.title:
+            missing.append("title")
+        if not self.ingredients:
+            missing.append("ingredients")
+        if not self.instructions:
+            missing.append("instructions")
+        if self.serving_min is None:
+            missing.append("servings")
+        if (
+            self.prep_time_minutes is None
+            and self.cook_time_minutes is None
+            and self.total_time_minutes is None
+        ):
+            missing.append("time")
+        return missing
+
+    @property
+    def is_complete(self) -> bool:
+        """True when the recipe can be built without calling the LLM."""
+        return not self.missing_fields
+
+    def _split_times(self) -> tuple[int | None, int | None]:
+        """Return (prep, cook) minutes, deriving the gap from totalTime."""
+        prep, cook = self.prep_time_minutes, self.cook_time_minutes
+        total = self.total_time_minutes
+        if total is not None:
+            if prep is None and cook is None:
+                return 0, total
+            if prep is None and cook is not None:
+                prep = max(total - cook, 0)
+            elif cook is None and prep is not None:
+                cook = max(total - prep, 0)
+        return prep, cook
+
+    def _field_values(self) -> dict[str, Any]:
+        """Recovered fields in ``RecipeExtractionResult`` shape (None = absent)."""
+        prep, cook = self._split_times()
+        values: dict[str, Any] = {
+            "title": self.title,
+            "description": self.description,
+            "ingredients": [i.model_dump() for i in self.ingredients] or None,
+            "instructions": list(self.instructions) or None,
+            "prep_time_minutes": prep,
+            "cook_time_minutes": cook,
+            "category": self.category,
+            "ethnicity": self.ethnicity,
+            "oven_temperature_f": self.oven_temperature_f,
+        }
+        if self.serving_min is not None:
+            # Servings travel together so serving_max >= serving_min holds
+            values["serving_min"] = self.serving_min
+            values["serving_max"] = self.serving_max
+        return values
+
+    def to_extraction_result(self) -> RecipeExtractionResult:
+        """Build an extraction result from a complete structured recipe."""
+        values = {k: v for k, v in self._field_values().items() if v is not None}
+        values.setdefault("category", RecipeCategory.DINNER)
+        values.setdefault("serving_max", None)
+        return RecipeExtractionResult.model_validate(
+            {
+                **values,
+                "confidence_score": STRUCTURED_DATA_CONFIDENCE,
+                "extraction_notes": f"Parsed from schema.org {self.source} data",
+            }
+        )
+
+    def merge_into(self, result: RecipeExtractionResult) -> RecipeExtractionResult:
+        """Overlay page-provided fields on an LLM result.
+
+        Values present in the markup win; the LLM output only fills the fields
+        the page did not provide.
+        """
+        merged = result.model_dump()
+        merged.update(
+            (key, value)
+            for key, value in self._field_values().items()
+            # serving_max is only present alongside serving_min and may be None
+            if value is not None or key == "serving_max"
+        )
+        return RecipeExtractionResult.model_validate(merged)
+
+
+@dataclass
+class StructuredDataCapture:
+    """Collects recipe markup while the sanitizer walks the raw document.
+
+    JSON-LD scripts and microdata attributes are removed during sanitization,
+    so they are read as the pruning walk reaches them.
+    """
+
+    json_ld_blocks: list[str] = field(default_factory=list)
+    microdata: dict[str, Any] | None = None
+
+    def observe(self, tag: Tag) -> None:
+        """Record JSON-LD text or the first Recipe microdata scope."""
+        if tag.name == "script":
+            if "ld+json" in str(tag.get("type", "")).lower():
+                self.json_ld_blocks.append(tag.get_text())
+        elif self.microdata is None and _is_recipe_scope(tag):
+            self.microdata = _read_microdata(tag)
+
+    def recipe(self) -> StructuredRecipe | None:
+        """Return the captured recipe, if the page had usable markup."""
+        return extract_structured_recipe(self.json_ld_blocks, self.microdata)
+
+
+def extract_structured_recipe(
+    json_ld_blocks: Iterable[str], microdata: dict[str, Any] | None = None
+) -> StructuredRecipe | None:
+    """Return the page's schema.org recipe, preferring JSON-LD over microdata.
+
+    Args:
+        json_ld_blocks: Raw text of ``application/ld+json`` script tags
+        microdata: itemprop values read from a Recipe itemscope
+
+    Returns:
+        Parsed recipe, or None when the page has no usable recipe markup
+    """
+    for block in json_ld_blocks:
+        try:
+            data = json.loads(block, strict=False)
+        except (TypeError, ValueError):
+            logger.debug("Skipping malformed JSON-LD block")
+            continue
+        recipe_obj = next(_iter_recipe_objects(data, depth=0), None)
+        if recipe_obj is not None:
+            recipe = _from_schema_object(recipe_obj, "json-ld")
+            if recipe is not None:
+                return recipe
+
+    if microdata:
+        return _from_schema_object(microdata, "microdata")
+
+    return None
+
+
+def parse_ingredient_line(text: str) -> IngredientIn | None:
+    """Split a free-text ingredient line into quantity, unit, name and prep.
+
+    Examples:
+        "2 cups all-purpose flour, sifted" -> 2.0 cup "all-purpose flour"
+        "1 onion, finely chopped" -> 1.0 "onion" (chopped, finely)
+    """
+    line = _clean_text(text)
+    if not line:
+        return None
+
+    is_optional = False
+    optional_stripped = re.sub(
+        r"\s*(?:\(optional\)|,\s*optional|\boptional\b)\s*$", "", line, flags=re.I
+    )
+    if optional_stripped != line:
+        is_optional = True
+        line = optional_stripped
+
+    quantity: float | None = None
+    match = _QUANTITY_RE.match(line + " ")
+    if match and (match.group("whole") or match.group("num") or match.group("uni")):
+        quantity = float(match.group("whole") or 0)
+        if match.group("num") and int(match.group("den")):
+            quantity += int(match.group("num")) / int(match.group("den"))
+        elif match.group("uni"):
+            quantity += _UNICODE_FRACTIONS[match.group("uni")]
+        line = line[match.end() :].strip() if match.end() <= len(line) else ""
+
+    unit: str | None = None
+    if quantity is not None and line:
+        first, _, rest = line.partition(" ")
+        canonical = _UNIT_ALIASES.get(first.lower().rstrip("."))
+        if canonical and rest:
+            unit = canonical
+            line = rest.strip()
+            if line.lower().startswith("of "):
+                line = line[3:]
+
+    name, prep = _split_prep(line)
+    if not name:
+        name = _clean_text(text)
+
+    return IngredientIn(
+        name=name,
+        quantity_value=round(quantity, 3) if quantity is not None else None,
+        quantity_unit=unit,
+        prep=prep,
+        is_optional=is_optional,
+    )
+
+
+def parse_iso_duration(value: Any) -> int | None:
+    """Convert an ISO 8601 duration (``PT1H30M``) to whole minutes."""
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return int(value)
+    if not isinstance(value, str):
+        return None
+    match = _ISO_DURATION_RE.match(value.strip())
+    if not match or not any(match.groupdict().values()):
+        return None
+    parts = {k: float(v) if v else 0.0 for k, v in match.groupdict().items()}
+    minutes = (
+        parts["days"] * 1440
+        + parts["hours"] * 60
+        + parts["minutes"]
+        + parts["seconds"] / 60
+    )
+    return round(minutes)
+
+
+def _iter_recipe_objects(data: Any, depth: int) -> Iterator[dict[str, Any]]:
+    """Yield schema.org Recipe objects nested anywhere in a JSON-LD document."""
+    if depth > _MAX_SEARCH_DEPTH:
+        return
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_recipe_objects(item, depth + 1)
+        return
+    if not isinstance(data, dict):
+        return
+    if _is_recipe_type(data.get("@type")):
+        yield data
+        return
+    for value in data.values():
+        if isinstance(value, dict | list):
+            yield from _iter_recipe_objects(value, depth + 1)
+
+
+def _is_recipe_type(value: Any) -> bool:
+    types = value if isinstance(value, list) else [value]
+    return any(
+        isinstance(t, str) and re.split(r"[/:#]", t)[-1] == "Recipe" for t in types
+    )
+
+
+def _from_schema_object(
+    obj: dict[str, Any], source: StructuredSource
+) -> StructuredRecipe | None:
+    """Map a schema.org Recipe mapping onto ``StructuredRecipe``."""
+    title = _first_text(obj.get("name") or obj.get("headline"))
+    ingredients = tuple(
+        ingredient
+        for line in _as_list(obj.get("recipeIngredient") or obj.get("ingredients"))
+        if isinstance(line, str)
+        for ingredient in [parse_ingredient_line(line)]
+        if ingredient is not None
+    )
+    if not title and not ingredients:
+        return None
+
+    instructions = tuple(_flatten_instructions(obj.get("recipeInstructions")))
+    serving_min, serving_max = _parse_yield(obj.get("recipeYield"))
+
+    description = _first_text(obj.get("description"))
+    return StructuredRecipe(
+        source=source,
+        title=title[:_MAX_TITLE_LENGTH] if title else None,
+        description=description[:_MAX_DESCRIPTION_LENGTH] if description else None,
+        ingredients=ingredients,
+        instructions=instructions,
+        prep_time_minutes=parse_iso_duration(_first(obj.get("prepTime"))),
+        cook_time_minutes=parse_iso_duration(_first(obj.get("cookTime"))),
+        total_time_minutes=parse_iso_duration(_first(obj.get("totalTime"))),
+        serving_min=serving_min,
+        serving_max=serving_max,
+        category=_map_category(obj.get("recipeCategory")),
+        ethnicity=_first_text(obj.get("recipeCuisine")),
+        oven_temperature_f=_find_oven_temperature(instructions),
+    )
+
+
+def _flatten_instructions(value: Any) -> Iterator[str]:
+    """Yield step text from strings, HowToStep and HowToSection shapes."""
+    for item in _as_list(value):
+        if isinstance(item, str):
+            # A single string may hold every step separated by newlines
+            for line in re.split(r"\n+", html.unescape(item)):
+                text = _clean_text(line)
+                if text:
+                    yield text
+        elif isinstance(item, dict):
+            if "itemListElement" in item:
+                yield from _flatten_instructions(item["itemListElement"])
+            else:
+                step = _first_text(item.get("text") or item.get("name"))
+                if step:
+                    yield step
+
+
+def _parse_yield(value: Any) -> tuple[int | None, int | None]:
+    for item in _as_list(value):
+        text = str(item) if isinstance(item, int | float | str) else ""
+        range_match = _YIELD_RANGE_RE.search(text)
+        if range_match:
+            low, high = int(range_match.group(1)), int(range_match.group(2))
+            if low >= 1:
+                return low, max(high, low)
+        number = _NUMBER_RE.search(text)
+        if number and int(number.group()) >= 1:
+            return int(number.group()), None
+    return None, None
+
+
+def _map_category(value: Any) -> RecipeCategory | None:
+    for item in _as_list(value):
+        if not isinstance(item, str):
+            continue
+        words = f" {' '.join(_category_words(item))} "
+        for category, keywords in _CATEGORY_KEYWORDS:
+            if any(f" {keyword} " in words for keyword in keywords):
+                return category
+    return None
+
+
+def _category_words(text: str) -> list[str]:
+    return _WORD_RE.findall(_APOSTROPHES_RE.sub("", text.lower()))
+
+
+def _find_oven_temperature(instructions: Iterable[str]) -> int | None:
+    for step in instructions:
+        match = _OVEN_TEMP_RE.search(step)
+        if match and int(match.group(1)) <= 550:
+            return int(match.group(1))
+    return None
+
+
+def _split_prep(name: str) -> tuple[str, IngredientPrepIn | None]:
+    """Move trailing ", finely chopped" style descriptors into ``prep``."""
+    base, sep, tail = name.partition(",")
+    if not sep:
+        return name.strip(), None
+
+    words = tail.strip().lower().split()
+    method = next((w for w in words if w in _PREP_METHODS), None)
+    size = next((w for w in words if w in _SIZE_DESCRIPTORS), None)
+    if method is None:
+        return name.strip(), None
+    return base.strip(), IngredientPrepIn(method=method, size_descriptor=size)
+
+
+def _is_recipe_scope(tag: Tag) -> bool:
+    itemtype = tag.get("itemtype")
+    return isinstance(itemtype, str) and _is_recipe_type(itemtype.split())
+
+
+def _read_microdata(scope: Tag) -> dict[str, Any]:
+    """Collect itemprop values of a Recipe scope, skipping nested itemscopes."""
+    props: dict[str, list[Any]] = {}
+    stack = list(reversed([c for c in scope.children if isinstance(c, Tag)]))
+    while stack:
+        tag = stack.pop()
+        itemprop = tag.get("itemprop")
+        if isinstance(itemprop, str):
+            value = _microdata_value(tag)
+            for prop in itemprop.split():
+                props.setdefault(prop, []).append(value)
+        if tag.has_attr("itemscope"):
+            # Nested items (author, nutrition, HowToStep...) own their props
+            continue
+        stack.extend(reversed([c for c in tag.children if isinstance(c, Tag)]))
+    return {
+        key: values if len(values) > 1 else values[0] for key, values in props.items()
+    }
+
+
+def _microdata_value(tag: Tag) -> str:
+    for attr in ("content", "datetime"):
+        value = tag.get(attr)
+        if isinstance(value, str):
+            return value
+    return tag.get_text(" ", strip=True)
+
+
+def _as_list(value: Any) -> list[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _first(value: Any) -> Any:
+    items = _as_list(value)
+    return items[0] if items else None
+
+
+def _first_text(value: Any) -> str | None:
+    for item in _as_list(value):
+        if isinstance(item, str):
+            text = _clean_text(item)
+            if text:
+                return text
+    return None
+
+
+def _clean_text(value: str) -> str:
+    text = _TAG_RE.sub(" ", html.unescape(value))
+    return _WHITESPACE_RE.sub(" ", text).strip()
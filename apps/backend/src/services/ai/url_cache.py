@@ -0,0 +1,256 @@
+"""Shared cache of fetched, sanitized and Markdown-converted web pages.
+
+Popular recipe URLs are requested again and again: by URL imports, by the chat
+agent's ``fetch_url_as_markdown`` tool and by ``services.web_fetch``. Entries
+are keyed on a normalized URL so those callers share one fetch across users
+and conversation turns. Callers that fetch with different limits (response
+size cap, timeout) pass a ``variant`` so a page truncated or rejected under a
+tight limit is never served to a caller with a looser one.
+
+Entries are fresh for ``ttl_seconds``. Stale entries are revalidated with a
+conditional GET (``If-None-Match`` / ``If-Modified-Since``); a 304 answer keeps
+the stored content without re-sanitizing. The cache is bounded by total
+stored characters and entry count, evicting least recently used pages first.
+
+NOTE: Like the weather cache this is an in-memory, per-process cache; each
+worker keeps its own copy.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+if TYPE_CHECKING:
+    from services.ai.html_extractor import SanitizedHTML
+
+
+logger = logging.getLogger(__name__)
+
+URL_CACHE_TTL_SECONDS = 15 * 60
+URL_CACHE_MAX_ENTRIES = 512
+# Upper bound on cached HTML + Markdown characters (~64MB of text)
+URL_CACHE_MAX_CHARS = 64 * 1024 * 1024
+
+# Query parameters that only identify a traffic source, never page content
+_TRACKING_PARAM_PREFIXES = ("utm_",)
+_TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ref", "_ga"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Return the cache key for ``url``.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters, and sorts the remaining query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    netloc = host if port in (None, _DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS
+        and not key.lower().startswith(_TRACKING_PARAM_PREFIXES)
+    )
+    return urlunsplit((scheme, netloc, parts.path or "/", urlencode(query), ""))
+
+
+def cache_key(url: str, variant: str = "") -> str:
+    """Return the cache key for ``url`` fetched under ``variant`` limits."""
+    normalized = normalize_url(url)
+    return f"{variant} {normalized}" if variant else normalized
+
+
+@dataclass
+class CacheValidators:
+    """HTTP validators sent with a conditional request and read from its answer.
+
+    The fetcher sends ``etag``/``last_modified`` when present, then overwrites
+    them with the response headers and sets ``not_modified`` on a 304.
+    """
+
+    etag: str | None = None
+    last_modified: str | None = None
+    not_modified: bool = False
+    cacheable: bool = True
+
+
+@dataclass
+class CachedPage:
+    """A sanitized page, its lazily converted Markdown and HTTP validators."""
+
+    url: str
+    sanitized_html: SanitizedHTML
+    etag: str | None = None
+    last_modified: str | None = None
+    markdown: str | None = None
+    fetched_at: float = field(default_factory=time.monotonic)
+    key: str = ""
+
+    @property
+    def size(self) -> int:
+        """Stored characters, used for size-bounded eviction."""
+        return len(self.sanitized_html) + len(self.markdown or "")
+
+
+type PageFetcher = Callable[[str, CacheValidators], Awaitable[SanitizedHTML | None]]
+
+
+class UrlContentCache:
+    """LRU cache of sanitized pages with TTL and HTTP revalidation."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = URL_CACHE_TTL_SECONDS,
+        max_entries: int = URL_CACHE_MAX_ENTRIES,
+        max_chars: int = URL_CACHE_MAX_CHARS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._clock = clock
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._total_chars = 0
+        # Concurrent requests for the same URL share one in-flight fetch
+        self._inflight: dict[str, asyncio.Task[CachedPage]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_chars(self) -> int:
+        return self._total_chars
+
+    def clear(self) -> None:
+        """Drop every cached page (primarily for tests)."""
+        self._entries.clear()
+        self._total_chars = 0
+
+    async def get_or_fetch(
+        self, url: str, fetch: PageFetcher, variant: str = ""
+    ) -> CachedPage:
+        """Return a fresh page for ``url``, fetching or revalidating as needed.
+
+        Args:
+            url: Page URL; cache lookups use ``normalize_url(url)``
+            fetch: Fetches and sanitizes the page. It receives the stored
+                validators and returns None when the server answered 304.
+            variant: Identifies the fetch limits ``fetch`` applies; pages
+                fetched under different variants are cached separately.
+
+        Raises:
+            Whatever ``fetch`` raises; failures are never cached.
+        """
+        key = cache_key(url, variant)
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(entry):
+            self._entries.move_to_end(key)
+            return entry
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._refresh(key, url, entry, fetch))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not abort the shared fetch
+        return await asyncio.shield(task)
+
+    def attach_markdown(self, page: CachedPage, markdown: str) -> None:
+        """Store converted Markdown on a cached page and re-apply size bounds."""
+        stored = self._entries.get(page.key)
+        if stored is not page:
+            page.markdown = markdown
+            return
+        self._total_chars -= page.size
+        page.markdown = markdown
+        self._total_chars += page.size
+        self._evict()
+
+    def _is_fresh(self, entry: CachedPage) -> bool:
+        return self._clock() - entry.fetched_at < self.ttl_seconds
+
+    async def _refresh(
+        self,
+        key: str,
+        url: str,
+        entry: CachedPage | None,
+        fetch: PageFetcher,
+    ) -> CachedPage:
+        validators = CacheValidators(
+            etag=entry.etag if entry else None,
+            last_modified=entry.last_modified if entry else None,
+        )
+        html = await fetch(url, validators)
+
+        if entry is not None and (html is None or validators.not_modified):
+            logger.debug("URL cache revalidated %s", key)
+            entry.etag = validators.etag or entry.etag
+            entry.last_modified = validators.last_modified or entry.last_modified
+            entry.fetched_at = self._clock()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            return entry
+
+        if html is None:
+            raise RuntimeError(f"Not-modified answer without a cached page: {key}")
+
+        page = CachedPage(
+            url=url,
+            sanitized_html=html,
+            etag=validators.etag,
+            last_modified=validators.last_modified,
+            fetched_at=self._clock(),
+            key=key,
+        )
+        if validators.cacheable and page.sanitized_html:
+            self._store(key, page)
+        else:
+            self._remove(key)
+        return page
+
+    def _store(self, key: str, page: CachedPage) -> None:
+        self._remove(key)
+        if page.size > self.max_chars:
+            return
+        self._entries[key] = page
+        self._total_chars += page.size
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._total_chars -= old.size
+
+    def _evict(self) -> None:
+        while self._entries and (
+            len(self._entries) > self.max_entries or self._total_chars > self.max_chars
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._total_chars -= evicted.size
+
+
+@lru_cache
+def get_url_content_cache() -> UrlContentCache:
+    """Return the process-wide URL content cache."""
+    return UrlContentCache()
+
+
+def clear_url_content_cache() -> None:
+    """Clear the shared URL content cache.
+
+    Tests should use this instead of reaching into the cache instance.
+    """
+    get_url_content_cache().clear()
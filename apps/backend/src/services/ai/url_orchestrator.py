@@ -9,9 +9,10 @@ from typing import Any
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.observability import get_tracer, set_span_error_status
-from models.users import User
-from schemas.ai import SSEEvent
+from schemas.ai import RecipeExtractionResult, SSEEvent
+from schemas.auth import CurrentUser
 from services.ai.extraction_common import DraftManager
+from services.ai.html_extractor import SanitizedHTML
 from services.ai.interfaces import (
     AIAgentProtocol,
     AIExtractionService,
@@ -19,10 +20,42 @@ from services.ai.interfaces import (
     RecipeConverterProtocol,
 )
 from services.ai.models import DraftOutcome
+from services.ai.structured_data import StructuredRecipe
 
 
 _tracer = get_tracer(__name__)
 
+# Extraction result fields behind each StructuredRecipe.missing_fields name
+_MISSING_FIELD_TARGETS = {
+    "servings": "serving_min and serving_max",
+    "time": "prep_time_minutes and cook_time_minutes",
+}
+
+
+def _missing_fields_prompt(structured: StructuredRecipe) -> str:
+    """Prompt asking the model for the fields the page's markup left out."""
+    missing = ", ".join(
+        _MISSING_FIELD_TARGETS.get(name, name) for name in structured.missing_fields
+    )
+    return (
+        "Extract the recipe information from this HTML content. The page's "
+        "schema.org data already provides the other fields and they will be "
+        f"kept, so focus on reading these from the page text: {missing}."
+    )
+
+
+def _page_structured_recipe(
+    html: str, prompt_override: str | None
+) -> StructuredRecipe | None:
+    """Return schema.org recipe data carried by the sanitized page, if any.
+
+    A prompt override means the caller wants the model's reading of the page,
+    so structured data is ignored in that case.
+    """
+    if prompt_override is not None or not isinstance(html, SanitizedHTML):
+        return None
+    return html.structured_recipe
+
 
 class UrlOrchestrator(AIExtractionService):
     def __init__(
@@ -41,7 +74,7 @@ class UrlOrchestrator(AIExtractionService):
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[Any]:
         with _tracer.start_as_current_span("ai_recipe_extract.url") as span:
@@ -76,9 +109,14 @@ class UrlOrchestrator(AIExtractionService):
                         failure_draft, token, False, message="fetch_failed"
                     )
 
-                extraction_result = await self.ai_agent.run_extraction_agent(
-                    sanitized_html, prompt_override
-                )
+                structured = _page_structured_recipe(sanitized_html, prompt_override)
+                if structured is not None and structured.is_complete:
+                    span.set_attribute("ai_recipe.extraction_source", "structured_data")
+                    extraction_result = structured.to_extraction_result()
+                else:
+                    extraction_result = await self._run_agent(
+                        sanitized_html, prompt_override, structured, span
+                    )
 
                 from schemas.ai import ExtractionNotFound
 
@@ -130,17 +168,52 @@ class UrlOrchestrator(AIExtractionService):
         self,
         normalized_images: list[bytes],
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
+        prompt_override: str | None = None,
+    ) -> DraftOutcome[Any]:
+        # URL orchestrator does not implement image extraction
+        raise NotImplementedError()
+
+    async def start_image_extraction(
+        self,
+        image_files: list[tuple[bytes, str]],
+        db: AsyncSession,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> DraftOutcome[Any]:
         # URL orchestrator does not implement image extraction
         raise NotImplementedError()
 
+    async def _run_agent(
+        self,
+        html: str,
+        prompt_override: str | None,
+        structured: StructuredRecipe | None,
+        span: Any,
+    ) -> Any:
+        """Run the LLM, letting partial page structured data override its fields.
+
+        With partial structured data the prompt names the missing fields so the
+        model concentrates on them.
+        """
+        if structured is not None:
+            prompt_override = _missing_fields_prompt(structured)
+        extraction_result = await self.ai_agent.run_extraction_agent(
+            html, prompt_override
+        )
+        if structured is not None and isinstance(
+            extraction_result, RecipeExtractionResult
+        ):
+            span.set_attribute("ai_recipe.extraction_source", "structured_data+llm")
+            return structured.merge_into(extraction_result)
+        span.set_attribute("ai_recipe.extraction_source", "llm")
+        return extraction_result
+
     async def stream_extraction_progress(
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None = None,
     ) -> AsyncGenerator[str, None]:
         with _tracer.start_as_current_span("ai_recipe_extract.url") as span:
@@ -158,7 +231,7 @@ class UrlOrchestrator(AIExtractionService):
         self,
         source_url: str,
         db: AsyncSession,
-        current_user: User,
+        current_user: CurrentUser,
         prompt_override: str | None,
         span: Any,
     ) -> AsyncGenerator[str, None]:
@@ -206,14 +279,38 @@ class UrlOrchestrator(AIExtractionService):
             ).to_sse()
         )
 
+        structured = _page_structured_recipe(html, prompt_override)
+        if structured is not None and structured.is_complete:
+            span.set_attribute("ai_recipe.extraction_source", "structured_data")
+            yield (
+                SSEEvent.model_validate(
+                    {
+                        "status": "structured_data",
+                        "step": "structured_data",
+                        "progress": 0.5,
+                        "detail": "Reading recipe data published by the page...",
+                    }
+                ).to_sse()
+            )
+            async for line in self._finish_stream(
+                structured.to_extraction_result(),
+                source_url,
+                db,
+                current_user,
+                prompt_override,
+                span,
+            ):
+                yield line
+            return
+
         yield (
             SSEEvent.model_validate(
                 {"status": "ai_call", "step": "ai_call", "progress": 0.5}
             ).to_sse()
         )
         try:
-            extraction_result = await self.ai_agent.run_extraction_agent(
-                html, prompt_override
+            extraction_result = await self._run_agent(
+                html, prompt_override, structured, span
             )
         except Exception as e:
             span.set_attribute("ai_recipe.extraction_status", "agent_error")
@@ -228,6 +325,21 @@ class UrlOrchestrator(AIExtractionService):
             )
             return
 
+        async for line in self._finish_stream(
+            extraction_result, source_url, db, current_user, prompt_override, span
+        ):
+            yield line
+
+    async def _finish_stream(
+        self,
+        extraction_result: Any,
+        source_url: str,
+        db: AsyncSession,
+        current_user: CurrentUser,
+        prompt_override: str | None,
+        span: Any,
+    ) -> AsyncGenerator[str, None]:
+        """Convert an extraction result into a draft and emit terminal events."""
         from schemas.ai import ExtractionNotFound
 
         if isinstance(extraction_result, ExtractionNotFound):
@@ -5,6 +5,7 @@ from services.chat_agent.agent import (
     build_datetime_instructions as build_datetime_instructions,
     build_user_context_instructions as build_user_context_instructions,
     get_chat_agent,
+    get_chat_system_prompt,
     normalize_agent_output,
 )
 from services.chat_agent.deps import ChatAgentDeps
@@ -23,6 +24,7 @@ __all__ = [
     "build_datetime_instructions",
     "build_user_context_instructions",
     "get_chat_agent",
+    "get_chat_system_prompt",
     "normalize_agent_output",
     # Schemas
     "DayOfWeekMeals",
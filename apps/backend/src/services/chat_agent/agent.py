@@ -24,10 +24,12 @@ from services.chat_agent.tools import (
     tool_get_recipe_details,
     tool_propose_meal_for_day,
     tool_search_recipes,
+    tool_suggest_flavor_pairings,
     tool_suggest_recipe,
     tool_update_user_memory,
     tool_web_search,
 )
+from services.flavor_pairs import get_flavor_pair_index
 
 
 logger = logging.getLogger(__name__)
@@ -168,6 +170,11 @@ YOUR CAPABILITIES:
 - Provide cooking tips and substitutions
 """
 
+# Appended to CAPABILITIES only when the flavor pairing index is loaded
+FLAVOR_PAIRING_CAPABILITY = (
+    "- Suggest ingredients that pair well together (suggest_flavor_pairings)\n"
+)
+
 USER_SETTINGS = """
 USER PREFERENCES & SETTINGS:
 - User preferences and dietary information are provided in the dynamic context
@@ -282,24 +289,41 @@ You can guide users to different parts of the app:
 # COMPOSE SYSTEM PROMPT FROM MODULES
 # ============================================================================
 
-CHAT_SYSTEM_PROMPT = (
-    "You are Nibble, a friendly meal planning assistant for families.\n\n"
-    + IDENTITY_RULES
-    + "\n"
-    + CAPABILITIES
-    + "\n"
-    + USER_SETTINGS
-    + "\n"
-    + MEMORY_INSTRUCTIONS
-    + "\n"
-    + APP_NAVIGATION
-    + "\n"
-    + RECIPE_DISCOVERY
-    + "\n"
-    + MEAL_PLANNING_WORKFLOW
-    + "\n"
-    + OUTPUT_AND_TOOL_RULES
-)
+
+def _compose_system_prompt(capabilities: str) -> str:
+    return (
+        "You are Nibble, a friendly meal planning assistant for families.\n\n"
+        + IDENTITY_RULES
+        + "\n"
+        + capabilities
+        + "\n"
+        + USER_SETTINGS
+        + "\n"
+        + MEMORY_INSTRUCTIONS
+        + "\n"
+        + APP_NAVIGATION
+        + "\n"
+        + RECIPE_DISCOVERY
+        + "\n"
+        + MEAL_PLANNING_WORKFLOW
+        + "\n"
+        + OUTPUT_AND_TOOL_RULES
+    )
+
+
+CHAT_SYSTEM_PROMPT = _compose_system_prompt(CAPABILITIES)
+
+
+def get_chat_system_prompt() -> str:
+    """Return the static system prompt for the tools this process registers.
+
+    Matches the agent's ``instructions=``; training capture uses it to
+    reconstruct the prompt. Equal to ``CHAT_SYSTEM_PROMPT`` unless the flavor
+    pairing index is loaded.
+    """
+    if get_flavor_pair_index() is None:
+        return CHAT_SYSTEM_PROMPT
+    return _compose_system_prompt(CAPABILITIES + FLAVOR_PAIRING_CAPABILITY)
 
 
 # ---------------------------------------------------------------------------
@@ -372,7 +396,7 @@ def get_chat_agent() -> Agent[ChatAgentDeps, AssistantMessage]:
 
     agent: Agent[ChatAgentDeps, AssistantMessage] = Agent(
         model,
-        instructions=CHAT_SYSTEM_PROMPT,
+        instructions=get_chat_system_prompt(),
         output_type=AssistantMessage,
         name="Nibble",
         retries=4,
@@ -415,6 +439,11 @@ def get_chat_agent() -> Agent[ChatAgentDeps, AssistantMessage]:
     agent.tool(name="update_user_memory", retries=_TOOL_CALL_RETRIES)(
         tool_update_user_memory
     )
+    # Only advertised when the index loaded at startup (FLAVOR_PAIRS_PATH)
+    if get_flavor_pair_index() is not None:
+        agent.tool(name="suggest_flavor_pairings", retries=_TOOL_CALL_RETRIES)(
+            tool_suggest_flavor_pairings
+        )
 
     return agent
 
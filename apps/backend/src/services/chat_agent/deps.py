@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-from asyncio import Lock
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
@@ -10,31 +9,50 @@ from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from dependencies.db import AsyncSessionLocal, ReadSessionLocal, SessionFactory
 from models.user_preferences import UserPreferences
-from models.users import User
+from schemas.auth import CurrentUser
 
 
 @dataclass(frozen=True)
 class ChatAgentDeps:
     """Dependencies injected into the chat agent context."""
 
-    db: AsyncSession
-    user: User
+    user: CurrentUser
     current_datetime: datetime
     user_timezone: str  # IANA timezone identifier (e.g., 'America/New_York')
 
     # User context for personalization
     user_preferences: UserPreferences | None = None
     memory_content: str | None = None
-    db_lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+    # Opens a fresh session per tool DB access; the streaming route passes the
+    # streaming pool's factory
+    session_factory: SessionFactory = field(
+        default=AsyncSessionLocal, repr=False, compare=False
+    )
+    # Read-only pool used by lookup tools (recipe search, meal history, ...)
+    read_session_factory: SessionFactory = field(
+        default=ReadSessionLocal, repr=False, compare=False
+    )
 
     @asynccontextmanager
     async def use_db(self) -> AsyncIterator[AsyncSession]:
-        """Serialize access to the shared request-scoped async session.
+        """Open a short-lived session for one tool's database work.
 
-        Pydantic AI may execute multiple tool calls concurrently. SQLAlchemy
-        AsyncSession/asyncpg connections cannot process concurrent operations,
-        so assistant tools that use the injected session must acquire this guard.
+        Pydantic AI may execute multiple tool calls concurrently. Each call gets
+        its own session (and pooled connection) for just the duration of its
+        queries, so concurrent tools run in parallel and no connection is held
+        while the model is generating.
         """
-        async with self.db_lock:
-            yield self.db
+        async with self.session_factory() as session:
+            yield session
+
+    @asynccontextmanager
+    async def use_read_db(self) -> AsyncIterator[AsyncSession]:
+        """Like ``use_db`` but from the read-only pool, for tools that only query.
+
+        Read tools dispatched together each hold their own connection, so a turn
+        issuing several of them waits for the slowest rather than their sum.
+        """
+        async with self.read_session_factory() as session:
+            yield session
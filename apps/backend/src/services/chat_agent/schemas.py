@@ -68,3 +68,25 @@ class MealPlanHistoryResponse(BaseModel):
             "to assess variety"
         )
     )
+
+
+class FlavorPairingSuggestion(BaseModel):
+    """One ingredient that pairs well with the requested ingredient."""
+
+    ingredient: str = Field(description="Partner ingredient")
+    recipes: int = Field(description="Recipes in the corpus using both ingredients")
+    lift: float = Field(
+        description="How much more often they co-occur than by chance (>1 = affinity)"
+    )
+
+
+class FlavorPairingsResponse(BaseModel):
+    """Co-occurrence based flavor pairings for an ingredient."""
+
+    status: str = Field(default="ok")
+    ingredient: str = Field(description="Ingredient as requested")
+    matched_ingredient: str | None = Field(
+        default=None, description="Corpus ingredient the request was matched to"
+    )
+    pairings: list[FlavorPairingSuggestion] = Field(default_factory=list)
+    message: str | None = Field(default=None)
@@ -1,5 +1,6 @@
 """Chat agent tools package."""
 
+from services.chat_agent.tools.flavor_pairs import tool_suggest_flavor_pairings
 from services.chat_agent.tools.meal_history import tool_get_meal_plan_history
 from services.chat_agent.tools.meal_proposals import tool_propose_meal_for_day
 from services.chat_agent.tools.memory import tool_update_user_memory
@@ -18,6 +19,7 @@ __all__ = [
     "tool_get_recipe_details",
     "tool_search_recipes",
     "tool_suggest_recipe",
+    "tool_suggest_flavor_pairings",
     "tool_update_user_memory",
     "tool_get_daily_weather",
     "tool_fetch_url_as_markdown",
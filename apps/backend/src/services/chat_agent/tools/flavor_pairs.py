@@ -0,0 +1,58 @@
+"""Tool for ingredient flavor-pairing suggestions."""
+
+from __future__ import annotations
+
+from pydantic_ai import RunContext
+
+from services.chat_agent.deps import ChatAgentDeps
+from services.chat_agent.schemas import (
+    FlavorPairingsResponse,
+    FlavorPairingSuggestion,
+)
+from services.flavor_pairs import get_flavor_pair_index
+
+
+async def tool_suggest_flavor_pairings(
+    ctx: RunContext[ChatAgentDeps],
+    ingredient: str,
+    limit: int = 8,
+) -> FlavorPairingsResponse:
+    """Find ingredients that pair well with an ingredient.
+
+    Use this when the user asks what goes well with an ingredient, how to use
+    up something they have, or for ideas to round out a dish. Pairings come
+    from how often ingredients appear together across a large recipe corpus,
+    ranked by lift (co-occurrence beyond chance), so they favour genuine
+    affinities over staples that appear everywhere.
+
+    Args:
+        ingredient: A single ingredient, e.g. "basil" or "sweet potato"
+        limit: Maximum pairings to return (default: 8, max: 20)
+
+    Returns:
+        The matched corpus ingredient and its best partners with recipe counts
+    """
+    index = get_flavor_pair_index()
+    if index is None:
+        return FlavorPairingsResponse(
+            status="unavailable",
+            ingredient=ingredient,
+            message="Flavor pairing data is not available; use general knowledge.",
+        )
+
+    matched = index.resolve(ingredient)
+    pairings = index.suggest(ingredient, limit=max(1, min(limit, 20)))
+    return FlavorPairingsResponse(
+        status="ok" if pairings else "not_found",
+        ingredient=ingredient,
+        matched_ingredient=matched,
+        pairings=[
+            FlavorPairingSuggestion(
+                ingredient=pairing.ingredient,
+                recipes=pairing.recipes,
+                lift=pairing.lift,
+            )
+            for pairing in pairings
+        ],
+        message=None if pairings else f"No pairing data for {ingredient!r}.",
+    )
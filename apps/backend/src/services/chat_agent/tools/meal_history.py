@@ -51,7 +51,7 @@ async def tool_get_meal_plan_history(
         .order_by(Meal.planned_for_date.desc(), Meal.meal_type)
     )
 
-    async with ctx.deps.use_db() as db:
+    async with ctx.deps.use_read_db() as db:
         result = await db.execute(stmt)
         meals = result.scalars().all()
 
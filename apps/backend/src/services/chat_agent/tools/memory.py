@@ -7,7 +7,6 @@ from typing import Any
 
 from pydantic_ai import RunContext
 
-from dependencies.db import AsyncSessionLocal
 from services.chat_agent.deps import ChatAgentDeps
 from services.memory_update import MemoryUpdateService
 
@@ -87,7 +86,7 @@ async def tool_update_user_memory(
 
     try:
         # Use separate database session for write operation
-        async with AsyncSessionLocal() as write_db:
+        async with ctx.deps.use_db() as write_db:
             memory_service = MemoryUpdateService(write_db)
             memory_doc = await memory_service.update_memory_content(
                 user_id=user.id,
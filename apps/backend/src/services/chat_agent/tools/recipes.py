@@ -7,6 +7,7 @@ Implementation note:
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime
 from typing import Any, Literal
 
@@ -224,14 +225,17 @@ async def _load_full_recipes(
             )
         )
     )
-    async with ctx.deps.use_db() as db:
-        # Ensure any pending operations are complete before new query.
-        await db.flush()
+    async with ctx.deps.use_read_db() as db:
         result = await db.execute(stmt)
         full_recipes = result.scalars().all()
     return {str(r.id): _recipe_to_full_payload(r) for r in full_recipes}
 
 
+async def _fetch_rows(ctx: RunContext[ChatAgentDeps], stmt: Any) -> list[Any]:
+    async with ctx.deps.use_read_db() as db:
+        return list((await db.execute(stmt)).all())
+
+
 def _apply_optional_filters(
     *,
     predicates: list[Any],
@@ -314,9 +318,10 @@ async def _hybrid_search_with_query(
         .limit(cte_limit)
     )
 
-    async with ctx.deps.use_db() as db:
-        text_rows = (await db.execute(text_stmt)).all()
-        vector_rows = (await db.execute(vector_stmt)).all()
+    # Independent read sessions let the text and vector searches overlap
+    text_rows, vector_rows = await asyncio.gather(
+        _fetch_rows(ctx, text_stmt), _fetch_rows(ctx, vector_stmt)
+    )
 
     combined: dict[str, dict[str, Any]] = {}
 
@@ -571,7 +576,7 @@ async def tool_search_recipes(
     stmt = stmt.order_by(sort_map.get(sort_by, Recipe.name.asc()))
     stmt = stmt.limit(max_results)
 
-    async with ctx.deps.use_db() as db:
+    async with ctx.deps.use_read_db() as db:
         result = await db.execute(stmt)
         rows = result.all()
 
@@ -674,7 +679,7 @@ async def tool_get_recipe_details(
         )
     )
 
-    async with ctx.deps.use_db() as db:
+    async with ctx.deps.use_read_db() as db:
         result = await db.execute(stmt)
         recipe = result.scalar_one_or_none()
     if recipe is None:
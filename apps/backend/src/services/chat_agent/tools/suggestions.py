@@ -9,7 +9,6 @@ from pydantic_ai import RunContext
 
 from core.observability import get_tracer, set_span_error_status
 from core.security import create_draft_token
-from dependencies.db import AsyncSessionLocal
 from services.ai.draft_service import create_success_draft
 from services.chat_agent.deps import ChatAgentDeps
 
@@ -91,7 +90,7 @@ async def tool_suggest_recipe(
             # Use a separate database session for draft creation to avoid
             # conflicts with concurrent tool executions (pydantic-ai runs
             # multiple tools in parallel, which can cause session conflicts)
-            async with AsyncSessionLocal() as draft_db:
+            async with ctx.deps.use_db() as draft_db:
                 draft = await create_success_draft(
                     db=draft_db,
                     current_user=user,
@@ -15,7 +15,7 @@ async def tool_get_daily_weather(
     ctx: RunContext[ChatAgentDeps],
 ) -> dict[str, Any]:
     """Read-only weather lookup based on user profile."""
-    async with ctx.deps.use_db() as db:
+    async with ctx.deps.use_read_db() as db:
         preferences = await user_preferences_crud.get_by_user_id(db, ctx.deps.user.id)
     return await get_daily_forecast_for_preferences(
         user_id=ctx.deps.user.id,
@@ -10,6 +10,7 @@ from pydantic_ai import RunContext
 
 from schemas.chat_streaming import MAX_SSE_EVENT_BYTES
 from services.ai.markdown_extractor import MarkdownExtractionService
+from services.ai.url_cache import get_url_content_cache
 from services.chat_agent.deps import ChatAgentDeps
 from services.web_search import search_web
 
@@ -27,7 +28,7 @@ _markdown_extractor: MarkdownExtractionService | None = None
 def _get_markdown_extractor() -> MarkdownExtractionService:
     global _markdown_extractor
     if _markdown_extractor is None:
-        _markdown_extractor = MarkdownExtractionService()
+        _markdown_extractor = MarkdownExtractionService(cache=get_url_content_cache())
     return _markdown_extractor
 
 
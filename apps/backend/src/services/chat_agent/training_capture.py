@@ -1,21 +1,55 @@
-"""Service for capturing LLM interactions as training data."""
+"""Service for capturing LLM interactions as training data.
+
+Chat turns hand their sample to ``enqueue_training_sample`` once the reply is
+persisted; a background task writes queued samples in batches, off the
+request path. Prompts are delta-encoded on the way in:
+
+* the static system prompt and the tool definitions are stored once in
+  ``ai_training_prompt_blobs`` by SHA-256 and referenced by hash;
+* each turn stores only the messages added since the previous sample of the
+  same conversation (``parent_sample_id`` + ``prompt_prefix_length``), so a
+  conversation of N turns no longer stores O(N^2) history.
+
+``rehydrate_prompt`` rebuilds the full ``{"messages", "tools"}`` prompt for
+export. Every ``keyframe_every`` turns, and whenever this process has not seen
+the previous turn (restart, another worker), a sample stores its full message
+list so rehydration chains stay short and never cross processes.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
 import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
 
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.observability import get_meter
+from dependencies.db import AsyncSessionLocal, SessionFactory
+from models.ai_training_prompt_blobs import AITrainingPromptBlob
 from models.ai_training_samples import AITrainingSample
-from models.users import User
+from schemas.auth import CurrentUser
 
 
 logger = logging.getLogger(__name__)
 
+_meter = get_meter(__name__)
+_captured_samples = _meter.create_counter(
+    "training_capture.samples",
+    description="Training samples handled by the capture queue, by outcome",
+)
+
+type PromptMessages = list[dict[str, Any]]
 
-def _is_synthetic_user(user: User) -> bool:
+
+def _is_synthetic_user(user: CurrentUser) -> bool:
     """Check if user is a synthetic data generation user.
 
     Synthetic users are identified by the @pantrypilot.synthetic email domain.
@@ -45,11 +79,17 @@ async def capture_training_sample(
     prompt_tokens: int | None = None,
     completion_tokens: int | None = None,
     latency_ms: int | None = None,
-    user: User | None = None,
+    user: CurrentUser | None = None,
+    parent_sample_id: uuid.UUID | None = None,
+    prompt_prefix_length: int | None = None,
+    system_prompt_hash: str | None = None,
+    tools_hash: str | None = None,
 ) -> AITrainingSample:
     """Capture LLM interaction for fine-tuning training data.
 
     Automatically detects synthetic users by email pattern and sets is_simulated flag.
+    The delta arguments are set by the capture queue (see ``encode_prompt``);
+    without them ``raw_prompt`` is stored as the full prompt.
 
     Args:
         db: Database session
@@ -67,6 +107,10 @@ async def capture_training_sample(
         completion_tokens: Completion token count
         latency_ms: Total request latency in milliseconds
         user: User object (optional, for synthetic detection)
+        parent_sample_id: Sample whose messages this prompt extends
+        prompt_prefix_length: Messages reused from the parent (delta rows only)
+        system_prompt_hash: Hash of the static system prompt blob
+        tools_hash: Hash of the tool definitions blob
 
     Returns:
         Created training sample record
@@ -91,6 +135,10 @@ async def capture_training_sample(
         completion_tokens=completion_tokens,
         latency_ms=latency_ms,
         is_simulated=is_simulated,
+        parent_sample_id=parent_sample_id,
+        prompt_prefix_length=prompt_prefix_length,
+        system_prompt_hash=system_prompt_hash,
+        tools_hash=tools_hash,
     )
 
     db.add(sample)
@@ -135,3 +183,342 @@ async def update_training_sample_feedback(
     logger.debug("Updated feedback for training sample %s: %s", sample_id, feedback)
 
     return sample
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _message_digest(message: dict[str, Any]) -> str:
+    return _sha256(json.dumps(message, sort_keys=True, default=str))
+
+
+@dataclass(frozen=True)
+class ConversationCaptureState:
+    """What the capture queue remembers about a conversation's last sample."""
+
+    sample_id: uuid.UUID
+    message_digests: tuple[str, ...]
+    depth: int  # samples since the last full (keyframe) sample
+
+
+@dataclass(frozen=True)
+class EncodedPrompt:
+    """A prompt split into a delta row plus content-addressed blobs."""
+
+    raw_prompt: str
+    parent_sample_id: uuid.UUID | None
+    prompt_prefix_length: int
+    system_prompt_hash: str | None
+    tools_hash: str | None
+    blobs: dict[str, tuple[str, str]]  # hash -> (kind, content)
+    message_digests: tuple[str, ...]
+    depth: int
+
+
+def encode_prompt(
+    prompt: dict[str, Any],
+    *,
+    system_prefix: str | None = None,
+    previous: ConversationCaptureState | None = None,
+    keyframe_every: int = 20,
+) -> EncodedPrompt:
+    """Delta-encode ``prompt`` (``{"messages": [...], "tools": [...]}``).
+
+    The leading system message is split into ``system_prefix`` (stored as a
+    blob when the content starts with it, otherwise the whole content is the
+    blob) and an inline per-turn suffix. Non-system messages shared with
+    ``previous`` are replaced by a prefix length; only the rest are stored.
+    """
+    messages: PromptMessages = list(prompt.get("messages", []))
+    blobs: dict[str, tuple[str, str]] = {}
+
+    system_hash: str | None = None
+    system_suffix = ""
+    if messages and messages[0].get("role") == "system":
+        content = str(messages.pop(0).get("content", ""))
+        static = (
+            system_prefix
+            if system_prefix and content.startswith(system_prefix)
+            else content
+        )
+        system_suffix = content[len(static) :]
+        system_hash = _sha256(static)
+        blobs[system_hash] = ("system", static)
+
+    tools_hash: str | None = None
+    tools = prompt.get("tools") or []
+    if tools:
+        tools_json = json.dumps(tools)
+        tools_hash = _sha256(tools_json)
+        blobs[tools_hash] = ("tools", tools_json)
+
+    digests = tuple(_message_digest(message) for message in messages)
+    prefix = 0
+    if previous is not None and previous.depth + 1 < keyframe_every:
+        for old, new in zip(previous.message_digests, digests, strict=False):
+            if old != new:
+                break
+            prefix += 1
+
+    parent = previous if prefix else None
+    raw_prompt = json.dumps({"system": system_suffix, "messages": messages[prefix:]})
+    return EncodedPrompt(
+        raw_prompt=raw_prompt,
+        parent_sample_id=parent.sample_id if parent else None,
+        prompt_prefix_length=prefix,
+        system_prompt_hash=system_hash,
+        tools_hash=tools_hash,
+        blobs=blobs,
+        message_digests=digests,
+        depth=parent.depth + 1 if parent else 0,
+    )
+
+
+def rehydrate_prompt(
+    raw_prompt: str,
+    *,
+    system_prompt: str | None,
+    tools_json: str | None,
+    parent_messages: PromptMessages | None = None,
+    prompt_prefix_length: int = 0,
+) -> dict[str, Any]:
+    """Rebuild the full prompt of a delta-encoded sample.
+
+    Args:
+        raw_prompt: The sample's stored delta
+        system_prompt: Content of the ``system_prompt_hash`` blob
+        tools_json: Content of the ``tools_hash`` blob
+        parent_messages: The parent's rehydrated non-system messages
+        prompt_prefix_length: How many of those the sample reuses
+
+    Returns:
+        ``{"messages": [...], "tools": [...]}`` as originally captured.
+
+    Raises:
+        ValueError: If the sample needs parent messages that are missing.
+    """
+    delta = json.loads(raw_prompt)
+    if prompt_prefix_length and (
+        parent_messages is None or len(parent_messages) < prompt_prefix_length
+    ):
+        raise ValueError("Parent sample messages are missing for delta prompt")
+
+    messages: PromptMessages = []
+    if system_prompt is not None:
+        messages.append(
+            {"role": "system", "content": system_prompt + delta.get("system", "")}
+        )
+    messages.extend((parent_messages or [])[:prompt_prefix_length])
+    messages.extend(delta.get("messages", []))
+    return {"messages": messages, "tools": json.loads(tools_json) if tools_json else []}
+
+
+@dataclass(frozen=True)
+class TrainingSampleCapture:
+    """One chat turn to be written as a training sample."""
+
+    conversation_id: uuid.UUID
+    message_id: uuid.UUID
+    user_id: uuid.UUID
+    prompt: dict[str, Any]
+    raw_response: str
+    tool_calls: dict[str, Any] | None
+    model_name: str
+    model_version: str | None = None
+    prompt_tokens: int | None = None
+    completion_tokens: int | None = None
+    latency_ms: int | None = None
+    user: CurrentUser | None = None
+    # Static part of the system message, stored once as a blob
+    system_prefix: str | None = None
+
+
+@dataclass
+class TrainingCaptureQueue:
+    """Bounded in-process queue written to the database by a background task.
+
+    Samples are written in batches (one session and commit per batch). A
+    failed batch is retried one sample at a time, so a bad sample only loses
+    itself. When the queue is full new samples are dropped and counted rather
+    than slowing down chat turns.
+
+    NOTE: Samples still queued when the process is killed are lost;
+    ``shutdown`` drains the queue on a graceful stop.
+    """
+
+    session_factory: SessionFactory = AsyncSessionLocal
+    maxsize: int = 512
+    batch_size: int = 32
+    keyframe_every: int = 20
+    max_conversations: int = 1024
+    _queue: asyncio.Queue[TrainingSampleCapture] | None = field(
+        default=None, init=False, repr=False
+    )
+    _worker: asyncio.Task[None] | None = field(default=None, init=False, repr=False)
+    _conversations: OrderedDict[uuid.UUID, ConversationCaptureState] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _known_blobs: set[str] = field(default_factory=set, init=False, repr=False)
+
+    def enqueue(self, capture: TrainingSampleCapture) -> bool:
+        """Queue ``capture`` for writing; return False if it was dropped."""
+        if self._queue is None or self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(self.maxsize)
+            self._worker = asyncio.create_task(self._run(self._queue))
+        try:
+            self._queue.put_nowait(capture)
+        except asyncio.QueueFull:
+            _captured_samples.add(1, {"outcome": "dropped"})
+            logger.warning(
+                "Training capture queue full; dropped sample for message %s",
+                capture.message_id,
+            )
+            return False
+        return True
+
+    async def drain(self) -> None:
+        """Wait until every queued sample has been written (or failed)."""
+        if self._queue is not None and self._worker is not None:
+            await self._queue.join()
+
+    async def shutdown(self, timeout: float = 10.0) -> None:
+        """Drain the queue (up to ``timeout`` seconds) and stop the worker."""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), timeout)
+        except TimeoutError:
+            logger.warning("Training capture queue not drained before shutdown")
+        self._worker.cancel()
+        await asyncio.wait({self._worker})
+        self._worker = None
+
+    async def _run(self, queue: asyncio.Queue[TrainingSampleCapture]) -> None:
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._write_batch(batch)
+            except Exception:
+                if len(batch) == 1:
+                    self._record_failure(batch[0])
+                else:
+                    logger.warning(
+                        "Failed to write %d training samples; retrying one by one",
+                        len(batch),
+                        exc_info=True,
+                    )
+                    await self._write_each(batch)
+            else:
+                _captured_samples.add(len(batch), {"outcome": "written"})
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _write_each(self, batch: list[TrainingSampleCapture]) -> None:
+        """Write ``batch`` one sample per session and commit."""
+        for capture in batch:
+            try:
+                await self._write_batch([capture])
+            except Exception:
+                self._record_failure(capture)
+            else:
+                _captured_samples.add(1, {"outcome": "written"})
+
+    def _record_failure(self, capture: TrainingSampleCapture) -> None:
+        _captured_samples.add(1, {"outcome": "failed"})
+        logger.exception(
+            "Failed to write training sample for message %s", capture.message_id
+        )
+        # The next turn must not reference an unwritten parent
+        self._conversations.pop(capture.conversation_id, None)
+
+    async def _write_batch(self, batch: list[TrainingSampleCapture]) -> None:
+        states: dict[uuid.UUID, ConversationCaptureState] = {}
+        new_blobs: dict[str, tuple[str, str]] = {}
+        async with self.session_factory() as db:
+            for capture in batch:
+                previous = states.get(capture.conversation_id) or (
+                    self._conversations.get(capture.conversation_id)
+                )
+                encoded = encode_prompt(
+                    capture.prompt,
+                    system_prefix=capture.system_prefix,
+                    previous=previous,
+                    keyframe_every=self.keyframe_every,
+                )
+                await self._store_blobs(db, encoded.blobs, new_blobs)
+                sample = await capture_training_sample(
+                    db,
+                    conversation_id=capture.conversation_id,
+                    message_id=capture.message_id,
+                    user_id=capture.user_id,
+                    raw_prompt=encoded.raw_prompt,
+                    raw_response=capture.raw_response,
+                    tool_calls=capture.tool_calls,
+                    model_name=capture.model_name,
+                    model_version=capture.model_version,
+                    prompt_tokens=capture.prompt_tokens,
+                    completion_tokens=capture.completion_tokens,
+                    latency_ms=capture.latency_ms,
+                    user=capture.user,
+                    parent_sample_id=encoded.parent_sample_id,
+                    prompt_prefix_length=encoded.prompt_prefix_length,
+                    system_prompt_hash=encoded.system_prompt_hash,
+                    tools_hash=encoded.tools_hash,
+                )
+                states[capture.conversation_id] = ConversationCaptureState(
+                    sample_id=sample.id,
+                    message_digests=encoded.message_digests,
+                    depth=encoded.depth,
+                )
+            await db.commit()
+
+        self._known_blobs.update(new_blobs)
+        for conversation_id, state in states.items():
+            self._conversations[conversation_id] = state
+            self._conversations.move_to_end(conversation_id)
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    async def _store_blobs(
+        self,
+        db: AsyncSession,
+        blobs: dict[str, tuple[str, str]],
+        pending: dict[str, tuple[str, str]],
+    ) -> None:
+        rows = [
+            {"content_hash": content_hash, "kind": kind, "content": content}
+            for content_hash, (kind, content) in blobs.items()
+            if content_hash not in self._known_blobs and content_hash not in pending
+        ]
+        if not rows:
+            return
+        await db.execute(
+            insert(AITrainingPromptBlob)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["content_hash"])
+        )
+        pending.update(
+            {row["content_hash"]: blobs[row["content_hash"]] for row in rows}
+        )
+
+
+@lru_cache
+def get_training_capture_queue() -> TrainingCaptureQueue:
+    """Return the process-wide training capture queue."""
+    return TrainingCaptureQueue()
+
+
+def enqueue_training_sample(capture: TrainingSampleCapture) -> bool:
+    """Hand a chat turn's sample to the background writer."""
+    return get_training_capture_queue().enqueue(capture)
+
+
+async def shutdown_training_capture_queue() -> None:
+    """Write out queued samples and stop the writer (application shutdown)."""
+    if get_training_capture_queue.cache_info().currsize:
+        await get_training_capture_queue().shutdown()
+        get_training_capture_queue.cache_clear()
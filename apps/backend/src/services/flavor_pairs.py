@@ -0,0 +1,344 @@
+"""Ingredient co-occurrence engine and flavor-pairing lookups.
+
+Offline, ``build_cooccurrence`` turns recipe ingredient lists into an
+ingredient vocabulary plus a recipe x ingredient incidence matrix in CSR form
+(``indptr``/``indices``) and computes the off-diagonal of ``XᵀX`` in one
+vectorized pass: rows with the same ingredient count are stacked into a dense
+block, every upper-triangle column pair becomes an ``i * V + j`` key and
+``np.unique`` counts the keys. Pair counts are scored with lift
+(``n_ab * N / (n_a * n_b)``) and PMI (its log) so ubiquitous ingredients do
+not dominate.
+
+``FlavorPairIndex`` is the compact runtime artifact: for each ingredient, its
+top-K partners by lift (count and lift only, CSR again) saved with
+``np.savez_compressed``. The API loads it at startup with
+``load_flavor_pair_index`` (``FLAVOR_PAIRS_PATH``) and the chat agent reads
+it through ``get_flavor_pair_index``; NumPy is the only dependency, so the API
+image does not need the DAPT extras.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from core.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+# Common "filler" ingredients to exclude from pairing analysis
+FILLER_INGREDIENTS = frozenset(
+    {
+        "salt",
+        "pepper",
+        "water",
+        "oil",
+        "butter",
+        "flour",
+        "sugar",
+        "eggs",
+        "egg",
+        "milk",
+    }
+)
+
+DEFAULT_TOP_K = 25
+DEFAULT_MIN_PAIR_COUNT = 20
+
+
+def normalize_ingredient(ingredient: str) -> str:
+    """Normalize ingredient name for matching."""
+    return ingredient.lower().strip()
+
+
+@dataclass(frozen=True)
+class Cooccurrence:
+    """Sparse ingredient co-occurrence counts over a recipe corpus.
+
+    ``vocab`` is sorted, so ``pair_a < pair_b`` also orders the names; the
+    ``pair_*`` arrays hold the upper triangle of ``XᵀX`` (COO, counts >= 1).
+    """
+
+    vocab: list[str]
+    doc_freq: npt.NDArray[np.int64]
+    n_recipes: int
+    pair_a: npt.NDArray[np.int64]
+    pair_b: npt.NDArray[np.int64]
+    pair_count: npt.NDArray[np.int64]
+
+    def lift(self) -> npt.NDArray[np.float64]:
+        """``P(a, b) / (P(a) P(b))`` for every pair."""
+        expected = self.doc_freq[self.pair_a] * self.doc_freq[self.pair_b]
+        return self.pair_count * self.n_recipes / expected.astype(np.float64)
+
+    def pmi(self) -> npt.NDArray[np.float64]:
+        """Pointwise mutual information (natural log of ``lift``)."""
+        return np.log(self.lift())
+
+    def top_pairs(
+        self, n: int, min_count: int = 1, by: str = "count"
+    ) -> list[tuple[str, str, int, float]]:
+        """Return ``(a, b, count, lift)`` for the best ``n`` pairs.
+
+        ``by`` is ``"count"``, ``"lift"`` or ``"pmi"`` (same order as lift);
+        ties break on the other measure, then the names.
+        """
+        keep = np.flatnonzero(self.pair_count >= min_count)
+        lift = self.lift()[keep]
+        count = self.pair_count[keep]
+        primary, secondary = (count, lift) if by == "count" else (lift, count)
+        # lexsort: last key is primary; pair_a/pair_b follow name order
+        order = np.lexsort(
+            (self.pair_b[keep], self.pair_a[keep], -secondary, -primary)
+        )[:n]
+        return [
+            (
+                self.vocab[self.pair_a[keep[i]]],
+                self.vocab[self.pair_b[keep[i]]],
+                int(self.pair_count[keep[i]]),
+                float(lift[i]),
+            )
+            for i in order
+        ]
+
+    def to_counter(self) -> Counter[tuple[str, str]]:
+        """Pair counts keyed by sorted ingredient names."""
+        vocab = self.vocab
+        return Counter(
+            {
+                (vocab[a], vocab[b]): int(c)
+                for a, b, c in zip(
+                    self.pair_a.tolist(),
+                    self.pair_b.tolist(),
+                    self.pair_count.tolist(),
+                    strict=True,
+                )
+            }
+        )
+
+
+def build_incidence(
+    ingredient_lists: Iterable[Iterable[str]],
+    exclude: frozenset[str] = FILLER_INGREDIENTS,
+) -> tuple[list[str], npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Return ``(vocab, indptr, indices)`` for the recipe x ingredient matrix.
+
+    Ingredients are normalized once, ``exclude`` is dropped and duplicates
+    within a recipe count once. Each row's indices are sorted.
+    """
+    ids: dict[str, int] = {}
+    indices: list[int] = []
+    indptr = [0]
+    for ingredients in ingredient_lists:
+        row = {
+            ids.setdefault(name, len(ids))
+            for name in map(normalize_ingredient, ingredients or ())
+            if name not in exclude
+        }
+        indices.extend(row)
+        indptr.append(len(indices))
+
+    # Renumber in name order so pair (i, j) with i < j is the sorted name pair
+    names = list(ids)
+    order = sorted(range(len(names)), key=names.__getitem__)
+    rank = np.empty(len(names), dtype=np.int64)
+    rank[order] = np.arange(len(names))
+    column = rank[np.asarray(indices, dtype=np.int64)]
+    bounds = np.asarray(indptr, dtype=np.int64)
+    row_of = np.repeat(np.arange(len(bounds) - 1), np.diff(bounds))
+    column = column[np.lexsort((column, row_of))]
+    return [names[i] for i in order], bounds, column
+
+
+def build_cooccurrence(
+    ingredient_lists: Iterable[Iterable[str]],
+    exclude: frozenset[str] = FILLER_INGREDIENTS,
+) -> Cooccurrence:
+    """Count ingredient pairs co-occurring in the same recipe (``XᵀX``)."""
+    vocab, indptr, indices = build_incidence(ingredient_lists, exclude)
+    size = len(vocab)
+    lengths = np.diff(indptr)
+
+    keys: list[npt.NDArray[np.int64]] = []
+    for k in np.unique(lengths[lengths >= 2]).tolist():
+        starts = indptr[:-1][lengths == k]
+        block = indices[starts[:, None] + np.arange(k)]
+        a, b = np.triu_indices(k, 1)
+        keys.append((block[:, a] * size + block[:, b]).ravel())
+    flat = np.concatenate(keys) if keys else np.empty(0, dtype=np.int64)
+    pair_keys, pair_count = np.unique(flat, return_counts=True)
+
+    return Cooccurrence(
+        vocab=vocab,
+        doc_freq=np.bincount(indices, minlength=size).astype(np.int64),
+        n_recipes=len(lengths),
+        pair_a=pair_keys // max(size, 1),
+        pair_b=pair_keys % max(size, 1),
+        pair_count=pair_count.astype(np.int64),
+    )
+
+
+@dataclass(frozen=True)
+class FlavorPairing:
+    """One suggested partner for an ingredient."""
+
+    ingredient: str
+    recipes: int
+    lift: float
+
+
+@dataclass
+class FlavorPairIndex:
+    """Top-K pairing partners per ingredient, stored as CSR arrays."""
+
+    vocab: list[str]
+    doc_freq: npt.NDArray[np.int64]
+    n_recipes: int
+    indptr: npt.NDArray[np.int64]
+    partners: npt.NDArray[np.int32]
+    counts: npt.NDArray[np.int32]
+    lifts: npt.NDArray[np.float32]
+    _ids: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._ids = {name: i for i, name in enumerate(self.vocab)}
+
+    @classmethod
+    def from_cooccurrence(
+        cls,
+        cooccurrence: Cooccurrence,
+        top_k: int = DEFAULT_TOP_K,
+        min_count: int = DEFAULT_MIN_PAIR_COUNT,
+    ) -> FlavorPairIndex:
+        """Keep each ingredient's ``top_k`` partners by lift, then count."""
+        keep = cooccurrence.pair_count >= min_count
+        a, b = cooccurrence.pair_a[keep], cooccurrence.pair_b[keep]
+        count = cooccurrence.pair_count[keep]
+        lift = cooccurrence.lift()[keep]
+
+        # Both directions, grouped by ingredient with the best lift first
+        rows, cols = np.concatenate((a, b)), np.concatenate((b, a))
+        count, lift = np.concatenate((count, count)), np.concatenate((lift, lift))
+        order = np.lexsort((cols, -count, -lift, rows))
+        rows, cols, count, lift = rows[order], cols[order], count[order], lift[order]
+
+        size = len(cooccurrence.vocab)
+        row_start = np.searchsorted(rows, np.arange(size))
+        top = (np.arange(len(rows)) - row_start[rows]) < top_k
+        kept_rows = rows[top]
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(kept_rows, minlength=size), out=indptr[1:])
+        return cls(
+            vocab=cooccurrence.vocab,
+            doc_freq=cooccurrence.doc_freq,
+            n_recipes=cooccurrence.n_recipes,
+            indptr=indptr,
+            partners=cols[top].astype(np.int32),
+            counts=count[top].astype(np.int32),
+            lifts=lift[top].astype(np.float32),
+        )
+
+    def save(self, path: Path) -> None:
+        """Write the index as a compressed ``.npz``."""
+        np.savez_compressed(
+            path,
+            vocab=np.asarray(self.vocab, dtype=np.str_),
+            doc_freq=self.doc_freq,
+            n_recipes=np.int64(self.n_recipes),
+            indptr=self.indptr,
+            partners=self.partners,
+            counts=self.counts,
+            lifts=self.lifts,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> FlavorPairIndex:
+        """Read an index written by ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                vocab=data["vocab"].tolist(),
+                doc_freq=data["doc_freq"],
+                n_recipes=int(data["n_recipes"]),
+                indptr=data["indptr"],
+                partners=data["partners"],
+                counts=data["counts"],
+                lifts=data["lifts"],
+            )
+
+    def resolve(self, ingredient: str) -> str | None:
+        """Map free text to a vocabulary entry.
+
+        Exact normalized match first, otherwise the most common entry that
+        contains the text (``"basil"`` -> ``"fresh basil"``).
+        """
+        name = normalize_ingredient(ingredient)
+        if not name:
+            return None
+        if name in self._ids:
+            return name
+        candidates = [v for v in self.vocab if name in v]
+        if not candidates:
+            return None
+        return max(candidates, key=lambda v: self.doc_freq[self._ids[v]])
+
+    def suggest(self, ingredient: str, limit: int = 10) -> list[FlavorPairing]:
+        """Return up to ``limit`` partners for ``ingredient``, best lift first."""
+        name = self.resolve(ingredient)
+        if name is None:
+            return []
+        i = self._ids[name]
+        start, end = int(self.indptr[i]), int(self.indptr[i + 1])
+        end = min(end, start + max(limit, 0))
+        return [
+            FlavorPairing(
+                ingredient=self.vocab[partner],
+                recipes=int(count),
+                lift=round(float(lift), 2),
+            )
+            for partner, count, lift in zip(
+                self.partners[start:end].tolist(),
+                self.counts[start:end].tolist(),
+                self.lifts[start:end].tolist(),
+                strict=True,
+            )
+        ]
+
+
+_flavor_pair_index: FlavorPairIndex | None = None
+
+
+def load_flavor_pair_index() -> FlavorPairIndex | None:
+    """Load the index at ``FLAVOR_PAIRS_PATH``; None when unavailable.
+
+    Reads the ``.npz`` synchronously, so call it at startup (off the event
+    loop). A failed load is not remembered; calling again retries.
+    """
+    global _flavor_pair_index
+    _flavor_pair_index = None
+    path = get_settings().FLAVOR_PAIRS_PATH
+    if not path:
+        return None
+    try:
+        index = FlavorPairIndex.load(Path(path))
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Flavor pair index unavailable (%s): %s", path, exc)
+        return None
+    _flavor_pair_index = index
+    logger.info(
+        "Loaded flavor pair index: %d ingredients, %d pairings",
+        len(index.vocab),
+        len(index.partners),
+    )
+    return index
+
+
+def get_flavor_pair_index() -> FlavorPairIndex | None:
+    """Return the index loaded at startup; None when unavailable."""
+    return _flavor_pair_index
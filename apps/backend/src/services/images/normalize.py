@@ -93,6 +93,29 @@ def validate_combined_size(
         )
 
 
+def validate_images(image_files: list[tuple[bytes, str]]) -> None:
+    """Run the cheap type and size checks for a batch of uploads.
+
+    Lets callers reject bad uploads before starting the (slower) decode and
+    re-encode work in ``normalize_images``.
+
+    Args:
+        image_files: List of (image_bytes, content_type) tuples
+
+    Raises:
+        ImageFormatError: If any content type is not allowed
+        ImageSizeLimitError: If a file or the combined upload is too large
+    """
+    sizes = []
+    for image_bytes, content_type in image_files:
+        validate_content_type(content_type)
+        size = len(image_bytes)
+        validate_file_size(size)
+        sizes.append(size)
+
+    validate_combined_size(sizes)
+
+
 def normalize_image(
     image_bytes: bytes,
     max_dimension: int = MAX_IMAGE_DIMENSION,
@@ -193,14 +216,7 @@ def normalize_images(
         ImageValidationError: If validation or normalization fails
     """
     # Validate all files first
-    sizes = []
-    for image_bytes, content_type in image_files:
-        validate_content_type(content_type)
-        size = len(image_bytes)
-        validate_file_size(size)
-        sizes.append(size)
-
-    validate_combined_size(sizes)
+    validate_images(image_files)
 
     # Normalize all images
     normalized = []
@@ -2,17 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
-from typing import Any
+from functools import lru_cache
+from typing import Any, Protocol
 from uuid import UUID
 
 import httpx
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.config import get_settings
 from crud.user_preferences import user_preferences_crud
+from models.chat_conversations import ChatConversation
 from models.user_preferences import UserPreferences
 
 
@@ -21,7 +29,16 @@ logger = logging.getLogger(__name__)
 OPEN_METEO_BASE_URL = "https://api.open-meteo.com/v1/forecast"
 WEATHER_GOV_POINTS_URL = "https://api.weather.gov/points"
 WEATHER_CACHE_TTL = timedelta(minutes=20)
+# Failed lookups are retried sooner so a provider outage heals quickly
+WEATHER_ERROR_CACHE_TTL = timedelta(minutes=2)
+WEATHER_CACHE_MAX_ENTRIES = 4096
+# Coordinates are rounded to ~1 km, finer than the forecast model grids
+WEATHER_COORD_PRECISION = 2
 WEATHER_MAX_DAYS = 7
+# Pre-warm cadence; entries expiring before the next run are refreshed
+WEATHER_PREWARM_INTERVAL = timedelta(minutes=15)
+WEATHER_PREWARM_ACTIVE_WINDOW = timedelta(days=1)
+WEATHER_PREWARM_CONCURRENCY = 4
 
 
 @dataclass(frozen=True)
@@ -30,34 +47,199 @@ class WeatherCacheEntry:
     payload: dict[str, Any]
 
 
-# NOTE: This is an in-memory, per-process cache.
-# In multi-worker deployments (e.g., gunicorn/uvicorn with multiple workers),
-# each worker maintains its own copy of this cache. That means:
-#   * cache entries are not shared across workers, and
-#   * external weather APIs may still be called redundantly across processes.
-#
-# For production deployments that require cross-worker caching, consider
-# replacing this with a shared cache backend such as Redis. Tests should
-# use `clear_weather_cache()` instead of mutating `_weather_cache` directly.
-_weather_cache: dict[str, WeatherCacheEntry] = {}
+class SharedWeatherBackend(Protocol):
+    """Cross-worker store for forecasts (e.g. Redis).
+
+    Implementations may raise; ``WeatherCache`` logs backend errors and falls
+    back to its local entries.
+    """
+
+    async def get(self, key: str) -> WeatherCacheEntry | None: ...
+
+    async def set(self, key: str, entry: WeatherCacheEntry, ttl: timedelta) -> None: ...
+
+
+class UpstashWeatherBackend:
+    """Shared forecast store on Upstash Redis (JSON values with an expiry)."""
+
+    def __init__(self, redis: Any, prefix: str = "pantrypilot:weather") -> None:
+        self._redis = redis
+        self._prefix = prefix
+
+    async def get(self, key: str) -> WeatherCacheEntry | None:
+        raw = await self._redis.get(f"{self._prefix}:{key}")
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return WeatherCacheEntry(
+            fetched_at=datetime.fromisoformat(data["fetched_at"]),
+            payload=data["payload"],
+        )
+
+    async def set(self, key: str, entry: WeatherCacheEntry, ttl: timedelta) -> None:
+        value = json.dumps(
+            {"fetched_at": entry.fetched_at.isoformat(), "payload": entry.payload}
+        )
+        await self._redis.set(
+            f"{self._prefix}:{key}", value, ex=max(1, int(ttl.total_seconds()))
+        )
+
+
+type ForecastFetcher = Callable[[], Awaitable[dict[str, Any]]]
+
+
+class WeatherCache:
+    """LRU forecast cache keyed on location, with single-flight fetches.
+
+    Lookups go local entries -> shared backend (when configured) -> fetch.
+    Concurrent misses for one key share a single in-flight fetch, so a burst
+    of users in the same city triggers one provider call per worker, and at
+    most one per TTL across workers once the backend holds the forecast.
+
+    NOTE: Without a backend this is an in-memory, per-process cache; each
+    worker keeps its own copy.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = WEATHER_CACHE_MAX_ENTRIES,
+        backend: SharedWeatherBackend | None = None,
+        clock: Callable[[], datetime] = lambda: datetime.now(UTC),
+    ) -> None:
+        self.max_entries = max_entries
+        self.backend = backend
+        self._clock = clock
+        self._entries: OrderedDict[str, WeatherCacheEntry] = OrderedDict()
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        """Drop every local entry (the shared backend is left untouched)."""
+        self._entries.clear()
+
+    def get(self, key: str) -> WeatherCacheEntry | None:
+        return self._entries.get(key)
+
+    def set(self, key: str, entry: WeatherCacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: ForecastFetcher,
+        *,
+        min_remaining: timedelta = timedelta(0),
+    ) -> dict[str, Any]:
+        """Return a fresh payload for ``key``, fetching it at most once.
+
+        Args:
+            key: Location key from ``_cache_key``
+            fetch: Fetches the forecast from the weather providers
+            min_remaining: Treat entries expiring sooner than this as stale
+                (used by the pre-warm job to refresh ahead of expiry)
+        """
+        entry = self._entries.get(key)
+        if entry is not None and self._is_fresh(entry, min_remaining):
+            self._entries.move_to_end(key)
+            return entry.payload
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, fetch, min_remaining))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one cancelled caller does not abort the shared fetch
+        return await asyncio.shield(task)
+
+    def _is_fresh(self, entry: WeatherCacheEntry, min_remaining: timedelta) -> bool:
+        age = self._clock() - entry.fetched_at
+        return age + min_remaining < _ttl_for(entry.payload)
+
+    async def _load(
+        self, key: str, fetch: ForecastFetcher, min_remaining: timedelta
+    ) -> dict[str, Any]:
+        if self.backend is not None:
+            try:
+                shared = await self.backend.get(key)
+            except Exception as exc:
+                logger.warning("Shared weather cache read failed: %s", exc)
+                shared = None
+            if shared is not None and self._is_fresh(shared, min_remaining):
+                self.set(key, shared)
+                return shared.payload
+
+        entry = WeatherCacheEntry(fetched_at=self._clock(), payload=await fetch())
+        self.set(key, entry)
+        if self.backend is not None:
+            try:
+                await self.backend.set(key, entry, _ttl_for(entry.payload))
+            except Exception as exc:
+                logger.warning("Shared weather cache write failed: %s", exc)
+        return entry.payload
+
+
+def _ttl_for(payload: dict[str, Any]) -> timedelta:
+    if payload.get("status") == "ok":
+        return WEATHER_CACHE_TTL
+    return WEATHER_ERROR_CACHE_TTL
+
+
+@lru_cache
+def get_weather_cache() -> WeatherCache:
+    """Return the process-wide weather cache.
+
+    Forecasts are shared across workers through Upstash Redis when it is
+    configured; otherwise the cache is local to this process.
+    """
+    return WeatherCache(backend=_build_shared_backend())
+
+
+def _build_shared_backend() -> SharedWeatherBackend | None:
+    settings = get_settings()
+    if not settings.UPSTASH_REDIS_REST_URL or not settings.UPSTASH_REDIS_REST_TOKEN:
+        return None
+    try:
+        from upstash_redis.asyncio import Redis
+
+        redis = Redis(
+            url=settings.UPSTASH_REDIS_REST_URL,
+            token=settings.UPSTASH_REDIS_REST_TOKEN,
+        )
+    except Exception as exc:
+        logger.warning("Shared weather cache disabled: %s", exc)
+        return None
+    return UpstashWeatherBackend(redis, prefix=f"{settings.APP_NAME.lower()}:weather")
 
 
 def clear_weather_cache() -> None:
-    """Clear the in-memory weather cache.
+    """Clear the local weather cache.
 
     This helper is primarily intended for tests so that cache state does
-    not leak between test cases. It is safe to call at any time.
-
-    The cache remains per-process and is not shared across workers. For
-    cross-worker caching, use a shared backend (e.g., Redis).
+    not leak between test cases. It is safe to call at any time. Entries in
+    the shared backend expire on their own.
     """
-    _weather_cache.clear()
+    get_weather_cache().clear()
+
+
+def _round_coordinate(value: float) -> float:
+    return round(value, WEATHER_COORD_PRECISION)
 
 
 def _cache_key(
-    *, user_id: UUID, latitude: float, longitude: float, unit: str, timezone: str | None
+    *, latitude: float, longitude: float, unit: str, timezone: str | None
 ) -> str:
-    return f"{user_id}:{latitude:.5f}:{longitude:.5f}:{unit}:{timezone or 'auto'}"
+    """Location key shared by every user whose coordinates round together."""
+    precision = WEATHER_COORD_PRECISION
+    return (
+        f"{_round_coordinate(latitude):.{precision}f}:"
+        f"{_round_coordinate(longitude):.{precision}f}:"
+        f"{unit}:{timezone or 'auto'}"
+    )
 
 
 def _format_location(preferences: UserPreferences) -> str | None:
@@ -130,41 +312,129 @@ async def get_daily_forecast_for_preferences(
         }
 
     unit = _get_temperature_unit(preferences)
-    cache_key = _cache_key(
-        user_id=user_id,
+    payload = await _get_cached_forecast(
         latitude=latitude,
         longitude=longitude,
-        unit=unit,
         timezone=timezone,
+        unit=unit,
+        country=preferences.country,
+    )
+    if payload.get("status") == "ok":
+        # Cached forecasts are shared by location; the label is per user
+        return {**payload, "location": _format_location(preferences)}
+    return payload
+
+
+async def _get_cached_forecast(
+    *,
+    latitude: float,
+    longitude: float,
+    timezone: str,
+    unit: str,
+    country: str | None,
+    min_remaining: timedelta = timedelta(0),
+) -> dict[str, Any]:
+    cache_key = _cache_key(
+        latitude=latitude, longitude=longitude, unit=unit, timezone=timezone
     )
-    cached = _weather_cache.get(cache_key)
-    now = datetime.now(UTC)
-    if cached and now - cached.fetched_at < WEATHER_CACHE_TTL:
-        return cached.payload
 
-    location_label = _format_location(preferences)
+    async def fetch() -> dict[str, Any]:
+        return await _fetch_forecast(
+            latitude=_round_coordinate(latitude),
+            longitude=_round_coordinate(longitude),
+            timezone=timezone,
+            unit=unit,
+            country=country,
+        )
+
+    return await get_weather_cache().get_or_fetch(
+        cache_key, fetch, min_remaining=min_remaining
+    )
 
+
+async def _fetch_forecast(
+    *,
+    latitude: float,
+    longitude: float,
+    timezone: str,
+    unit: str,
+    country: str | None,
+) -> dict[str, Any]:
     payload = await _fetch_open_meteo(
         latitude=latitude,
         longitude=longitude,
         timezone=timezone,
         unit=unit,
-        location_label=location_label,
+        location_label=None,
+    )
+
+    if payload.get("status") != "ok" and (country or "").upper() in {"US", "USA"}:
+        fallback = await _fetch_weather_gov(
+            latitude=latitude,
+            longitude=longitude,
+            location_label=None,
+        )
+        if fallback.get("status") == "ok":
+            payload = fallback
+    return payload
+
+
+async def prewarm_weather_cache(db: AsyncSession) -> int:
+    """Refresh forecasts for the locations of recently active users.
+
+    Users with chat activity within ``WEATHER_PREWARM_ACTIVE_WINDOW`` and a
+    geocoded location are grouped by cache key, so each location is fetched
+    once. Entries that would expire before the next run are refreshed.
+
+    Returns:
+        Number of distinct locations warmed
+    """
+    cutoff = datetime.now(UTC) - WEATHER_PREWARM_ACTIVE_WINDOW
+    active_users = (
+        select(ChatConversation.user_id)
+        .where(ChatConversation.last_activity_at >= cutoff)
+        .distinct()
+    )
+    result = await db.execute(
+        select(UserPreferences).where(
+            UserPreferences.user_id.in_(active_users),
+            UserPreferences.latitude.is_not(None),
+            UserPreferences.longitude.is_not(None),
+        )
     )
 
-    if payload.get("status") != "ok":
-        country = (preferences.country or "").upper()
-        if country in {"US", "USA"}:
-            fallback = await _fetch_weather_gov(
-                latitude=latitude,
-                longitude=longitude,
-                location_label=location_label,
+    locations: dict[str, dict[str, Any]] = {}
+    for preferences in result.scalars():
+        latitude = _to_float(preferences.latitude)
+        longitude = _to_float(preferences.longitude)
+        if latitude is None or longitude is None:
+            continue
+        timezone = preferences.timezone or "auto"
+        unit = _get_temperature_unit(preferences)
+        key = _cache_key(
+            latitude=latitude, longitude=longitude, unit=unit, timezone=timezone
+        )
+        locations.setdefault(
+            key,
+            {
+                "latitude": latitude,
+                "longitude": longitude,
+                "timezone": timezone,
+                "unit": unit,
+                "country": preferences.country,
+            },
+        )
+
+    semaphore = asyncio.Semaphore(WEATHER_PREWARM_CONCURRENCY)
+
+    async def warm(request: dict[str, Any]) -> None:
+        async with semaphore:
+            await _get_cached_forecast(
+                **request, min_remaining=WEATHER_PREWARM_INTERVAL
             )
-            if fallback.get("status") == "ok":
-                payload = fallback
 
-    _weather_cache[cache_key] = WeatherCacheEntry(fetched_at=now, payload=payload)
-    return payload
+    await asyncio.gather(*(warm(request) for request in locations.values()))
+    return len(locations)
 
 
 async def _fetch_open_meteo(
@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 from services.ai.html_extractor import HTMLExtractionService
+from services.ai.url_cache import get_url_content_cache
 
 
 @dataclass(frozen=True)
@@ -16,7 +17,11 @@ class WebFetchResult:
 
 async def fetch_url_content(url: str) -> WebFetchResult:
     """Fetch and sanitize HTML content with safety limits."""
-    extractor = HTMLExtractionService(timeout=10, max_size=1 * 1024 * 1024)
+    extractor = HTMLExtractionService(
+        timeout=10,
+        max_size=1 * 1024 * 1024,
+        cache=get_url_content_cache(),
+    )
     try:
         content = await extractor.fetch_and_sanitize(url)
         return WebFetchResult(url=url, content=content)
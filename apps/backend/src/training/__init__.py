@@ -36,6 +36,9 @@ from training.query_templates import (
 )
 from training.seed_database import (
     SYNTHETIC_PASSWORD,
+    PersonaRows,
+    build_persona_rows,
+    bulk_seed_all_personas,
     cleanup_synthetic_users,
     run_seeding,
     seed_all_personas,
@@ -68,6 +71,9 @@ __all__ = [
     "get_tool_coverage_queries",
     # Seeding
     "SYNTHETIC_PASSWORD",
+    "PersonaRows",
+    "build_persona_rows",
+    "bulk_seed_all_personas",
     "cleanup_synthetic_users",
     "run_seeding",
     "seed_all_personas",
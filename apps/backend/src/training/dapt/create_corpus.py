@@ -10,6 +10,14 @@ Target composition (~150M tokens):
 - OpenRecipes: ~25M tokens (17%)
 - Flavor pairing knowledge: ~5M tokens (3%)
 - General text augmentation: ~7M tokens (4%) [optional]
+
+The build streams in constant memory: records are read one at a time and,
+when shuffling, scattered to random temporary bucket files (about
+``--bucket-mb`` each) which are then shuffled one at a time in memory and
+concatenated - a uniform shuffle without holding the corpus. Tokens are
+counted exactly with ``--tokenizer`` (the DAPT base model's tokenizer by
+default) as records stream past, and ``--dedup-threshold`` drops near-duplicate
+texts with MinHash LSH (the only state that grows with the corpus).
 """
 
 from __future__ import annotations
@@ -17,12 +25,21 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import math
 import random
 import sys
-from collections.abc import Iterator
+import tempfile
+import zlib
+from collections import Counter
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
+from types import TracebackType
+from typing import IO, Any
 
+import numpy as np
+import numpy.typing as npt
 from tqdm import tqdm
 
 
@@ -40,6 +57,20 @@ INPUT_FILES: dict[str, str | Path] = {
     "flavor_pairs": "flavor_pairs.jsonl",
 }
 
+# Tokenizer of the default DAPT base model (training/scripts/dapt_train.py);
+# "tiktoken:<encoding>" and "heuristic" (bytes / 4) are also accepted
+DEFAULT_TOKENIZER = "Qwen/Qwen3-0.6B-Base"
+TOKEN_BATCH_SIZE = 512
+
+# Target in-memory size of one shuffle bucket
+DEFAULT_BUCKET_MB = 256
+
+# MinHash near-duplicate detection over word shingles
+MINHASH_PERMUTATIONS = 128
+SHINGLE_WORDS = 5
+
+type TokenCounter = Callable[[Sequence[str]], int]
+
 
 def read_jsonl(file_path: Path) -> Iterator[dict[str, Any]]:
     """Read JSONL file and yield records."""
@@ -58,32 +89,169 @@ def read_jsonl(file_path: Path) -> Iterator[dict[str, Any]]:
                     continue
 
 
-def count_lines(file_path: Path) -> int:
-    """Count lines in a file."""
-    if not file_path.exists():
-        return 0
-    with open(file_path, encoding="utf-8") as f:
-        return sum(1 for _ in f)
-
-
-def estimate_tokens_from_file(file_path: Path) -> int:
-    """Estimate token count from file size."""
-    if not file_path.exists():
-        return 0
-    return file_path.stat().st_size // 4
-
-
-def create_corpus(
-    data_dir: Path,
-    output_path: Path,
-    shuffle: bool = True,
-    seed: int | None = None,
-) -> dict[str, int]:
-    """Create combined corpus from all sources."""
-    # Collect all records
-    all_records: list[dict[str, Any]] = []
-    source_counts: dict[str, int] = {}
-
+def _estimate_tokens(texts: Sequence[str]) -> int:
+    return sum(len(text.encode("utf-8")) for text in texts) // 4
+
+
+def load_token_counter(spec: str = DEFAULT_TOKENIZER) -> tuple[TokenCounter, bool]:
+    """Return a batch token counter for ``spec`` and whether it is exact.
+
+    ``spec`` is a Hugging Face tokenizer name, ``tiktoken:<encoding>`` or
+    ``heuristic``. If the tokenizer cannot be loaded (package missing, no
+    network) the bytes / 4 estimate is used instead and reported as such.
+    """
+    if spec == "heuristic":
+        return _estimate_tokens, False
+    try:
+        if spec.startswith("tiktoken:"):
+            import tiktoken
+
+            encoding = tiktoken.get_encoding(spec.removeprefix("tiktoken:"))
+
+            def count_tiktoken(texts: Sequence[str]) -> int:
+                return sum(map(len, encoding.encode_ordinary_batch(list(texts))))
+
+            return count_tiktoken, True
+
+        from transformers import AutoTokenizer
+
+        tokenizer = AutoTokenizer.from_pretrained(spec)
+
+        def count_hf(texts: Sequence[str]) -> int:
+            encoded = tokenizer(list(texts), add_special_tokens=False)
+            return sum(map(len, encoded["input_ids"]))
+
+        return count_hf, True
+    except Exception as e:
+        logger.warning(f"Tokenizer {spec!r} unavailable ({e}); estimating tokens")
+        return _estimate_tokens, False
+
+
+def _lsh_bands(threshold: float, permutations: int) -> tuple[int, int]:
+    """Pick (bands, rows) whose LSH threshold (1/b)^(1/r) is closest."""
+    options = [
+        (bands, permutations // bands)
+        for bands in range(1, permutations + 1)
+        if permutations % bands == 0
+    ]
+    return min(options, key=lambda o: abs((1 / o[0]) ** (1 / o[1]) - threshold))
+
+
+class NearDuplicateFilter:
+    """MinHash LSH over word shingles; keeps the first text of each group.
+
+    A text is a duplicate when an LSH band matches an earlier text and their
+    signatures agree on at least ``threshold`` of the permutations (the
+    estimated Jaccard similarity). Memory is one signature plus one entry
+    per band for every kept text.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        permutations: int = MINHASH_PERMUTATIONS,
+        seed: int = 1,
+    ) -> None:
+        self.threshold = threshold
+        self.bands, self.rows = _lsh_bands(threshold, permutations)
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: (a * x + b) >> 32 with odd a, 32-bit x
+        self._a = rng.integers(1, 2**32, permutations, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2**32, permutations, dtype=np.uint64)
+        self._tables: list[dict[int, int]] = [{} for _ in range(self.bands)]
+        self._signatures: list[npt.NDArray[np.uint32]] = []
+
+    def signature(self, text: str) -> npt.NDArray[np.uint32]:
+        """MinHash signature of the text's lower-cased word shingles."""
+        words = text.lower().split()
+        shingles = {
+            " ".join(words[i : i + SHINGLE_WORDS])
+            for i in range(max(1, len(words) - SHINGLE_WORDS + 1))
+        }
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        mixed = (np.outer(self._a, hashes) + self._b[:, None]) >> np.uint64(32)
+        return mixed.min(axis=1).astype(np.uint32)
+
+    def is_duplicate(self, text: str) -> bool:
+        """Return True for a near-duplicate; otherwise remember the text."""
+        signature = self.signature(text)
+        keys = [hash(band.tobytes()) for band in signature.reshape(self.bands, -1)]
+        for table, key in zip(self._tables, keys, strict=True):
+            other = table.get(key)
+            if other is not None and (
+                np.mean(self._signatures[other] == signature) >= self.threshold
+            ):
+                return True
+
+        index = len(self._signatures)
+        self._signatures.append(signature)
+        for table, key in zip(self._tables, keys, strict=True):
+            table.setdefault(key, index)
+        return False
+
+
+class ExternalShuffler:
+    """Shuffle lines through random temporary buckets.
+
+    ``add`` appends each line to a uniformly random bucket file; ``drain``
+    shuffles each bucket in memory and writes them out in turn. Every
+    permutation is equally likely, and memory is bounded by one bucket.
+    """
+
+    def __init__(
+        self, buckets: int, rng: random.Random, tmp_dir: Path | None = None
+    ) -> None:
+        self._rng = rng
+        self._dir = tempfile.TemporaryDirectory(prefix="dapt-shuffle-", dir=tmp_dir)
+        self._paths = [
+            Path(self._dir.name) / f"bucket-{i:04d}.jsonl" for i in range(buckets)
+        ]
+        self._files = [open(path, "w", encoding="utf-8") for path in self._paths]
+
+    def add(self, line: str) -> None:
+        self._files[self._rng.randrange(len(self._files))].write(line)
+
+    def drain(self, out: IO[str]) -> None:
+        for f in self._files:
+            f.close()
+        for path in tqdm(self._paths, desc="Shuffling buckets", leave=False):
+            with open(path, encoding="utf-8") as f:
+                lines = f.readlines()
+            self._rng.shuffle(lines)
+            out.writelines(lines)
+            path.unlink()
+
+    def __enter__(self) -> ExternalShuffler:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        for f in self._files:
+            f.close()
+        self._dir.cleanup()
+
+
+@dataclass
+class CorpusStats:
+    """Per-source counts for one corpus build."""
+
+    records: dict[str, int] = field(default_factory=dict)
+    tokens: Counter[str] = field(default_factory=Counter)
+    duplicates: Counter[str] = field(default_factory=Counter)
+    tokens_exact: bool = False
+
+
+def resolve_sources(data_dir: Path) -> list[tuple[str, Path]]:
+    """Return ``(source_name, path)`` for every input file that exists."""
+    sources = []
     for source_name, filename in INPUT_FILES.items():
         # Handle both Path and str types for filename
         if isinstance(filename, Path):
@@ -95,48 +263,109 @@ def create_corpus(
         if not file_path.exists():
             logger.warning(f"Source not found, skipping: {source_name}")
             continue
+        sources.append((source_name, file_path))
+    return sources
+
+
+def _stream_source(
+    source_name: str,
+    file_path: Path,
+    write: Callable[[str], Any],
+    stats: CorpusStats,
+    count_tokens: TokenCounter,
+    dedup: NearDuplicateFilter | None,
+) -> None:
+    logger.info(f"Loading {source_name} from {file_path}...")
+    count = 0
+    pending: list[str] = []
+    for record in tqdm(read_jsonl(file_path), desc=f"Loading {source_name}"):
+        text = record.get("text")
+        if dedup is not None and isinstance(text, str) and dedup.is_duplicate(text):
+            stats.duplicates[source_name] += 1
+            continue
 
-        logger.info(f"Loading {source_name} from {file_path}...")
-        count = 0
-        for record in tqdm(
-            read_jsonl(file_path), desc=f"Loading {source_name}", leave=False
-        ):
-            # Add source metadata
-            record["_source"] = source_name
-            all_records.append(record)
-            count += 1
+        # Remove internal metadata before writing
+        output_record = {k: v for k, v in record.items() if not k.startswith("_")}
+        write(json.dumps(output_record, ensure_ascii=False) + "\n")
+        count += 1
+        if isinstance(text, str):
+            pending.append(text)
+        if len(pending) >= TOKEN_BATCH_SIZE:
+            stats.tokens[source_name] += count_tokens(pending)
+            pending.clear()
 
-        source_counts[source_name] = count
-        logger.info(f"  Loaded {count:,} records from {source_name}")
+    if pending:
+        stats.tokens[source_name] += count_tokens(pending)
+    stats.records[source_name] = count
+    logger.info(f"  Loaded {count:,} records from {source_name}")
 
-    if not all_records:
+
+def build_corpus(
+    data_dir: Path,
+    output_path: Path,
+    shuffle: bool = True,
+    seed: int | None = None,
+    *,
+    tokenizer: str = "heuristic",
+    dedup_threshold: float | None = None,
+    bucket_mb: float = DEFAULT_BUCKET_MB,
+    tmp_dir: Path | None = None,
+) -> CorpusStats:
+    """Stream all sources into ``output_path`` and return per-source stats."""
+    stats = CorpusStats()
+    sources = resolve_sources(data_dir)
+    if not sources:
         logger.error("No records found in any source!")
-        return {}
+        return stats
 
-    # Shuffle if requested
-    if shuffle:
-        if seed is not None:
-            random.seed(seed)
-        random.shuffle(all_records)
-        logger.info(f"Shuffled {len(all_records):,} records (seed={seed})")
+    count_tokens, stats.tokens_exact = load_token_counter(tokenizer)
+    dedup = NearDuplicateFilter(dedup_threshold) if dedup_threshold else None
+    rng = random.Random(seed)
+    input_bytes = sum(path.stat().st_size for _, path in sources)
+    buckets = max(1, math.ceil(input_bytes / (bucket_mb * 1024 * 1024)))
 
-    # Write combined corpus
     logger.info(f"Writing combined corpus to {output_path}...")
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        out = stack.enter_context(open(output_path, "w", encoding="utf-8"))
+        shuffler = None
+        write: Callable[[str], Any] = out.write
+        if shuffle:
+            shuffler = stack.enter_context(ExternalShuffler(buckets, rng, tmp_dir))
+            write = shuffler.add
+
+        for source_name, file_path in sources:
+            _stream_source(source_name, file_path, write, stats, count_tokens, dedup)
+
+        if shuffler is not None:
+            shuffler.drain(out)
+            total = sum(stats.records.values())
+            logger.info(
+                f"Shuffled {total:,} records in {buckets} buckets (seed={seed})"
+            )
+
+    if not any(stats.records.values()):
+        logger.error("No records found in any source!")
+    return stats
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        for record in tqdm(all_records, desc="Writing corpus"):
-            # Remove internal metadata before writing
-            output_record = {k: v for k, v in record.items() if not k.startswith("_")}
-            f.write(json.dumps(output_record, ensure_ascii=False) + "\n")
 
-    return source_counts
+def create_corpus(
+    data_dir: Path,
+    output_path: Path,
+    shuffle: bool = True,
+    seed: int | None = None,
+) -> dict[str, int]:
+    """Create combined corpus from all sources; return records per source."""
+    stats = build_corpus(data_dir, output_path, shuffle, seed)
+    return stats.records if any(stats.records.values()) else {}
 
 
-def print_summary(output_path: Path, source_counts: dict[str, int]) -> None:
+def print_summary(output_path: Path, stats: CorpusStats) -> None:
     """Print corpus summary statistics."""
+    source_counts = stats.records
     total_records = sum(source_counts.values())
-    total_tokens = estimate_tokens_from_file(output_path)
+    total_tokens = sum(stats.tokens.values())
+    token_label = "Tokens" if stats.tokens_exact else "Estimated tokens"
     file_size_mb = output_path.stat().st_size / (1024 * 1024)
 
     logger.info("\n" + "=" * 60)
@@ -145,14 +374,16 @@ def print_summary(output_path: Path, source_counts: dict[str, int]) -> None:
     logger.info(f"Output file: {output_path}")
     logger.info(f"File size: {file_size_mb:.1f} MB")
     logger.info(f"Total records: {total_records:,}")
-    logger.info(
-        f"Estimated tokens: ~{total_tokens:,} ({total_tokens / 1_000_000:.1f}M)"
-    )
+    logger.info(f"{token_label}: {total_tokens:,} ({total_tokens / 1_000_000:.1f}M)")
+    if stats.duplicates:
+        dropped = sum(stats.duplicates.values())
+        logger.info(f"Near-duplicates removed: {dropped:,}")
     logger.info("")
     logger.info("Source breakdown:")
     for source, count in source_counts.items():
         pct = (count / total_records) * 100 if total_records > 0 else 0
-        logger.info(f"  - {source}: {count:,} records ({pct:.1f}%)")
+        tokens = stats.tokens[source]
+        logger.info(f"  - {source}: {count:,} records ({pct:.1f}%), {tokens:,} tokens")
     logger.info("")
     logger.info("License compliance:")
     logger.info("  - Food.com: CC0 (Public Domain) ✅")
@@ -189,6 +420,32 @@ def main() -> int:
         default=42,
         help="Random seed for shuffling (default: 42)",
     )
+    parser.add_argument(
+        "--tokenizer",
+        default=DEFAULT_TOKENIZER,
+        help=(
+            "Tokenizer for exact token counts: Hugging Face name, "
+            f"tiktoken:<encoding> or heuristic (default: {DEFAULT_TOKENIZER})"
+        ),
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=None,
+        help="Drop texts with estimated Jaccard similarity >= this (e.g. 0.85)",
+    )
+    parser.add_argument(
+        "--bucket-mb",
+        type=float,
+        default=DEFAULT_BUCKET_MB,
+        help=f"Shuffle bucket size held in memory (default: {DEFAULT_BUCKET_MB})",
+    )
+    parser.add_argument(
+        "--tmp-dir",
+        type=Path,
+        default=None,
+        help="Directory for shuffle buckets (default: system temp dir)",
+    )
     parser.add_argument(
         "--foodcom-recipes",
         type=Path,
@@ -228,18 +485,22 @@ def main() -> int:
         INPUT_FILES["flavor_pairs"] = args.flavor_pairs.resolve()
 
     # Create corpus
-    source_counts = create_corpus(
+    stats = build_corpus(
         data_dir=args.data_dir,
         output_path=args.output,
         shuffle=not args.no_shuffle,
         seed=args.seed if not args.no_shuffle else None,
+        tokenizer=args.tokenizer,
+        dedup_threshold=args.dedup_threshold,
+        bucket_mb=args.bucket_mb,
+        tmp_dir=args.tmp_dir,
     )
 
-    if not source_counts:
+    if not any(stats.records.values()):
         return 1
 
     # Print summary
-    print_summary(args.output, source_counts)
+    print_summary(args.output, stats)
 
     logger.info("\nCorpus creation complete!")
     logger.info(
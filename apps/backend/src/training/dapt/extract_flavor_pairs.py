@@ -6,6 +6,11 @@ dataset to create flavor pairing knowledge for domain-adaptive pre-training.
 
 Since FlavorDB has academic license restrictions, this approach uses the
 CC0-licensed Food.com data to derive similar knowledge.
+
+Pair counting uses the sparse co-occurrence engine in ``services.flavor_pairs``
+(recipe x ingredient CSR matrix, ``XᵀX`` in one vectorized pass). Pairs can be
+ranked by raw count, lift or PMI, and ``--index-output`` also writes the
+compact top-K pairing index the chat agent serves (``FLAVOR_PAIRS_PATH``).
 """
 
 from __future__ import annotations
@@ -14,14 +19,22 @@ import argparse
 import json
 import logging
 import sys
-from ast import literal_eval
 from collections import Counter
 from collections.abc import Iterator
-from itertools import combinations
 from pathlib import Path
 
 import pandas as pd
-from tqdm import tqdm
+
+from services.flavor_pairs import (
+    DEFAULT_MIN_PAIR_COUNT,
+    DEFAULT_TOP_K,
+    FILLER_INGREDIENTS,
+    Cooccurrence,
+    FlavorPairIndex,
+    build_cooccurrence,
+    normalize_ingredient,
+)
+from training.dapt.process_foodcom import parse_list
 
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
@@ -33,78 +46,22 @@ MIN_COOCCURRENCE = 100
 # Top N pairs to extract
 TOP_PAIRS = 500
 
-# Common "filler" ingredients to exclude from pairing analysis
-FILLER_INGREDIENTS = {
-    "salt",
-    "pepper",
-    "water",
-    "oil",
-    "butter",
-    "flour",
-    "sugar",
-    "eggs",
-    "egg",
-    "milk",
-}
-
-
-def safe_literal_eval(value: str) -> list[str]:
-    """Safely evaluate a string representation of a list."""
-    if pd.isna(value):
-        return []
-    try:
-        result = literal_eval(value)
-        return result if isinstance(result, list) else []
-    except (ValueError, SyntaxError):
-        return []
-
-
-def normalize_ingredient(ingredient: str) -> str:
-    """Normalize ingredient name for matching."""
-    return ingredient.lower().strip()
-
-
-def extract_pairs(recipes_df: pd.DataFrame) -> Counter[tuple[str, str]]:
-    """Extract ingredient co-occurrence pairs from recipes."""
-    pairs: Counter[tuple[str, str]] = Counter()
-
-    for _, row in tqdm(
-        recipes_df.iterrows(), total=len(recipes_df), desc="Extracting pairs"
-    ):
-        ingredients = row["ingredients"]
-        if not ingredients:
-            continue
-
-        # Normalize and filter ingredients
-        normalized = [
-            normalize_ingredient(ing)
-            for ing in ingredients
-            if normalize_ingredient(ing) not in FILLER_INGREDIENTS
-        ]
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique = []
-        for ing in normalized:
-            if ing not in seen:
-                seen.add(ing)
-                unique.append(ing)
+RANK_BY_CHOICES = ("count", "lift", "pmi")
 
-        # Generate all pairs (sorted for consistency)
-        for pair in combinations(sorted(unique), 2):
-            pairs[pair] += 1
 
-    return pairs
+def extract_pairs(recipes_df: pd.DataFrame) -> Cooccurrence:
+    """Extract ingredient co-occurrence pairs from recipes."""
+    return build_cooccurrence(recipes_df["ingredients"])
 
 
 def format_pairing_knowledge(
-    pairs: Counter[tuple[str, str]], min_count: int = MIN_COOCCURRENCE
+    cooccurrence: Cooccurrence,
+    min_count: int = MIN_COOCCURRENCE,
+    top_n: int = TOP_PAIRS,
+    rank_by: str = "count",
 ) -> Iterator[dict[str, str]]:
     """Format co-occurrence pairs as training text."""
-    for (ing1, ing2), count in pairs.most_common(TOP_PAIRS):
-        if count < min_count:
-            break
-
+    for ing1, ing2, count, _lift in cooccurrence.top_pairs(top_n, min_count, rank_by):
         # Generate multiple text variations for richer training
         texts = [
             f"Flavor pairing: {ing1} and {ing2} are commonly used together "
@@ -124,16 +81,17 @@ def generate_category_knowledge(
     """Generate category-based pairing knowledge from recipe tags."""
     # Group recipes by tag categories
     category_ingredients: dict[str, Counter[str]] = {}
+    if "tags" not in recipes_df:
+        return
 
-    for _, row in recipes_df.iterrows():
-        tags = row.get("tags", [])
-        ingredients = row.get("ingredients", [])
-
+    for tags, ingredients in zip(
+        recipes_df["tags"], recipes_df["ingredients"], strict=True
+    ):
         if not tags or not ingredients:
             continue
 
         # Use first tag as category
-        category = tags[0] if tags else "general"
+        category = tags[0]
         if category not in category_ingredients:
             category_ingredients[category] = Counter()
 
@@ -151,6 +109,19 @@ def generate_category_knowledge(
             yield {"text": text}
 
 
+def load_recipes(recipes_path: Path) -> pd.DataFrame:
+    """Load the ingredient and tag columns with their lists parsed."""
+    logger.info(f"Loading recipes from {recipes_path}...")
+    header = pd.read_csv(recipes_path, nrows=0).columns
+    columns = [c for c in ("ingredients", "tags") if c in header]
+    recipes = pd.read_csv(recipes_path, usecols=columns, dtype=str)
+    logger.info(f"Loaded {len(recipes):,} recipes")
+
+    for column in columns:
+        recipes[column] = [parse_list(value) for value in recipes[column]]
+    return recipes
+
+
 def write_jsonl(records: Iterator[dict[str, str]], output_path: Path) -> int:
     """Write records to JSONL file and return count."""
     count = 0
@@ -197,11 +168,38 @@ def main() -> int:
         default=TOP_PAIRS,
         help=f"Number of top pairs to include (default: {TOP_PAIRS})",
     )
+    parser.add_argument(
+        "--rank-by",
+        choices=RANK_BY_CHOICES,
+        default="count",
+        help="Rank pairs by raw count, lift or PMI (default: count)",
+    )
     parser.add_argument(
         "--include-categories",
         action="store_true",
         help="Include category-based ingredient knowledge",
     )
+    parser.add_argument(
+        "--index-output",
+        type=Path,
+        default=None,
+        help="Also write the chat agent's flavor pairing index (.npz)",
+    )
+    parser.add_argument(
+        "--index-top-k",
+        type=int,
+        default=DEFAULT_TOP_K,
+        help=f"Partners kept per ingredient in the index (default: {DEFAULT_TOP_K})",
+    )
+    parser.add_argument(
+        "--index-min-count",
+        type=int,
+        default=DEFAULT_MIN_PAIR_COUNT,
+        help=(
+            "Minimum co-occurrence count for index pairings "
+            f"(default: {DEFAULT_MIN_PAIR_COUNT})"
+        ),
+    )
     args = parser.parse_args()
 
     # Find recipes file
@@ -214,27 +212,36 @@ def main() -> int:
             logger.error(f"Recipes file not found: {recipes_path}")
             return 1
 
-    # Load recipes
-    logger.info(f"Loading recipes from {recipes_path}...")
-    recipes = pd.read_csv(recipes_path)
-    logger.info(f"Loaded {len(recipes):,} recipes")
-
-    # Parse ingredients column
-    recipes["ingredients"] = recipes["ingredients"].apply(safe_literal_eval)
-    if "tags" in recipes.columns:
-        recipes["tags"] = recipes["tags"].apply(safe_literal_eval)
+    recipes = load_recipes(recipes_path)
 
     # Extract pairs
     pairs = extract_pairs(recipes)
-    logger.info(f"Found {len(pairs):,} unique ingredient pairs")
-    logger.info(f"Top pairs by frequency: {pairs.most_common(10)}")
+    logger.info(
+        f"Found {len(pairs.pair_count):,} unique ingredient pairs "
+        f"across {len(pairs.vocab):,} ingredients"
+    )
+    top = pairs.top_pairs(10, args.min_count, args.rank_by)
+    logger.info(f"Top pairs by {args.rank_by}: {top}")
 
     # Create output directory
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
+    if args.index_output is not None:
+        index = FlavorPairIndex.from_cooccurrence(
+            pairs, top_k=args.index_top_k, min_count=args.index_min_count
+        )
+        args.index_output.parent.mkdir(parents=True, exist_ok=True)
+        index.save(args.index_output)
+        logger.info(
+            f"Wrote pairing index ({len(index.partners):,} pairings) "
+            f"to {args.index_output}"
+        )
+
     # Generate and write knowledge
     def generate_all() -> Iterator[dict[str, str]]:
-        yield from format_pairing_knowledge(pairs, args.min_count)
+        yield from format_pairing_knowledge(
+            pairs, args.min_count, args.top_n, args.rank_by
+        )
         if args.include_categories:
             yield from generate_category_knowledge(recipes)
 
@@ -4,6 +4,13 @@
 This script converts the raw Food.com CSV files into JSONL format suitable
 for language model pre-training.
 
+The CSVs are read in chunks (``--chunksize`` rows) and each chunk is turned
+into JSONL text by a pool of worker processes; chunks are written back in
+order, so the output is byte-identical to formatting row by row with
+``format_recipe``. Per chunk, the list columns are parsed with a regular
+expression (``literal_eval`` only for cells that need it) and the recipe text
+is assembled column by column instead of per ``iterrows`` row.
+
 The Food.com dataset is licensed under CC0 (Public Domain) and is free for
 commercial use.
 """
@@ -13,17 +20,21 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import os
+import re
 import sys
 from ast import literal_eval
+from itertools import repeat
+from multiprocessing import Pool
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import pandas as pd
 from tqdm import tqdm
 
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator
+    from collections.abc import Callable, Iterable, Iterator
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -34,6 +45,18 @@ MIN_REVIEW_LENGTH = 50
 # Regex patterns for identifying substitution tips in reviews
 SUBSTITUTION_PATTERNS = r"substitut|instead of|replaced|used .* instead|swap"
 
+DEFAULT_CHUNKSIZE = 20_000
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+RECIPE_TEXT_COLUMNS = ("name", "description", "steps", "ingredients", "tags")
+LIST_COLUMNS = ("steps", "ingredients", "tags")
+
+# A repr'd string item without escapes (repr uses a backslash for those, and
+# literal_eval rejects raw newlines and NUL bytes)
+_ITEM = r"'[^'\\\n\r\0]*'|\"[^\"\\\n\r\0]*\""
+_STRING_LIST_RE = re.compile(rf"\[(?:(?:{_ITEM})(?:, (?:{_ITEM}))*)?\]")
+_ITEM_RE = re.compile(r"'([^']*)'|\"([^\"]*)\"")
+
 
 def safe_literal_eval(value: str) -> list[str]:
     """Safely evaluate a string representation of a list."""
@@ -46,15 +69,42 @@ def safe_literal_eval(value: str) -> list[str]:
         return []
 
 
+def parse_list(value: Any) -> list[Any]:
+    """Fast equivalent of ``safe_literal_eval`` for lists of plain strings.
+
+    Food.com list cells are Python reprs of string lists (``['a', "b's"]``).
+    When a cell is exactly that shape with no escapes, the items are the text
+    between the quotes; anything else falls back to ``literal_eval``.
+    """
+    if isinstance(value, str) and _STRING_LIST_RE.fullmatch(value):
+        return [single or double for single, double in _ITEM_RE.findall(value)]
+    return safe_literal_eval(value)
+
+
 def format_recipe(row: pd.Series) -> str:
-    """Format a recipe row into training text."""
-    name = str(row["name"]).strip()
-    ingredients = row["ingredients"]
-    steps = row["steps"]
-    tags = row["tags"]
-    minutes = row.get("minutes", 0)
-    description = row.get("description", "")
+    """Format a recipe row into training text.
+
+    Row-at-a-time counterpart of ``format_recipe_texts``; list columns must
+    already be parsed.
+    """
+    return _recipe_text(
+        row["name"],
+        row.get("minutes", 0),
+        row.get("description", ""),
+        row["ingredients"],
+        row["steps"],
+        row["tags"],
+    )
 
+
+def _recipe_text(
+    name: Any,
+    minutes: Any,
+    description: Any,
+    ingredients: list[str],
+    steps: list[str],
+    tags: list[str],
+) -> str:
     # Format ingredients
     ingredients_str = ", ".join(ingredients) if ingredients else "Not specified"
 
@@ -68,7 +118,7 @@ def format_recipe(row: pd.Series) -> str:
     tags_str = ", ".join(tags[:5]) if tags else "general"
 
     # Build recipe text in markdown-like format
-    text = f"""# {name}
+    text = f"""# {str(name).strip()}
 
 Category: {tags_str}
 Prep Time: {minutes} minutes
@@ -83,11 +133,162 @@ Prep Time: {minutes} minutes
     # Add description if available and meaningful
     if description and isinstance(description, str) and len(description) > 10:
         text += f"\n## About\n{description.strip()}\n"
-
     return text
 
 
-def process_recipes(input_dir: Path) -> Iterator[dict[str, str]]:
+def format_recipe_texts(recipes: pd.DataFrame) -> list[str]:
+    """Format a chunk of raw recipe rows; same text as ``format_recipe``."""
+    size = len(recipes)
+    lists = {
+        column: [parse_list(value) for value in recipes[column]]
+        if column in recipes
+        else [[]] * size
+        for column in LIST_COLUMNS
+    }
+    minutes = recipes["minutes"] if "minutes" in recipes else repeat(0, size)
+    description = (
+        recipes["description"] if "description" in recipes else repeat("", size)
+    )
+    return list(
+        map(
+            _recipe_text,
+            recipes["name"],
+            minutes,
+            description,
+            lists["ingredients"],
+            lists["steps"],
+            lists["tags"],
+        )
+    )
+
+
+def format_review_texts(reviews: pd.DataFrame) -> list[str]:
+    """Return the substitution tips found in a chunk of raw reviews."""
+    review = reviews["review"]
+    mask = review.str.contains(SUBSTITUTION_PATTERNS, case=False, na=False)
+    mask &= review.str.len() >= MIN_REVIEW_LENGTH
+    return [f"Cook's Tip: {text.strip()}" for text in review[mask]]
+
+
+def _to_jsonl(texts: list[str]) -> str:
+    return "".join(
+        json.dumps({"text": text}, ensure_ascii=False) + "\n" for text in texts
+    )
+
+
+def _recipe_chunk_to_jsonl(chunk: pd.DataFrame) -> tuple[int, str]:
+    texts = format_recipe_texts(chunk)
+    return len(texts), _to_jsonl(texts)
+
+
+def _review_chunk_to_jsonl(chunk: pd.DataFrame) -> tuple[int, str]:
+    texts = format_review_texts(chunk)
+    return len(texts), _to_jsonl(texts)
+
+
+def read_recipe_chunks(
+    recipes_path: Path, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """Read the columns ``format_recipe`` uses, ``chunksize`` rows at a time.
+
+    Text columns are read as strings. ``minutes`` gets the dtype pandas infers
+    for the whole column (a cheap single-column pass), so a chunk never
+    formats it differently from a full-file read (e.g. ``40`` vs ``40.0``).
+    """
+    header = pd.read_csv(recipes_path, nrows=0).columns
+    columns = [c for c in (*RECIPE_TEXT_COLUMNS, "minutes") if c in header]
+    dtypes: dict[str, Any] = {c: str for c in RECIPE_TEXT_COLUMNS if c in header}
+    if "minutes" in header:
+        dtypes["minutes"] = pd.read_csv(recipes_path, usecols=["minutes"])[
+            "minutes"
+        ].dtype
+    yield from pd.read_csv(
+        recipes_path, usecols=columns, dtype=dtypes, chunksize=chunksize
+    )
+
+
+def read_review_chunks(
+    reviews_path: Path, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[pd.DataFrame]:
+    """Read the ``review`` column as strings, ``chunksize`` rows at a time."""
+    yield from pd.read_csv(
+        reviews_path, usecols=["review"], dtype={"review": str}, chunksize=chunksize
+    )
+
+
+def write_chunks_jsonl(
+    chunks: Iterable[pd.DataFrame],
+    to_jsonl: Callable[[pd.DataFrame], tuple[int, str]],
+    output_path: Path,
+    workers: int = DEFAULT_WORKERS,
+    desc: str = "Processing",
+) -> int:
+    """Convert chunks in a process pool and write them in input order."""
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as f:
+        if workers <= 1:
+            results: Iterable[tuple[int, str]] = map(to_jsonl, chunks)
+            for chunk_count, text in tqdm(results, desc=desc, unit="chunk"):
+                f.write(text)
+                count += chunk_count
+            return count
+        with Pool(workers) as pool:
+            results = pool.imap(to_jsonl, chunks)
+            for chunk_count, text in tqdm(results, desc=desc, unit="chunk"):
+                f.write(text)
+                count += chunk_count
+    return count
+
+
+def write_recipes_jsonl(
+    input_dir: Path,
+    output_path: Path,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    """Write the recipe corpus and return the record count."""
+    recipes_path = input_dir / "RAW_recipes.csv"
+    if not recipes_path.exists():
+        logger.error(f"Recipes file not found: {recipes_path}")
+        output_path.write_text("", encoding="utf-8")
+        return 0
+
+    logger.info(f"Processing recipes from {recipes_path}...")
+    return write_chunks_jsonl(
+        read_recipe_chunks(recipes_path, chunksize),
+        _recipe_chunk_to_jsonl,
+        output_path,
+        workers,
+        desc="Processing recipes",
+    )
+
+
+def write_reviews_jsonl(
+    input_dir: Path,
+    output_path: Path,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    workers: int = DEFAULT_WORKERS,
+) -> int:
+    """Write substitution-tip reviews and return the record count."""
+    reviews_path = input_dir / "RAW_interactions.csv"
+    if not reviews_path.exists():
+        logger.warning(f"Reviews file not found: {reviews_path}, skipping")
+        output_path.write_text("", encoding="utf-8")
+        return 0
+
+    logger.info(f"Processing reviews from {reviews_path}...")
+    return write_chunks_jsonl(
+        read_review_chunks(reviews_path, chunksize),
+        _review_chunk_to_jsonl,
+        output_path,
+        workers,
+        desc="Processing reviews",
+    )
+
+
+def process_recipes(
+    input_dir: Path, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[dict[str, str]]:
     """Process recipes from CSV and yield JSONL records."""
     recipes_path = input_dir / "RAW_recipes.csv"
 
@@ -95,23 +296,14 @@ def process_recipes(input_dir: Path) -> Iterator[dict[str, str]]:
         logger.error(f"Recipes file not found: {recipes_path}")
         return
 
-    logger.info(f"Loading recipes from {recipes_path}...")
-    recipes = pd.read_csv(recipes_path)
-    logger.info(f"Loaded {len(recipes):,} recipes")
+    for chunk in read_recipe_chunks(recipes_path, chunksize):
+        for text in format_recipe_texts(chunk):
+            yield {"text": text}
 
-    # Parse list columns
-    recipes["steps"] = recipes["steps"].apply(safe_literal_eval)
-    recipes["ingredients"] = recipes["ingredients"].apply(safe_literal_eval)
-    recipes["tags"] = recipes["tags"].apply(safe_literal_eval)
 
-    for _, row in tqdm(
-        recipes.iterrows(), total=len(recipes), desc="Processing recipes"
-    ):
-        text = format_recipe(row)
-        yield {"text": text}
-
-
-def process_reviews(input_dir: Path) -> Iterator[dict[str, str]]:
+def process_reviews(
+    input_dir: Path, chunksize: int = DEFAULT_CHUNKSIZE
+) -> Iterator[dict[str, str]]:
     """Process reviews with substitution tips."""
     reviews_path = input_dir / "RAW_interactions.csv"
 
@@ -119,26 +311,9 @@ def process_reviews(input_dir: Path) -> Iterator[dict[str, str]]:
         logger.warning(f"Reviews file not found: {reviews_path}, skipping")
         return
 
-    logger.info(f"Loading reviews from {reviews_path}...")
-    reviews = pd.read_csv(reviews_path)
-    logger.info(f"Loaded {len(reviews):,} reviews")
-
-    # Filter for reviews with substitution information
-    mask = reviews["review"].str.contains(SUBSTITUTION_PATTERNS, case=False, na=False)
-    substitution_reviews = reviews[mask]
-    logger.info(f"Found {len(substitution_reviews):,} reviews with substitution tips")
-
-    for _, row in tqdm(
-        substitution_reviews.iterrows(),
-        total=len(substitution_reviews),
-        desc="Processing reviews",
-    ):
-        review = row.get("review", "")
-        if pd.isna(review) or len(str(review)) < MIN_REVIEW_LENGTH:
-            continue
-
-        text = f"Cook's Tip: {str(review).strip()}"
-        yield {"text": text}
+    for chunk in read_review_chunks(reviews_path, chunksize):
+        for text in format_review_texts(chunk):
+            yield {"text": text}
 
 
 def write_jsonl(records: Iterator[dict[str, str]], output_path: Path) -> int:
@@ -188,6 +363,18 @@ def main() -> int:
         action="store_true",
         help="Skip processing reviews",
     )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"CSV rows per chunk (default: {DEFAULT_CHUNKSIZE:,})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Formatting processes; 1 runs inline (default: {DEFAULT_WORKERS})",
+    )
     args = parser.parse_args()
 
     # Set default reviews output
@@ -198,7 +385,9 @@ def main() -> int:
     args.output.parent.mkdir(parents=True, exist_ok=True)
 
     # Process recipes
-    recipe_count = write_jsonl(process_recipes(args.input_dir), args.output)
+    recipe_count = write_recipes_jsonl(
+        args.input_dir, args.output, args.chunksize, args.workers
+    )
     logger.info(f"Wrote {recipe_count:,} recipes to {args.output}")
     recipe_tokens = estimate_tokens(args.output)
     logger.info(
@@ -207,7 +396,9 @@ def main() -> int:
 
     # Process reviews
     if not args.no_reviews:
-        review_count = write_jsonl(process_reviews(args.input_dir), args.reviews_output)
+        review_count = write_reviews_jsonl(
+            args.input_dir, args.reviews_output, args.chunksize, args.workers
+        )
         logger.info(f"Wrote {review_count:,} reviews to {args.reviews_output}")
         review_tokens = estimate_tokens(args.reviews_output)
         token_m = review_tokens / 1_000_000
@@ -15,6 +15,7 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import shutil
 import sys
 import urllib.request
 from collections.abc import Iterator, Mapping, Sequence
@@ -71,7 +72,7 @@ def download_openrecipes(output_dir: Path) -> Path | None:
             # Decompress
             with gzip.open(gz_file, "rb") as f_in:
                 with open(output_file, "wb") as f_out:
-                    f_out.write(f_in.read())
+                    shutil.copyfileobj(f_in, f_out)
 
             gz_file.unlink()
             logger.info(f"Downloaded and extracted to {output_file}")
@@ -96,6 +97,68 @@ def _detect_json_format(f: IO[str]) -> str | None:
     return None
 
 
+# Characters that may follow a complete array element
+_ELEMENT_END = frozenset(",] \t\r\n")
+
+
+def _read_array_start(f: IO[str], chunk_size: int) -> str:
+    """Return the text after the opening ``[`` of a JSON array."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            raise ValueError("Expected a JSON array")
+        buffer = chunk.lstrip()
+        if buffer:
+            break
+    if buffer[0] != "[":
+        raise ValueError("Expected a JSON array")
+    return buffer[1:]
+
+
+def _skip_separators(buffer: str, pos: int) -> int:
+    while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ","):
+        pos += 1
+    return pos
+
+
+def iter_json_array(f: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without loading it all.
+
+    Reads ``chunk_size`` characters at a time and decodes one element at a
+    time with ``JSONDecoder.raw_decode``; only the current element (plus one
+    chunk) is held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _read_array_start(f, chunk_size)
+    pos = 0
+    eof = False
+
+    while True:
+        pos = _skip_separators(buffer, pos)
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        if pos < len(buffer):
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                # Trust a value only once the character after it has been read;
+                # a number at the end of the buffer may continue in the next chunk
+                if eof or (end < len(buffer) and buffer[end] in _ELEMENT_END):
+                    yield item
+                    pos = end
+                    continue
+        elif eof:
+            raise ValueError("Unterminated JSON array")
+
+        chunk = f.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+
 def parse_openrecipes(file_path: Path) -> Iterator[dict[str, Any]]:
     """Parse OpenRecipes JSON file with streaming to avoid memory issues."""
     with open(file_path, encoding="utf-8") as f:
@@ -103,10 +166,10 @@ def parse_openrecipes(file_path: Path) -> Iterator[dict[str, Any]]:
         f.seek(0)  # Rewind for actual parsing
 
         if first_char == "[":
-            # JSON array format - must load into memory
-            recipes = json.load(f)
-            if isinstance(recipes, list):
-                yield from recipes
+            # JSON array format - decode one element at a time
+            for recipe in iter_json_array(f):
+                if isinstance(recipe, dict):
+                    yield recipe
         else:
             # JSONL format - stream line by line
             for line in f:
@@ -15,6 +15,15 @@ Execution Modes:
         - More predictable resource usage
         - Use for constrained environments
 
+    Queued (``generate_queued``): every (persona, query) pair goes on one
+    work queue drained by ``concurrency`` workers
+        - A shared token bucket paces requests instead of fixed sleeps; a 429
+          halves its rate and pauses it for the server's Retry-After
+        - Completed pairs are appended to a checkpoint file, so an
+          interrupted run resumes where it stopped
+        - Progress (items, req/s, ETA, current pacing) is logged live
+        - Use for large runs, especially against a local backend
+
 Rate Limits:
     - Redis rate limiter: 10 requests per 60 seconds per user
     - Weather API: No hard limit, 20-minute cache per location
@@ -31,6 +40,8 @@ Usage (AML notebook):
 
 Environment Variables:
     API_BASE_URL: Backend URL (default: http://localhost:8000)
+    GENERATION_CONCURRENCY: Queued mode workers (default: 8)
+    REQUESTS_PER_MINUTE: Queued mode starting request rate (default: 60)
     DATABASE_URL: Cloud database URL (optional, for seeding)
     SEED_BEFORE_GENERATE: Set to "true" to seed personas before generating
 """
@@ -43,9 +54,11 @@ import logging
 import os
 import random
 import time
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
 from uuid import uuid4
 
 import httpx
@@ -69,6 +82,11 @@ MAX_RETRY_DELAY = 60.0  # seconds
 DEFAULT_REQUEST_DELAY = float(os.getenv("REQUEST_DELAY_SECONDS", "7.0"))
 DEFAULT_MULTI_TURN_DELAY = float(os.getenv("MULTI_TURN_DELAY_SECONDS", "8.0"))
 
+# Queued mode: global worker count and starting request rate
+DEFAULT_CONCURRENCY = int(os.getenv("GENERATION_CONCURRENCY", "8"))
+DEFAULT_REQUESTS_PER_MINUTE = float(os.getenv("REQUESTS_PER_MINUTE", "60"))
+PROGRESS_INTERVAL = 10.0  # seconds between live progress lines
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -92,6 +110,42 @@ def _calculate_retry_delay(attempt: int) -> float:
     return delay + jitter
 
 
+def _parse_retry_after(value: object) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _is_rate_limited(result: ConversationResult) -> bool:
+    return bool(result.error and "429" in result.error)
+
+
+def _select_queries(
+    queries: list[str], count: int, rng: random.Random | None = None
+) -> list[str]:
+    """Sample ``count`` queries, repeating the list when it is too short."""
+    if len(queries) > count:
+        return (rng or random).sample(queries, count)
+    repeated = queries * (count // len(queries) + 1)
+    return repeated[:count]
+
+
+def _allocate_samples(target: int) -> tuple[int, int]:
+    """Split a persona's target into single-turn and multi-turn conversations."""
+    single_turn_count = int(target * 0.7)  # 70% single-turn
+    multi_turn_count = max(2, int(target * 0.3 / 4))  # 30% multi-turn (avg 4 turns)
+    return single_turn_count, multi_turn_count
+
+
 def _load_env_files() -> None:
     """Load environment files."""
     try:
@@ -118,6 +172,7 @@ class ConversationResult:
     tool_calls: list[dict[str, Any]] = field(default_factory=list)
     error: str | None = None
     duration_seconds: float = 0.0
+    retry_after: float | None = None  # from the Retry-After header on a 429
 
 
 @dataclass
@@ -142,6 +197,184 @@ class GenerationStats:
     total_duration_seconds: float = 0.0
     conversations_per_persona: dict[str, int] = field(default_factory=dict)
     failures: list[FailedConversation] = field(default_factory=list)
+    rate_limited_responses: int = 0
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """One queued unit of work: a single query or a multi-turn scenario.
+
+    ``key`` identifies the item across runs (persona, turn texts and the
+    occurrence number for repeated queries) for checkpointing.
+    """
+
+    persona: str
+    turns: tuple[str, ...]
+    key: str
+
+    @property
+    def multi_turn(self) -> bool:
+        return len(self.turns) > 1
+
+
+def build_work_items(
+    personas: Iterable[str],
+    target_per_persona: int | None = None,
+    seed: int = 0,
+) -> list[WorkItem]:
+    """Expand personas into work items, reproducibly for a given ``seed``.
+
+    Uses the same 70/30 single/multi-turn allocation as
+    ``generate_for_persona``. Items are interleaved round-robin across
+    personas so every persona makes progress from the start.
+    """
+    rng = random.Random(seed)
+    per_persona: list[list[WorkItem]] = []
+    for persona_name in personas:
+        persona = PERSONAS[persona_name]
+        target = target_per_persona or SAMPLE_TARGETS.get(persona_name, 100)
+        single_turn_count, multi_turn_count = _allocate_samples(target)
+
+        turn_lists: list[tuple[str, ...]] = [
+            (format_query(query, persona),)
+            for query in _select_queries(
+                get_persona_queries(persona_name), single_turn_count, rng
+            )
+        ]
+        scenarios = get_conversation_scenarios(persona_name)
+        for scenario in rng.sample(scenarios, min(multi_turn_count, len(scenarios))):
+            turn_lists.append(tuple(format_query(turn, persona) for turn in scenario))
+
+        seen: dict[tuple[str, ...], int] = {}
+        items = []
+        for turns in turn_lists:
+            occurrence = seen[turns] = seen.get(turns, -1) + 1
+            key = json.dumps([persona_name, list(turns), occurrence])
+            items.append(WorkItem(persona_name, turns, key))
+        per_persona.append(items)
+
+    longest = max((len(items) for items in per_persona), default=0)
+    return [items[i] for i in range(longest) for items in per_persona if i < len(items)]
+
+
+class TokenBucket:
+    """Request pacing shared by every queued worker.
+
+    Tokens refill at ``rate`` per second up to ``burst``; ``acquire`` waits
+    for one. Waiters are served in arrival order. A 429 drains the bucket,
+    halves the rate (down to ``min_rate``) and blocks it until the server's
+    Retry-After has passed; each success adds back 5% of the configured
+    rate (additive increase, multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float = 1.0,
+        min_rate: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+        self.burst = max(burst, 1.0)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._blocked_until:
+                    await asyncio.sleep(self._blocked_until - now)
+                    continue
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_rate_limited(self, retry_after: float) -> None:
+        """Back off after a 429 that asked for ``retry_after`` seconds."""
+        now = self._clock()
+        self.rate = max(self.min_rate, self.rate / 2)
+        self._tokens = 0.0
+        self._updated = max(now, self._updated)
+        self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def on_success(self) -> None:
+        """Recover some of the rate lost to earlier 429s."""
+        self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class GenerationCheckpoint:
+    """Append-only file of completed work item keys.
+
+    One JSON string per line, flushed as each item completes; a line cut
+    short by an interruption is ignored on load.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._file: IO[str] | None = None
+
+    def completed(self) -> set[str]:
+        """Keys recorded by earlier runs."""
+        if not self.path.exists():
+            return set()
+        keys = set()
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    keys.add(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return keys
+
+    def mark_done(self, item: WorkItem) -> None:
+        if self._file is None:
+            self._file = self.path.open("a", encoding="utf-8")
+        self._file.write(json.dumps(item.key) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+@dataclass
+class GenerationProgress:
+    """Live counters for a queued run."""
+
+    total: int
+    skipped: int = 0
+    completed: int = 0
+    failed: int = 0
+    requests: int = 0
+    rate_limited: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    def describe(self, pacing_rate: float) -> str:
+        """One progress line: items, throughput, pacing and ETA."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        finished = self.completed + self.failed
+        remaining = self.total - finished
+        eta = f"{remaining * elapsed / finished / 60:.1f}m" if finished else "?"
+        return (
+            f"{finished}/{self.total} items ({self.failed} failed, "
+            f"{self.skipped} checkpointed), {self.requests / elapsed:.2f} req/s, "
+            f"{finished * 60 / elapsed:.1f} items/min, pacing "
+            f"{pacing_rate * 60:.0f} req/min, {self.rate_limited} rate-limited, "
+            f"ETA {eta}"
+        )
 
 
 class ConversationGenerator:
@@ -168,6 +401,8 @@ class ConversationGenerator:
         self.multi_turn_delay = multi_turn_delay
         self.tokens: dict[str, str] = {}  # persona -> access_token
         self.stats = GenerationStats()
+        self._login_locks: dict[str, asyncio.Lock] = {}
+        self._login_failed: set[str] = set()
 
         logger.info(
             "Initialized with request_delay=%.1fs, multi_turn_delay=%.1fs",
@@ -312,6 +547,9 @@ class ConversationGenerator:
                         response_text="",
                         error=f"HTTP {response.status_code}: {error_text.decode()}",
                         duration_seconds=time.time() - start_time,
+                        retry_after=_parse_retry_after(
+                            response.headers.get("Retry-After")
+                        ),
                     )
 
                 # Collect streaming response
@@ -398,13 +636,8 @@ class ConversationGenerator:
         queries = get_persona_queries(persona_name)
         persona = PERSONAS[persona_name]
 
-        # Randomly sample queries if we have more than needed
-        if len(queries) > num_queries:
-            selected_queries = random.sample(queries, num_queries)
-        else:
-            # Repeat queries if needed
-            selected_queries = queries * (num_queries // len(queries) + 1)
-            selected_queries = selected_queries[:num_queries]
+        # Randomly sample queries, repeating them if there are too few
+        selected_queries = _select_queries(queries, num_queries)
 
         for i, query_template in enumerate(selected_queries):
             # Format query with persona context
@@ -562,8 +795,7 @@ class ConversationGenerator:
             }
 
         # Allocate between single-turn and multi-turn
-        single_turn_count = int(target * 0.7)  # 70% single-turn
-        multi_turn_count = max(2, int(target * 0.3 / 4))  # 30% multi-turn (avg 4 turns)
+        single_turn_count, multi_turn_count = _allocate_samples(target)
 
         logger.info(
             "Generating for %s: %d single-turn, %d multi-turn conversations",
@@ -699,6 +931,249 @@ class ConversationGenerator:
             logger.error("Failed persona %s: %s", persona_name, e)
             raise
 
+    async def generate_queued(
+        self,
+        personas: list[str] | None = None,
+        target_per_persona: int | None = None,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        checkpoint_path: Path | str | None = None,
+        seed: int = 0,
+        progress_interval: float = PROGRESS_INTERVAL,
+    ) -> dict[str, Any]:
+        """Generate training data from one work queue with a global budget.
+
+        Every persona's queries and scenarios become ``WorkItem``s on a
+        single queue drained by ``concurrency`` workers; all requests share
+        one ``TokenBucket`` starting at ``requests_per_minute`` and fed by
+        429/Retry-After responses. With ``checkpoint_path``, completed items
+        are recorded as they finish and skipped when the run is repeated
+        with the same ``seed`` (failed items are retried).
+
+        Returns:
+            Per-persona results shaped like ``generate_all``'s, plus the
+            number of ``checkpointed`` items skipped
+        """
+        selected_personas = personas or list(PERSONAS.keys())
+        items = build_work_items(selected_personas, target_per_persona, seed)
+        checkpoint = (
+            GenerationCheckpoint(Path(checkpoint_path)) if checkpoint_path else None
+        )
+        done = checkpoint.completed() if checkpoint else set()
+
+        queue: asyncio.Queue[WorkItem] = asyncio.Queue()
+        results: dict[str, Any] = {
+            name: {
+                "persona": name,
+                "single_turn": [],
+                "multi_turn": [],
+                "checkpointed": 0,
+            }
+            for name in selected_personas
+        }
+        for item in items:
+            if item.key in done:
+                results[item.persona]["checkpointed"] += 1
+            else:
+                queue.put_nowait(item)
+
+        progress = GenerationProgress(
+            total=queue.qsize(), skipped=len(items) - queue.qsize()
+        )
+        bucket = TokenBucket(requests_per_minute / 60, burst=concurrency)
+        logger.info(
+            "Starting queued generation: %d items for %d personas "
+            "(%d already checkpointed), %d workers, %.0f req/min",
+            progress.total,
+            len(selected_personas),
+            progress.skipped,
+            concurrency,
+            requests_per_minute,
+        )
+        start_time = time.time()
+
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            workers = [
+                asyncio.create_task(
+                    self._queue_worker(
+                        client, queue, bucket, checkpoint, progress, results
+                    )
+                )
+                for _ in range(max(1, min(concurrency, progress.total)))
+            ]
+            reporter = asyncio.create_task(
+                self._report_progress(progress, bucket, progress_interval)
+            )
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                reporter.cancel()
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(reporter, *workers, return_exceptions=True)
+                if checkpoint is not None:
+                    checkpoint.close()
+
+        logger.info("Progress: %s", progress.describe(bucket.rate))
+        for name, result in results.items():
+            self.stats.conversations_per_persona[name] = len(
+                result["single_turn"]
+            ) + sum(len(c) for c in result["multi_turn"])
+        self.stats.total_duration_seconds = time.time() - start_time
+        self._print_summary()
+        return results
+
+    async def _queue_worker(
+        self,
+        client: httpx.AsyncClient,
+        queue: asyncio.Queue[WorkItem],
+        bucket: TokenBucket,
+        checkpoint: GenerationCheckpoint | None,
+        progress: GenerationProgress,
+        results: dict[str, Any],
+    ) -> None:
+        """Drain ``queue`` until it is empty."""
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                turns = await self._run_work_item(client, item, bucket, progress)
+            except Exception as e:
+                logger.exception("[%s] Work item crashed: %s", item.persona, e)
+                turns = [
+                    ConversationResult(
+                        persona=item.persona,
+                        conversation_id="",
+                        query=item.turns[0],
+                        response_text="",
+                        error=str(e),
+                    )
+                ]
+
+            if item.multi_turn:
+                results[item.persona]["multi_turn"].append(turns)
+            else:
+                results[item.persona]["single_turn"].extend(turns)
+
+            if turns and turns[-1].error is None and len(turns) == len(item.turns):
+                progress.completed += 1
+                if checkpoint is not None:
+                    checkpoint.mark_done(item)
+            else:
+                progress.failed += 1
+
+    async def _run_work_item(
+        self,
+        client: httpx.AsyncClient,
+        item: WorkItem,
+        bucket: TokenBucket,
+        progress: GenerationProgress,
+    ) -> list[ConversationResult]:
+        """Send an item's turns in order, stopping at the first failure."""
+        if not await self._ensure_login(client, item.persona, bucket):
+            result = ConversationResult(
+                persona=item.persona,
+                conversation_id="",
+                query=item.turns[0],
+                response_text="",
+                error="Login failed",
+            )
+            self._record_result(result)
+            return [result]
+
+        conversation_id = str(uuid4()) if item.multi_turn else None
+        results: list[ConversationResult] = []
+        for query in item.turns:
+            result = await self._send_paced(
+                client, item.persona, query, conversation_id, bucket, progress
+            )
+            self._record_result(result)
+            results.append(result)
+            if result.error:
+                break
+        return results
+
+    async def _ensure_login(
+        self, client: httpx.AsyncClient, persona_name: str, bucket: TokenBucket
+    ) -> bool:
+        """Log a persona in once, however many workers need it."""
+        lock = self._login_locks.setdefault(persona_name, asyncio.Lock())
+        async with lock:
+            if persona_name in self.tokens:
+                return True
+            if persona_name in self._login_failed:
+                return False
+            await bucket.acquire()
+            if await self.login(client, persona_name):
+                return True
+            self._login_failed.add(persona_name)
+            return False
+
+    async def _send_paced(
+        self,
+        client: httpx.AsyncClient,
+        persona_name: str,
+        message: str,
+        conversation_id: str | None,
+        bucket: TokenBucket,
+        progress: GenerationProgress,
+    ) -> ConversationResult:
+        """Send one message through the token bucket, retrying 429s."""
+        for attempt in range(MAX_RETRIES):
+            await bucket.acquire()
+            progress.requests += 1
+            result = await self.send_chat_message(
+                client, persona_name, message, conversation_id
+            )
+            if not _is_rate_limited(result):
+                bucket.on_success()
+                return result
+
+            progress.rate_limited += 1
+            self.stats.rate_limited_responses += 1
+            delay = result.retry_after
+            if delay is None:
+                delay = _calculate_retry_delay(attempt)
+            bucket.on_rate_limited(delay)
+            logger.warning(
+                "[%s] Rate limited (429), retry %d/%d after %.1fs at %.0f req/min",
+                persona_name,
+                attempt + 1,
+                MAX_RETRIES,
+                delay,
+                bucket.rate * 60,
+            )
+        return result
+
+    def _record_result(self, result: ConversationResult) -> None:
+        """Add one request's outcome to ``self.stats``."""
+        self.stats.total_conversations += 1
+        if result.error:
+            self.stats.failed_conversations += 1
+            self.stats.failures.append(
+                FailedConversation(
+                    persona=result.persona,
+                    query=result.query,
+                    conversation_id=result.conversation_id,
+                    error=result.error,
+                )
+            )
+        else:
+            self.stats.successful_conversations += 1
+            self.stats.total_tool_calls += len(result.tool_calls)
+
+    async def _report_progress(
+        self, progress: GenerationProgress, bucket: TokenBucket, interval: float
+    ) -> None:
+        """Log a progress line every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            logger.info("Progress: %s", progress.describe(bucket.rate))
+
     def _print_summary(self) -> None:
         """Print generation summary."""
         logger.info("\n" + "=" * 60)
@@ -708,6 +1183,8 @@ class ConversationGenerator:
         logger.info("Successful: %d", self.stats.successful_conversations)
         logger.info("Failed: %d", self.stats.failed_conversations)
         logger.info("Total tool calls: %d", self.stats.total_tool_calls)
+        if self.stats.rate_limited_responses:
+            logger.info("Rate-limited responses: %d", self.stats.rate_limited_responses)
         logger.info("Total duration: %.1f seconds", self.stats.total_duration_seconds)
         logger.info("")
         logger.info("Per-persona breakdown:")
@@ -765,6 +1242,10 @@ async def run_generation(
     concurrent: bool = True,
     request_delay: float | None = None,
     multi_turn_delay: float | None = None,
+    queued: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+    checkpoint_path: Path | str | None = None,
 ) -> dict[str, Any]:
     """Main entry point for generation.
 
@@ -776,6 +1257,10 @@ async def run_generation(
         concurrent: Run personas concurrently (default: True)
         request_delay: Delay between single-turn requests (env var if None)
         multi_turn_delay: Delay between multi-turn turns (env var if None)
+        queued: Use the work-queue generator (``generate_queued``)
+        concurrency: Queued mode worker count
+        requests_per_minute: Queued mode starting request rate
+        checkpoint_path: Queued mode checkpoint file for resumable runs
 
     Returns:
         Generation results
@@ -799,6 +1284,14 @@ async def run_generation(
         request_delay=request_delay or DEFAULT_REQUEST_DELAY,
         multi_turn_delay=multi_turn_delay or DEFAULT_MULTI_TURN_DELAY,
     )
+    if queued:
+        return await generator.generate_queued(
+            personas=personas,
+            target_per_persona=target_per_persona,
+            concurrency=concurrency,
+            requests_per_minute=requests_per_minute,
+            checkpoint_path=checkpoint_path,
+        )
     return await generator.generate_all(
         personas=personas,
         target_per_persona=target_per_persona,
@@ -814,6 +1307,11 @@ if __name__ == "__main__":
     # Sequential execution (slower but more predictable)
     # asyncio.run(run_generation(concurrent=False))
 
+    # Work queue with a global request budget, resumable after interruption
+    # asyncio.run(
+    #     run_generation(queued=True, checkpoint_path="generation_checkpoint.jsonl")
+    # )
+
     # Seed database first, then generate
     # asyncio.run(run_generation(seed_first=True))
 
@@ -16,6 +16,7 @@ TOOL COVERAGE (from agent.py):
 9. update_user_memory - Implicit through personal info sharing
 """
 
+from collections.abc import Mapping
 from typing import Any
 
 
@@ -1084,12 +1085,12 @@ def get_follow_ups(follow_up_type: str) -> list[str]:
     return FOLLOW_UP_TYPES[follow_up_type]
 
 
-def format_query(query_template: str, variables: dict[str, Any]) -> str:
+def format_query(query_template: str, variables: Mapping[str, Any]) -> str:
     """Format a query template with variable values.
 
     Args:
         query_template: Template string with {variable} placeholders
-        variables: Dictionary of variable names to values
+        variables: Mapping of variable names to values (e.g. a persona)
 
     Returns:
         Formatted query string
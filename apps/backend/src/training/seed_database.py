@@ -7,6 +7,14 @@ defined in the training module.
 Usage:
     # From apps/backend directory with database running:
     PYTHONPATH=./src uv run python -m training.seed_database
+
+``run_seeding`` uses the bulk engine by default: every persona's rows are
+built up front with deterministic UUIDs (``build_persona_rows``) and written
+with one multi-row INSERT per table, in a single transaction per persona,
+with all personas seeded concurrently on separate connections. Geocoded
+locations of the previous seed are carried over, so a re-seed makes no
+geocoding requests. ``seed_persona``/``seed_all_personas`` remain as the
+ORM path.
 """
 
 from __future__ import annotations
@@ -14,11 +22,14 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import uuid
+from dataclasses import dataclass, field
 from datetime import UTC, date, datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
+from sqlalchemy import Delete, delete, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from core.security import get_password_hash
@@ -30,11 +41,18 @@ from models.recipes_names import Recipe
 from models.user_preferences import UserPreferences
 from models.users import User
 from services.geocoding import GeocodingService
-from training.personas import PERSONAS, PersonaProfile, RecipeData
+from training.personas import (
+    PERSONAS,
+    MealPlanHistoryEntry,
+    PersonaProfile,
+    RecipeData,
+)
 
 
 if TYPE_CHECKING:
-    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+    from services.geocoding import GeocodingResult
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -47,30 +65,46 @@ SYNTHETIC_PASSWORD = "SyntheticUser2026!"  # noqa: S105  # pragma: allowlist sec
 _GEOCODE_MAX_ATTEMPTS = 3
 _GEOCODE_RETRY_INITIAL_DELAY_SECONDS = 1.0
 
+# Synthetic users are identified by their email domain
+SYNTHETIC_EMAIL_DOMAIN = "pantrypilot.synthetic"
 
-async def _geocode_preferences_best_effort(
-    db: AsyncSession,
-    preferences: UserPreferences,
+# Namespace for the bulk engine's deterministic (uuid5) primary keys
+SEED_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_DNS, SYNTHETIC_EMAIL_DOMAIN)
+
+# Personas seeded at once by the bulk engine (one connection each)
+BULK_SEED_CONCURRENCY = 8
+
+# Rows per multi-row INSERT, well under PostgreSQL's 32767 bind parameters
+_INSERT_BATCH_ROWS = 1000
+
+# Quantities cycled through a recipe's synthetic ingredient links
+_QUANTITY_PATTERN = [
+    (Decimal("1.0"), "cup"),
+    (Decimal("2.0"), "tbsp"),
+    (Decimal("0.5"), "tsp"),
+    (Decimal("8.0"), "oz"),
+]
+
+
+async def _geocode_best_effort(
+    geocoder: GeocodingService,
+    location: dict[str, Any],
     username: str,
-) -> None:
-    """Best-effort geocode for seeding.
+) -> GeocodingResult | None:
+    """Best-effort geocode of a persona location for seeding.
 
     Uses a small retry loop with exponential backoff. The underlying
     `GeocodingService` enforces a 1 request/second rate limit; this retry adds
     extra spacing between attempts when results are missing or transient errors
     occur.
-
-    Does not commit; seeding owns the transaction lifecycle.
     """
-    geocoder = GeocodingService(db)
-
     for attempt in range(1, _GEOCODE_MAX_ATTEMPTS + 1):
         try:
             result = await geocoder.geocode_location(
-                city=preferences.city,
-                state_or_region=preferences.state_or_region,
-                postal_code=preferences.postal_code,
-                country=preferences.country,
+                city=location["city"],
+                state_or_region=location["state_or_region"],
+                postal_code=location["postal_code"],
+                country=location["country"],
             )
         except Exception:
             logger.exception(
@@ -82,11 +116,7 @@ async def _geocode_preferences_best_effort(
             result = None
 
         if result is not None:
-            preferences.latitude = result.latitude
-            preferences.longitude = result.longitude
-            preferences.timezone = result.timezone
-            preferences.geocoded_at = datetime.now(UTC)
-            return
+            return result
 
         if attempt < _GEOCODE_MAX_ATTEMPTS:
             delay_seconds = _GEOCODE_RETRY_INITIAL_DELAY_SECONDS * (2 ** (attempt - 1))
@@ -95,11 +125,43 @@ async def _geocode_preferences_best_effort(
     logger.warning(
         "Geocoding returned no results for %s (%s, %s %s, %s)",
         username,
-        preferences.city,
-        preferences.state_or_region,
-        preferences.postal_code,
-        preferences.country,
+        location["city"],
+        location["state_or_region"],
+        location["postal_code"],
+        location["country"],
     )
+    return None
+
+
+def _geocoded_values(result: GeocodingResult) -> dict[str, Any]:
+    """Preference column values for a geocoding result."""
+    return {
+        "latitude": result.latitude,
+        "longitude": result.longitude,
+        "timezone": result.timezone,
+        "geocoded_at": datetime.now(UTC),
+    }
+
+
+async def _geocode_preferences_best_effort(
+    db: AsyncSession,
+    preferences: UserPreferences,
+    username: str,
+) -> None:
+    """Best-effort geocode of seeded preferences.
+
+    Does not commit; seeding owns the transaction lifecycle.
+    """
+    location = {
+        "city": preferences.city,
+        "state_or_region": preferences.state_or_region,
+        "postal_code": preferences.postal_code,
+        "country": preferences.country,
+    }
+    result = await _geocode_best_effort(GeocodingService(db), location, username)
+    if result is not None:
+        for key, value in _geocoded_values(result).items():
+            setattr(preferences, key, value)
 
 
 def _load_env_files() -> None:
@@ -189,22 +251,13 @@ async def create_persona_user(
     Returns:
         Created User object with ID populated
     """
-    # Generate deterministic email from persona name
-    email = f"{persona['user_id']}@pantrypilot.synthetic"
-    username = persona["user_id"]  # e.g., "synthetic-veggie-val"
-
     user = User(
-        username=username,
-        email=email,
-        hashed_password=get_password_hash(SYNTHETIC_PASSWORD),
-        is_verified=True,  # Skip email verification for synthetic users
-        first_name=_extract_first_name(persona_name),
-        last_name="(Synthetic)",
+        **_user_values(persona_name, persona, get_password_hash(SYNTHETIC_PASSWORD))
     )
     db.add(user)
     await db.flush()  # Get user ID assigned
 
-    logger.info("Created synthetic user: %s (ID: %s)", email, user.id)
+    logger.info("Created synthetic user: %s (ID: %s)", user.email, user.id)
     return user
 
 
@@ -226,21 +279,7 @@ async def create_persona_preferences(
     prefs = persona["preferences"]
     location = prefs["location"]
 
-    preferences = UserPreferences(
-        user_id=user.id,
-        # Dietary settings
-        dietary_restrictions=prefs.get("dietary_restrictions", []),
-        allergies=[],  # Not specified in personas, default empty
-        preferred_cuisines=prefs.get("cuisine_preferences", []),
-        # Family settings
-        family_size=prefs.get("household_size", 2),
-        default_servings=prefs.get("household_size", 2) * 2,  # 2 servings per person
-        # Location for weather tool
-        city=location["city"],
-        state_or_region=location["state_or_region"],
-        postal_code=location["postal_code"],
-        country=location["country"][:2] if location["country"] else "US",  # ISO alpha-2
-    )
+    preferences = UserPreferences(user_id=user.id, **_preference_values(persona))
     db.add(preferences)
     await db.flush()
 
@@ -277,28 +316,7 @@ async def create_persona_recipes(
     recipe_map: dict[str, Recipe] = {}
 
     for recipe_data in persona["recipes"]:
-        # Parse time from tags (e.g., "30min", "60min")
-        prep_time, cook_time = _parse_recipe_times(recipe_data.get("tags", []))
-
-        # Calculate total time if both prep and cook times are available
-        total_time = None
-        if prep_time and cook_time:
-            total_time = prep_time + cook_time
-
-        recipe = Recipe(
-            user_id=user.id,
-            name=recipe_data["name"],
-            description=_generate_recipe_description(recipe_data),
-            prep_time_minutes=prep_time,
-            cook_time_minutes=cook_time,
-            total_time_minutes=total_time,
-            serving_min=2,
-            serving_max=max(4, persona["preferences"].get("household_size", 4)),
-            difficulty=_infer_difficulty(recipe_data.get("tags", [])),
-            course_type="dinner",
-            ethnicity=_infer_ethnicity(recipe_data.get("tags", [])),
-            instructions=_generate_placeholder_instructions(recipe_data["name"]),
-        )
+        recipe = Recipe(user_id=user.id, **_recipe_values(recipe_data, persona))
         db.add(recipe)
         recipe_map[recipe_data["name"]] = recipe
 
@@ -353,30 +371,10 @@ async def create_persona_recipe_ingredients(
         return []
 
     links: list[RecipeIngredient] = []
-    quantity_pattern = [
-        (Decimal("1.0"), "cup"),
-        (Decimal("2.0"), "tbsp"),
-        (Decimal("0.5"), "tsp"),
-        (Decimal("8.0"), "oz"),
-    ]
-
-    ingredient_count = len(ingredients)
 
     for recipe in recipes:
-        # Deterministic, persona-specific spread of ingredients per recipe.
-        base = sum(ord(char) for char in recipe.name)
-        per_recipe = min(5, max(3, ingredient_count))
-
-        used_idx: set[int] = set()
-        for offset in range(per_recipe):
-            idx = (base + (offset * 7)) % ingredient_count
-            while idx in used_idx and len(used_idx) < ingredient_count:
-                idx = (idx + 1) % ingredient_count
-            used_idx.add(idx)
-
-            quantity_value, quantity_unit = quantity_pattern[
-                offset % len(quantity_pattern)
-            ]
+        picks = _ingredient_picks(str(recipe.name), len(ingredients))
+        for idx, quantity_value, quantity_unit in picks:
             links.append(
                 RecipeIngredient(
                     recipe_id=recipe.id,
@@ -422,16 +420,7 @@ async def create_persona_meal_history(
     today = date.today()
     history_entries = persona["meal_plan_history"]
 
-    # Calculate relative dates: distribute meals over the past N days
-    # Start from (len(history) - 1) days ago, ending yesterday
-    num_entries = len(history_entries)
-
     for i, entry in enumerate(history_entries):
-        # Days ago: first entry is (num_entries - 1) days ago, last is 0 (today-ish)
-        # But we want history to end yesterday, so offset by 1
-        days_ago = num_entries - i
-        meal_date = today - timedelta(days=days_ago)
-
         # Get recipe ID if it exists in our recipe map
         recipe = recipe_map.get(entry["recipe"])
         recipe_id = recipe.id if recipe else None
@@ -439,16 +428,7 @@ async def create_persona_meal_history(
         meal = Meal(
             user_id=user.id,
             recipe_id=recipe_id,
-            planned_for_date=meal_date,
-            meal_type=entry.get("meal", "dinner"),
-            was_cooked=True,  # Historical entries assumed cooked
-            cooked_at=datetime(
-                meal_date.year,
-                meal_date.month,
-                meal_date.day,
-                18,  # 6pm
-                0,
-            ),
+            **_meal_values(entry, i, len(history_entries), today),
         )
         db.add(meal)
         meals.append(meal)
@@ -533,10 +513,42 @@ async def seed_all_personas(db: AsyncSession) -> dict[str, dict[str, Any]]:
     return results
 
 
+def _synthetic_user_ids() -> Any:
+    """Subquery selecting the ids of all synthetic users."""
+    return select(User.id).where(User.email.like(f"%@{SYNTHETIC_EMAIL_DOMAIN}"))
+
+
+def _cleanup_statements() -> list[Delete]:
+    """Set-based deletes of synthetic users' data, in dependency order."""
+    user_ids = _synthetic_user_ids()
+    recipe_ids = select(Recipe.id).where(Recipe.user_id.in_(user_ids))
+    return [
+        # Meals and ingredient links reference recipes, so delete them first
+        delete(Meal).where(Meal.user_id.in_(user_ids)),
+        delete(RecipeIngredient).where(RecipeIngredient.recipe_id.in_(recipe_ids)),
+        delete(Recipe).where(Recipe.user_id.in_(user_ids)),
+        # Ingredients (pantry items)
+        delete(Ingredient).where(Ingredient.user_id.in_(user_ids)),
+        delete(UserPreferences).where(UserPreferences.user_id.in_(user_ids)),
+    ]
+
+
+async def _delete_synthetic_rows(executor: AsyncSession | AsyncConnection) -> int:
+    """Run the cleanup deletes; returns the number of users deleted."""
+    for statement in _cleanup_statements():
+        await executor.execute(statement)
+    # Remaining user-owned tables cascade on user delete
+    result = await executor.execute(
+        delete(User).where(User.id.in_(_synthetic_user_ids())).returning(User.id)
+    )
+    return len(result.scalars().all())
+
+
 async def cleanup_synthetic_users(db: AsyncSession) -> int:
     """Remove all synthetic users and their data.
 
-    This is useful for cleanup before re-seeding.
+    This is useful for cleanup before re-seeding. Each table is cleared with
+    a single DELETE over the synthetic user ids.
 
     Args:
         db: Database session
@@ -544,50 +556,285 @@ async def cleanup_synthetic_users(db: AsyncSession) -> int:
     Returns:
         Number of users deleted
     """
-    from sqlalchemy import delete, select
-
-    # Find all synthetic users
-    result = await db.execute(
-        select(User).where(User.email.like("%@pantrypilot.synthetic"))
-    )
-    users = result.scalars().all()
-    user_ids = [user.id for user in users]
+    count = await _delete_synthetic_rows(db)
+    await db.commit()
 
-    if not user_ids:
+    if not count:
         logger.info("No synthetic users to delete")
         return 0
 
-    # Delete related records first (in dependency order)
-    # Meals reference recipes, so delete meals first
-    await db.execute(delete(Meal).where(Meal.user_id.in_(user_ids)))
+    logger.info("Deleted %d synthetic users and their data", count)
+    return count
+
+
+# Bulk seeding engine
+
+
+def _seed_uuid(username: str, *parts: str | int) -> uuid.UUID:
+    """Deterministic primary key for a seeded row (stable across re-seeds)."""
+    return uuid.uuid5(SEED_NAMESPACE, "/".join([username, *map(str, parts)]))
+
 
-    # Recipes can be deleted after meals
-    await db.execute(delete(Recipe).where(Recipe.user_id.in_(user_ids)))
+@dataclass
+class PersonaRows:
+    """A persona's seed data as column-value rows, ready for bulk INSERTs."""
 
-    # Ingredients (pantry items)
-    await db.execute(delete(Ingredient).where(Ingredient.user_id.in_(user_ids)))
+    user: dict[str, Any]
+    preferences: dict[str, Any]
+    recipes: list[dict[str, Any]] = field(default_factory=list)
+    ingredients: list[dict[str, Any]] = field(default_factory=list)
+    recipe_ingredients: list[dict[str, Any]] = field(default_factory=list)
+    meals: list[dict[str, Any]] = field(default_factory=list)
 
-    # User preferences
-    await db.execute(
-        delete(UserPreferences).where(UserPreferences.user_id.in_(user_ids))
+    def tables(self) -> list[tuple[type[Base], list[dict[str, Any]]]]:
+        """Rows per model, in foreign-key order."""
+        return [
+            (User, [self.user]),
+            (UserPreferences, [self.preferences]),
+            (Recipe, self.recipes),
+            (Ingredient, self.ingredients),
+            (RecipeIngredient, self.recipe_ingredients),
+            (Meal, self.meals),
+        ]
+
+    def as_result(self) -> dict[str, Any]:
+        """The rows in ``seed_persona``'s result layout."""
+        return {
+            "user": self.user,
+            "preferences": self.preferences,
+            "recipes": self.recipes,
+            "ingredients": self.ingredients,
+            "recipe_ingredients": self.recipe_ingredients,
+            "meals": self.meals,
+        }
+
+
+def build_persona_rows(
+    persona_name: str,
+    persona: PersonaProfile,
+    *,
+    hashed_password: str,
+    today: date,
+    geocoded: dict[str, Any] | None = None,
+) -> PersonaRows:
+    """Build every row seeded for a persona, with deterministic UUIDs.
+
+    Produces the same data as the ORM path (``seed_persona``) without a
+    database round trip.
+
+    Args:
+        persona_name: Name of the persona
+        persona: PersonaProfile with all data
+        hashed_password: Password hash for the synthetic user
+        today: Date the meal history is relative to
+        geocoded: Latitude/longitude/timezone/geocoded_at values, if known
+
+    Returns:
+        PersonaRows for ``bulk_seed_persona``
+    """
+    username = persona["user_id"]
+    user_id = _seed_uuid(username)
+    rows = PersonaRows(
+        user={
+            "id": user_id,
+            **_user_values(persona_name, persona, hashed_password),
+        },
+        preferences={
+            "id": _seed_uuid(username, "preferences"),
+            "user_id": user_id,
+            **_preference_values(persona),
+            **(geocoded or {}),
+        },
     )
 
-    # Finally delete users
-    count = 0
-    for user in users:
-        await db.delete(user)
-        count += 1
+    recipe_ids: dict[str, uuid.UUID] = {}
+    for i, recipe_data in enumerate(persona["recipes"]):
+        recipe_id = _seed_uuid(username, "recipe", i)
+        recipe_ids[recipe_data["name"]] = recipe_id
+        rows.recipes.append(
+            {
+                "id": recipe_id,
+                "user_id": user_id,
+                **_recipe_values(recipe_data, persona),
+            }
+        )
 
-    await db.commit()
-    logger.info("Deleted %d synthetic users and their data", count)
-    return count
+    ingredient_ids = [
+        _seed_uuid(username, "ingredient", i)
+        for i in range(len(persona["pantry_items"]))
+    ]
+    rows.ingredients = [
+        {"id": ingredient_id, "user_id": user_id, "ingredient_name": item_name}
+        for ingredient_id, item_name in zip(
+            ingredient_ids, persona["pantry_items"], strict=True
+        )
+    ]
 
+    for recipe in rows.recipes:
+        picks = _ingredient_picks(recipe["name"], len(ingredient_ids))
+        for offset, (idx, quantity_value, quantity_unit) in enumerate(picks):
+            rows.recipe_ingredients.append(
+                {
+                    "id": uuid.uuid5(recipe["id"], f"ingredient/{offset}"),
+                    "recipe_id": recipe["id"],
+                    "ingredient_id": ingredient_ids[idx],
+                    "quantity_value": quantity_value,
+                    "quantity_unit": quantity_unit,
+                    "prep": {},
+                    "is_optional": False,
+                }
+            )
 
-async def run_seeding(cleanup_first: bool = True) -> dict[str, dict[str, Any]]:
+    history_entries = persona["meal_plan_history"]
+    for i, entry in enumerate(history_entries):
+        rows.meals.append(
+            {
+                "id": _seed_uuid(username, "meal", i),
+                "user_id": user_id,
+                "recipe_id": recipe_ids.get(entry["recipe"]),
+                **_meal_values(entry, i, len(history_entries), today),
+            }
+        )
+
+    return rows
+
+
+async def bulk_seed_persona(conn: AsyncConnection, rows: PersonaRows) -> None:
+    """Write a persona's rows with one multi-row INSERT per table.
+
+    Runs inside the caller's transaction.
+    """
+    for model, table_rows in rows.tables():
+        for start in range(0, len(table_rows), _INSERT_BATCH_ROWS):
+            batch = table_rows[start : start + _INSERT_BATCH_ROWS]
+            await conn.execute(insert(model).values(batch))
+
+
+async def _load_synthetic_geocodes(conn: AsyncConnection) -> dict[str, dict[str, Any]]:
+    """Geocoded preference values of existing synthetic users, by username."""
+    result = await conn.execute(
+        select(
+            User.username,
+            UserPreferences.latitude,
+            UserPreferences.longitude,
+            UserPreferences.timezone,
+            UserPreferences.geocoded_at,
+        )
+        .join(UserPreferences, UserPreferences.user_id == User.id)
+        .where(
+            User.id.in_(_synthetic_user_ids()),
+            UserPreferences.latitude.is_not(None),
+            UserPreferences.longitude.is_not(None),
+        )
+    )
+    return {
+        row.username: {
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "timezone": row.timezone,
+            "geocoded_at": row.geocoded_at,
+        }
+        for row in result
+    }
+
+
+async def _geocode_missing(
+    engine: AsyncEngine, geocodes: dict[str, dict[str, Any]]
+) -> None:
+    """Best-effort geocode of personas without a known location, in place.
+
+    Requests are serialized by the geocoder's 1 request/second limit.
+    """
+    async with AsyncSession(engine) as db:
+        geocoder = GeocodingService(db)
+        for persona in PERSONAS.values():
+            username = persona["user_id"]
+            if username in geocodes:
+                continue
+            location = _preference_values(persona)
+            try:
+                result = await _geocode_best_effort(geocoder, location, username)
+            except Exception:
+                logger.exception(
+                    "Geocoding failed for %s (continuing seeding)", username
+                )
+                continue
+            if result is not None:
+                geocodes[username] = _geocoded_values(result)
+
+
+async def bulk_seed_all_personas(
+    engine: AsyncEngine,
+    *,
+    cleanup_first: bool = True,
+    geocode: bool = True,
+    concurrency: int = BULK_SEED_CONCURRENCY,
+) -> dict[str, PersonaRows]:
+    """Seed all personas with the bulk engine.
+
+    Geocoded locations of existing synthetic users are kept for the new
+    rows, then (optionally) the old rows are removed with set-based deletes.
+    Each persona is written in its own transaction on its own connection,
+    ``concurrency`` personas at a time.
+
+    Args:
+        engine: Database engine
+        cleanup_first: Whether to remove existing synthetic users first
+        geocode: Geocode personas whose location is not already known
+        concurrency: Personas seeded at once
+
+    Returns:
+        Dictionary mapping persona names to their seeded rows
+    """
+    # One hash for every synthetic user; hashing is deliberately slow
+    hashed_password = await asyncio.to_thread(get_password_hash, SYNTHETIC_PASSWORD)
+
+    async with engine.begin() as conn:
+        geocodes = await _load_synthetic_geocodes(conn)
+        if cleanup_first:
+            count = await _delete_synthetic_rows(conn)
+            logger.info("Deleted %d synthetic users and their data", count)
+
+    if geocode:
+        await _geocode_missing(engine, geocodes)
+
+    today = date.today()
+    results = {
+        persona_name: build_persona_rows(
+            persona_name,
+            persona,
+            hashed_password=hashed_password,
+            today=today,
+            geocoded=geocodes.get(persona["user_id"]),
+        )
+        for persona_name, persona in PERSONAS.items()
+    }
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def seed_one(persona_name: str, rows: PersonaRows) -> None:
+        async with semaphore:
+            try:
+                async with engine.begin() as conn:
+                    await bulk_seed_persona(conn, rows)
+            except Exception:
+                logger.exception("Failed to seed persona %s", persona_name)
+                raise
+        logger.info("Seeded persona: %s", persona_name)
+
+    await asyncio.gather(*(seed_one(name, rows) for name, rows in results.items()))
+    return results
+
+
+async def run_seeding(
+    cleanup_first: bool = True, bulk: bool = True
+) -> dict[str, dict[str, Any]]:
     """Main entry point for seeding.
 
     Args:
         cleanup_first: Whether to remove existing synthetic users first
+        bulk: Use the bulk engine (``bulk_seed_all_personas``) instead of
+            the per-row ORM path
 
     Returns:
         Dictionary with seeding results
@@ -602,31 +849,36 @@ async def run_seeding(cleanup_first: bool = True) -> dict[str, dict[str, Any]]:
         async with engine.begin() as conn:
             await conn.run_sync(Base.metadata.create_all)
 
-        async_session = async_sessionmaker(
-            engine, expire_on_commit=False, class_=AsyncSession
-        )
+        if bulk:
+            logger.info("Seeding personas (bulk)...")
+            rows = await bulk_seed_all_personas(engine, cleanup_first=cleanup_first)
+            results = {name: data.as_result() for name, data in rows.items()}
+        else:
+            async_session = async_sessionmaker(
+                engine, expire_on_commit=False, class_=AsyncSession
+            )
 
-        async with async_session() as db:
-            if cleanup_first:
-                logger.info("Cleaning up existing synthetic users...")
-                await cleanup_synthetic_users(db)
-
-            logger.info("Seeding personas...")
-            results = await seed_all_personas(db)
-
-            # Summary
-            logger.info("\n=== Seeding Complete ===")
-            for persona_name, data in results.items():
-                logger.info(
-                    "  %s: %d recipes, %d meals, %d ingredient items, %d recipe links",
-                    persona_name,
-                    len(data["recipes"]),
-                    len(data["meals"]),
-                    len(data["ingredients"]),
-                    len(data["recipe_ingredients"]),
-                )
+            async with async_session() as db:
+                if cleanup_first:
+                    logger.info("Cleaning up existing synthetic users...")
+                    await cleanup_synthetic_users(db)
+
+                logger.info("Seeding personas...")
+                results = await seed_all_personas(db)
+
+        # Summary
+        logger.info("\n=== Seeding Complete ===")
+        for persona_name, data in results.items():
+            logger.info(
+                "  %s: %d recipes, %d meals, %d ingredient items, %d recipe links",
+                persona_name,
+                len(data["recipes"]),
+                len(data["meals"]),
+                len(data["ingredients"]),
+                len(data["recipe_ingredients"]),
+            )
 
-            return results
+        return results
 
     finally:
         await engine.dispose()
@@ -635,6 +887,122 @@ async def run_seeding(cleanup_first: bool = True) -> dict[str, dict[str, Any]]:
 # Helper functions
 
 
+def _user_values(
+    persona_name: str, persona: PersonaProfile, hashed_password: str
+) -> dict[str, Any]:
+    """User column values for a persona (deterministic email and username)."""
+    username = persona["user_id"]  # e.g., "synthetic-veggie-val"
+    return {
+        "username": username,
+        "email": f"{username}@{SYNTHETIC_EMAIL_DOMAIN}",
+        "hashed_password": hashed_password,
+        "is_verified": True,  # Skip email verification for synthetic users
+        "first_name": _extract_first_name(persona_name),
+        "last_name": "(Synthetic)",
+    }
+
+
+def _preference_values(persona: PersonaProfile) -> dict[str, Any]:
+    """UserPreferences column values for a persona (without geocoding)."""
+    prefs = persona["preferences"]
+    location = prefs["location"]
+    household_size = prefs.get("household_size", 2)
+    return {
+        # Dietary settings
+        "dietary_restrictions": prefs.get("dietary_restrictions", []),
+        "allergies": [],  # Not specified in personas, default empty
+        "preferred_cuisines": prefs.get("cuisine_preferences", []),
+        # Family settings
+        "family_size": household_size,
+        "default_servings": household_size * 2,  # 2 servings per person
+        # Location for weather tool
+        "city": location["city"],
+        "state_or_region": location["state_or_region"],
+        "postal_code": location["postal_code"],
+        # ISO alpha-2
+        "country": location["country"][:2] if location["country"] else "US",
+    }
+
+
+def _recipe_values(recipe_data: RecipeData, persona: PersonaProfile) -> dict[str, Any]:
+    """Recipe column values for one of a persona's recipes."""
+    tags = recipe_data.get("tags", [])
+    # Parse time from tags (e.g., "30min", "60min")
+    prep_time, cook_time = _parse_recipe_times(tags)
+
+    # Calculate total time if both prep and cook times are available
+    total_time = None
+    if prep_time and cook_time:
+        total_time = prep_time + cook_time
+
+    return {
+        "name": recipe_data["name"],
+        "description": _generate_recipe_description(recipe_data),
+        "prep_time_minutes": prep_time,
+        "cook_time_minutes": cook_time,
+        "total_time_minutes": total_time,
+        "serving_min": 2,
+        "serving_max": max(4, persona["preferences"].get("household_size", 4)),
+        "difficulty": _infer_difficulty(tags),
+        "course_type": "dinner",
+        "ethnicity": _infer_ethnicity(tags),
+        "instructions": _generate_placeholder_instructions(recipe_data["name"]),
+    }
+
+
+def _ingredient_picks(
+    recipe_name: str, ingredient_count: int
+) -> list[tuple[int, Decimal, str]]:
+    """Pantry indices and quantities linked to a recipe.
+
+    Deterministic, persona-specific spread of 3-5 distinct ingredients per
+    recipe, derived from the recipe name.
+    """
+    if not ingredient_count:
+        return []
+
+    base = sum(ord(char) for char in recipe_name)
+    per_recipe = min(5, max(3, ingredient_count))
+
+    picks: list[tuple[int, Decimal, str]] = []
+    used_idx: set[int] = set()
+    for offset in range(per_recipe):
+        idx = (base + (offset * 7)) % ingredient_count
+        while idx in used_idx and len(used_idx) < ingredient_count:
+            idx = (idx + 1) % ingredient_count
+        used_idx.add(idx)
+
+        quantity_value, quantity_unit = _QUANTITY_PATTERN[
+            offset % len(_QUANTITY_PATTERN)
+        ]
+        picks.append((idx, quantity_value, quantity_unit))
+    return picks
+
+
+def _meal_values(
+    entry: MealPlanHistoryEntry, index: int, num_entries: int, today: date
+) -> dict[str, Any]:
+    """Meal column values for a history entry, dated relative to ``today``.
+
+    Meals are distributed over the past ``num_entries`` days: the first entry
+    is ``num_entries`` days ago and the history ends yesterday.
+    """
+    days_ago = num_entries - index
+    meal_date = today - timedelta(days=days_ago)
+    return {
+        "planned_for_date": meal_date,
+        "meal_type": entry.get("meal", "dinner"),
+        "was_cooked": True,  # Historical entries assumed cooked
+        "cooked_at": datetime(
+            meal_date.year,
+            meal_date.month,
+            meal_date.day,
+            18,  # 6pm
+            0,
+        ),
+    }
+
+
 def _extract_first_name(persona_name: str) -> str:
     """Extract first name from persona name (e.g., 'veggie_val' -> 'Val')."""
     parts = persona_name.split("_")
@@ -0,0 +1,293 @@
+"""Per-sample token counts and sequence-packing plans for SFT exports.
+
+``count_export_tokens`` reads an exported JSONL file (``export_training_data``
+output, optionally ``.gz``/``.zst``) once, encodes every message, tool call
+and tool definition with tiktoken's multi-threaded ``encode_ordinary_batch``
+and caches the per-sample counts in a ``<export>.tokens.json`` sidecar keyed
+by the export's SHA-256, so later analyses and plans skip tokenization.
+
+``plan_packing`` turns those counts into a packing plan: best-fit-decreasing
+bin packing of samples into ``max_seq_length`` sequences. ``sft_train.py
+--packing_plan`` builds one training row per planned sequence, so sequences
+fill with whole samples instead of padding.
+
+Counts use a tiktoken encoding (``cl100k_base`` by default), which tracks the
+Qwen/Granite tokenizers closely but not exactly; plan with a little headroom
+below the training ``max_seq_length``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import gzip
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Any
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENCODING = "cl100k_base"
+# Role markers and separators the chat template adds around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+ENCODE_BATCH_SAMPLES = 1024
+CACHE_SUFFIX = ".tokens.json"
+CACHE_VERSION = 1
+
+type BatchEncoder = Callable[[list[str]], list[int]]
+
+
+def sample_texts(sample: dict[str, Any]) -> tuple[list[str], int]:
+    """Return the texts to encode for one sample and its message count.
+
+    Handles the native export format (``messages`` + ``tools``) and the
+    legacy ShareGPT format (``conversations`` with ``value``). Tool
+    definitions are counted because ``sft_train.py`` injects them into the
+    system prompt.
+    """
+    messages = sample.get("messages") or sample.get("conversations") or []
+    texts: list[str] = []
+    for msg in messages:
+        texts.append(msg.get("content", "") or msg.get("value", "") or "")
+        for tool_call in msg.get("tool_calls") or []:
+            function = tool_call.get("function", {})
+            texts.append(function.get("name", ""))
+            arguments = function.get("arguments", "")
+            texts.append(
+                arguments if isinstance(arguments, str) else json.dumps(arguments)
+            )
+    texts.extend(json.dumps(tool) for tool in sample.get("tools") or [])
+    return texts, len(messages)
+
+
+def tiktoken_batch_encoder(
+    encoding: str = DEFAULT_ENCODING, num_threads: int | None = None
+) -> BatchEncoder:
+    """Return a batch encoder that counts tokens on ``num_threads`` threads."""
+    import tiktoken
+
+    enc = tiktoken.get_encoding(encoding)
+    threads = num_threads or os.cpu_count() or 1
+
+    def encode(texts: list[str]) -> list[int]:
+        return [
+            len(tokens)
+            for tokens in enc.encode_ordinary_batch(texts, num_threads=threads)
+        ]
+
+    return encode
+
+
+def count_batch(samples: Sequence[dict[str, Any]], encode: BatchEncoder) -> list[int]:
+    """Token counts for ``samples`` with a single ``encode`` call."""
+    flat: list[str] = []
+    spans: list[tuple[int, int]] = []
+    for sample in samples:
+        texts, messages = sample_texts(sample)
+        spans.append((len(texts), messages))
+        flat.extend(texts)
+    lengths = encode(flat)
+
+    counts = []
+    offset = 0
+    for n_texts, messages in spans:
+        counts.append(
+            sum(lengths[offset : offset + n_texts]) + messages * MESSAGE_OVERHEAD_TOKENS
+        )
+        offset += n_texts
+    return counts
+
+
+def open_export(path: Path) -> IO[str]:
+    """Open an export for reading, decompressing ``.gz``/``.zst`` files."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.suffix == ".zst":
+        try:
+            import zstandard
+        except ImportError as exc:
+            raise RuntimeError(
+                "Reading .zst exports needs the zstandard package "
+                "(uv pip install zstandard)"
+            ) from exc
+        stream: IO[str] = zstandard.open(path, "rt", encoding="utf-8")
+        return stream
+    return open(path, encoding="utf-8")
+
+
+def iter_samples(path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the samples of an export, skipping blank lines."""
+    with open_export(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of the file's bytes, used to validate the count cache."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(path: Path) -> Path:
+    """Sidecar file holding ``path``'s token counts."""
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+
+def load_cached_counts(path: Path, encoding: str, sha256: str) -> list[int] | None:
+    """Counts cached for ``path``, or None if missing or stale."""
+    sidecar = cache_path(path)
+    if not sidecar.exists():
+        return None
+    try:
+        cached = json.loads(sidecar.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if (
+        cached.get("version") != CACHE_VERSION
+        or cached.get("encoding") != encoding
+        or cached.get("sha256") != sha256
+    ):
+        return None
+    counts: list[int] = cached["counts"]
+    return counts
+
+
+def count_export_tokens(
+    path: Path,
+    encoding: str = DEFAULT_ENCODING,
+    *,
+    encode: BatchEncoder | None = None,
+    batch_samples: int = ENCODE_BATCH_SAMPLES,
+    use_cache: bool = True,
+) -> list[int]:
+    """Per-sample token counts for an export, cached next to it.
+
+    Args:
+        path: Exported JSONL file
+        encoding: tiktoken encoding name; part of the cache key
+        encode: Batch encoder override (defaults to threaded tiktoken)
+        batch_samples: Samples tokenized per ``encode`` call
+        use_cache: Read and write the ``.tokens.json`` sidecar
+
+    Returns:
+        One count per sample, in file order
+    """
+    sha256 = file_sha256(path) if use_cache else ""
+    cached = load_cached_counts(path, encoding, sha256) if use_cache else None
+    if cached is not None:
+        logger.info("Using cached token counts for %s", path)
+        return cached
+
+    encode = encode or tiktoken_batch_encoder(encoding)
+    counts: list[int] = []
+    batch: list[dict[str, Any]] = []
+    for sample in iter_samples(path):
+        batch.append(sample)
+        if len(batch) >= batch_samples:
+            counts.extend(count_batch(batch, encode))
+            batch = []
+    if batch:
+        counts.extend(count_batch(batch, encode))
+
+    if use_cache:
+        cache_path(path).write_text(
+            json.dumps(
+                {
+                    "version": CACHE_VERSION,
+                    "encoding": encoding,
+                    "sha256": sha256,
+                    "counts": counts,
+                }
+            )
+        )
+    return counts
+
+
+@dataclass
+class PackingPlan:
+    """Samples grouped into sequences of at most ``max_seq_length`` tokens.
+
+    ``sequences`` holds sample indices; samples longer than
+    ``max_seq_length`` (which the trainer truncates) are listed in
+    ``oversize`` and each fill a sequence of their own, after the packed ones.
+    """
+
+    max_seq_length: int
+    sequences: list[list[int]] = field(default_factory=list)
+    oversize: list[int] = field(default_factory=list)
+    tokens: int = 0
+
+    @property
+    def num_sequences(self) -> int:
+        return len(self.sequences) + len(self.oversize)
+
+    @property
+    def utilization(self) -> float:
+        """Share of the packed sequences' token slots holding real tokens."""
+        capacity = self.num_sequences * self.max_seq_length
+        return self.tokens / capacity if capacity else 0.0
+
+    def order(self) -> list[int]:
+        """Sample indices in packed order (oversize samples last)."""
+        return [i for sequence in self.sequences for i in sequence] + self.oversize
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "max_seq_length": self.max_seq_length,
+            "sequences": self.sequences,
+            "oversize": self.oversize,
+            "tokens": self.tokens,
+            "utilization": round(self.utilization, 4),
+        }
+
+
+def plan_packing(counts: Sequence[int], max_seq_length: int) -> PackingPlan:
+    """Best-fit-decreasing packing of sample token counts.
+
+    Longest samples are placed first, each into the open sequence with the
+    least room that still fits it, which typically leaves only a few percent
+    of each sequence empty.
+    """
+    plan = PackingPlan(max_seq_length=max_seq_length)
+    # Open sequences keyed by remaining room, kept sorted for bisect
+    rooms: list[tuple[int, int]] = []
+    for i in sorted(range(len(counts)), key=lambda i: (-counts[i], i)):
+        size = counts[i]
+        if size > max_seq_length:
+            plan.oversize.append(i)
+            plan.tokens += max_seq_length
+            continue
+        plan.tokens += size
+        slot = bisect.bisect_left(rooms, (size, -1))
+        if slot < len(rooms):
+            room, sequence = rooms.pop(slot)
+            plan.sequences[sequence].append(i)
+        else:
+            room, sequence = max_seq_length, len(plan.sequences)
+            plan.sequences.append([i])
+        if room - size > 0:
+            bisect.insort(rooms, (room - size, sequence))
+    return plan
+
+
+def padded_tokens(counts: Iterable[int], batch_size: int, max_seq_length: int) -> int:
+    """Token slots used by unpacked, dynamically padded batches in file order."""
+    total = 0
+    batch: list[int] = []
+    for count in counts:
+        batch.append(min(count, max_seq_length))
+        if len(batch) == batch_size:
+            total += max(batch) * batch_size
+            batch = []
+    if batch:
+        total += max(batch) * len(batch)
+    return total
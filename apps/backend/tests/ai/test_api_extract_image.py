@@ -288,3 +288,41 @@ async def test_extract_recipe_from_image_multiple_files(
     finally:
         # Clean up override
         app.dependency_overrides.pop(get_ai_extraction_service, None)
+
+
+@pytest.mark.asyncio
+async def test_extract_recipe_from_image_stream_returns_pending_draft(
+    async_client: AsyncClient,
+) -> None:
+    """stream=true starts background extraction instead of running it inline."""
+    from datetime import UTC, datetime, timedelta
+    from uuid import uuid4
+
+    from services.ai.models import DraftOutcome
+    from services.ai.orchestrator import get_ai_extraction_service
+
+    mock_draft = AsyncMock()
+    mock_draft.id = uuid4()
+    mock_draft.expires_at = datetime.now(UTC) + timedelta(hours=1)
+    mock_service = AsyncMock()
+    mock_service.start_image_extraction = AsyncMock(
+        return_value=DraftOutcome(
+            draft=mock_draft, token="test-token", success=True, message="pending"
+        )
+    )
+    app.dependency_overrides[get_ai_extraction_service] = lambda: mock_service
+
+    try:
+        files = {"files": ("recipe.jpg", create_test_image(), "image/jpeg")}
+        resp = await async_client.post(
+            "/api/v1/ai/extract-recipe-from-image?stream=true", files=files
+        )
+
+        assert resp.status_code == status.HTTP_200_OK
+        body = resp.json()
+        assert body["message"] == "Image extraction started"
+        assert body["data"]["draft_id"] == str(mock_draft.id)
+        mock_service.start_image_extraction.assert_awaited_once()
+        mock_service.extract_recipe_from_images.assert_not_awaited()
+    finally:
+        app.dependency_overrides.pop(get_ai_extraction_service, None)
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import socket
-from unittest.mock import Mock, patch
+from collections.abc import AsyncIterator
+from unittest.mock import AsyncMock, Mock, patch
 
 import httpx
 import pytest
@@ -13,6 +14,36 @@ from fastapi import HTTPException
 from services.ai.html_extractor import HTMLExtractionService
 
 
+class _ChunkedStream(httpx.AsyncByteStream):
+    """Async byte stream that records how many chunks were pulled."""
+
+    def __init__(self, chunks: list[bytes]) -> None:
+        self._chunks = chunks
+        self.pulled = 0
+        self.closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self._chunks:
+            self.pulled += 1
+            yield chunk
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def _streamed_response(
+    chunks: list[bytes], headers: dict[str, str] | None = None
+) -> tuple[httpx.Response, _ChunkedStream]:
+    stream = _ChunkedStream(chunks)
+    response = httpx.Response(
+        200,
+        request=httpx.Request("GET", "https://example.com/recipe"),
+        headers=headers if headers is not None else {"content-type": "text/html"},
+        stream=stream,
+    )
+    return response, stream
+
+
 @pytest.fixture
 def mock_recipe_html() -> str:
     return """
@@ -89,17 +120,55 @@ async def test_fetch_timeout():
             await extractor.fetch_and_sanitize("https://example.com/slow")
 
 
+async def _fetch_text(extractor: HTMLExtractionService, url: str) -> str:
+    return "".join([chunk async for chunk in extractor._iter_html_chunks(url)])
+
+
+def _chunks_of(text: str, size: int):
+    async def iter_chunks(*_args: object) -> AsyncIterator[str]:
+        for start in range(0, len(text), size):
+            yield text[start : start + size]
+
+    return iter_chunks
+
+
 @pytest.mark.asyncio
-async def test_successful_fetch(mock_recipe_html):
+async def test_successful_fetch(mock_recipe_html, monkeypatch: pytest.MonkeyPatch):
     extractor = HTMLExtractionService()
-    with patch.object(
-        HTMLExtractionService, "_fetch_html", return_value=mock_recipe_html
-    ):
-        result = await extractor.fetch_and_sanitize("https://example.com/recipe")
+    monkeypatch.setattr(extractor, "_validate_url", lambda url: None)
+    monkeypatch.setattr(extractor, "_iter_html_chunks", _chunks_of(mock_recipe_html, 7))
+
+    result = await extractor.fetch_and_sanitize("https://example.com/recipe")
+
     assert "Chicken Parmesan" in result
     assert "alert('evil script')" not in result
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+async def test_streamed_parse_matches_full_parse(
+    parser: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Feeding chunks during the download builds the same sanitized page."""
+    html = (
+        "<!DOCTYPE html><html><head><title>T</title>"
+        '<script type="application/ld+json">{"@type": "Recipe", "name": "Soup",'
+        ' "recipeIngredient": ["1 cup stock"]}</script></head>'
+        '<body class="has-sidebar"><nav>menu</nav><article class="recipe">'
+        "<h1>Crème  brûlée</h1><p>Mix &amp; bake<br><img src='/a.png'></p>"
+        "<ul><li>one<li>two</ul></article><!-- end --></body></html>"
+    )
+    extractor = HTMLExtractionService(parser=parser)
+    expected = extractor._sanitize_html(html, "https://example.com/recipe")
+
+    for size in (1, 5, 64):
+        monkeypatch.setattr(extractor, "_iter_html_chunks", _chunks_of(html, size))
+        result = await extractor._fetch_and_parse("https://example.com/recipe")
+        assert result == expected
+        assert result is not None
+        assert result.structured_recipe == expected.structured_recipe
+
+
 @pytest.mark.asyncio
 async def test_http_error():
     extractor = HTMLExtractionService()
@@ -107,7 +176,7 @@ async def test_http_error():
         mock_resp = Mock()
         mock_resp.raise_for_status.side_effect = Exception("404 Not Found")
         mock_async = mock_client.return_value.__aenter__.return_value
-        mock_async.get.return_value = mock_resp
+        mock_async.send = AsyncMock(return_value=mock_resp)
         from fastapi import HTTPException
 
         with pytest.raises(HTTPException):
@@ -115,7 +184,7 @@ async def test_http_error():
 
 
 @pytest.mark.asyncio
-async def test_fetch_html_reports_bot_protection_challenge() -> None:
+async def test_iter_html_chunks_reports_bot_protection_challenge() -> None:
     extractor = HTMLExtractionService()
     request = httpx.Request("GET", "https://www.ambitiouskitchen.com/recipe")
     response = httpx.Response(
@@ -131,11 +200,12 @@ async def test_fetch_html_reports_bot_protection_challenge() -> None:
 
     with patch("httpx.AsyncClient") as mock_client:
         mock_async = mock_client.return_value.__aenter__.return_value
-        mock_async.get.return_value = response
+        mock_async.send = AsyncMock(return_value=response)
 
         with pytest.raises(HTTPException) as exc:
-            await extractor._fetch_html(
-                "https://www.ambitiouskitchen.com/lemon-blueberry-sweet-rolls/"
+            await _fetch_text(
+                extractor,
+                "https://www.ambitiouskitchen.com/lemon-blueberry-sweet-rolls/",
             )
 
     assert exc.value.status_code == 422
@@ -146,18 +216,91 @@ async def test_fetch_html_reports_bot_protection_challenge() -> None:
 async def test_empty_response():
     extractor = HTMLExtractionService()
     with patch("httpx.AsyncClient") as mock_client:
-        mock_resp = Mock()
-        mock_resp.text = ""
-        mock_resp.content = b""
-        mock_resp.headers = {"content-type": "text/html"}
-        mock_resp.raise_for_status = Mock()
+        response, _ = _streamed_response([])
         mock_async = mock_client.return_value.__aenter__.return_value
-        mock_async.get.return_value = mock_resp
+        mock_async.send = AsyncMock(return_value=response)
         result = await extractor.fetch_and_sanitize("https://example.com/empty")
         assert result == ""
 
 
-def test_remove_boilerplate_preserves_structural_containers() -> None:
+@pytest.mark.asyncio
+async def test_iter_html_chunks_streams_and_decodes_across_chunks() -> None:
+    extractor = HTMLExtractionService()
+    body = "<html><body><p>Crème brûlée</p></body></html>".encode()
+    # Split inside the multi-byte "è" so the decoder has to carry state.
+    split = body.index("è".encode()) + 1
+    response, stream = _streamed_response([body[:split], body[split:]])
+
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_async = mock_client.return_value.__aenter__.return_value
+        mock_async.send = AsyncMock(return_value=response)
+        result = await _fetch_text(extractor, "https://example.com/recipe")
+
+    assert result == body.decode()
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_html_chunks_aborts_once_max_size_is_exceeded() -> None:
+    extractor = HTMLExtractionService(max_size=4096)
+    chunks = [b"<html>" + b"a" * 2048] + [b"a" * 2048 for _ in range(50)]
+    response, stream = _streamed_response(chunks)
+
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_async = mock_client.return_value.__aenter__.return_value
+        mock_async.send = AsyncMock(return_value=response)
+        with pytest.raises(HTTPException) as exc:
+            await _fetch_text(extractor, "https://example.com/huge")
+
+    assert exc.value.status_code == 413
+    # Download stopped right after crossing the limit, not at end of body.
+    assert stream.pulled == 2
+    assert stream.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_html_chunks_rejects_declared_oversized_body() -> None:
+    extractor = HTMLExtractionService(max_size=1024)
+    response, stream = _streamed_response(
+        [b"<html>", b"a" * 100],
+        headers={"content-type": "text/html", "content-length": "999999"},
+    )
+
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_async = mock_client.return_value.__aenter__.return_value
+        mock_async.send = AsyncMock(return_value=response)
+        with pytest.raises(HTTPException) as exc:
+            await _fetch_text(extractor, "https://example.com/huge")
+
+    assert exc.value.status_code == 413
+    assert "999999" in str(exc.value.detail)
+    # Rejected on the header alone, before any body bytes were read
+    assert stream.pulled == 0
+
+
+@pytest.mark.asyncio
+async def test_iter_html_chunks_sniffs_html_when_content_type_missing() -> None:
+    extractor = HTMLExtractionService()
+    html_response, _ = _streamed_response(
+        [b"<!DOCTYPE html><html><body>Hi</body></html>"], headers={}
+    )
+    json_response, _ = _streamed_response(
+        [b'{"not": "html"}'], headers={"content-type": "application/json"}
+    )
+
+    with patch("httpx.AsyncClient") as mock_client:
+        mock_async = mock_client.return_value.__aenter__.return_value
+        mock_async.send = AsyncMock(return_value=html_response)
+        assert "Hi" in await _fetch_text(extractor, "https://example.com/a")
+
+        mock_async.send = AsyncMock(return_value=json_response)
+        with pytest.raises(HTTPException) as exc:
+            await _fetch_text(extractor, "https://example.com/b")
+
+    assert exc.value.status_code == 422
+
+
+def test_prune_tree_preserves_structural_containers() -> None:
     extractor = HTMLExtractionService()
     html = """
         <html>
@@ -179,10 +322,64 @@ def test_remove_boilerplate_preserves_structural_containers() -> None:
 
     soup = BeautifulSoup(html, "html.parser")
 
-    extractor._remove_boilerplate(soup)
+    extractor._prune_tree(soup)
 
     result = str(soup)
     assert "Creamy Mediterranean Chicken" in result
     assert "Chicken, cream, tomatoes, and spinach." in result
     assert "Newsletter signup" not in result
     assert soup.body is not None
+
+
+@pytest.mark.parametrize("parser", ["lxml", "html.parser"])
+def test_sanitize_html_matches_across_parser_backends(parser: str) -> None:
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+    extractor = HTMLExtractionService(parser=parser)
+    html = """
+        <html>
+            <head><title>Ignored</title><script>track()</script></head>
+            <body class="has-sidebar">
+                <nav>Menu</nav>
+                <!-- tracking pixel -->
+                <div itemtype="https://schema.org/Recipe" class="wprm" id="r1">
+                    <h1 style="color:red">Pancakes</h1>
+                    <ul>
+                        <li>  2 cups   flour </li>
+                        <li><a href="/milk" onclick="x()">1 cup milk</a></li>
+                    </ul>
+                    <img src="/img/pancakes.jpg" alt="Pancakes">
+                    <div class="social-share">Share me</div>
+                    <div id="comments">Great!</div>
+                </div>
+                <footer>Footer</footer>
+            </body>
+        </html>
+        """
+
+    result = extractor._sanitize_html(html, "https://example.com/recipes/pancakes")
+    soup = BeautifulSoup(result, "html.parser")
+
+    root = soup.find()
+    assert root is not None
+    assert root.name == "div"
+    # Attributes on the extracted container itself are scrubbed too.
+    assert root.attrs == {}
+    assert soup.h1 is not None and soup.h1.attrs == {}
+    assert "2 cups flour" in result
+    assert soup.a is not None
+    assert soup.a["href"] == "https://example.com/milk"
+    assert soup.img is not None
+    assert soup.img["src"] == "https://example.com/img/pancakes.jpg"
+    for removed in ("Menu", "track()", "tracking pixel", "Share me", "Great!"):
+        assert removed not in result
+
+
+def test_sanitize_html_defaults_to_lxml_when_installed() -> None:
+    pytest.importorskip("lxml")
+    assert HTMLExtractionService().parser == "lxml"
+
+
+def test_unsupported_parser_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        HTMLExtractionService(parser="html5lib")
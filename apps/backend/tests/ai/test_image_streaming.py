@@ -0,0 +1,234 @@
+"""Tests for background image extraction and its progress stream."""
+
+import asyncio
+import io
+import json
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from PIL import Image
+
+from schemas.ai import ExtractionNotFound, RecipeExtractionResult, SSEEvent
+from schemas.recipes import RecipeCategory
+from services.ai.draft_service import FAILURE_DRAFT_TYPE, PENDING_DRAFT_TYPE
+from services.ai.image_jobs import ImageExtractionJob, clear_image_jobs, get_image_job
+from services.ai.image_orchestrator import ImageOrchestrator
+from services.images.normalize import ImageFormatError
+
+
+RESULT = RecipeExtractionResult(
+    title="Photo Pancakes",
+    prep_time_minutes=5,
+    cook_time_minutes=10,
+    serving_min=2,
+    instructions=["Mix", "Fry"],
+    category=RecipeCategory.BREAKFAST,
+    ingredients=[{"name": "egg"}, {"name": "milk"}],
+)
+
+
+@pytest.fixture(autouse=True)
+def _clear_jobs():
+    yield
+    clear_image_jobs()
+
+
+def _jpeg() -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (64, 48), color="white").save(output, format="JPEG")
+    return output.getvalue()
+
+
+def _stream_agent(result: Any) -> AsyncMock:
+    """Fake streaming agent emitting a few growing partial outputs."""
+
+    async def stream(images, on_partial, prompt_override=None):
+        await on_partial(RecipeExtractionResult.model_construct(title="Photo Pancakes"))
+        await on_partial(
+            RecipeExtractionResult.model_construct(
+                title="Photo Pancakes", ingredients=[{"name": "egg"}]
+            )
+        )
+        # Unchanged shape: no event
+        await on_partial(
+            RecipeExtractionResult.model_construct(
+                title="Photo Pancakes", ingredients=[{"name": "egg"}]
+            )
+        )
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return AsyncMock(side_effect=stream)
+
+
+def _build(result: Any, user_id) -> tuple[ImageOrchestrator, MagicMock, MagicMock]:
+    draft = MagicMock()
+    draft.id = uuid4()
+    draft.user_id = user_id
+    draft.type = PENDING_DRAFT_TYPE
+    draft.expires_at = datetime.now(UTC) + timedelta(hours=1)
+
+    ai_agent = MagicMock()
+    ai_agent.stream_image_extraction_agent = _stream_agent(result)
+    converter = MagicMock()
+    converter.convert_to_recipe_create = MagicMock(return_value={"title": "x"})
+    draft_manager = MagicMock()
+    draft_manager.create_pending_draft = AsyncMock(return_value=draft)
+    draft_manager.finalize_pending_draft = AsyncMock(return_value=draft)
+    draft_manager.create_draft_token = MagicMock(return_value="token")
+
+    orchestrator = ImageOrchestrator(ai_agent, converter, draft_manager)
+    return orchestrator, draft_manager, draft
+
+
+@asynccontextmanager
+async def _fake_session():
+    yield AsyncMock()
+
+
+async def _stream(orchestrator: ImageOrchestrator, draft: Any, user: Any) -> list:
+    with patch("crud.ai_drafts.get_draft_by_id", AsyncMock(return_value=draft)):
+        return [
+            json.loads(line.removeprefix("data: "))
+            async for line in orchestrator.stream_extraction_progress(
+                str(draft.id), AsyncMock(), user
+            )
+        ]
+
+
+@pytest.mark.asyncio
+async def test_stream_relays_real_stages_and_partial_output() -> None:
+    user = MagicMock(id=uuid4())
+    orchestrator, draft_manager, draft = _build(RESULT, user.id)
+
+    with patch("services.ai.image_orchestrator.AsyncSessionLocal", _fake_session):
+        outcome = await orchestrator.start_image_extraction(
+            [(_jpeg(), "image/jpeg")], AsyncMock(), user
+        )
+        events = await _stream(orchestrator, draft, user)
+
+    assert outcome.draft is draft
+    statuses = [event["status"] for event in events]
+    assert statuses == [
+        "started",
+        "processing",
+        "ai_call",
+        "partial",
+        "partial",
+        "converting",
+        "complete",
+    ]
+    partials = [event for event in events if event["status"] == "partial"]
+    assert partials[0]["detail"] == "Found recipe: Photo Pancakes"
+    assert partials[1]["partial"]["ingredient_count"] == 1
+    assert events[-1]["success"] is True
+    draft_manager.finalize_pending_draft.assert_awaited_once()
+    assert draft_manager.finalize_pending_draft.await_args.args[2] == {"title": "x"}
+
+
+@pytest.mark.asyncio
+async def test_agent_failure_settles_failure_draft_and_reports_error() -> None:
+    user = MagicMock(id=uuid4())
+    orchestrator, draft_manager, draft = _build(RuntimeError("quota"), user.id)
+
+    with patch("services.ai.image_orchestrator.AsyncSessionLocal", _fake_session):
+        await orchestrator.start_image_extraction(
+            [(_jpeg(), "image/jpeg")], AsyncMock(), user
+        )
+        events = await _stream(orchestrator, draft, user)
+
+    assert events[-1]["status"] == "error"
+    assert events[-1]["error_code"] == "agent_error"
+    not_found = draft_manager.finalize_pending_draft.await_args.args[3]
+    assert isinstance(not_found, ExtractionNotFound)
+
+
+@pytest.mark.asyncio
+async def test_invalid_upload_is_rejected_before_any_draft() -> None:
+    user = MagicMock(id=uuid4())
+    orchestrator, draft_manager, _ = _build(RESULT, user.id)
+
+    with pytest.raises(ImageFormatError):
+        await orchestrator.start_image_extraction(
+            [(b"GIF89a", "image/gif")], AsyncMock(), user
+        )
+
+    draft_manager.create_pending_draft.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_finished_draft_without_job_reports_outcome() -> None:
+    user = MagicMock(id=uuid4())
+    orchestrator, _, draft = _build(RESULT, user.id)
+    draft.type = FAILURE_DRAFT_TYPE
+    draft.payload = {"error": "extraction_not_found"}
+
+    assert get_image_job(draft.id) is None
+    events = await _stream(orchestrator, draft, user)
+
+    assert [event["status"] for event in events] == ["complete"]
+    assert events[0]["success"] is False
+
+
+@pytest.mark.asyncio
+async def test_pending_draft_from_other_worker_is_polled() -> None:
+    user = MagicMock(id=uuid4())
+    orchestrator, _, draft = _build(RESULT, user.id)
+    draft.payload = {"status": "pending"}
+    settled = MagicMock(id=draft.id, user_id=user.id, type="recipe_suggestion")
+    settled.payload = {"title": "Photo Pancakes"}
+    db = AsyncMock()
+    poll_sessions = []
+
+    @asynccontextmanager
+    async def poll_session():
+        session = AsyncMock()
+        poll_sessions.append(session)
+        yield session
+
+    with (
+        patch(
+            "crud.ai_drafts.get_draft_by_id",
+            AsyncMock(side_effect=[draft, draft, settled]),
+        ),
+        patch("services.ai.image_orchestrator.StreamSessionLocal", poll_session),
+        patch("services.ai.image_orchestrator.IMAGE_DRAFT_POLL_INTERVAL_SECONDS", 0),
+    ):
+        events = [
+            json.loads(line.removeprefix("data: "))
+            async for line in orchestrator.stream_extraction_progress(
+                str(draft.id), db, user
+            )
+        ]
+
+    assert [event["status"] for event in events] == ["ai_call", "complete"]
+    assert events[-1]["success"] is True
+    # Polls use their own sessions; the request session is released up front
+    assert len(poll_sessions) == 2
+    db.commit.assert_awaited_once()
+    db.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_replays_history() -> None:
+    job = ImageExtractionJob(draft_id=uuid4(), user_id=uuid4())
+    job.publish(SSEEvent.model_validate({"status": "started", "step": "started"}))
+
+    async def collect() -> list[str]:
+        return [event.status async for event in job.subscribe()]
+
+    early = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    job.publish(SSEEvent.model_validate({"status": "ai_call", "step": "ai_call"}))
+    job.publish(SSEEvent.terminal_success(draft_id=job.draft_id, success=True))
+    # Events after the terminal one are ignored
+    job.publish(SSEEvent.model_validate({"status": "late", "step": "late"}))
+
+    expected = ["started", "ai_call", "complete"]
+    assert await early == expected
+    assert await collect() == expected
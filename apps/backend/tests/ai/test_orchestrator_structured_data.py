@@ -0,0 +1,152 @@
+"""Tests for the schema.org structured-data fast path in URL extraction."""
+
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from schemas.ai import RecipeExtractionResult
+from schemas.recipes import RecipeCategory
+from services.ai.html_extractor import SanitizedHTML
+from services.ai.structured_data import extract_structured_recipe
+from services.ai.url_orchestrator import UrlOrchestrator
+
+
+COMPLETE_RECIPE = {
+    "@type": "Recipe",
+    "name": "Structured Pancakes",
+    "recipeIngredient": ["2 eggs", "1 cup milk", "1 cup flour"],
+    "recipeInstructions": ["Whisk everything.", "Fry in a hot pan."],
+    "recipeYield": "4 servings",
+    "totalTime": "PT20M",
+}
+
+
+def _sanitized(recipe: dict[str, object]) -> SanitizedHTML:
+    return SanitizedHTML(
+        "<article><h1>Pancakes</h1></article>",
+        extract_structured_recipe([json.dumps(recipe)]),
+    )
+
+
+def _build_orchestrator(html: str) -> tuple[UrlOrchestrator, AsyncMock, MagicMock]:
+    html_extractor = MagicMock()
+    html_extractor.fetch_sanitized_html = AsyncMock(return_value=html)
+    ai_agent = MagicMock()
+    ai_agent.run_extraction_agent = AsyncMock(
+        return_value=RecipeExtractionResult(
+            title="LLM Pancakes",
+            prep_time_minutes=5,
+            cook_time_minutes=10,
+            serving_min=2,
+            instructions=["Mix", "Cook"],
+            category=RecipeCategory.BREAKFAST,
+            ingredients=[{"name": "egg"}],
+        )
+    )
+    converter = MagicMock()
+    converter.convert_to_recipe_create = MagicMock(return_value=MagicMock())
+
+    draft = MagicMock()
+    draft.id = uuid4()
+    draft.expires_at = datetime.now(UTC) + timedelta(hours=1)
+    draft_manager = MagicMock()
+    draft_manager.create_success_draft = AsyncMock(return_value=draft)
+    draft_manager.create_draft_token = MagicMock(return_value="token")
+
+    orchestrator = UrlOrchestrator(
+        html_extractor=html_extractor,
+        ai_agent=ai_agent,
+        recipe_converter=converter,
+        draft_manager=draft_manager,
+    )
+    return orchestrator, ai_agent.run_extraction_agent, converter
+
+
+def _converted_result(converter: MagicMock) -> RecipeExtractionResult:
+    return converter.convert_to_recipe_create.call_args.args[0]
+
+
+@pytest.mark.asyncio
+async def test_complete_structured_recipe_skips_llm() -> None:
+    orchestrator, run_agent, converter = _build_orchestrator(
+        _sanitized(COMPLETE_RECIPE)
+    )
+
+    outcome = await orchestrator.extract_recipe_from_url(
+        "https://example.com/pancakes", AsyncMock(), MagicMock(id=uuid4())
+    )
+
+    assert outcome.success is True
+    run_agent.assert_not_awaited()
+    result = _converted_result(converter)
+    assert result.title == "Structured Pancakes"
+    assert (result.prep_time_minutes, result.cook_time_minutes) == (0, 20)
+
+
+@pytest.mark.asyncio
+async def test_partial_structured_recipe_fills_gaps_from_llm() -> None:
+    partial = {k: v for k, v in COMPLETE_RECIPE.items() if k != "recipeInstructions"}
+    orchestrator, run_agent, converter = _build_orchestrator(_sanitized(partial))
+
+    await orchestrator.extract_recipe_from_url(
+        "https://example.com/pancakes", AsyncMock(), MagicMock(id=uuid4())
+    )
+
+    run_agent.assert_awaited_once()
+    prompt = run_agent.await_args.args[1]
+    assert prompt.endswith("reading these from the page text: instructions.")
+    result = _converted_result(converter)
+    assert result.title == "Structured Pancakes"
+    assert result.serving_min == 4
+    assert result.instructions == ["Mix", "Cook"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_override_always_uses_llm() -> None:
+    orchestrator, run_agent, converter = _build_orchestrator(
+        _sanitized(COMPLETE_RECIPE)
+    )
+
+    await orchestrator.extract_recipe_from_url(
+        "https://example.com/pancakes",
+        AsyncMock(),
+        MagicMock(id=uuid4()),
+        prompt_override="Only list the ingredients",
+    )
+
+    run_agent.assert_awaited_once()
+    assert _converted_result(converter).title == "LLM Pancakes"
+
+
+@pytest.mark.asyncio
+async def test_stream_reports_structured_data_step_instead_of_ai_call() -> None:
+    orchestrator, run_agent, _ = _build_orchestrator(_sanitized(COMPLETE_RECIPE))
+
+    events = [
+        json.loads(line.removeprefix("data: "))
+        async for line in orchestrator.stream_extraction_progress(
+            "https://example.com/pancakes", AsyncMock(), MagicMock(id=uuid4())
+        )
+    ]
+
+    steps = [event["step"] for event in events]
+    assert "structured_data" in steps
+    assert "ai_call" not in steps
+    assert events[-1]["success"] is True
+    run_agent.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_partial_prompt_names_result_fields_for_servings_and_time() -> None:
+    partial = {"@type": "Recipe", "name": "Pancakes", "recipeIngredient": ["2 eggs"]}
+    orchestrator, run_agent, _ = _build_orchestrator(_sanitized(partial))
+
+    await orchestrator.extract_recipe_from_url(
+        "https://example.com/pancakes", AsyncMock(), MagicMock(id=uuid4())
+    )
+
+    prompt = run_agent.await_args.args[1]
+    assert "instructions, serving_min and serving_max, prep_time_minutes" in prompt
@@ -0,0 +1,263 @@
+"""Tests for schema.org recipe structured data parsing."""
+
+import json
+
+import pytest
+
+from schemas.ai import RecipeExtractionResult
+from schemas.recipes import RecipeCategory
+from services.ai.html_extractor import HTMLExtractionService
+from services.ai.structured_data import (
+    STRUCTURED_DATA_CONFIDENCE,
+    _map_category,
+    extract_structured_recipe,
+    parse_ingredient_line,
+    parse_iso_duration,
+)
+
+
+RECIPE_JSON_LD = {
+    "@context": "https://schema.org",
+    "@graph": [
+        {"@type": "WebPage", "name": "Site page"},
+        {
+            "@type": ["Recipe"],
+            "name": "Weeknight Chili &amp; Beans",
+            "description": "A <b>hearty</b> chili.",
+            "recipeIngredient": [
+                "1 1/2 cups dried beans, rinsed",
+                "2 tbsp. olive oil",
+                "1 onion, finely chopped",
+                "½ tsp salt",
+                "Parsley (optional)",
+            ],
+            "recipeInstructions": [
+                {
+                    "@type": "HowToSection",
+                    "itemListElement": [
+                        {"@type": "HowToStep", "text": "Preheat oven to 350°F."},
+                        {"@type": "HowToStep", "text": "Bake for 45 minutes."},
+                    ],
+                }
+            ],
+            "recipeYield": ["4-6", "4 servings"],
+            "prepTime": "PT15M",
+            "totalTime": "PT1H",
+            "recipeCategory": "Main Course",
+            "recipeCuisine": ["Mexican"],
+        },
+    ],
+}
+
+
+def _page(json_ld: object) -> str:
+    return (
+        "<html><head>"
+        f'<script type="application/ld+json">{json.dumps(json_ld)}</script>'
+        "</head><body><article><h1>Chili</h1></article></body></html>"
+    )
+
+
+def test_json_ld_recipe_is_parsed_from_graph() -> None:
+    recipe = extract_structured_recipe([json.dumps(RECIPE_JSON_LD)])
+
+    assert recipe is not None
+    assert recipe.source == "json-ld"
+    assert recipe.title == "Weeknight Chili & Beans"
+    assert recipe.description == "A hearty chili."
+    assert recipe.instructions == ("Preheat oven to 350°F.", "Bake for 45 minutes.")
+    assert (recipe.serving_min, recipe.serving_max) == (4, 6)
+    assert recipe.category == RecipeCategory.DINNER
+    assert recipe.ethnicity == "Mexican"
+    assert recipe.oven_temperature_f == 350
+    assert recipe.is_complete
+
+
+def test_complete_recipe_builds_extraction_result() -> None:
+    recipe = extract_structured_recipe([json.dumps(RECIPE_JSON_LD)])
+    assert recipe is not None
+
+    result = recipe.to_extraction_result()
+
+    assert isinstance(result, RecipeExtractionResult)
+    assert result.prep_time_minutes == 15
+    # cookTime is derived from totalTime - prepTime
+    assert result.cook_time_minutes == 45
+    assert len(result.ingredients) == 5
+    assert result.confidence_score == STRUCTURED_DATA_CONFIDENCE
+
+
+def test_malformed_json_ld_is_skipped() -> None:
+    blocks = ["{not json", json.dumps({"@type": "Organization", "name": "Acme"})]
+
+    assert extract_structured_recipe(blocks) is None
+
+
+def test_incomplete_recipe_reports_missing_fields() -> None:
+    recipe = extract_structured_recipe(
+        [
+            json.dumps(
+                {
+                    "@type": "Recipe",
+                    "name": "Toast",
+                    "recipeIngredient": ["1 slice bread"],
+                }
+            )
+        ]
+    )
+
+    assert recipe is not None
+    assert not recipe.is_complete
+    assert recipe.missing_fields == ["instructions", "servings", "time"]
+
+
+def test_merge_prefers_page_values_and_keeps_llm_gaps() -> None:
+    recipe = extract_structured_recipe(
+        [
+            json.dumps(
+                {
+                    "@type": "Recipe",
+                    "name": "Page Title",
+                    "recipeIngredient": ["2 eggs"],
+                    "recipeYield": "2",
+                }
+            )
+        ]
+    )
+    assert recipe is not None
+    llm_result = RecipeExtractionResult(
+        title="LLM Title",
+        prep_time_minutes=5,
+        cook_time_minutes=10,
+        serving_min=4,
+        serving_max=8,
+        instructions=["Whisk", "Cook"],
+        category=RecipeCategory.BREAKFAST,
+        ingredients=[{"name": "egg", "quantity_value": 3}],
+        confidence_score=0.7,
+    )
+
+    merged = recipe.merge_into(llm_result)
+
+    assert merged.title == "Page Title"
+    assert merged.ingredients[0].name == "eggs"
+    assert (merged.serving_min, merged.serving_max) == (2, None)
+    assert merged.instructions == ["Whisk", "Cook"]
+    assert merged.category == RecipeCategory.BREAKFAST
+    assert merged.confidence_score == 0.7
+
+
+@pytest.mark.parametrize(
+    ("line", "quantity", "unit", "name"),
+    [
+        ("2 cups all-purpose flour", 2.0, "cup", "all-purpose flour"),
+        ("1½ Tablespoons sugar", 1.5, "tbsp", "sugar"),
+        ("1-2 cloves garlic", 1.0, "clove", "garlic"),
+        ("8 oz of cream cheese", 8.0, "ounce", "cream cheese"),
+        ("3 eggs", 3.0, None, "eggs"),
+        ("Salt and pepper to taste", None, None, "Salt and pepper to taste"),
+    ],
+)
+def test_parse_ingredient_line(
+    line: str, quantity: float | None, unit: str | None, name: str
+) -> None:
+    ingredient = parse_ingredient_line(line)
+
+    assert ingredient is not None
+    assert ingredient.quantity_value == quantity
+    assert ingredient.quantity_unit == unit
+    assert ingredient.name == name
+
+
+def test_parse_ingredient_line_extracts_prep_and_optional() -> None:
+    ingredient = parse_ingredient_line("1 large onion, finely chopped (optional)")
+
+    assert ingredient is not None
+    assert ingredient.name == "large onion"
+    assert ingredient.prep is not None
+    assert ingredient.prep.method == "chopped"
+    assert ingredient.prep.size_descriptor == "finely"
+    assert ingredient.is_optional
+
+
+@pytest.mark.parametrize(
+    ("value", "minutes"),
+    [("PT1H30M", 90), ("PT45M", 45), ("P0DT2H", 120), ("PT90S", 2), (20, 20)],
+)
+def test_parse_iso_duration(value: object, minutes: int) -> None:
+    assert parse_iso_duration(value) == minutes
+
+
+def test_parse_iso_duration_rejects_garbage() -> None:
+    assert parse_iso_duration("about an hour") is None
+    assert parse_iso_duration("P") is None
+
+
+def test_sanitizer_captures_json_ld_before_removing_scripts() -> None:
+    sanitized = HTMLExtractionService()._sanitize_html(
+        _page(RECIPE_JSON_LD), "https://example.com/chili"
+    )
+
+    assert "<script" not in sanitized
+    assert sanitized.structured_recipe is not None
+    assert sanitized.structured_recipe.title == "Weeknight Chili & Beans"
+
+
+def test_sanitizer_reads_microdata_and_skips_nested_items() -> None:
+    html = """
+    <html><body>
+      <div itemscope itemtype="http://schema.org/Recipe">
+        <h1 itemprop="name">Pancakes</h1>
+        <div itemprop="author" itemscope itemtype="http://schema.org/Person">
+          <span itemprop="name">Jane Doe</span>
+        </div>
+        <meta itemprop="prepTime" content="PT10M">
+        <span itemprop="recipeYield">Serves 2</span>
+        <ul>
+          <li itemprop="recipeIngredient">2 eggs</li>
+          <li itemprop="recipeIngredient">1 cup milk</li>
+        </ul>
+        <div itemprop="recipeInstructions">Mix and fry.</div>
+      </div>
+    </body></html>
+    """
+
+    sanitized = HTMLExtractionService()._sanitize_html(html, "https://example.com")
+    recipe = sanitized.structured_recipe
+
+    assert recipe is not None
+    assert recipe.source == "microdata"
+    assert recipe.title == "Pancakes"
+    assert recipe.prep_time_minutes == 10
+    assert recipe.serving_min == 2
+    assert [i.name for i in recipe.ingredients] == ["eggs", "milk"]
+    assert recipe.is_complete
+
+
+def test_sanitizer_without_markup_has_no_structured_recipe() -> None:
+    sanitized = HTMLExtractionService()._sanitize_html(
+        "<html><body><article><p>Just a story</p></article></body></html>",
+        "https://example.com",
+    )
+
+    assert sanitized.structured_recipe is None
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("Sweet Potato Casserole", None),
+        ("Shepherd's Pie", RecipeCategory.DINNER),
+        ("Chicken Pot Pie", RecipeCategory.DINNER),
+        ("Apple Pie", RecipeCategory.DESSERT),
+        (["Cookies", "Dinner"], RecipeCategory.DESSERT),
+        ("Hors d'oeuvres", RecipeCategory.APPETIZER),
+        ("Main Course", RecipeCategory.DINNER),
+        ("Maintenance diet", None),
+        ("Piedmontese", None),
+    ],
+)
+def test_category_keywords_match_whole_words(
+    value: str | list[str], expected: RecipeCategory | None
+) -> None:
+    assert _map_category(value) == expected
@@ -0,0 +1,258 @@
+"""Tests for the shared URL content cache."""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from services.ai.html_extractor import HTMLExtractionService, SanitizedHTML
+from services.ai.markdown_extractor import MarkdownExtractionService
+from services.ai.url_cache import CacheValidators, UrlContentCache, normalize_url
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fetcher(
+    pages: list[str | None], validators_out: dict[str, object] | None = None
+) -> AsyncMock:
+    """Build a fetcher returning ``pages`` in order (None = 304)."""
+
+    async def fetch(url: str, validators: CacheValidators) -> SanitizedHTML | None:
+        page = pages.pop(0)
+        if page is None:
+            validators.not_modified = True
+            return None
+        for key, value in (validators_out or {}).items():
+            setattr(validators, key, value)
+        return SanitizedHTML(page)
+
+    return AsyncMock(side_effect=fetch)
+
+
+@pytest.mark.parametrize(
+    ("url", "expected"),
+    [
+        ("HTTPS://Example.COM:443/recipe#step-2", "https://example.com/recipe"),
+        ("https://example.com", "https://example.com/"),
+        (
+            "https://example.com/r?utm_source=x&b=2&a=1&fbclid=abc",
+            "https://example.com/r?a=1&b=2",
+        ),
+        ("http://example.com:8080/r", "http://example.com:8080/r"),
+    ],
+)
+def test_normalize_url(url: str, expected: str) -> None:
+    assert normalize_url(url) == expected
+
+
+@pytest.mark.asyncio
+async def test_fresh_entry_is_shared_across_url_variants() -> None:
+    cache = UrlContentCache()
+    fetch = _fetcher(["<p>Soup</p>"])
+
+    first = await cache.get_or_fetch("https://example.com/soup?utm_medium=x", fetch)
+    second = await cache.get_or_fetch("https://EXAMPLE.com/soup#comments", fetch)
+
+    assert first is second
+    assert fetch.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_is_revalidated_with_stored_validators() -> None:
+    clock = FakeClock()
+    cache = UrlContentCache(ttl_seconds=60, clock=clock)
+    fetch = _fetcher(["<p>Soup</p>", None], {"etag": '"v1"'})
+
+    first = await cache.get_or_fetch("https://example.com/soup", fetch)
+    clock.now += 61
+    second = await cache.get_or_fetch("https://example.com/soup", fetch)
+
+    assert second is first
+    sent: CacheValidators = fetch.await_args.args[1]
+    assert sent.etag == '"v1"'
+    assert second.fetched_at == clock.now
+
+
+@pytest.mark.asyncio
+async def test_changed_page_replaces_stale_entry() -> None:
+    clock = FakeClock()
+    cache = UrlContentCache(ttl_seconds=60, clock=clock)
+    fetch = _fetcher(["<p>Old</p>", "<p>New</p>"])
+
+    await cache.get_or_fetch("https://example.com/soup", fetch)
+    clock.now += 61
+    page = await cache.get_or_fetch("https://example.com/soup", fetch)
+
+    assert page.sanitized_html == "<p>New</p>"
+    assert len(cache) == 1
+    assert cache.total_chars == len("<p>New</p>")
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_entries_and_size() -> None:
+    cache = UrlContentCache(max_entries=2, max_chars=25)
+    fetch = _fetcher(["a" * 10, "b" * 10, "c" * 10])
+
+    await cache.get_or_fetch("https://example.com/a", fetch)
+    await cache.get_or_fetch("https://example.com/b", fetch)
+    # Touch "a" so "b" is the least recently used entry
+    await cache.get_or_fetch("https://example.com/a", fetch)
+    await cache.get_or_fetch("https://example.com/c", fetch)
+
+    assert len(cache) == 2
+    assert cache.total_chars == 20
+    page = await cache.get_or_fetch("https://example.com/a", fetch)
+    assert page.sanitized_html == "a" * 10
+
+    cache.attach_markdown(page, "m" * 10)
+    # 30 chars exceed the bound, so the older "c" entry is evicted
+    assert len(cache) == 1
+    assert cache.total_chars == 20
+
+
+@pytest.mark.asyncio
+async def test_no_store_and_empty_pages_are_not_cached() -> None:
+    cache = UrlContentCache()
+    fetch = _fetcher(["<p>Private</p>", ""], {"cacheable": False})
+
+    await cache.get_or_fetch("https://example.com/private", fetch)
+    await cache.get_or_fetch("https://example.com/empty", fetch)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_fetch() -> None:
+    cache = UrlContentCache()
+    release = asyncio.Event()
+
+    async def slow_fetch(url: str, validators: CacheValidators) -> SanitizedHTML:
+        await release.wait()
+        return SanitizedHTML("<p>Stew</p>")
+
+    fetch = AsyncMock(side_effect=slow_fetch)
+    waiters = [
+        asyncio.create_task(cache.get_or_fetch("https://example.com/stew", fetch))
+        for _ in range(5)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    pages = await asyncio.gather(*waiters)
+
+    assert fetch.await_count == 1
+    assert all(page is pages[0] for page in pages)
+
+
+@pytest.mark.asyncio
+async def test_fetch_errors_are_not_cached() -> None:
+    cache = UrlContentCache()
+    fetch = AsyncMock(side_effect=HTTPException(status_code=400, detail="boom"))
+
+    with pytest.raises(HTTPException):
+        await cache.get_or_fetch("https://example.com/broken", fetch)
+
+    assert len(cache) == 0
+
+
+@pytest.mark.asyncio
+async def test_extractor_sends_conditional_request_and_keeps_page_on_304() -> None:
+    clock = FakeClock()
+    extractor = HTMLExtractionService(cache=UrlContentCache(ttl_seconds=1, clock=clock))
+    url = "https://example.com/recipe"
+    first = httpx.Response(
+        200,
+        headers={"content-type": "text/html", "etag": '"abc"'},
+        content=b"<html><body><article>Pie</article></body></html>",
+        request=httpx.Request("GET", url),
+    )
+    not_modified = httpx.Response(304, request=httpx.Request("GET", url))
+
+    with (
+        patch.object(HTMLExtractionService, "_validate_url"),
+        patch("httpx.AsyncClient") as mock_client,
+    ):
+        send = AsyncMock(side_effect=[first, not_modified])
+        mock_client.return_value.__aenter__.return_value.send = send
+        mock_client.return_value.__aenter__.return_value.build_request = httpx.Request
+
+        original = await extractor.fetch_and_sanitize(url)
+        clock.now += 5
+        revalidated = await extractor.fetch_and_sanitize(url)
+
+    assert revalidated is original
+    assert "Pie" in revalidated
+    conditional_request: httpx.Request = send.await_args_list[1].args[0]
+    assert conditional_request.headers["If-None-Match"] == '"abc"'
+
+
+@pytest.mark.asyncio
+async def test_markdown_is_converted_once_per_cached_page() -> None:
+    service = MarkdownExtractionService(cache=UrlContentCache())
+    html = SanitizedHTML("<h1>Simple Pasta</h1><p>200g pasta</p>")
+
+    with (
+        patch.object(
+            HTMLExtractionService,
+            "_fetch_and_sanitize_conditional",
+            new_callable=AsyncMock,
+            return_value=html,
+        ) as fetch,
+        patch.object(
+            service.markdown_converter,
+            "convert",
+            wraps=service.markdown_converter.convert,
+        ) as convert,
+    ):
+        first = await service.fetch_as_markdown("https://example.com/pasta")
+        second = await service.fetch_as_markdown("https://example.com/pasta")
+
+    assert first == second
+    assert "Simple Pasta" in first
+    assert fetch.await_count == 1
+    assert convert.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_variants_are_cached_separately() -> None:
+    cache = UrlContentCache()
+    fetch = _fetcher(["<p>Truncated</p>", "<p>Full page</p>"])
+
+    small = await cache.get_or_fetch("https://example.com/soup", fetch, variant="1")
+    large = await cache.get_or_fetch("https://example.com/soup", fetch, variant="5")
+    again = await cache.get_or_fetch("https://example.com/soup", fetch, variant="1")
+
+    assert small.sanitized_html == "<p>Truncated</p>"
+    assert large.sanitized_html == "<p>Full page</p>"
+    assert again is small
+    assert fetch.await_count == 2
+
+    cache.attach_markdown(large, "Full page")
+    assert cache.total_chars == small.size + large.size
+
+
+@pytest.mark.asyncio
+async def test_extractors_with_different_limits_do_not_share_pages() -> None:
+    cache = UrlContentCache()
+    chat_fetch = HTMLExtractionService(timeout=10, max_size=1024 * 1024, cache=cache)
+    import_fetch = HTMLExtractionService(cache=cache)
+
+    with patch.object(
+        HTMLExtractionService,
+        "_fetch_and_sanitize_conditional",
+        new_callable=AsyncMock,
+        return_value=SanitizedHTML("<p>Stew</p>"),
+    ) as fetch:
+        await chat_fetch.fetch_cached_page("https://example.com/stew")
+        await import_fetch.fetch_cached_page("https://example.com/stew")
+        await import_fetch.fetch_cached_page("https://example.com/stew")
+
+    assert fetch.await_count == 2
+    assert len(cache) == 2
@@ -30,7 +30,11 @@ os.environ.setdefault("ENVIRONMENT", "test")
 from core.config import get_settings
 from core.security import get_password_hash
 from dependencies.auth import get_current_user
-from dependencies.db import get_db
+from dependencies.db import (
+    get_db,
+    get_read_session_factory,
+    get_stream_session_factory,
+)
 from main import app
 from models.base import Base
 from models.meal_history import Meal
@@ -137,6 +141,12 @@ class _FakeSession:
     async def close(self):  # pragma: no cover - no-op
         return None
 
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_exc_info):
+        await self.close()
+
 
 async def _override_get_db_factory() -> AsyncGenerator[_FakeSession, None]:
     """Yield a fake session for dependency override."""
@@ -159,11 +169,15 @@ async def _override_get_current_user_factory():  # pragma: no cover - simple hel
 async def async_client() -> AsyncGenerator[AsyncClient, None]:
     """Async client with DB & auth overrides (auto-auth)."""
     app.dependency_overrides[get_db] = _override_get_db_factory
+    app.dependency_overrides[get_stream_session_factory] = lambda: _FakeSession
+    app.dependency_overrides[get_read_session_factory] = lambda: _FakeSession
     app.dependency_overrides[get_current_user] = _override_get_current_user_factory
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as client:
         yield client
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_stream_session_factory, None)
+    app.dependency_overrides.pop(get_read_session_factory, None)
     app.dependency_overrides.pop(get_current_user, None)
 
 
@@ -243,11 +257,15 @@ async def auth_client() -> AsyncGenerator[tuple[AsyncClient, AsyncSession], None
             yield session
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_stream_session_factory] = lambda: SessionLocal
+    app.dependency_overrides[get_read_session_factory] = lambda: SessionLocal
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as c:
         async with SessionLocal() as session:
             yield c, session
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_stream_session_factory, None)
+    app.dependency_overrides.pop(get_read_session_factory, None)
     await engine.dispose()
 
 
@@ -299,9 +317,13 @@ async def async_db_session() -> AsyncGenerator[AsyncSession, None]:
             yield session
 
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_stream_session_factory] = lambda: SessionLocal
+    app.dependency_overrides[get_read_session_factory] = lambda: SessionLocal
     try:
         async with SessionLocal() as session:
             yield session
     finally:
         app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_stream_session_factory, None)
+        app.dependency_overrides.pop(get_read_session_factory, None)
         await engine.dispose()
@@ -0,0 +1,71 @@
+"""Tests for the bounded password hashing executor."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from core.password_hashing import PasswordHashingBusyError, PasswordHashingExecutor
+
+
+def _blocking(gate: threading.Event) -> str:
+    gate.wait(timeout=5)
+    return threading.current_thread().name
+
+
+@pytest.mark.asyncio
+async def test_run_offloads_to_named_worker_threads() -> None:
+    executor = PasswordHashingExecutor(workers=1)
+    gate = threading.Event()
+    gate.set()
+    try:
+        thread_name = await executor.run("hash", _blocking, gate)
+    finally:
+        executor.shutdown()
+
+    assert thread_name.startswith("password-hash")
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_immediately() -> None:
+    executor = PasswordHashingExecutor(workers=1, max_queue=1, queue_timeout=5)
+    gate = threading.Event()
+    try:
+        running = asyncio.create_task(executor.run("verify", _blocking, gate))
+        await asyncio.sleep(0.05)
+        queued = asyncio.create_task(executor.run("verify", _blocking, gate))
+        await asyncio.sleep(0)
+        assert executor.waiting == 1
+
+        with pytest.raises(PasswordHashingBusyError, match="queue_full"):
+            await executor.run("verify", _blocking, gate)
+
+        gate.set()
+        await asyncio.gather(running, queued)
+    finally:
+        gate.set()
+        executor.shutdown()
+
+    assert executor.waiting == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_times_out() -> None:
+    executor = PasswordHashingExecutor(workers=1, max_queue=4, queue_timeout=0.05)
+    gate = threading.Event()
+    try:
+        running = asyncio.create_task(executor.run("hash", _blocking, gate))
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(PasswordHashingBusyError, match="queue_timeout"):
+            await executor.run("hash", _blocking, gate)
+
+        gate.set()
+        await running
+        # The slot is released, so the next call runs straight away
+        assert await executor.run("hash", _blocking, gate)
+    finally:
+        gate.set()
+        executor.shutdown()
@@ -0,0 +1,87 @@
+"""Tests for the stage timer and sampled request profiler."""
+
+from __future__ import annotations
+
+import itertools
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import core.profiling as profiling
+from core.profiling import maybe_profile, stage_timer
+
+
+@pytest.fixture
+def histogram(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    histogram = MagicMock()
+    monkeypatch.setattr(profiling, "_stage_duration_ms", histogram)
+    return histogram
+
+
+def _use_profile_settings(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, every_n: int
+) -> None:
+    settings = SimpleNamespace(
+        PROFILE_SAMPLE_EVERY_N=every_n, PROFILER="cprofile", PROFILE_DIR=str(tmp_path)
+    )
+    monkeypatch.setattr(profiling, "get_settings", lambda: settings)
+    monkeypatch.setattr(profiling, "_request_counter", itertools.count(1))
+
+
+def test_stage_timer_records_outcome(histogram: MagicMock) -> None:
+    with stage_timer("chat", "history_load") as timer:
+        pass
+    with pytest.raises(RuntimeError), stage_timer("chat", "finalize"):
+        raise RuntimeError("boom")
+
+    ok_call, error_call = histogram.record.call_args_list
+    assert ok_call.args == (
+        timer.duration_ms,
+        {"pipeline": "chat", "stage": "history_load", "outcome": "ok"},
+    )
+    assert error_call.args[1]["outcome"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_stage_timer_decorates_sync_and_async(histogram: MagicMock) -> None:
+    @stage_timer("chat", "normalize")
+    def normalize(value: int) -> int:
+        return value + 1
+
+    @stage_timer("chat", "tool", tool_name="search_recipes")
+    async def search(value: int) -> int:
+        return value * 2
+
+    async with stage_timer("chat", "context_load"):
+        assert normalize(1) == 2
+        assert await search(2) == 4
+
+    stages = [call.args[1]["stage"] for call in histogram.record.call_args_list]
+    assert stages == ["normalize", "tool", "context_load"]
+    assert histogram.record.call_args_list[1].args[1]["tool_name"] == "search_recipes"
+
+
+def test_maybe_profile_samples_every_nth_request(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _use_profile_settings(monkeypatch, tmp_path, every_n=2)
+
+    for _ in range(4):
+        with maybe_profile("chat_turn"):
+            sum(range(1000))
+
+    dumps = sorted(tmp_path.glob("chat_turn-*.prof"))
+    assert len(dumps) == 2
+
+
+def test_maybe_profile_disabled_by_default(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    _use_profile_settings(monkeypatch, tmp_path, every_n=0)
+
+    with maybe_profile("chat_turn"):
+        pass
+
+    assert list(tmp_path.iterdir()) == []
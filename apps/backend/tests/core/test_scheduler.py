@@ -0,0 +1,207 @@
+"""Tests for the scheduled background jobs."""
+
+from __future__ import annotations
+
+import asyncio
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import core.scheduler as scheduler_module
+from core.scheduler import (
+    _title_messages,
+    run_title_generation,
+    run_weather_prewarm,
+    setup_scheduler,
+)
+
+
+def _message(text: str | None, role: str = "user") -> SimpleNamespace:
+    blocks = [{"type": "text", "text": text}] if text is not None else None
+    return SimpleNamespace(id=uuid.uuid4(), role=role, content_blocks=blocks)
+
+
+def _conversation() -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(), title="Chat 1", created_at=datetime(2026, 1, 1, tzinfo=UTC)
+    )
+
+
+class FakeSessions:
+    """SchedulerSessionLocal stand-in recording every executed statement."""
+
+    def __init__(
+        self, conversations: list[SimpleNamespace], messages: dict[uuid.UUID, list]
+    ) -> None:
+        self.conversations = conversations
+        self.messages = messages
+        self.statements: list[Any] = []
+        self.updates: list[list[dict[str, Any]]] = []
+
+    async def _execute(self, statement: Any, params: Any = None) -> MagicMock:
+        self.statements.append(statement)
+        result = MagicMock()
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        if sql.startswith("UPDATE"):
+            self.updates.append(params)
+        elif "row_number()" in sql:
+            result.all.return_value = [
+                SimpleNamespace(conversation_id=conversation_id, **vars(message))
+                for conversation_id, messages in self.messages.items()
+                for message in messages
+            ]
+        else:
+            result.all.return_value = self.conversations
+        return result
+
+    def __call__(self) -> Any:
+        session = MagicMock()
+        session.execute = AsyncMock(side_effect=self._execute)
+        session.commit = AsyncMock()
+
+        @asynccontextmanager
+        async def context() -> AsyncIterator[MagicMock]:
+            yield session
+
+        return context()
+
+
+@asynccontextmanager
+async def _lock(acquired: bool) -> AsyncIterator[bool]:
+    yield acquired
+
+
+@pytest.fixture
+def fake_sessions(monkeypatch: pytest.MonkeyPatch) -> FakeSessions:
+    conversations = [_conversation() for _ in range(5)]
+    messages = {
+        conversation.id: [_message(f"question {i}"), _message("answer", "assistant")]
+        for i, conversation in enumerate(conversations)
+    }
+    sessions = FakeSessions(conversations, messages)
+    monkeypatch.setattr(scheduler_module, "SchedulerSessionLocal", sessions)
+    monkeypatch.setattr(scheduler_module, "_job_lock", lambda _: _lock(True))
+    return sessions
+
+
+def test_title_messages_skips_invalid_blocks() -> None:
+    """Test that only messages with text blocks are kept."""
+    messages = [
+        _message("Need dinner ideas"),
+        _message(None),
+        SimpleNamespace(id=1, role="assistant", content_blocks=[{"type": "tool"}]),
+        _message("Try pasta", "assistant"),
+    ]
+
+    assert _title_messages(messages) == [
+        {"role": "user", "content": "Need dinner ideas"},
+        {"role": "assistant", "content": "Try pasta"},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_titles_generated_concurrently_and_bulk_updated(
+    fake_sessions: FakeSessions, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test one message query, bounded concurrency and one bulk update per batch."""
+    in_flight = 0
+    peak = 0
+
+    async def fake_generate(messages: list[dict[str, str]], **_: Any) -> str | None:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+        if messages[0]["content"] == "question 3":
+            raise RuntimeError("model unavailable")
+        return f"Title for {messages[0]['content']}"
+
+    monkeypatch.setattr(scheduler_module, "generate_conversation_title", fake_generate)
+    monkeypatch.setattr(scheduler_module, "TITLE_CONCURRENCY", 2)
+    monkeypatch.setattr(scheduler_module, "TITLE_BATCH_SIZE", 3)
+
+    await run_title_generation()
+
+    assert peak == 2
+    # Candidates, then a message query and an update for each of 2 batches
+    assert len(fake_sessions.statements) == 5
+    window_sql = str(fake_sessions.statements[1].compile(dialect=postgresql.dialect()))
+    assert "row_number() OVER (PARTITION BY chat_messages.conversation_id" in window_sql
+
+    updated = [row for batch in fake_sessions.updates for row in batch]
+    expected_ids = [c.id for i, c in enumerate(fake_sessions.conversations) if i != 3]
+    assert [row["conversation_id"] for row in updated] == expected_ids
+    assert updated[0]["new_title"] == "Title for question 0"
+
+
+@pytest.mark.asyncio
+async def test_skips_run_when_lock_is_held(
+    fake_sessions: FakeSessions, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that an overlapping run exits without touching the database."""
+    monkeypatch.setattr(scheduler_module, "_job_lock", lambda _: _lock(False))
+
+    await run_title_generation()
+
+    assert fake_sessions.statements == []
+
+
+@pytest.mark.parametrize("job_id", ["generate_chat_titles", "prewarm_weather_cache"])
+def test_jobs_do_not_overlap(job_id: str) -> None:
+    """Test locked jobs run at most one instance at a time."""
+    job = setup_scheduler().get_job(job_id)
+
+    assert job.max_instances == 1
+    assert job.coalesce is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(("acquired", "expected_calls"), [(True, 1), (False, 0)])
+async def test_weather_prewarm_runs_under_its_own_lock(
+    fake_sessions: FakeSessions,
+    monkeypatch: pytest.MonkeyPatch,
+    acquired: bool,
+    expected_calls: int,
+) -> None:
+    """Test a shared-cache pre-warm takes its lock and skips when it is held."""
+    lock_ids: list[int] = []
+
+    def job_lock(lock_id: int) -> Any:
+        lock_ids.append(lock_id)
+        return _lock(acquired)
+
+    prewarm = AsyncMock(return_value=3)
+    shared = SimpleNamespace(backend=object())
+    monkeypatch.setattr(scheduler_module, "get_weather_cache", lambda: shared)
+    monkeypatch.setattr(scheduler_module, "_job_lock", job_lock)
+    monkeypatch.setattr(scheduler_module, "prewarm_weather_cache", prewarm)
+
+    await run_weather_prewarm()
+
+    assert lock_ids == [scheduler_module.WEATHER_PREWARM_LOCK_ID]
+    assert lock_ids[0] != scheduler_module.TITLE_GENERATION_LOCK_ID
+    assert prewarm.await_count == expected_calls
+
+
+@pytest.mark.asyncio
+async def test_weather_prewarm_without_shared_cache_runs_in_every_process(
+    fake_sessions: FakeSessions, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test per-process caches are warmed without taking the advisory lock."""
+    prewarm = AsyncMock(return_value=3)
+    local_only = SimpleNamespace(backend=None)
+    monkeypatch.setattr(scheduler_module, "get_weather_cache", lambda: local_only)
+    monkeypatch.setattr(scheduler_module, "_job_lock", lambda _: _lock(False))
+    monkeypatch.setattr(scheduler_module, "prewarm_weather_cache", prewarm)
+
+    await run_weather_prewarm()
+
+    prewarm.assert_awaited_once()
@@ -0,0 +1,122 @@
+"""Tests for the SSE response writer."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from starlette.types import Message
+
+from core.sse import HEARTBEAT_FRAME, SseResponse
+
+
+class _Client:
+    """Minimal ASGI peer recording body writes; disconnects on demand."""
+
+    def __init__(self) -> None:
+        self.bodies: list[bytes] = []
+        self.finished = False
+        self.gone = asyncio.Event()
+
+    async def receive(self) -> dict[str, Any]:
+        await self.gone.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message: Message) -> None:
+        if message["type"] != "http.response.body":
+            return
+        if message["more_body"]:
+            self.bodies.append(message["body"])
+        else:
+            self.finished = True
+
+
+async def _run(response: SseResponse, client: _Client) -> None:
+    await response({"type": "http"}, client.receive, client.send)
+
+
+@pytest.mark.asyncio
+async def test_frames_produced_together_share_one_write() -> None:
+    async def events() -> AsyncIterator[str]:
+        yield "data: a\n\n"
+        yield "data: b\n\n"
+        yield "data: c\n\n"
+        await asyncio.sleep(0.01)
+        yield "data: d\n\n"
+
+    client = _Client()
+    await _run(SseResponse(events(), heartbeat_interval=0), client)
+
+    assert client.bodies == [b"data: a\n\ndata: b\n\ndata: c\n\n", b"data: d\n\n"]
+    assert client.finished
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_sends_heartbeat_comments() -> None:
+    async def events() -> AsyncIterator[str]:
+        await asyncio.sleep(0.05)
+        yield "data: late\n\n"
+
+    client = _Client()
+    await _run(SseResponse(events(), heartbeat_interval=0.01), client)
+
+    assert client.bodies[0] == HEARTBEAT_FRAME
+    assert client.bodies[-1] == b"data: late\n\n"
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_the_event_source() -> None:
+    cleaned_up = asyncio.Event()
+
+    async def events() -> AsyncIterator[str]:
+        yield "data: first\n\n"
+        try:
+            await asyncio.Event().wait()  # a model call that never returns
+        except asyncio.CancelledError:
+            cleaned_up.set()
+            raise
+        yield "data: never\n\n"
+
+    client = _Client()
+    task = asyncio.create_task(
+        _run(SseResponse(events(), heartbeat_interval=0), client)
+    )
+    await asyncio.sleep(0.01)
+    client.gone.set()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert cleaned_up.is_set()
+    assert client.bodies == [b"data: first\n\n"]
+    assert not client.finished
+
+
+@pytest.mark.asyncio
+async def test_slow_client_back_pressures_the_producer() -> None:
+    produced = 0
+
+    async def events() -> AsyncIterator[str]:
+        nonlocal produced
+        for i in range(50):
+            produced += 1
+            yield f"data: {i}\n\n"
+
+    release = asyncio.Event()
+    client = _Client()
+    record = client.send
+
+    async def slow_send(message: Message) -> None:
+        if message["type"] == "http.response.body":
+            await release.wait()
+        await record(message)
+
+    response = SseResponse(events(), heartbeat_interval=0, max_pending=4)
+    task = asyncio.create_task(response({"type": "http"}, client.receive, slow_send))
+    await asyncio.sleep(0.01)
+    # One coalesced write in flight, a full queue and one frame waiting on put
+    assert produced <= 2 * 4 + 1
+    release.set()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert b"".join(client.bodies).count(b"data: ") == 50
@@ -0,0 +1,146 @@
+"""Tests for the authenticated user cache and get_current_user."""
+
+from __future__ import annotations
+
+import uuid
+from collections.abc import Iterator
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from pydantic import ValidationError
+
+import dependencies.auth as auth_deps
+from core.security import create_access_token
+from core.user_cache import UserCache, clear_user_cache, invalidate_cached_user
+from crud.user import user_crud
+from schemas.auth import CurrentUser
+from schemas.user_preferences import UserProfileUpdate
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _snapshot(user_id: uuid.UUID | None = None) -> CurrentUser:
+    return CurrentUser(
+        id=user_id or uuid.uuid4(), username="alice", email="alice@example.test"
+    )
+
+
+def _user_row(user_id: uuid.UUID, username: str = "alice") -> SimpleNamespace:
+    return SimpleNamespace(
+        id=user_id,
+        username=username,
+        email=f"{username}@example.test",
+        first_name=None,
+        last_name=None,
+        is_admin=False,
+        is_verified=True,
+        created_at=None,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_user_cache() -> Iterator[None]:
+    clear_user_cache()
+    yield
+    clear_user_cache()
+
+
+def test_snapshot_is_immutable() -> None:
+    user = _snapshot()
+
+    with pytest.raises(ValidationError):
+        user.is_admin = True  # type: ignore[misc]
+
+
+def test_entries_expire_after_ttl() -> None:
+    clock = FakeClock()
+    cache = UserCache(ttl_seconds=30, clock=clock)
+    user = _snapshot()
+    cache.set((user.id, 1), user, cache.epoch)
+
+    assert cache.get((user.id, 1)) is user
+    assert cache.get((user.id, 2)) is None
+    clock.now += 31
+    assert cache.get((user.id, 1)) is None
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_every_token_of_the_user() -> None:
+    cache = UserCache()
+    user, other = _snapshot(), _snapshot()
+    for key, snapshot in [((user.id, 1), user), ((user.id, 2), user)]:
+        cache.set(key, snapshot, cache.epoch)
+    cache.set((other.id, 1), other, cache.epoch)
+
+    cache.invalidate(user.id)
+
+    assert cache.get((user.id, 1)) is None
+    assert cache.get((user.id, 2)) is None
+    assert cache.get((other.id, 1)) is other
+
+
+def test_lookup_started_before_invalidation_is_not_stored() -> None:
+    cache = UserCache()
+    user = _snapshot()
+    epoch = cache.epoch
+
+    cache.invalidate(user.id)
+    cache.set((user.id, 1), user, epoch)
+
+    assert cache.get((user.id, 1)) is None
+
+
+def test_lru_bound() -> None:
+    cache = UserCache(max_entries=2)
+    users = [_snapshot() for _ in range(3)]
+    for user in users:
+        cache.set((user.id, None), user, cache.epoch)
+
+    assert len(cache) == 2
+    assert cache.get((users[0].id, None)) is None
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_reads_db_once_per_token(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user_id = uuid.uuid4()
+    lookup = AsyncMock(return_value=_user_row(user_id))
+    monkeypatch.setattr(auth_deps, "get_user_by_id", lookup)
+    token = create_access_token({"sub": str(user_id)}, timedelta(minutes=5))
+
+    first = await auth_deps.get_current_user(MagicMock(), token)
+    second = await auth_deps.get_current_user(MagicMock(), token)
+
+    assert isinstance(first, CurrentUser)
+    assert second is first
+    assert lookup.await_count == 1
+
+    invalidate_cached_user(user_id)
+    await auth_deps.get_current_user(MagicMock(), token)
+    assert lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_profile_update_invalidates_cached_user(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    user_id = uuid.uuid4()
+    row = _user_row(user_id)
+    monkeypatch.setattr(auth_deps, "get_user_by_id", AsyncMock(return_value=row))
+    token = create_access_token({"sub": str(user_id)}, timedelta(minutes=5))
+    assert (await auth_deps.get_current_user(MagicMock(), token)).username == "alice"
+
+    db = MagicMock(commit=AsyncMock(), refresh=AsyncMock())
+    await user_crud.update(db, row, UserProfileUpdate(username="alicia"))  # type: ignore[arg-type]
+
+    refreshed = await auth_deps.get_current_user(MagicMock(), token)
+    assert refreshed.username == "alicia"
@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from typing import Any, cast
 from unittest.mock import AsyncMock, patch
+from uuid import uuid4
 
 import pytest
 from pydantic_ai import models
@@ -15,7 +18,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from models.user_preferences import UserPreferences
 from services.chat_agent import ChatAgentDeps, get_chat_agent
-from services.chat_agent.tools.recipes import tool_search_recipes
+from services.chat_agent.tools.meal_history import tool_get_meal_plan_history
+from services.chat_agent.tools.recipes import (
+    tool_get_recipe_details,
+    tool_search_recipes,
+)
 
 
 # Block any real model requests in tests
@@ -44,6 +51,12 @@ class EmptyResult:
     def all(self) -> list[Any]:
         return []
 
+    def scalars(self) -> EmptyResult:
+        return self
+
+    def scalar_one_or_none(self) -> None:
+        return None
+
 
 class ConcurrencyCheckingSession:
     """Fake async session that fails if execute calls overlap."""
@@ -72,13 +85,32 @@ class ConcurrencyCheckingSession:
         return None
 
 
+class RecordingSessionFactory:
+    """Session factory double tracking every session it opens."""
+
+    def __init__(self) -> None:
+        self.sessions: list[ConcurrencyCheckingSession] = []
+        self.open_count = 0
+        self.max_open_count = 0
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[ConcurrencyCheckingSession]:
+        session = ConcurrencyCheckingSession()
+        self.sessions.append(session)
+        self.open_count += 1
+        self.max_open_count = max(self.max_open_count, self.open_count)
+        try:
+            yield session
+        finally:
+            self.open_count -= 1
+
+
 class TestChatAgentDeps:
     """Tests for ChatAgentDeps dataclass."""
 
     def test_deps_with_no_preferences(self) -> None:
         """Test ChatAgentDeps can be constructed without preferences."""
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -98,7 +130,6 @@ class TestChatAgentDeps:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -110,46 +141,43 @@ class TestChatAgentDeps:
         assert deps.memory_content == "User prefers spicy food"
 
     @pytest.mark.asyncio
-    async def test_use_db_serializes_shared_session_access(self) -> None:
-        """Test shared assistant DB session access is serialized."""
-        db = AsyncMock()
+    async def test_use_db_opens_independent_sessions(self) -> None:
+        """Test concurrent tool DB access gets separate sessions in parallel."""
+        factory = RecordingSessionFactory()
         deps = ChatAgentDeps(
-            db=db,
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
+            session_factory=factory,
         )
 
         active_users = 0
         max_active_users = 0
-        events: list[str] = []
 
-        async def use_shared_db(label: str) -> None:
+        async def use_db() -> AsyncSession:
             nonlocal active_users, max_active_users
-            async with deps.use_db() as guarded_db:
-                assert guarded_db is db
+            async with deps.use_db() as db:
                 active_users += 1
                 max_active_users = max(max_active_users, active_users)
-                events.append(f"{label}:start")
                 await asyncio.sleep(0)
-                events.append(f"{label}:end")
                 active_users -= 1
+                return db
 
-        await asyncio.gather(use_shared_db("first"), use_shared_db("second"))
+        first, second = await asyncio.gather(use_db(), use_db())
 
-        assert max_active_users == 1
-        assert len(events) == 4
-        assert set(events) == {"first:start", "first:end", "second:start", "second:end"}
+        assert max_active_users == 2
+        assert first is not second
+        assert factory.open_count == 0
 
     @pytest.mark.asyncio
-    async def test_concurrent_recipe_search_serializes_shared_session(self) -> None:
-        """Test concurrent DB-backed recipe tools do not overlap session use."""
-        db = ConcurrencyCheckingSession()
+    async def test_concurrent_recipe_search_uses_session_per_call(self) -> None:
+        """Test concurrent DB-backed recipe tools never share a session."""
+        factory = RecordingSessionFactory()
         deps = ChatAgentDeps(
-            db=cast(AsyncSession, db),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
+            read_session_factory=factory,
         )
         ctx = cast(Any, MockRunContext(deps))
 
@@ -163,8 +191,33 @@ class TestChatAgentDeps:
                 tool_search_recipes(ctx, query="pasta"),
             )
 
-        assert db.execute_call_count == 4
-        assert db.max_active_execute_count == 1
+        # Text and vector searches each get their own read session
+        assert len(factory.sessions) == 4
+        assert sum(db.execute_call_count for db in factory.sessions) == 4
+        assert all(db.max_active_execute_count == 1 for db in factory.sessions)
+        assert factory.open_count == 0
+
+    @pytest.mark.asyncio
+    async def test_read_tools_overlap_on_read_pool(self) -> None:
+        """Test different read tools dispatched together run at the same time."""
+        writes = RecordingSessionFactory()
+        reads = RecordingSessionFactory()
+        deps = ChatAgentDeps(
+            user=MockUser(),  # type: ignore
+            current_datetime=datetime.now(UTC),
+            user_timezone="UTC",
+            session_factory=writes,
+            read_session_factory=reads,
+        )
+        ctx = cast(Any, MockRunContext(deps))
+
+        await asyncio.gather(
+            tool_get_meal_plan_history(ctx),
+            tool_get_recipe_details(ctx, recipe_id=str(uuid4())),
+        )
+
+        assert reads.max_open_count == 2
+        assert writes.sessions == []
 
 
 class TestAgentConstruction:
@@ -182,7 +235,6 @@ class TestAgentConstruction:
     async def test_agent_with_no_preferences_context(self) -> None:
         """Test agent instructions when user has no preferences."""
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -215,7 +267,6 @@ class TestAgentConstruction:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="America/Los_Angeles",
@@ -248,7 +299,6 @@ class TestAgentConstruction:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -277,7 +327,6 @@ class TestAgentConstruction:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -296,7 +345,6 @@ class TestAgentConstruction:
         """Test agent instructions with memory but no preferences."""
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -317,7 +365,6 @@ class TestAgentConstruction:
         """Test agent instructions with empty memory string."""
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -361,7 +408,6 @@ class TestAgentIntegrationWithPreferences:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="America/Los_Angeles",
@@ -396,7 +442,6 @@ class TestAgentIntegrationWithPreferences:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -429,7 +474,6 @@ class TestAgentIntegrationWithPreferences:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -474,7 +518,6 @@ class TestAgentIntegrationWithPreferences:
         )
 
         deps = ChatAgentDeps(
-            db=AsyncMock(),
             user=MockUser(),  # type: ignore
             current_datetime=datetime.now(UTC),
             user_timezone="UTC",
@@ -163,11 +163,6 @@ class TestSuggestRecipeTool:
             return draft
 
         monkeypatch.setattr(suggestions, "_tracer", tracer)
-        monkeypatch.setattr(
-            suggestions,
-            "AsyncSessionLocal",
-            lambda: FakeAsyncSessionLocal(fake_session),
-        )
         monkeypatch.setattr(
             suggestions,
             "create_success_draft",
@@ -179,8 +174,11 @@ class TestSuggestRecipeTool:
             lambda **_kwargs: token_value,
         )
 
+        deps = MockChatAgentDeps(user=user)
+        deps.use_db = lambda: FakeAsyncSessionLocal(fake_session)  # type: ignore[attr-defined]
+
         response = await suggestions.tool_suggest_recipe(
-            MockRunContext(MockChatAgentDeps(user=user)),
+            MockRunContext(deps),
             **params,
         )
 
@@ -235,19 +233,17 @@ class TestSuggestRecipeTool:
             raise failure
 
         monkeypatch.setattr(suggestions, "_tracer", tracer)
-        monkeypatch.setattr(
-            suggestions,
-            "AsyncSessionLocal",
-            lambda: FakeAsyncSessionLocal(fake_session),
-        )
         monkeypatch.setattr(
             suggestions,
             "create_success_draft",
             fake_create_success_draft,
         )
 
+        deps = MockChatAgentDeps(user=user)
+        deps.use_db = lambda: FakeAsyncSessionLocal(fake_session)  # type: ignore[attr-defined]
+
         response = await suggestions.tool_suggest_recipe(
-            MockRunContext(MockChatAgentDeps(user=user)),
+            MockRunContext(deps),
             **params,
         )
 
@@ -0,0 +1,165 @@
+"""Tests for the ingredient co-occurrence engine and flavor pairing tool."""
+
+from __future__ import annotations
+
+from collections import Counter
+from itertools import combinations
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from pydantic_ai.models.test import TestModel
+
+import services.chat_agent.agent as agent_module
+from services import flavor_pairs
+from services.chat_agent.tools.flavor_pairs import tool_suggest_flavor_pairings
+from services.flavor_pairs import FlavorPairIndex, build_cooccurrence
+
+
+RECIPES = [
+    ["Basil", "tomato", "mozzarella", "salt"],
+    ["basil ", "tomato", "garlic", "tomato"],
+    ["garlic", "ginger", "soy sauce"],
+    ["ginger", "soy sauce", "scallion", "pepper"],
+    ["tomato", "garlic"],
+    ["fresh basil", "tomato"],
+    [],
+]
+
+
+def _combinations_counter(recipes: list[list[str]]) -> Counter[tuple[str, str]]:
+    pairs: Counter[tuple[str, str]] = Counter()
+    for ingredients in recipes:
+        unique = {
+            name
+            for name in (i.lower().strip() for i in ingredients)
+            if name not in flavor_pairs.FILLER_INGREDIENTS
+        }
+        pairs.update(combinations(sorted(unique), 2))
+    return pairs
+
+
+def test_cooccurrence_matches_pairwise_counting() -> None:
+    """Test that XᵀX counts equal counting every recipe's combinations."""
+    cooccurrence = build_cooccurrence(RECIPES)
+
+    assert cooccurrence.to_counter() == _combinations_counter(RECIPES)
+    assert cooccurrence.n_recipes == len(RECIPES)
+    assert "salt" not in cooccurrence.vocab
+    assert cooccurrence.vocab == sorted(cooccurrence.vocab)
+
+
+def test_top_pairs_by_count_and_lift() -> None:
+    """Test ranking by raw count versus lift."""
+    cooccurrence = build_cooccurrence(RECIPES)
+
+    by_count = cooccurrence.top_pairs(3, min_count=2)
+    assert [(a, b, count) for a, b, count, _ in by_count] == [
+        ("ginger", "soy sauce", 2),  # count ties break on lift
+        ("basil", "tomato", 2),
+        ("garlic", "tomato", 2),
+    ]
+    assert by_count[0][3] == pytest.approx(2 * 7 / (2 * 2))
+
+    by_lift = cooccurrence.top_pairs(3, by="lift")
+    assert [(a, b) for a, b, _, _ in by_lift] == [
+        ("ginger", "soy sauce"),  # lift ties break on count
+        ("basil", "mozzarella"),
+        ("ginger", "scallion"),
+    ]
+
+
+def test_index_round_trip_and_suggest(tmp_path: Path) -> None:
+    """Test the runtime artifact keeps top-K partners by lift."""
+    index = FlavorPairIndex.from_cooccurrence(
+        build_cooccurrence(RECIPES), top_k=2, min_count=1
+    )
+    path = tmp_path / "flavor_pairs.npz"
+    index.save(path)
+    loaded = FlavorPairIndex.load(path)
+
+    suggestions = loaded.suggest("Soy Sauce")
+    assert [s.ingredient for s in suggestions] == ["ginger", "scallion"]
+    assert suggestions[0].recipes == 2
+    assert len(loaded.suggest("tomato", limit=5)) == 2
+    assert loaded.resolve("mozz") == "mozzarella"
+    assert loaded.suggest("saffron") == []
+
+
+@pytest.mark.asyncio
+async def test_tool_reports_unavailable_without_index(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test the chat tool degrades gracefully when no artifact is configured."""
+    monkeypatch.setattr(
+        "services.chat_agent.tools.flavor_pairs.get_flavor_pair_index", lambda: None
+    )
+
+    response = await tool_suggest_flavor_pairings(MagicMock(), ingredient="basil")
+
+    assert response.status == "unavailable"
+    assert response.pairings == []
+
+
+@pytest.mark.asyncio
+async def test_tool_returns_pairings(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test the chat tool serves pairings from the index."""
+    index = FlavorPairIndex.from_cooccurrence(
+        build_cooccurrence(RECIPES), top_k=5, min_count=1
+    )
+    monkeypatch.setattr(
+        "services.chat_agent.tools.flavor_pairs.get_flavor_pair_index", lambda: index
+    )
+
+    response = await tool_suggest_flavor_pairings(
+        MagicMock(), ingredient="Ginger", limit=1
+    )
+
+    assert response.status == "ok"
+    assert response.matched_ingredient == "ginger"
+    assert [p.ingredient for p in response.pairings] == ["soy sauce"]
+
+
+def _settings(path: Path | None) -> MagicMock:
+    return MagicMock(FLAVOR_PAIRS_PATH=str(path) if path else None)
+
+
+def test_failed_load_is_retried(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a missing artifact is not cached; a later startup load succeeds."""
+    path = tmp_path / "flavor_pairs.npz"
+    monkeypatch.setattr(flavor_pairs, "get_settings", lambda: _settings(path))
+    monkeypatch.setattr(flavor_pairs, "_flavor_pair_index", None)
+
+    assert flavor_pairs.load_flavor_pair_index() is None
+    assert flavor_pairs.get_flavor_pair_index() is None
+
+    FlavorPairIndex.from_cooccurrence(
+        build_cooccurrence(RECIPES), top_k=2, min_count=1
+    ).save(path)
+    loaded = flavor_pairs.load_flavor_pair_index()
+
+    assert loaded is not None
+    assert flavor_pairs.get_flavor_pair_index() is loaded
+
+
+@pytest.mark.parametrize("loaded", [True, False])
+def test_agent_registers_pairing_tool_only_when_index_loaded(
+    monkeypatch: pytest.MonkeyPatch, loaded: bool
+) -> None:
+    """Test the tool and its capability line depend on the loaded index."""
+    index = MagicMock() if loaded else None
+    monkeypatch.setattr(agent_module, "get_flavor_pair_index", lambda: index)
+    monkeypatch.setattr(agent_module, "_create_model", lambda: TestModel())
+    agent_module.get_chat_agent.cache_clear()
+    try:
+        agent = agent_module.get_chat_agent()
+        tools = agent._function_toolset.tools
+        prompt = agent_module.get_chat_system_prompt()
+    finally:
+        agent_module.get_chat_agent.cache_clear()
+
+    assert ("suggest_flavor_pairings" in tools) is loaded
+    assert (agent_module.FLAVOR_PAIRING_CAPABILITY in prompt) is loaded
+    assert "search_recipes" in tools
@@ -61,7 +61,7 @@ class TestWebToolTokenOptimization:
         </html>
         """
         soup = BeautifulSoup(html_content, "html.parser")
-        html_extractor._remove_boilerplate(soup)
+        html_extractor._prune_tree(soup)
         result = str(soup)
 
         # Verify boilerplate elements are removed
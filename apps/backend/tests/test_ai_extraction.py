@@ -1,7 +1,8 @@
 """Tests for AI recipe extraction functionality."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
 import pytest
 import pytest_asyncio
 from fastapi import status
@@ -355,8 +356,13 @@ async def test_html_extractor_fetch_timeout():
 async def test_html_extractor_successful_fetch(mock_recipe_html):
     """Test successful HTML extraction and sanitization (patch internal fetch)."""
     extractor = HTMLExtractionService()
-    with patch.object(
-        HTMLExtractionService, "_fetch_html", return_value=mock_recipe_html
+
+    async def iter_chunks(*_args: object):
+        yield mock_recipe_html
+
+    with (
+        patch.object(HTMLExtractionService, "_validate_url"),
+        patch.object(HTMLExtractionService, "_iter_html_chunks", iter_chunks),
     ):
         result = await extractor.fetch_and_sanitize("https://example.com/recipe")
     assert "Chicken Parmesan" in result
@@ -375,7 +381,7 @@ async def test_html_extractor_http_error():
         mock_response = Mock()
         mock_response.raise_for_status.side_effect = Exception("404 Not Found")
         mock_async_client = mock_client.return_value.__aenter__.return_value
-        mock_async_client.get.return_value = mock_response
+        mock_async_client.send = AsyncMock(return_value=mock_response)
 
         from fastapi import HTTPException
 
@@ -389,13 +395,14 @@ async def test_html_extractor_empty_response():
     extractor = HTMLExtractionService()
 
     with patch("httpx.AsyncClient") as mock_client:
-        mock_response = Mock()
-        mock_response.text = ""
-        mock_response.content = b""  # Add empty content
-        mock_response.headers = {"content-type": "text/html"}  # Add headers
-        mock_response.raise_for_status = Mock()
+        mock_response = httpx.Response(
+            200,
+            request=httpx.Request("GET", "https://example.com/empty"),
+            headers={"content-type": "text/html"},
+            content=b"",
+        )
         mock_async_client = mock_client.return_value.__aenter__.return_value
-        mock_async_client.get.return_value = mock_response
+        mock_async_client.send = AsyncMock(return_value=mock_response)
 
         result = await extractor.fetch_and_sanitize("https://example.com/empty")
         assert result == ""
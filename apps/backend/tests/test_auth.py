@@ -18,6 +18,7 @@ from datetime import UTC, datetime, timedelta
 import jwt
 import pytest
 import pytest_asyncio
+from argon2 import PasswordHasher
 from fastapi import status
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import (
@@ -27,8 +28,14 @@ from sqlalchemy.ext.asyncio import (
     create_async_engine,
 )
 
+import api.v1.auth as auth_mod
 from core.config import get_settings
-from core.security import create_access_token, get_password_hash
+from core.password_hashing import PasswordHashingBusyError
+from core.security import (
+    create_access_token,
+    get_password_hash,
+    password_needs_rehash,
+)
 from dependencies.auth import get_current_user
 from dependencies.db import get_db
 from main import app
@@ -142,6 +149,57 @@ async def test_login_unverified_email(auth_client: tuple[AsyncClient, AsyncSessi
     assert "not verified" in resp.json()["detail"].lower()
 
 
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_hash(
+    auth_client: tuple[AsyncClient, AsyncSession],
+):
+    """A hash made with weaker Argon2 parameters is upgraded on login."""
+    client, db = auth_client
+    user = await _create_user(db, username="legacy")
+    user.hashed_password = PasswordHasher(
+        time_cost=1, memory_cost=64, parallelism=1
+    ).hash("secret")
+    await db.commit()
+    legacy_hash = user.hashed_password
+
+    resp = await client.post(
+        "/api/v1/auth/login",
+        data={"username": user.username, "password": "secret"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    assert resp.status_code == status.HTTP_200_OK
+    await db.refresh(user)
+    assert user.hashed_password != legacy_hash
+    assert not password_needs_rehash(user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_login_returns_503_when_hashing_pool_is_busy(
+    auth_client: tuple[AsyncClient, AsyncSession], monkeypatch: pytest.MonkeyPatch
+):
+    """Saturated password hashing pool answers 503 with Retry-After."""
+    client, db = auth_client
+    user = await _create_user(db, username="busy")
+
+    class BusyExecutor:
+        async def run(self, *args: object) -> object:
+            raise PasswordHashingBusyError("queue_full")
+
+    monkeypatch.setattr(auth_mod, "get_password_hashing_executor", BusyExecutor)
+
+    resp = await client.post(
+        "/api/v1/auth/login",
+        data={"username": user.username, "password": "secret"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+    assert resp.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert resp.headers["Retry-After"] == str(
+        auth_mod.PASSWORD_HASH_RETRY_AFTER_SECONDS
+    )
+
+
 @pytest.mark.asyncio
 async def test_protected_endpoint_requires_token(
     auth_client: tuple[AsyncClient, AsyncSession],
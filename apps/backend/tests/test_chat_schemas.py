@@ -6,7 +6,12 @@ from uuid import uuid4
 
 import pytest
 
-from schemas.chat_streaming import MAX_SSE_EVENT_BYTES, ChatSseEvent, ChatStreamRequest
+from schemas.chat_streaming import (
+    MAX_SSE_EVENT_BYTES,
+    ChatSseEncoder,
+    ChatSseEvent,
+    ChatStreamRequest,
+)
 
 
 def test_chat_stream_request_validation() -> None:
@@ -115,3 +120,30 @@ def test_chat_sse_event_tool_started_serializes() -> None:
     sse_output = event.to_sse()
     assert '"event":"tool.started"' in sse_output
     assert '"tool_call_id":"call_123"' in sse_output
+
+
+@pytest.mark.parametrize("message_id", [uuid4(), None])
+def test_chat_sse_encoder_matches_event_to_sse(message_id: object) -> None:
+    """ChatSseEncoder output is byte-identical to ChatSseEvent.to_sse()."""
+    conversation_id = uuid4()
+    data = {"delta": 'Caf\u00e9 "quoted"\n', "blocks": [{"n": 1.5, "ok": None}]}
+
+    encoder = ChatSseEncoder(conversation_id, message_id)  # type: ignore[arg-type]
+
+    for event, payload in (("message.delta", data), ("done", None)):
+        expected = ChatSseEvent(
+            event=event,  # type: ignore[arg-type]
+            conversation_id=conversation_id,
+            message_id=message_id,  # type: ignore[arg-type]
+            data=payload or {},
+        ).to_sse()
+        assert encoder.encode(event, payload) == expected  # type: ignore[arg-type]
+
+
+def test_chat_sse_encoder_enforces_size_and_event_names() -> None:
+    encoder = ChatSseEncoder(uuid4(), uuid4())
+
+    with pytest.raises(ValueError, match="MAX_SSE_EVENT_BYTES"):
+        encoder.encode("message.delta", {"delta": "x" * MAX_SSE_EVENT_BYTES})
+    with pytest.raises(ValueError, match="Unknown chat SSE event"):
+        encoder.encode("message.bogus")  # type: ignore[arg-type]
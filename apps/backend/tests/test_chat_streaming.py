@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from contextvars import ContextVar
 from types import SimpleNamespace
 from typing import cast
@@ -70,8 +71,10 @@ class _RecordingTracer:
 
 
 class _SpanAwareAgent:
-    def __init__(self) -> None:
+    def __init__(self, sessions: _CountingSessions | None = None) -> None:
         self.stream_span_name: str | None = None
+        self.sessions = sessions
+        self.open_sessions_while_streaming: int | None = None
 
     async def run_stream_events(
         self,
@@ -79,6 +82,8 @@ class _SpanAwareAgent:
         **_kwargs: object,
     ) -> AsyncIterator[object]:
         self.stream_span_name = _current_span_name.get()
+        if self.sessions is not None:
+            self.open_sessions_while_streaming = self.sessions.open_count
         if False:
             yield object()
 
@@ -110,6 +115,68 @@ class _FakeDb:
     async def rollback(self) -> None:
         return None
 
+    async def __aenter__(self) -> _FakeDb:
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        return None
+
+
+def _patch_stream_collaborators(
+    monkeypatch: pytest.MonkeyPatch, agent: _SpanAwareAgent
+) -> None:
+    """Replace the chat route's DB helpers and settings with no-op doubles."""
+    from api.v1 import chat
+
+    async def _noop_async(*_args: object, **_kwargs: object) -> None:
+        return None
+
+    async def _empty_history(*_args: object, **_kwargs: object) -> list[object]:
+        return []
+
+    class _FakeUserPreferencesCrud:
+        async def get_by_user_id(self, *_args: object, **_kwargs: object) -> None:
+            return None
+
+    class _FakeMemoryUpdateService:
+        def __init__(self, *_args: object, **_kwargs: object) -> None:
+            pass
+
+        async def get_memory_document(self, *_args: object, **_kwargs: object) -> None:
+            return None
+
+    monkeypatch.setattr(chat, "get_chat_agent", lambda: agent)
+    monkeypatch.setattr(chat, "get_correlation_id", lambda: "req-span-test")
+    monkeypatch.setattr(
+        chat,
+        "get_settings",
+        lambda: SimpleNamespace(LLM_PROVIDER="test-provider", CHAT_MODEL="test-model"),
+    )
+    monkeypatch.setattr(chat, "_get_or_create_conversation", _noop_async)
+    monkeypatch.setattr(chat, "_create_assistant_message", _noop_async)
+    monkeypatch.setattr(chat, "_update_conversation_activity", _noop_async)
+    monkeypatch.setattr(chat, "_load_conversation_history", _empty_history)
+    monkeypatch.setattr(chat, "UserPreferencesCRUD", _FakeUserPreferencesCrud)
+    monkeypatch.setattr(chat, "MemoryUpdateService", _FakeMemoryUpdateService)
+    monkeypatch.setattr(chat, "enqueue_training_sample", lambda capture: True)
+
+
+class _CountingSessions:
+    """Session factory double counting sessions that are currently open."""
+
+    def __init__(self) -> None:
+        self.opened = 0
+        self.open_count = 0
+
+    @asynccontextmanager
+    async def __call__(self) -> AsyncIterator[AsyncSession]:
+        self.opened += 1
+        self.open_count += 1
+        try:
+            yield cast(AsyncSession, _FakeDb())
+        finally:
+            self.open_count -= 1
+
 
 @pytest.fixture
 def mock_chat_agent():
@@ -166,44 +233,15 @@ async def test_agent_stream_runs_inside_assistant_span(
     tracer = _RecordingTracer()
     agent = _SpanAwareAgent()
 
-    async def _noop_async(*_args: object, **_kwargs: object) -> None:
-        return None
-
-    async def _empty_history(*_args: object, **_kwargs: object) -> list[object]:
-        return []
-
-    class _FakeUserPreferencesCrud:
-        async def get_by_user_id(self, *_args: object, **_kwargs: object) -> None:
-            return None
-
-    class _FakeMemoryUpdateService:
-        def __init__(self, *_args: object, **_kwargs: object) -> None:
-            pass
-
-        async def get_memory_document(self, *_args: object, **_kwargs: object) -> None:
-            return None
-
     monkeypatch.setattr(chat, "_tracer", tracer)
-    monkeypatch.setattr(chat, "get_chat_agent", lambda: agent)
-    monkeypatch.setattr(chat, "get_correlation_id", lambda: "req-span-test")
-    monkeypatch.setattr(
-        chat,
-        "get_settings",
-        lambda: SimpleNamespace(LLM_PROVIDER="test-provider", CHAT_MODEL="test-model"),
-    )
-    monkeypatch.setattr(chat, "_get_or_create_conversation", _noop_async)
-    monkeypatch.setattr(chat, "_create_assistant_message", _noop_async)
-    monkeypatch.setattr(chat, "_update_conversation_activity", _noop_async)
-    monkeypatch.setattr(chat, "_load_conversation_history", _empty_history)
-    monkeypatch.setattr(chat, "UserPreferencesCRUD", _FakeUserPreferencesCrud)
-    monkeypatch.setattr(chat, "MemoryUpdateService", _FakeMemoryUpdateService)
-    monkeypatch.setattr(chat, "capture_training_sample", _noop_async)
+    _patch_stream_collaborators(monkeypatch, agent)
 
     response = await chat.stream_chat_message(
         uuid4(),
         ChatStreamRequest(content=sensitive_prompt),
         SimpleNamespace(id=uuid4()),
-        cast(AsyncSession, _FakeDb()),
+        lambda: cast(AsyncSession, _FakeDb()),
+        lambda: cast(AsyncSession, _FakeDb()),
     )
 
     chunks: list[str] = []
@@ -222,6 +260,35 @@ async def test_agent_stream_runs_inside_assistant_span(
     assert all(sensitive_prompt not in str(event) for event in assistant_span.events)
 
 
+@pytest.mark.asyncio
+async def test_no_session_is_held_while_agent_streams(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Verify the route releases its DB session before the model streams."""
+    from api.v1 import chat
+
+    sessions = _CountingSessions()
+    agent = _SpanAwareAgent(sessions)
+    _patch_stream_collaborators(monkeypatch, agent)
+
+    response = await chat.stream_chat_message(
+        uuid4(),
+        ChatStreamRequest(content="What's for dinner?"),
+        SimpleNamespace(id=uuid4()),
+        sessions,
+        _CountingSessions(),
+    )
+    setup_sessions = sessions.opened
+    async for _chunk in response.body_iterator:
+        pass
+
+    assert setup_sessions == 1
+    assert agent.open_sessions_while_streaming == 0
+    # Personalization loading and the final message update use their own
+    assert sessions.opened == 3
+    assert sessions.open_count == 0
+
+
 @pytest.mark.asyncio
 async def test_stream_chat_message_invalid_payload(
     async_client: AsyncClient,
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import cast
+from unittest.mock import MagicMock
 from uuid import uuid4
 
 import pytest
@@ -35,6 +36,12 @@ class _FakeDb:
     async def commit(self) -> None:
         self.commits += 1
 
+    async def __aenter__(self) -> _FakeDb:
+        return self
+
+    async def __aexit__(self, *_exc_info: object) -> None:
+        return None
+
 
 @pytest.mark.asyncio
 async def test_handle_agent_stream_event_emits_tool_started_and_result() -> None:
@@ -65,7 +72,7 @@ async def test_handle_agent_stream_event_emits_tool_started_and_result() -> None
         conversation_id=conversation_id,
         message_id=message_id,
         user_id=user_id,
-        db=cast(AsyncSession, db),
+        sessions=lambda: cast(AsyncSession, db),
         tool_calls_by_id=tool_calls_by_id,
         tool_call_order=tool_call_order,
         request_id="req-1",
@@ -90,7 +97,7 @@ async def test_handle_agent_stream_event_emits_tool_started_and_result() -> None
         conversation_id=conversation_id,
         message_id=message_id,
         user_id=user_id,
-        db=cast(AsyncSession, db),
+        sessions=lambda: cast(AsyncSession, db),
         tool_calls_by_id=tool_calls_by_id,
         tool_call_order=tool_call_order,
         request_id="req-1",
@@ -134,6 +141,8 @@ async def test_handle_agent_stream_event_records_tool_lifecycle_events(
     tool_call_order = [0]
 
     monkeypatch.setattr("api.v1.chat.get_current_span", lambda: span)
+    monkeypatch.setenv("ENABLE_OBSERVABILITY", "true")
+    monkeypatch.setattr("core.observability.get_product_telemetry_exporter", MagicMock)
 
     call_event = FunctionToolCallEvent(
         ToolCallPart(
@@ -147,7 +156,7 @@ async def test_handle_agent_stream_event_records_tool_lifecycle_events(
         conversation_id=conversation_id,
         message_id=message_id,
         user_id=user_id,
-        db=cast(AsyncSession, db),
+        sessions=lambda: cast(AsyncSession, db),
         tool_calls_by_id=tool_calls_by_id,
         tool_call_order=tool_call_order,
         request_id="req-1",
@@ -165,7 +174,7 @@ async def test_handle_agent_stream_event_records_tool_lifecycle_events(
         conversation_id=conversation_id,
         message_id=message_id,
         user_id=user_id,
-        db=cast(AsyncSession, db),
+        sessions=lambda: cast(AsyncSession, db),
         tool_calls_by_id=tool_calls_by_id,
         tool_call_order=tool_call_order,
         request_id="req-1",
@@ -227,7 +227,6 @@ class TestBuildTrainingPromptData:
         mock_result.all_messages.return_value = [request]
 
         deps = ChatAgentDeps(
-            db=MagicMock(),
             user=MagicMock(),
             current_datetime=datetime.datetime(
                 2026, 1, 23, 15, 45, tzinfo=datetime.UTC
@@ -277,7 +276,6 @@ class TestBuildTrainingPromptData:
         mock_prefs.country = "US"
 
         deps = ChatAgentDeps(
-            db=MagicMock(),
             user=MagicMock(),
             current_datetime=datetime.datetime(2026, 2, 20, 10, 0, tzinfo=datetime.UTC),
             user_timezone="America/Los_Angeles",
@@ -0,0 +1,88 @@
+"""Tests for the per-role database engine pools."""
+
+from __future__ import annotations
+
+import inspect
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+import dependencies.db as db_mod
+from dependencies.db import build_engine, get_pool_settings
+
+
+POSTGRES_URL = "postgresql+asyncpg://user:pw@localhost:5432/pantry"
+
+
+def test_role_defaults_differ() -> None:
+    crud = get_pool_settings("crud")
+    scheduler = get_pool_settings("scheduler")
+
+    assert crud.pool_pre_ping
+    assert scheduler.pool_size < crud.pool_size
+    assert scheduler.command_timeout and crud.command_timeout
+    assert scheduler.command_timeout > crud.command_timeout
+
+
+def test_role_specific_env_overrides_shared(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("DB_POOL_SIZE", "7")
+    monkeypatch.setenv("DB_STREAM_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_STATEMENT_CACHE_SIZE", "0")
+    monkeypatch.setenv("DB_SCHEDULER_COMMAND_TIMEOUT", "0")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    assert get_pool_settings("crud").pool_size == 7
+    assert get_pool_settings("stream").pool_size == 3
+    assert get_pool_settings("stream").statement_cache_size == 0
+    assert get_pool_settings("scheduler").command_timeout is None
+    assert not get_pool_settings("crud").pool_pre_ping
+
+
+def test_asyncpg_engine_gets_tuned_pool() -> None:
+    engine = build_engine("stream", POSTGRES_URL)
+    settings = get_pool_settings("stream")
+
+    assert engine.pool.size() == settings.pool_size  # type: ignore[attr-defined]
+    assert engine.pool._max_overflow == settings.max_overflow  # type: ignore[attr-defined]
+    assert type(engine.pool).__name__ == "StreamInstrumentedPool"
+
+
+@pytest.mark.asyncio
+async def test_checkout_wait_is_recorded(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    histogram = MagicMock()
+    monkeypatch.setattr(db_mod, "_checkout_wait_ms", histogram)
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=db_mod._instrumented_pool("crud"),
+    )
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    histogram.record.assert_called_once()
+    wait_ms, attributes = histogram.record.call_args.args
+    assert wait_ms >= 0
+    assert attributes == {"pool": "crud"}
+
+
+def test_checkout_hook_still_exists() -> None:
+    """The wait timer overrides private ``QueuePool._do_get``; catch upgrades."""
+    assert "_do_get" in vars(QueuePool)
+    assert list(inspect.signature(QueuePool._do_get).parameters) == ["self"]
+    assert issubclass(db_mod._instrumented_pool("crud"), AsyncAdaptedQueuePool)
+
+
+def test_read_pool_sessions_are_read_only() -> None:
+    read = db_mod._connect_args("read", get_pool_settings("read"))
+    crud = db_mod._connect_args("crud", get_pool_settings("crud"))
+
+    assert read["server_settings"]["default_transaction_read_only"] == "on"
+    assert "default_transaction_read_only" not in crud["server_settings"]
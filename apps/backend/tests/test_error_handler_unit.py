@@ -8,8 +8,9 @@ from __future__ import annotations
 
 from unittest.mock import patch
 
-from fastapi import FastAPI, HTTPException, status
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
 from fastapi.testclient import TestClient
 from pydantic import BaseModel, Field
 
@@ -26,6 +27,22 @@ class Item(BaseModel):
     qty: int = Field(ge=1)
 
 
+def _add_passthrough_routes(app: FastAPI) -> None:
+    """Routes that succeed, for checking what the middlewares pass through."""
+
+    @app.get("/state")
+    async def state(request: Request):
+        return {"correlation_id": request.state.correlation_id}
+
+    @app.get("/stream")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+
 def build_test_app(env: str) -> TestClient:
     app = FastAPI()
     app.add_middleware(CorrelationIdMiddleware)
@@ -65,6 +82,7 @@ def build_test_app(env: str) -> TestClient:
             detail="Access denied",
         )
 
+    _add_passthrough_routes(app)
     client = TestClient(app)
 
     # Patch environment setting per test invocation
@@ -185,3 +203,25 @@ def test_forbidden_error_development():
     # Should include details in development
     assert "details" in body["error"]
     assert body["error"]["details"]["detail"] == "Access denied"
+
+
+def test_correlation_id_is_echoed_and_exposed_on_request_state():
+    client = build_test_app("production")
+    resp = client.get("/state", headers={"X-Correlation-ID": "abc-123"})
+    assert resp.status_code == 200
+    assert resp.headers["X-Correlation-ID"] == "abc-123"
+    assert resp.json() == {"correlation_id": "abc-123"}
+
+
+def test_correlation_id_generated_when_missing():
+    client = build_test_app("production")
+    resp = client.get("/state")
+    assert resp.headers["X-Correlation-ID"] == resp.json()["correlation_id"]
+
+
+def test_streaming_response_passes_through_middlewares():
+    client = build_test_app("production")
+    with client.stream("GET", "/stream") as resp:
+        chunks = list(resp.iter_text())
+        assert resp.headers["X-Correlation-ID"]
+    assert "".join(chunks) == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
@@ -0,0 +1,532 @@
+"""Tests for the streaming training data export script."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import uuid
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import pytest_asyncio
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+import scripts.export_training_data as export_module
+from models.ai_training_prompt_blobs import AITrainingPromptBlob
+from models.ai_training_samples import AITrainingSample
+from scripts.export_training_data import (
+    _convert_in_order,
+    _convert_rows,
+    _export_row,
+    _is_validation,
+    _rehydrate_delta_prompts,
+    _rehydrate_sample,
+    _ShardedJsonlWriter,
+    export_streaming,
+)
+from services.chat_agent.training_capture import (
+    ConversationCaptureState,
+    encode_prompt,
+)
+
+
+def _sample(conversation_id: uuid.UUID, text: str) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        conversation_id=conversation_id,
+        raw_prompt=json.dumps(
+            {"messages": [{"role": "user", "content": text}], "tools": []}
+        ),
+        prompt_prefix_length=None,
+        model_name="test-model",
+        user_feedback=None,
+        is_simulated=False,
+        tool_calls=None,
+    )
+
+
+def _samples(conversations: int = 40, turns: int = 3) -> list[SimpleNamespace]:
+    ids = [uuid.uuid4() for _ in range(conversations)]
+    return [_sample(cid, f"turn {turn}") for cid in ids for turn in range(turns)]
+
+
+def _read_lines(paths: list[str]) -> list[str]:
+    lines: list[str] = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            lines.extend(f)
+    return lines
+
+
+class FakeSessions:
+    """AsyncSessionLocal stand-in streaming ``samples`` in fixed batches."""
+
+    def __init__(self, samples: list[Any], batch_size: int = 7) -> None:
+        self.samples = samples
+        self.batch_size = batch_size
+
+    async def _partitions(self) -> AsyncIterator[list[Any]]:
+        for start in range(0, len(self.samples), self.batch_size):
+            yield self.samples[start : start + self.batch_size]
+
+    def __call__(self) -> Any:
+        result = MagicMock()
+        result.partitions = self._partitions
+        session = MagicMock()
+        session.stream_scalars = AsyncMock(return_value=result)
+
+        @asynccontextmanager
+        async def context() -> AsyncIterator[MagicMock]:
+            yield session
+
+        return context()
+
+
+@pytest.fixture
+def samples(monkeypatch: pytest.MonkeyPatch) -> Iterator[list[SimpleNamespace]]:
+    rows = _samples()
+    monkeypatch.setattr(export_module, "AsyncSessionLocal", FakeSessions(rows))
+    yield rows
+
+
+class TestIsValidation:
+    """Tests for the hash-based train/validation split."""
+
+    def test_is_deterministic(self) -> None:
+        """Test the same id, ratio and seed always give the same answer."""
+        ids = [str(uuid.uuid4()) for _ in range(200)]
+
+        first = [_is_validation(cid, 0.3, seed=7) for cid in ids]
+        second = [_is_validation(cid, 0.3, seed=7) for cid in ids]
+
+        assert first == second
+
+    def test_seed_changes_split(self) -> None:
+        """Test a different seed reshuffles which conversations validate."""
+        ids = [str(uuid.uuid4()) for _ in range(200)]
+
+        seed_a = [_is_validation(cid, 0.5, seed=1) for cid in ids]
+        seed_b = [_is_validation(cid, 0.5, seed=2) for cid in ids]
+
+        assert seed_a != seed_b
+
+    def test_ratio_is_respected(self) -> None:
+        """Test roughly ``val_ratio`` of conversations land in validation."""
+        ids = [str(uuid.uuid4()) for _ in range(4000)]
+
+        share = sum(_is_validation(cid, 0.2, seed=42) for cid in ids) / len(ids)
+
+        assert 0.17 < share < 0.23
+
+    def test_zero_ratio_disables_split(self) -> None:
+        """Test a zero ratio sends everything to training."""
+        assert not any(_is_validation(str(uuid.uuid4()), 0.0, 42) for _ in range(50))
+
+    def test_turns_of_a_conversation_share_a_side(self) -> None:
+        """Test every turn of a conversation goes to the same split."""
+        rows = [_export_row(sample) for sample in _samples(turns=4)]
+
+        converted = _convert_rows(rows, False, val_ratio=0.5, seed=3)
+
+        sides: dict[str, set[bool]] = {}
+        for row, item in zip(rows, converted, strict=True):
+            assert item is not None
+            sides.setdefault(row.conversation_id, set()).add(item[0])
+        assert all(len(side) == 1 for side in sides.values())
+        assert {True, False} == set().union(*sides.values())
+
+
+class TestShardedJsonlWriter:
+    """Tests for shard rollover, naming and compression."""
+
+    def test_rolls_over_every_shard_size_lines(self, tmp_path: Path) -> None:
+        """Test shards are numbered and hold at most ``shard_size`` lines."""
+        writer = _ShardedJsonlWriter(str(tmp_path / "train.jsonl"), "none", 2)
+        for i in range(5):
+            writer.write(f"{i}\n")
+        writer.close()
+
+        assert [Path(p).name for p in writer.paths] == [
+            "train-00000.jsonl",
+            "train-00001.jsonl",
+            "train-00002.jsonl",
+        ]
+        assert [Path(p).read_text() for p in writer.paths] == [
+            "0\n1\n",
+            "2\n3\n",
+            "4\n",
+        ]
+        assert writer.count == 5
+
+    def test_shard_index_is_appended_without_jsonl_extension(
+        self, tmp_path: Path
+    ) -> None:
+        """Test paths without ``.jsonl`` get the index as a suffix."""
+        writer = _ShardedJsonlWriter(str(tmp_path / "train"), "none", 1)
+        writer.write("a\n")
+        writer.write("b\n")
+        writer.close()
+
+        assert [Path(p).name for p in writer.paths] == ["train-00000", "train-00001"]
+
+    def test_close_leaves_an_empty_file(self, tmp_path: Path) -> None:
+        """Test an export with no samples still creates its output file."""
+        writer = _ShardedJsonlWriter(str(tmp_path / "val.jsonl"), "none", None)
+        writer.close()
+
+        assert writer.paths == [str(tmp_path / "val.jsonl")]
+        assert Path(writer.paths[0]).read_text() == ""
+
+    @pytest.mark.parametrize(
+        ("shard_size", "expected"),
+        [
+            (None, ["train.jsonl.gz"]),
+            (2, ["train-00000.jsonl.gz", "train-00001.jsonl.gz"]),
+        ],
+    )
+    def test_gzip_suffix_and_content(
+        self, tmp_path: Path, shard_size: int | None, expected: list[str]
+    ) -> None:
+        """Test gzip output is named ``.gz`` and decompresses to the lines."""
+        writer = _ShardedJsonlWriter(str(tmp_path / "train.jsonl"), "gzip", shard_size)
+        for i in range(3):
+            writer.write(f"{i}\n")
+        writer.close()
+
+        assert [Path(p).name for p in writer.paths] == expected
+        assert _read_lines(writer.paths) == ["0\n", "1\n", "2\n"]
+
+    def test_zstd_suffix(self, tmp_path: Path) -> None:
+        """Test zstd output is named ``.zst`` and decompresses to the lines."""
+        zstandard = pytest.importorskip("zstandard")
+        writer = _ShardedJsonlWriter(str(tmp_path / "train.jsonl"), "zstd", None)
+        writer.write("0\n")
+        writer.close()
+
+        assert writer.paths == [str(tmp_path / "train.jsonl.zst")]
+        with zstandard.open(writer.paths[0], "rt", encoding="utf-8") as f:
+            assert f.read() == "0\n"
+
+
+class TestConvertInOrder:
+    """Tests for process-pool conversion ordering."""
+
+    @pytest.mark.asyncio
+    async def test_pool_matches_in_process_conversion(self) -> None:
+        """Test ``workers > 1`` yields the same batches in the same order."""
+        rows = [_export_row(sample) for sample in _samples(conversations=30)]
+        batches = [rows[i : i + 4] for i in range(0, len(rows), 4)]
+
+        async def batch_iter() -> AsyncIterator[list[Any]]:
+            for batch in batches:
+                yield batch
+
+        async def collect(workers: int) -> list[Any]:
+            convert = partial(
+                _convert_rows, full_tool_outputs=False, val_ratio=0.25, seed=9
+            )
+            return [
+                converted
+                async for converted in _convert_in_order(batch_iter(), convert, workers)
+            ]
+
+        assert await collect(workers=2) == await collect(workers=1)
+
+
+class TestExportStreaming:
+    """End-to-end tests for ``export_streaming`` over a fake cursor."""
+
+    @pytest.mark.asyncio
+    async def test_output_is_deterministic(
+        self, samples: list[SimpleNamespace], tmp_path: Path
+    ) -> None:
+        """Test two runs with the same seed write identical files."""
+        outputs = []
+        for run in ("a", "b"):
+            counts = await export_streaming(
+                str(tmp_path / f"{run}-train.jsonl"),
+                str(tmp_path / f"{run}-val.jsonl"),
+                val_ratio=0.3,
+                seed=5,
+                workers=0,
+            )
+            train = (tmp_path / f"{run}-train.jsonl").read_text()
+            val = (tmp_path / f"{run}-val.jsonl").read_text()
+            outputs.append((counts, train, val))
+
+        assert outputs[0] == outputs[1]
+        train_count, val_count = outputs[0][0]
+        assert train_count + val_count == len(samples)
+        assert val_count > 0
+
+    @pytest.mark.asyncio
+    async def test_split_keeps_conversations_together(
+        self, samples: list[SimpleNamespace], tmp_path: Path
+    ) -> None:
+        """Test no conversation appears in both train and validation output."""
+        await export_streaming(
+            str(tmp_path / "train.jsonl"),
+            str(tmp_path / "val.jsonl"),
+            val_ratio=0.5,
+            workers=0,
+        )
+        conversation_of = {str(s.id): str(s.conversation_id) for s in samples}
+
+        def conversations(name: str) -> set[str]:
+            lines = (tmp_path / name).read_text().splitlines()
+            return {
+                conversation_of[json.loads(line)["metadata"]["sample_id"]]
+                for line in lines
+            }
+
+        train, val = conversations("train.jsonl"), conversations("val.jsonl")
+        assert train and val
+        assert not train & val
+
+    @pytest.mark.asyncio
+    async def test_workers_match_single_process_output(
+        self, samples: list[SimpleNamespace], tmp_path: Path
+    ) -> None:
+        """Test a process pool writes the same shards as in-process conversion."""
+        written = {}
+        for workers in (0, 2):
+            out = tmp_path / str(workers)
+            out.mkdir()
+            await export_streaming(
+                str(out / "train.jsonl"),
+                str(out / "val.jsonl"),
+                workers=workers,
+                compression="gzip",
+                shard_size=10,
+            )
+            written[workers] = {
+                path.name: _read_lines([str(path)]) for path in sorted(out.iterdir())
+            }
+
+        assert written[2] == written[0]
+        assert "train-00000.jsonl.gz" in written[0]
+
+
+SYSTEM_PREFIX = "You are Nibble."
+TOOLS = [{"type": "function", "function": {"name": "search_recipes"}}]
+
+
+def _turn_prompt(turn: int) -> dict[str, Any]:
+    messages: list[dict[str, Any]] = [
+        {"role": "system", "content": f"{SYSTEM_PREFIX}\nNow: turn {turn}"}
+    ]
+    for i in range(turn + 1):
+        messages.append({"role": "user", "content": f"question {i}"})
+        messages.append({"role": "assistant", "content": f"answer {i}"})
+    return {"messages": messages, "tools": TOOLS}
+
+
+def _delta_chain(turns: int) -> tuple[list[SimpleNamespace], dict[str, str]]:
+    """Encode ``turns`` turns of one conversation the way capture stores them."""
+    rows: list[SimpleNamespace] = []
+    blobs: dict[str, str] = {}
+    previous: ConversationCaptureState | None = None
+    for turn in range(turns):
+        encoded = encode_prompt(
+            _turn_prompt(turn), system_prefix=SYSTEM_PREFIX, previous=previous
+        )
+        blobs.update({h: content for h, (_kind, content) in encoded.blobs.items()})
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            raw_prompt=encoded.raw_prompt,
+            parent_sample_id=encoded.parent_sample_id,
+            prompt_prefix_length=encoded.prompt_prefix_length,
+            system_prompt_hash=encoded.system_prompt_hash,
+            tools_hash=encoded.tools_hash,
+        )
+        rows.append(row)
+        previous = ConversationCaptureState(
+            sample_id=row.id, message_digests=encoded.message_digests, depth=turn
+        )
+    return rows, blobs
+
+
+def _result(rows: list[Any]) -> MagicMock:
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = rows
+    result.__iter__.return_value = iter(rows)
+    return result
+
+
+class TestRehydrateSample:
+    """Tests for rebuilding delta-encoded prompts from their parent chain."""
+
+    def test_multi_level_chain_rebuilds_every_prompt(self) -> None:
+        """Test each sample of a three-level chain rebuilds its full prompt."""
+        rows, blobs = _delta_chain(3)
+        by_id = {row.id: row for row in rows}
+        cache: dict[uuid.UUID, dict[str, Any]] = {}
+
+        prompt = _rehydrate_sample(rows[2].id, by_id, blobs, cache)
+
+        assert rows[2].prompt_prefix_length == 4
+        assert prompt == _turn_prompt(2)
+        # Ancestors were rebuilt once and cached on the way
+        assert cache[rows[0].id] == _turn_prompt(0)
+        assert cache[rows[1].id] == _turn_prompt(1)
+
+    def test_missing_parent_raises(self) -> None:
+        """Test a sample whose parent row is absent cannot be rebuilt."""
+        rows, blobs = _delta_chain(3)
+        by_id = {row.id: row for row in rows if row is not rows[1]}
+
+        with pytest.raises(ValueError, match="parent"):
+            _rehydrate_sample(rows[2].id, by_id, blobs, {})
+
+    def test_missing_blob_raises(self) -> None:
+        """Test a sample whose system prompt blob is absent cannot be rebuilt."""
+        rows, blobs = _delta_chain(1)
+        del blobs[rows[0].system_prompt_hash]
+
+        with pytest.raises(ValueError, match="blob"):
+            _rehydrate_sample(rows[0].id, {rows[0].id: rows[0]}, blobs, {})
+
+
+class TestRehydrateDeltaPrompts:
+    """Tests for loading parent chains and blobs in batched queries."""
+
+    @pytest.mark.asyncio
+    async def test_loads_chain_and_skips_broken_samples(self) -> None:
+        """Test ancestors are fetched level by level and broken samples dropped."""
+        rows, blobs = _delta_chain(3)
+        orphan = SimpleNamespace(**{**vars(rows[1]), "id": uuid.uuid4()})
+        orphan.parent_sample_id = uuid.uuid4()  # parent row was deleted
+        blobless, _ = _delta_chain(1)
+        blobless[0].tools_hash = "0" * 64  # blob row was deleted
+        legacy = SimpleNamespace(id=uuid.uuid4(), prompt_prefix_length=None)
+
+        db = MagicMock()
+        db.execute = AsyncMock(
+            side_effect=[
+                _result([rows[1]]),  # parents of the exported samples
+                _result([rows[0]]),  # grandparents
+                _result(
+                    [
+                        SimpleNamespace(content_hash=h, content=c)
+                        for h, c in blobs.items()
+                    ]
+                ),
+            ]
+        )
+
+        prompts = await _rehydrate_delta_prompts(
+            db, [rows[2], orphan, blobless[0], legacy]
+        )
+
+        assert prompts == {rows[2].id: _turn_prompt(2)}
+        assert db.execute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_no_delta_samples_skip_queries(self) -> None:
+        """Test legacy full-prompt samples need no lookups."""
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        sample = SimpleNamespace(id=uuid.uuid4(), prompt_prefix_length=None)
+        assert await _rehydrate_delta_prompts(db, [sample]) == {}
+        db.execute.assert_not_awaited()
+
+
+def _parent_fk_ondelete() -> str:
+    (fk,) = AITrainingSample.__table__.c.parent_sample_id.foreign_keys
+    return str(fk.ondelete)
+
+
+@pytest_asyncio.fixture
+async def training_db() -> AsyncIterator[AsyncSession]:
+    """SQLite copy of the training tables using the model's parent FK rule."""
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:", future=True, poolclass=StaticPool
+    )
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TABLE ai_training_prompt_blobs ("
+            "content_hash TEXT PRIMARY KEY, kind TEXT NOT NULL, "
+            "content TEXT NOT NULL, created_at TIMESTAMP)"
+        )
+        await conn.exec_driver_sql(
+            f"""
+            CREATE TABLE ai_training_samples (
+                id TEXT PRIMARY KEY,
+                conversation_id TEXT NOT NULL,
+                message_id TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                raw_prompt TEXT NOT NULL,
+                parent_sample_id TEXT REFERENCES ai_training_samples (id)
+                    ON DELETE {_parent_fk_ondelete()},
+                prompt_prefix_length INTEGER,
+                system_prompt_hash TEXT,
+                tools_hash TEXT,
+                raw_response TEXT NOT NULL,
+                tool_calls TEXT,
+                model_name TEXT NOT NULL,
+                model_version TEXT,
+                temperature REAL,
+                max_tokens INTEGER,
+                prompt_tokens INTEGER,
+                completion_tokens INTEGER,
+                latency_ms INTEGER,
+                user_feedback TEXT,
+                is_simulated BOOLEAN NOT NULL DEFAULT 0,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """
+        )
+        await conn.exec_driver_sql("PRAGMA foreign_keys = ON")
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+class TestDeletedParents:
+    """Tests that deleting a sample never leaves unexportable descendants."""
+
+    @pytest.mark.asyncio
+    async def test_remaining_samples_export_after_parent_delete(
+        self, training_db: AsyncSession
+    ) -> None:
+        """Test deleting a parent removes its children instead of orphaning them."""
+        rows, blobs = _delta_chain(3)
+        ids = {"conversation_id": uuid.uuid4(), "user_id": uuid.uuid4()}
+        training_db.add_all(
+            AITrainingPromptBlob(content_hash=h, kind="system", content=c)
+            for h, c in blobs.items()
+        )
+        training_db.add_all(
+            AITrainingSample(
+                **vars(row),
+                **ids,
+                message_id=uuid.uuid4(),
+                raw_response="ok",
+                model_name="test-model",
+            )
+            for row in rows
+        )
+        await training_db.commit()
+
+        await training_db.execute(
+            sa.delete(AITrainingSample).where(AITrainingSample.id == rows[1].id)
+        )
+        await training_db.commit()
+        training_db.expunge_all()
+
+        remaining = (await training_db.scalars(sa.select(AITrainingSample))).all()
+        prompts = await _rehydrate_delta_prompts(training_db, remaining)
+
+        assert [sample.id for sample in remaining] == [rows[0].id]
+        assert prompts == {rows[0].id: _turn_prompt(0)}
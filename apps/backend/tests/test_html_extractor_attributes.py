@@ -3,24 +3,22 @@ from bs4 import BeautifulSoup
 from src.services.ai.html_extractor import HTMLExtractionService
 
 
-def test_clean_attributes_filters_unsafe_schemes():
+def test_sanitize_filters_unsafe_attribute_schemes():
     svc = HTMLExtractionService()
 
     html = '<div><a href="javascript:alert(1)">x</a>'
-    html += '<a href="/relative/path">rel</a>'
+    html += '<a href="/relative/path" onclick="evil()">rel</a>'
     html += '<img src="data:image/png;base64,iVBORw0KGgo" alt="ok"/>'
     html += '<img src="file:///etc/passwd"/>'
     html += "</div>"
 
-    soup = BeautifulSoup(html, "html.parser")
-
-    svc._clean_attributes(soup)
+    soup = BeautifulSoup(svc._sanitize_html(html, "https://example.com/"), "lxml")
 
     anchors = soup.find_all("a")
     # first anchor should have no href
     assert "href" not in anchors[0].attrs
-    # second anchor keeps relative href
-    assert anchors[1]["href"] == "/relative/path"
+    # second anchor keeps its (now absolute) href but loses event handlers
+    assert anchors[1].attrs == {"href": "https://example.com/relative/path"}
 
     imgs = soup.find_all("img")
     # data image should be preserved
@@ -29,7 +27,7 @@ def test_clean_attributes_filters_unsafe_schemes():
     assert all(not (i.get("src") and i.get("src").startswith("file:")) for i in imgs)
 
 
-def test_resolve_urls_makes_absolute_and_drops_unsafe():
+def test_sanitize_makes_urls_absolute_and_drops_unsafe():
     svc = HTMLExtractionService()
 
     html = '<div><a href="/rel/path">link</a>'
@@ -38,10 +36,8 @@ def test_resolve_urls_makes_absolute_and_drops_unsafe():
     html += '<img src="file:///etc/hosts"/>'
     html += "</div>"
 
-    soup = BeautifulSoup(html, "html.parser")
-
     base = "https://example.com/some/page"
-    svc._resolve_urls(soup, base)
+    soup = BeautifulSoup(svc._sanitize_html(html, base), "lxml")
 
     anchors = soup.find_all("a")
     assert anchors[0]["href"] == "https://example.com/rel/path"
@@ -52,3 +48,13 @@ def test_resolve_urls_makes_absolute_and_drops_unsafe():
     assert imgs[0]["src"] == "https://example.com/images/pic.jpg"
     # file: src should have been removed
     assert "src" not in imgs[1].attrs
+
+
+def test_sanitize_collapses_whitespace():
+    svc = HTMLExtractionService()
+
+    html = "<div><p>  Whisk   the\n\n eggs  </p></div>"
+
+    soup = BeautifulSoup(svc._sanitize_html(html, "https://example.com/"), "lxml")
+
+    assert soup.find("p").string == "Whisk the eggs"
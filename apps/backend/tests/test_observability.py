@@ -8,6 +8,7 @@ import pytest
 
 from core.observability import (
     ProductTelemetryEventName,
+    ProductTelemetryExporter,
     _enable_pydantic_ai_instrumentation,
     _get_connection_string,
     _is_console_trace_exporter_enabled,
@@ -16,6 +17,7 @@ from core.observability import (
     _NoOpTracer,
     build_product_telemetry_attributes,
     configure_observability,
+    get_product_telemetry_sample_rates,
     get_tracer,
     record_product_telemetry_event,
 )
@@ -173,7 +175,7 @@ class TestConfigureObservability:
                 "opentelemetry.sdk.trace": MagicMock(TracerProvider=mock_provider_cls),
                 "opentelemetry.sdk.trace.export": MagicMock(
                     ConsoleSpanExporter=mock_exporter_cls,
-                    SimpleSpanProcessor=mock_processor_cls,
+                    BatchSpanProcessor=mock_processor_cls,
                 ),
                 "opentelemetry.instrumentation.fastapi": MagicMock(
                     FastAPIInstrumentor=mock_instrumentor_cls
@@ -485,7 +487,18 @@ class TestProductTelemetryContract:
             attrs["product.telemetry.tool_names"] == "web_search,fetch_url_as_markdown"
         )
 
-    def test_record_event_keeps_event_name_off_span_attributes(self) -> None:
+    @pytest.fixture
+    def telemetry_enabled(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        monkeypatch.setenv("ENABLE_OBSERVABILITY", "true")
+        exporter = MagicMock()
+        monkeypatch.setattr(
+            "core.observability.get_product_telemetry_exporter", lambda: exporter
+        )
+        return exporter
+
+    def test_record_event_keeps_event_name_off_span_attributes(
+        self, telemetry_enabled: MagicMock
+    ) -> None:
         span = MagicMock()
 
         attrs = record_product_telemetry_event(
@@ -496,14 +509,123 @@ class TestProductTelemetryContract:
             success=True,
         )
 
-        set_attribute_keys = [
-            call.args[0] for call in span.set_attribute.call_args_list
-        ]
-        assert "product.telemetry.event" not in set_attribute_keys
+        (span_attrs,) = span.set_attributes.call_args.args
+        assert "product.telemetry.event" not in span_attrs
+        assert span_attrs["product.telemetry.request_id"] == "req-789"
+        span.set_attribute.assert_not_called()
         span.add_event.assert_called_once_with(
             "url_import_completed",
             attributes=attrs,
         )
+        telemetry_enabled.submit.assert_called_once_with(attrs)
+
+    def test_disabled_telemetry_never_starts_exporter(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("ENABLE_OBSERVABILITY", "false")
+        span = MagicMock()
+
+        with patch("core.observability.get_product_telemetry_exporter") as get_exporter:
+            record_product_telemetry_event(
+                span,
+                event=ProductTelemetryEventName.URL_IMPORT_COMPLETED,
+                feature_name="url_import",
+                request_id="req-1",
+                success=True,
+            )
+
+        get_exporter.assert_not_called()
+        span.add_event.assert_not_called()
+
+    def test_sampled_out_events_skip_span_but_keep_failures(
+        self, monkeypatch: pytest.MonkeyPatch, telemetry_enabled: MagicMock
+    ) -> None:
+        monkeypatch.setenv(
+            "PRODUCT_TELEMETRY_SAMPLE_RATES",
+            "assistant_tool_started=0,*=1,bogus",
+        )
+        get_product_telemetry_sample_rates.cache_clear()
+        span = MagicMock()
+        try:
+            assert get_product_telemetry_sample_rates() == {
+                "assistant_tool_started": 0.0,
+                "*": 1.0,
+            }
+            for success in (None, False):
+                record_product_telemetry_event(
+                    span,
+                    event=ProductTelemetryEventName.ASSISTANT_TOOL_STARTED,
+                    feature_name="assistant",
+                    request_id="req-1",
+                    success=success,
+                )
+            record_product_telemetry_event(
+                span,
+                event=ProductTelemetryEventName.ASSISTANT_MESSAGE_STARTED,
+                feature_name="assistant",
+                request_id="req-1",
+            )
+        finally:
+            get_product_telemetry_sample_rates.cache_clear()
+
+        emitted = [call.args[0] for call in span.add_event.call_args_list]
+        assert emitted == ["assistant_tool_started", "assistant_message_started"]
+        assert span.set_attributes.call_count == 3
+        assert telemetry_enabled.submit.call_count == 3
+
+    def test_exporter_drops_when_full_and_records_low_cardinality_metrics(
+        self,
+    ) -> None:
+        instruments: dict[str, MagicMock] = {}
+        meter = MagicMock()
+        meter.create_counter.side_effect = lambda name, **_: instruments.setdefault(
+            name, MagicMock()
+        )
+        meter.create_histogram.side_effect = lambda name, **_: instruments.setdefault(
+            name, MagicMock()
+        )
+        exporter = ProductTelemetryExporter(max_queue_size=2, meter=meter)
+        attrs = build_product_telemetry_attributes(
+            event=ProductTelemetryEventName.URL_IMPORT_COMPLETED,
+            feature_name="url_import",
+            request_id="req-1",
+            success=True,
+            latency_ms=120,
+        )
+
+        with patch.object(exporter, "_ensure_worker"):
+            accepted = [exporter.submit(attrs) for _ in range(3)]
+        exporter.flush()
+
+        assert accepted == [True, True, False]
+        assert exporter.dropped == 1
+        instruments["product.telemetry.dropped"].add.assert_called_once_with(1)
+        metric_attrs = {
+            "event": "url_import_completed",
+            "feature_name": "url_import",
+            "success": True,
+        }
+        assert instruments["product.telemetry.events"].add.call_count == 2
+        instruments["product.telemetry.events"].add.assert_called_with(1, metric_attrs)
+        instruments["product.telemetry.latency"].record.assert_called_with(
+            120, metric_attrs
+        )
+
+    def test_exporter_worker_drains_queue_on_shutdown(self) -> None:
+        meter = MagicMock()
+        exporter = ProductTelemetryExporter(meter=meter, flush_interval=0.01)
+        attrs = build_product_telemetry_attributes(
+            event=ProductTelemetryEventName.RECIPE_SEARCH_SUBMITTED,
+            feature_name="recipes",
+            request_id="req-1",
+        )
+
+        for _ in range(5):
+            exporter.submit(attrs)
+        exporter.shutdown()
+
+        events = meter.create_counter.return_value
+        assert events.add.call_count == 5
 
 
 class TestMainStartupObservabilityWiring:
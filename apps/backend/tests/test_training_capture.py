@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 import uuid
+from dataclasses import replace
 from types import SimpleNamespace
 
 import pytest
 
 from services.chat_agent.training_capture import (
+    ConversationCaptureState,
+    TrainingCaptureQueue,
+    TrainingSampleCapture,
     capture_training_sample,
+    encode_prompt,
+    rehydrate_prompt,
     update_training_sample_feedback,
 )
 
@@ -19,6 +25,17 @@ class MockSession:
     def __init__(self) -> None:
         self._added_objects: list = []
         self._get_result: object | None = None
+        self.executed: list = []
+        self.commits = 0
+
+    async def __aenter__(self) -> MockSession:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def execute(self, statement: object) -> None:
+        self.executed.append(statement)
 
     def add(self, obj: object) -> None:
         if hasattr(obj, "id") and obj.id is None:
@@ -29,7 +46,7 @@ class MockSession:
         pass
 
     async def commit(self) -> None:
-        pass
+        self.commits += 1
 
     async def get(self, model_class: type, pk: uuid.UUID) -> object | None:
         return self._get_result
@@ -184,3 +201,149 @@ async def test_update_training_sample_feedback_not_found(mock_db: MockSession) -
     )
 
     assert result is None
+
+
+SYSTEM_PREFIX = "You are Nibble, a cooking assistant."
+TOOLS = [{"type": "function", "function": {"name": "search_recipes"}}]
+
+
+def _turn_prompt(turn: int) -> dict:
+    messages: list[dict] = [
+        {"role": "system", "content": f"{SYSTEM_PREFIX}\nNow: turn {turn}"}
+    ]
+    for i in range(turn + 1):
+        messages.append({"role": "user", "content": f"question {i}"})
+        messages.append({"role": "assistant", "content": f"answer {i}"})
+    return {"messages": messages, "tools": TOOLS}
+
+
+def test_delta_encoded_prompts_rehydrate_to_the_original() -> None:
+    """Each turn stores only its new messages yet rebuilds the full prompt."""
+    blobs: dict[str, str] = {}
+    previous: ConversationCaptureState | None = None
+    parent_messages = None
+    for turn in range(3):
+        prompt = _turn_prompt(turn)
+        encoded = encode_prompt(prompt, system_prefix=SYSTEM_PREFIX, previous=previous)
+        blobs.update({h: content for h, (_kind, content) in encoded.blobs.items()})
+
+        assert encoded.prompt_prefix_length == 2 * turn
+        assert SYSTEM_PREFIX not in encoded.raw_prompt
+
+        rebuilt = rehydrate_prompt(
+            encoded.raw_prompt,
+            system_prompt=blobs[encoded.system_prompt_hash or ""],
+            tools_json=blobs[encoded.tools_hash or ""],
+            parent_messages=parent_messages,
+            prompt_prefix_length=encoded.prompt_prefix_length,
+        )
+        assert rebuilt == prompt
+
+        parent_messages = rebuilt["messages"][1:]
+        previous = ConversationCaptureState(
+            sample_id=uuid.uuid4(),
+            message_digests=encoded.message_digests,
+            depth=encoded.depth,
+        )
+
+
+def test_keyframe_when_history_diverges_or_chain_is_long() -> None:
+    first = encode_prompt(_turn_prompt(1), system_prefix=SYSTEM_PREFIX)
+    state = ConversationCaptureState(
+        sample_id=uuid.uuid4(), message_digests=first.message_digests, depth=0
+    )
+
+    trimmed = _turn_prompt(2)
+    del trimmed["messages"][1:3]  # history window dropped the oldest exchange
+    diverged = encode_prompt(trimmed, previous=state)
+    long_chain = encode_prompt(_turn_prompt(2), previous=replace(state, depth=19))
+
+    for encoded in (diverged, long_chain):
+        assert encoded.parent_sample_id is None
+        assert encoded.prompt_prefix_length == 0
+        assert encoded.depth == 0
+
+
+@pytest.mark.asyncio
+async def test_capture_queue_writes_deltas_off_the_request_path(
+    mock_db: MockSession,
+) -> None:
+    """Queued turns are written in the background, chained to their parent."""
+    queue = TrainingCaptureQueue(session_factory=lambda: mock_db)  # type: ignore[arg-type,return-value]
+    conversation_id = uuid.uuid4()
+
+    for turn in range(2):
+        written_before = len(mock_db._added_objects)
+        assert queue.enqueue(
+            TrainingSampleCapture(
+                conversation_id=conversation_id,
+                message_id=uuid.uuid4(),
+                user_id=uuid.uuid4(),
+                prompt=_turn_prompt(turn),
+                raw_response=f"answer {turn}",
+                tool_calls=None,
+                model_name="test-model",
+                system_prefix=SYSTEM_PREFIX,
+            )
+        )
+        assert len(mock_db._added_objects) == written_before  # not written inline
+        await queue.drain()
+
+    first, second = mock_db._added_objects
+    assert first.parent_sample_id is None
+    assert second.parent_sample_id == first.id
+    assert second.prompt_prefix_length == 2
+    assert second.system_prompt_hash == first.system_prompt_hash
+    assert len(mock_db.executed) == 1  # blobs inserted once
+    await queue.shutdown()
+
+
+class FailingSession(MockSession):
+    """Session whose flush fails for samples with a ``bad`` response."""
+
+    def __init__(self, committed: list) -> None:
+        super().__init__()
+        self.committed = committed
+
+    async def flush(self) -> None:
+        if self._added_objects[-1].raw_response == "bad":
+            raise RuntimeError("value too long for column")
+
+    async def commit(self) -> None:
+        await super().commit()
+        self.committed.extend(self._added_objects)
+
+
+@pytest.mark.asyncio
+async def test_capture_queue_retries_failed_batch_one_sample_at_a_time() -> None:
+    """One bad sample no longer discards the rest of its batch."""
+    committed: list = []
+    sessions: list[FailingSession] = []
+
+    def session_factory() -> FailingSession:
+        sessions.append(FailingSession(committed))
+        return sessions[-1]
+
+    queue = TrainingCaptureQueue(session_factory=session_factory)  # type: ignore[arg-type]
+    captures = [
+        TrainingSampleCapture(
+            conversation_id=uuid.uuid4(),
+            message_id=uuid.uuid4(),
+            user_id=uuid.uuid4(),
+            prompt=_turn_prompt(0),
+            raw_response=response,
+            tool_calls=None,
+            model_name="test-model",
+        )
+        for response in ("good 1", "bad", "good 2")
+    ]
+    for capture in captures:
+        assert queue.enqueue(capture)
+    await queue.drain()
+
+    # One failed batch session, then one session per sample
+    assert len(sessions) == 4
+    assert [sample.raw_response for sample in committed] == ["good 1", "good 2"]
+    assert captures[1].conversation_id not in queue._conversations
+    assert captures[2].conversation_id in queue._conversations
+    await queue.shutdown()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from datetime import UTC, datetime, timedelta
 from decimal import Decimal
 from typing import Any
@@ -12,6 +13,8 @@ import pytest
 
 from services.weather import (
     WEATHER_CACHE_TTL,
+    WEATHER_PREWARM_INTERVAL,
+    WeatherCache,
     WeatherCacheEntry,
     _aggregate_weather_gov_periods,
     _cache_key,
@@ -21,9 +24,11 @@ from services.weather import (
     _safe_float,
     _safe_int,
     _to_float,
-    _weather_cache,
     clear_weather_cache,
+    get_daily_forecast_for_preferences,
     get_daily_forecast_for_user,
+    get_weather_cache,
+    prewarm_weather_cache,
 )
 
 
@@ -96,24 +101,25 @@ class TestHelperFunctions:
         assert _format_location(prefs) == "Boston, 02101"
 
     def test_cache_key_format(self) -> None:
-        user_id = uuid4()
         key = _cache_key(
-            user_id=user_id,
             latitude=42.3601,
             longitude=-71.0589,
             unit="fahrenheit",
             timezone="America/New_York",
         )
-        assert str(user_id) in key
-        assert "42.36010" in key
-        assert "-71.05890" in key
-        assert "fahrenheit" in key
-        assert "America/New_York" in key
+        assert key == "42.36:-71.06:fahrenheit:America/New_York"
+
+    def test_cache_key_shared_by_nearby_coordinates(self) -> None:
+        first = _cache_key(
+            latitude=42.3601, longitude=-71.0589, unit="celsius", timezone=None
+        )
+        second = _cache_key(
+            latitude=42.3649, longitude=-71.0551, unit="celsius", timezone=None
+        )
+        assert first == second
 
     def test_cache_key_auto_timezone(self) -> None:
-        user_id = uuid4()
         key = _cache_key(
-            user_id=user_id,
             latitude=0.0,
             longitude=0.0,
             unit="celsius",
@@ -311,15 +317,17 @@ class TestGetDailyForecastForUser:
 
         cached_payload = {"status": "ok", "cached": True}
         cache_key = _cache_key(
-            user_id=user_id,
             latitude=42.3601,
             longitude=-71.0589,
             unit="fahrenheit",
             timezone="America/New_York",
         )
-        _weather_cache[cache_key] = WeatherCacheEntry(
-            fetched_at=datetime.now(UTC),
-            payload=cached_payload,
+        get_weather_cache().set(
+            cache_key,
+            WeatherCacheEntry(
+                fetched_at=datetime.now(UTC),
+                payload=cached_payload,
+            ),
         )
 
         with patch(
@@ -347,15 +355,17 @@ class TestGetDailyForecastForUser:
 
         cached_payload = {"status": "ok", "cached": True}
         cache_key = _cache_key(
-            user_id=user_id,
             latitude=42.3601,
             longitude=-71.0589,
             unit="fahrenheit",
             timezone="America/New_York",
         )
-        _weather_cache[cache_key] = WeatherCacheEntry(
-            fetched_at=datetime.now(UTC) - WEATHER_CACHE_TTL - timedelta(minutes=1),
-            payload=cached_payload,
+        get_weather_cache().set(
+            cache_key,
+            WeatherCacheEntry(
+                fetched_at=datetime.now(UTC) - WEATHER_CACHE_TTL - timedelta(minutes=1),
+                payload=cached_payload,
+            ),
         )
 
         fresh_payload: dict[str, Any] = {
@@ -493,3 +503,185 @@ class TestGetDailyForecastForUser:
 
         mock_weather_gov.assert_not_called()
         assert result["status"] == "error"
+
+
+def _prefs(**overrides: Any) -> MagicMock:
+    prefs = MagicMock()
+    prefs.latitude = Decimal("42.3601")
+    prefs.longitude = Decimal("-71.0589")
+    prefs.timezone = "America/New_York"
+    prefs.units = "imperial"
+    prefs.city = "Boston"
+    prefs.state_or_region = "MA"
+    prefs.postal_code = None
+    prefs.country = "US"
+    for key, value in overrides.items():
+        setattr(prefs, key, value)
+    return prefs
+
+
+OK_PAYLOAD: dict[str, Any] = {
+    "status": "ok",
+    "provider": "open-meteo",
+    "unit": "F",
+    "location": None,
+    "days": [],
+}
+
+
+class TestSharedWeatherCache:
+    """Location-keyed cache shared across users and workers."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self) -> None:
+        clear_weather_cache()
+
+    @pytest.mark.asyncio
+    async def test_neighbours_share_one_fetch_with_own_labels(self) -> None:
+        fetch = AsyncMock(return_value=OK_PAYLOAD)
+        with patch("services.weather._fetch_open_meteo", fetch):
+            first = await get_daily_forecast_for_preferences(
+                user_id=uuid4(), preferences=_prefs()
+            )
+            second = await get_daily_forecast_for_preferences(
+                user_id=uuid4(),
+                preferences=_prefs(
+                    latitude=Decimal("42.3612"), city="Cambridge", state_or_region=None
+                ),
+            )
+
+        assert fetch.await_count == 1
+        assert fetch.await_args.kwargs["latitude"] == 42.36
+        assert first["location"] == "Boston, MA, US"
+        assert second["location"] == "Cambridge, US"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_are_coalesced(self) -> None:
+        release = asyncio.Event()
+
+        async def slow_fetch(**_: Any) -> dict[str, Any]:
+            await release.wait()
+            return OK_PAYLOAD
+
+        fetch = AsyncMock(side_effect=slow_fetch)
+        with patch("services.weather._fetch_open_meteo", fetch):
+            waiters = [
+                asyncio.create_task(
+                    get_daily_forecast_for_preferences(
+                        user_id=uuid4(), preferences=_prefs()
+                    )
+                )
+                for _ in range(5)
+            ]
+            await asyncio.sleep(0)
+            release.set()
+            results = await asyncio.gather(*waiters)
+
+        assert fetch.await_count == 1
+        assert all(result["status"] == "ok" for result in results)
+
+    @pytest.mark.asyncio
+    async def test_errors_expire_sooner_than_forecasts(self) -> None:
+        now = datetime.now(UTC)
+        cache = WeatherCache(clock=lambda: now)
+        cache.set("ok", WeatherCacheEntry(now - timedelta(minutes=5), OK_PAYLOAD))
+        cache.set(
+            "err",
+            WeatherCacheEntry(now - timedelta(minutes=5), {"status": "error"}),
+        )
+        fetch = AsyncMock(return_value={"status": "ok", "fresh": True})
+
+        assert await cache.get_or_fetch("ok", fetch) is OK_PAYLOAD
+        assert (await cache.get_or_fetch("err", fetch))["fresh"] is True
+        assert fetch.await_count == 1
+
+    def test_lru_bound(self) -> None:
+        cache = WeatherCache(max_entries=2)
+        entry = WeatherCacheEntry(datetime.now(UTC), OK_PAYLOAD)
+        cache.set("a", entry)
+        cache.set("b", entry)
+        cache.set("a", entry)
+        cache.set("c", entry)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+
+    @pytest.mark.asyncio
+    async def test_shared_backend_serves_other_workers(self) -> None:
+        stored: dict[str, WeatherCacheEntry] = {}
+        backend = MagicMock()
+        backend.get = AsyncMock(side_effect=lambda key: stored.get(key))
+        backend.set = AsyncMock(
+            side_effect=lambda key, entry, ttl: stored.__setitem__(key, entry)
+        )
+        worker_a = WeatherCache(backend=backend)
+        worker_b = WeatherCache(backend=backend)
+        fetch = AsyncMock(return_value=OK_PAYLOAD)
+
+        await worker_a.get_or_fetch("boston", fetch)
+        result = await worker_b.get_or_fetch("boston", fetch)
+
+        assert result == OK_PAYLOAD
+        assert fetch.await_count == 1
+        assert backend.set.await_args.args[2] == WEATHER_CACHE_TTL
+
+    @pytest.mark.asyncio
+    async def test_backend_failure_falls_back_to_fetch(self) -> None:
+        backend = MagicMock()
+        backend.get = AsyncMock(side_effect=ConnectionError("down"))
+        backend.set = AsyncMock(side_effect=ConnectionError("down"))
+        cache = WeatherCache(backend=backend)
+
+        result = await cache.get_or_fetch("boston", AsyncMock(return_value=OK_PAYLOAD))
+
+        assert result == OK_PAYLOAD
+        assert len(cache) == 1
+
+    @pytest.mark.asyncio
+    async def test_prewarm_fetches_each_location_once(self) -> None:
+        rows = [
+            _prefs(),
+            _prefs(latitude=Decimal("42.3612")),
+            _prefs(latitude=Decimal("51.5074"), country="UK", units="metric"),
+        ]
+        result = MagicMock()
+        result.scalars.return_value = rows
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+        fetch = AsyncMock(return_value=OK_PAYLOAD)
+
+        with patch("services.weather._fetch_open_meteo", fetch):
+            warmed = await prewarm_weather_cache(db)
+            # Fresh entries are served without another provider call
+            await get_daily_forecast_for_preferences(
+                user_id=uuid4(), preferences=_prefs()
+            )
+
+        assert warmed == 2
+        assert fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_prewarm_refreshes_entries_expiring_before_next_run(self) -> None:
+        key = _cache_key(
+            latitude=42.3601,
+            longitude=-71.0589,
+            unit="fahrenheit",
+            timezone="America/New_York",
+        )
+        get_weather_cache().set(
+            key,
+            WeatherCacheEntry(
+                datetime.now(UTC) - WEATHER_CACHE_TTL + WEATHER_PREWARM_INTERVAL / 2,
+                OK_PAYLOAD,
+            ),
+        )
+        result = MagicMock()
+        result.scalars.return_value = [_prefs()]
+        db = AsyncMock()
+        db.execute = AsyncMock(return_value=result)
+        fetch = AsyncMock(return_value=OK_PAYLOAD)
+
+        with patch("services.weather._fetch_open_meteo", fetch):
+            await prewarm_weather_cache(db)
+
+        assert fetch.await_count == 1
@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from services.ai.url_cache import get_url_content_cache
 from services.web_fetch import WebFetchResult, fetch_url_content
 
 
@@ -82,6 +83,7 @@ class TestFetchUrlContent:
         mock_service_class.assert_called_once_with(
             timeout=10,
             max_size=1 * 1024 * 1024,  # 1MB
+            cache=get_url_content_cache(),
         )
 
     @pytest.mark.asyncio
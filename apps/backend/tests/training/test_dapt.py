@@ -9,11 +9,20 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
-from training.dapt.create_corpus import read_jsonl
+import pandas as pd
+import pytest
+
+from training.dapt import create_corpus, process_foodcom
+from training.dapt.create_corpus import (
+    NearDuplicateFilter,
+    build_corpus,
+    read_jsonl,
+)
 from training.dapt.process_openrecipes import (
     _format_instructions,
     _format_list_or_str,
     format_recipe,
+    iter_json_array,
     parse_openrecipes,
 )
 
@@ -79,6 +88,17 @@ class TestParseOpenrecipes:
         assert result[0]["name"] == "Recipe 1"
         assert result[1]["name"] == "Recipe 2"
 
+    def test_json_array_streams_across_chunk_boundaries(self) -> None:
+        """Test incremental array decoding with tiny read chunks."""
+        import io
+
+        items = [{"name": "a]b", "n": [1, 2]}, -1.5e10, "x", None, 12345, []]
+        text = json.dumps(items, indent=2)
+
+        for chunk_size in (1, 3, 64):
+            result = list(iter_json_array(io.StringIO(text), chunk_size))
+            assert result == items
+
     def test_parse_jsonl_format(self, tmp_path: Path) -> None:
         """Test parsing JSONL format."""
         jsonl_file = tmp_path / "recipes.jsonl"
@@ -212,6 +232,130 @@ class TestFormatRecipe:
         assert "passed down through generations" in result
 
 
+class TestProcessFoodcom:
+    """Tests for chunked Food.com preprocessing."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "[]",
+            "['salt', 'olive oil']",
+            '["mom\'s", \'say "hi"\']',
+            "['crème fraîche', '']",
+            "['a\\\\b', 'c']",
+            "['a', 'b',]",
+            "[1, 2]",
+            "not a list",
+            float("nan"),
+        ],
+    )
+    def test_parse_list_matches_literal_eval(self, value: object) -> None:
+        """Test that the fast path parses exactly like literal_eval."""
+        assert process_foodcom.parse_list(value) == (
+            process_foodcom.safe_literal_eval(value)  # type: ignore[arg-type]
+        )
+
+    def test_chunked_output_matches_row_by_row(self, tmp_path: Path) -> None:
+        """Test that chunked output is byte-identical to iterrows formatting."""
+        pd.DataFrame(
+            {
+                "name": ["Mom's Stew  ", "Plain", None],
+                "id": [1, 2, 3],
+                "minutes": [40, 5, 90],
+                "tags": ["['easy', \"kid's\"]", "[]", "['a', 'b', 'c', 'd', 'e', 'f']"],
+                "steps": ["['chop', 'simmer']", None, "['say \"hi\"']"],
+                "description": ["A hearty stew for winter.", None, "short"],
+                "ingredients": ["['beef', 'jalapeño']", "['salt']", "[]"],
+            }
+        ).to_csv(tmp_path / "RAW_recipes.csv", index=False)
+        recipes = pd.read_csv(tmp_path / "RAW_recipes.csv")
+        for column in process_foodcom.LIST_COLUMNS:
+            recipes[column] = recipes[column].apply(process_foodcom.safe_literal_eval)
+        expected = "".join(
+            json.dumps({"text": process_foodcom.format_recipe(row)}, ensure_ascii=False)
+            + "\n"
+            for _, row in recipes.iterrows()
+        )
+
+        output = tmp_path / "recipes.jsonl"
+        count = process_foodcom.write_recipes_jsonl(
+            tmp_path, output, chunksize=2, workers=2
+        )
+
+        assert count == 3
+        assert output.read_text(encoding="utf-8") == expected
+
+    def test_reviews_keep_long_substitution_tips(self, tmp_path: Path) -> None:
+        """Test review filtering across chunks."""
+        tip = "I used Greek yogurt instead of sour cream and it was great!"
+        pd.DataFrame(
+            {"review": [tip, "Substituted honey.", None, "Lovely " * 10, tip]}
+        ).to_csv(tmp_path / "RAW_interactions.csv", index=False)
+
+        output = tmp_path / "reviews.jsonl"
+        count = process_foodcom.write_reviews_jsonl(
+            tmp_path, output, chunksize=2, workers=1
+        )
+
+        assert count == 2
+        assert next(read_jsonl(output)) == {"text": f"Cook's Tip: {tip}"}
+
+
+class TestBuildCorpus:
+    """Tests for the streaming corpus builder."""
+
+    @pytest.fixture
+    def sources(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        recipes = tmp_path / "recipes.jsonl"
+        tips = tmp_path / "tips.jsonl"
+        recipes.write_text(
+            "".join(
+                json.dumps({"text": f"Recipe {i} " * 20}) + "\n" for i in range(300)
+            )
+        )
+        tips.write_text(
+            "".join(
+                json.dumps({"text": f"Tip {i}", "_meta": 1}) + "\n" for i in range(50)
+            )
+        )
+        monkeypatch.setattr(
+            create_corpus, "INPUT_FILES", {"recipes": recipes, "tips": tips}
+        )
+        return tmp_path
+
+    def test_external_shuffle_is_a_seeded_permutation(self, sources: Path) -> None:
+        """Test bucketed shuffle keeps every record and is reproducible."""
+        plain, first, second = (sources / f"{n}.jsonl" for n in ("a", "b", "c"))
+
+        stats = build_corpus(sources, plain, shuffle=False)
+        build_corpus(sources, first, seed=7, bucket_mb=0.01)
+        build_corpus(sources, second, seed=7, bucket_mb=0.01)
+
+        plain_lines = plain.read_text().splitlines()
+        shuffled = first.read_text().splitlines()
+        assert stats.records == {"recipes": 300, "tips": 50}
+        assert '"_meta"' not in plain.read_text()
+        assert shuffled != plain_lines
+        assert sorted(shuffled) == sorted(plain_lines)
+        assert second.read_text() == first.read_text()
+
+    def test_token_counts_per_source(self, sources: Path) -> None:
+        """Test the heuristic counter is labelled as an estimate."""
+        stats = build_corpus(sources, sources / "out.jsonl", shuffle=False)
+
+        assert not stats.tokens_exact
+        assert stats.tokens["tips"] == sum(len(f"Tip {i}") for i in range(50)) // 4
+
+    def test_near_duplicates_are_dropped(self) -> None:
+        """Test MinHash LSH keeps the first of near-identical texts."""
+        base = " ".join(f"word{i}" for i in range(200))
+        dedup = NearDuplicateFilter(threshold=0.8)
+
+        assert not dedup.is_duplicate(base)
+        assert dedup.is_duplicate(base + " extra")
+        assert not dedup.is_duplicate(" ".join(f"other{i}" for i in range(200)))
+
+
 class TestShuffleDeterminism:
     """Tests for shuffle determinism with seed."""
 
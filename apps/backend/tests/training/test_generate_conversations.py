@@ -14,9 +14,13 @@ from training.generate_conversations import (
     ConversationGenerator,
     ConversationResult,
     FailedConversation,
+    GenerationCheckpoint,
     GenerationStats,
+    TokenBucket,
     _calculate_retry_delay,
     _load_env_files,
+    _parse_retry_after,
+    build_work_items,
 )
 
 
@@ -1123,6 +1127,161 @@ class TestGeneratePersonaTask:
                 await generator._generate_persona_task(AsyncMock(), "veggie_val", 10)
 
 
+# =============================================================================
+# Queued Generation Tests
+# =============================================================================
+
+
+class TestParseRetryAfter:
+    """Test Retry-After header parsing."""
+
+    def test_delta_seconds(self):
+        assert _parse_retry_after("12") == 12.0
+
+    def test_http_date_in_the_past(self):
+        assert _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_missing_or_invalid(self):
+        assert _parse_retry_after(None) is None
+        assert _parse_retry_after("soon") is None
+
+
+class TestBuildWorkItems:
+    """Test work queue planning."""
+
+    def test_reproducible_and_unique(self):
+        """Same seed gives the same plan; keys identify items uniquely."""
+        items = build_work_items(["veggie_val", "solo_sam"], 20, seed=3)
+
+        assert items == build_work_items(["veggie_val", "solo_sam"], 20, seed=3)
+        assert len({item.key for item in items}) == len(items)
+
+    def test_allocation_and_interleaving(self):
+        """Uses the 70/30 split and alternates personas."""
+        items = build_work_items(["veggie_val", "solo_sam"], 20)
+
+        veggie = [item for item in items if item.persona == "veggie_val"]
+        assert sum(not item.multi_turn for item in veggie) == 14
+        assert [item.persona for item in items[:4]] == [
+            "veggie_val",
+            "solo_sam",
+            "veggie_val",
+            "solo_sam",
+        ]
+
+
+@pytest.mark.asyncio
+class TestTokenBucket:
+    """Test request pacing with a fake clock."""
+
+    @pytest.fixture
+    def clock(self):
+        now = [0.0]
+
+        async def fake_sleep(seconds):
+            now[0] += seconds
+
+        with patch("training.generate_conversations.asyncio.sleep", fake_sleep):
+            yield now
+
+    async def test_refills_at_rate_after_burst(self, clock):
+        bucket = TokenBucket(rate=2.0, burst=2, clock=lambda: clock[0])
+
+        for _ in range(4):
+            await bucket.acquire()
+
+        assert clock[0] == pytest.approx(1.0)
+
+    async def test_rate_limit_pauses_and_halves_rate(self, clock):
+        bucket = TokenBucket(rate=2.0, clock=lambda: clock[0])
+        await bucket.acquire()
+
+        bucket.on_rate_limited(retry_after=5.0)
+        await bucket.acquire()
+        assert clock[0] == pytest.approx(5.0)  # first request once Retry-After ends
+
+        await bucket.acquire()
+        assert bucket.rate == 1.0
+        assert clock[0] == pytest.approx(6.0)  # then one token per second
+
+        for _ in range(30):
+            bucket.on_success()
+        assert bucket.rate == 2.0
+
+
+class TestGenerationCheckpoint:
+    """Test the append-only checkpoint file."""
+
+    def test_round_trip_ignores_truncated_line(self, tmp_path):
+        path = tmp_path / "checkpoint.jsonl"
+        items = build_work_items(["solo_sam"], 4)
+        checkpoint = GenerationCheckpoint(path)
+        checkpoint.mark_done(items[0])
+        checkpoint.close()
+        with path.open("a") as f:
+            f.write('"truncat')
+
+        assert GenerationCheckpoint(path).completed() == {items[0].key}
+
+
+@pytest.mark.asyncio
+class TestGenerateQueued:
+    """Test the work-queue generator end to end with a mocked backend."""
+
+    async def test_retries_429_and_resumes_from_checkpoint(self, tmp_path):
+        generator = ConversationGenerator()
+        calls = []
+
+        async def mock_login(client, persona):
+            generator.tokens[persona] = "token"
+            return "token"
+
+        async def mock_send(client, persona, message, conversation_id=None):
+            calls.append(message)
+            if len(calls) == 1:
+                return ConversationResult(
+                    persona=persona,
+                    conversation_id="",
+                    query=message,
+                    response_text="",
+                    error="HTTP 429: Too many requests",
+                    retry_after=0.0,
+                )
+            return ConversationResult(
+                persona=persona,
+                conversation_id=conversation_id or str(uuid4()),
+                query=message,
+                response_text="ok",
+            )
+
+        checkpoint = tmp_path / "checkpoint.jsonl"
+        with (
+            patch.object(generator, "login", side_effect=mock_login),
+            patch.object(generator, "send_chat_message", side_effect=mock_send),
+        ):
+            kwargs = {
+                "personas": ["veggie_val", "solo_sam"],
+                "target_per_persona": 10,
+                "concurrency": 4,
+                "requests_per_minute": 600_000,
+                "checkpoint_path": checkpoint,
+            }
+            results = await generator.generate_queued(**kwargs)
+            first_run_calls = len(calls)
+            resumed = await generator.generate_queued(**kwargs)
+
+        items = build_work_items(["veggie_val", "solo_sam"], 10)
+        turns = sum(len(item.turns) for item in items)
+        assert first_run_calls == turns + 1  # one 429 retried
+        assert generator.stats.rate_limited_responses == 1
+        assert len(results["veggie_val"]["single_turn"]) == 7
+        assert len(checkpoint.read_text().splitlines()) == len(items)
+        assert len(calls) == first_run_calls  # nothing left to send
+        assert resumed["solo_sam"]["checkpointed"] == sum(
+            item.persona == "solo_sam" for item in items
+        )
+
+
 # =============================================================================
 # Run Generation Entry Point Tests
 # =============================================================================
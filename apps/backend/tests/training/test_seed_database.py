@@ -13,9 +13,13 @@ from training.seed_database import (
     _get_database_url,
     _infer_difficulty,
     _infer_ethnicity,
+    _ingredient_picks,
     _load_env_files,
     _normalize_asyncpg_url,
     _parse_recipe_times,
+    build_persona_rows,
+    bulk_seed_all_personas,
+    bulk_seed_persona,
     cleanup_synthetic_users,
     create_persona_ingredients,
     create_persona_meal_history,
@@ -862,3 +866,141 @@ class TestCleanupSyntheticUsers:
         count = await cleanup_synthetic_users(mock_db_session)
 
         assert count == 0
+
+
+# =============================================================================
+# Bulk Seeding Engine Tests
+# =============================================================================
+
+
+class TestBuildPersonaRows:
+    """Tests for build_persona_rows."""
+
+    def test_ids_are_deterministic(self, sample_persona: dict) -> None:
+        """Should produce identical rows (and ids) on every build."""
+        kwargs = {"hashed_password": "hash", "today": date(2026, 3, 1)}
+
+        first = build_persona_rows("test_persona", sample_persona, **kwargs)
+        second = build_persona_rows("test_persona", sample_persona, **kwargs)
+
+        assert first == second
+        other = dict(sample_persona, user_id="synthetic-other-user")
+        assert (
+            build_persona_rows("test_persona", other, **kwargs).user["id"]
+            != first.user["id"]
+        )
+
+    def test_rows_reference_each_other(self, sample_persona: dict) -> None:
+        """Should link every row to the persona's user, recipes and pantry."""
+        rows = build_persona_rows(
+            "test_persona", sample_persona, hashed_password="hash", today=date.today()
+        )
+        user_id = rows.user["id"]
+        recipe_ids = [recipe["id"] for recipe in rows.recipes]
+        ingredient_ids = [item["id"] for item in rows.ingredients]
+
+        assert rows.user["email"] == "synthetic-test-user@pantrypilot.synthetic"
+        assert rows.preferences["user_id"] == user_id
+        assert rows.preferences["country"] == "US"
+        assert len(recipe_ids) == 2
+        assert len(ingredient_ids) == 4
+        assert {row["user_id"] for row in rows.recipes + rows.ingredients} == {user_id}
+        assert [meal["recipe_id"] for meal in rows.meals] == recipe_ids
+
+        all_ids = [user_id, rows.preferences["id"], *recipe_ids, *ingredient_ids]
+        all_ids += [link["id"] for link in rows.recipe_ingredients]
+        all_ids += [meal["id"] for meal in rows.meals]
+        assert len(set(all_ids)) == len(all_ids)
+
+    def test_links_and_dates_match_orm_path(self, sample_persona: dict) -> None:
+        """Should use the same ingredient spread and relative dates."""
+        today = date(2026, 3, 1)
+        rows = build_persona_rows(
+            "test_persona", sample_persona, hashed_password="hash", today=today
+        )
+        ingredient_ids = [item["id"] for item in rows.ingredients]
+
+        expected = [
+            (recipe["id"], ingredient_ids[idx], value, unit)
+            for recipe in rows.recipes
+            for idx, value, unit in _ingredient_picks(recipe["name"], 4)
+        ]
+        assert [
+            (
+                link["recipe_id"],
+                link["ingredient_id"],
+                link["quantity_value"],
+                link["quantity_unit"],
+            )
+            for link in rows.recipe_ingredients
+        ] == expected
+        assert [meal["planned_for_date"] for meal in rows.meals] == [
+            today - timedelta(days=2),
+            today - timedelta(days=1),
+        ]
+
+    def test_carries_known_geocode(self, sample_persona: dict) -> None:
+        """Should fill geocoded fields from a previous seed."""
+        geocoded = {
+            "latitude": 37.779,
+            "longitude": -122.419,
+            "timezone": "America/Los_Angeles",
+            "geocoded_at": None,
+        }
+
+        rows = build_persona_rows(
+            "test_persona",
+            sample_persona,
+            hashed_password="hash",
+            today=date.today(),
+            geocoded=geocoded,
+        )
+
+        assert rows.preferences["timezone"] == "America/Los_Angeles"
+        assert rows.preferences["latitude"] == 37.779
+
+
+@pytest.mark.asyncio
+class TestBulkSeed:
+    """Tests for bulk_seed_persona and bulk_seed_all_personas."""
+
+    async def test_one_insert_per_table(self, sample_persona: dict) -> None:
+        """Should write each table with a single multi-row INSERT."""
+        rows = build_persona_rows(
+            "test_persona", sample_persona, hashed_password="hash", today=date.today()
+        )
+        conn = AsyncMock()
+
+        await bulk_seed_persona(conn, rows)
+
+        tables = [call.args[0].table.name for call in conn.execute.call_args_list]
+        assert tables == [
+            "users",
+            "user_preferences",
+            "recipe_names",
+            "ingredient_names",
+            "recipe_ingredients",
+            "meal_history",
+        ]
+
+    async def test_one_transaction_per_persona(self, sample_persona: dict) -> None:
+        """Should clean up once, then seed each persona in its own transaction."""
+        conn = AsyncMock()
+        conn.execute.return_value = MagicMock()  # no existing synthetic users
+        engine = MagicMock()
+        engine.begin.return_value.__aenter__.return_value = conn
+        personas = {
+            "persona1": sample_persona,
+            "persona2": dict(sample_persona, user_id="synthetic-second-user"),
+        }
+
+        with (
+            patch("training.seed_database.PERSONAS", personas),
+            patch("training.seed_database.get_password_hash", return_value="hash"),
+        ):
+            results = await bulk_seed_all_personas(engine, geocode=False)
+
+        assert list(results) == ["persona1", "persona2"]
+        assert engine.begin.call_count == 3
+        # Geocode lookup, 5 cleanup deletes, user delete, then 6 inserts each
+        assert conn.execute.await_count == 1 + 6 + 2 * 6
@@ -0,0 +1,120 @@
+"""Tests for SFT token counting, the count cache and the packing planner."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import random
+from pathlib import Path
+
+from training.token_stats import (
+    MESSAGE_OVERHEAD_TOKENS,
+    cache_path,
+    count_batch,
+    count_export_tokens,
+    padded_tokens,
+    plan_packing,
+)
+
+
+SAMPLES = [
+    {
+        "messages": [
+            {"role": "system", "content": "You are a kitchen helper"},
+            {"role": "user", "content": "What can I cook tonight?"},
+            {
+                "role": "assistant",
+                "content": "",
+                "tool_calls": [
+                    {
+                        "function": {
+                            "name": "search_recipes",
+                            "arguments": '{"query": "quick dinner"}',
+                        }
+                    }
+                ],
+            },
+        ],
+        "tools": [{"type": "function", "function": {"name": "search_recipes"}}],
+    },
+    {"conversations": [{"from": "human", "value": "hello there"}]},
+    {"messages": []},
+]
+
+
+class WordEncoder:
+    """Counts whitespace-separated words; records how often it is called."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, texts: list[str]) -> list[int]:
+        self.calls += 1
+        return [len(text.split()) for text in texts]
+
+
+def _write_export(path: Path, samples: list[dict]) -> None:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        for sample in samples:
+            f.write(json.dumps(sample) + "\n")
+
+
+def test_count_batch_covers_messages_tool_calls_and_tools() -> None:
+    """Test one encoder call counts every sample's pieces and overhead."""
+    encode = WordEncoder()
+
+    counts = count_batch(SAMPLES, encode)
+
+    tool_json = json.dumps(SAMPLES[0]["tools"][0])
+    assert counts == [
+        5 + 5 + 0 + 1 + 3 + len(tool_json.split()) + 3 * MESSAGE_OVERHEAD_TOKENS,
+        2 + MESSAGE_OVERHEAD_TOKENS,
+        0,
+    ]
+    assert encode.calls == 1
+
+
+def test_counts_are_cached_next_to_the_export(tmp_path: Path) -> None:
+    """Test the sidecar is reused until the export changes."""
+    export = tmp_path / "train.jsonl.gz"
+    _write_export(export, SAMPLES)
+    encode = WordEncoder()
+
+    first = count_export_tokens(export, encode=encode, batch_samples=2)
+    assert cache_path(export).exists()
+    assert encode.calls == 2
+
+    assert count_export_tokens(export, encode=encode) == first
+    assert encode.calls == 2
+
+    _write_export(export, SAMPLES[:1])
+    assert count_export_tokens(export, encode=encode) == first[:1]
+    assert encode.calls == 3
+
+
+def test_plan_packing_fills_sequences() -> None:
+    """Test every sample is packed once and no sequence overflows."""
+    rng = random.Random(0)
+    counts = [rng.randint(50, 3000) for _ in range(500)] + [5000]
+
+    plan = plan_packing(counts, 4096)
+
+    assert plan.oversize == [500]
+    assert sorted(plan.order()) == list(range(len(counts)))
+    assert all(sum(counts[i] for i in seq) <= 4096 for seq in plan.sequences)
+    assert plan.utilization > 0.95
+    assert plan.num_sequences < len(counts) / 2
+
+
+def test_plan_packing_is_best_fit() -> None:
+    """Test a sample goes to the fullest sequence it still fits in."""
+    plan = plan_packing([6, 5, 4, 3, 2], 10)
+
+    assert plan.sequences == [[0, 2], [1, 3, 4]]
+    assert plan.utilization == 1.0
+
+
+def test_padded_tokens_pads_to_batch_max() -> None:
+    """Test unpacked batches pad to their longest (truncated) sample."""
+    assert padded_tokens([1, 4, 2, 2, 9], batch_size=2, max_seq_length=8) == 20
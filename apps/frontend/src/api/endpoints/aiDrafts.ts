@@ -439,11 +439,12 @@ export async function extractRecipeFromImageStream(
   const API_BASE_URL = getApiBaseUrl();
 
   try {
-    // Step 1: Upload the image(s) using POST endpoint to get draft_id
+    // Step 1: Upload the image(s). With stream=true the POST returns the
+    // pending draft_id immediately while extraction runs in the background.
     const formData = createImageUploadFormData(files);
 
     const uploadResponse = await fetch(
-      `${API_BASE_URL}/api/v1/ai/extract-recipe-from-image`,
+      `${API_BASE_URL}/api/v1/ai/extract-recipe-from-image?stream=true`,
       {
         method: 'POST',
         headers,
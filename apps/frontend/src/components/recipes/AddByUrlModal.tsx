@@ -284,6 +284,8 @@ export const AddByUrlModal: FC<AddByUrlModalProps> = ({
         return 'Starting extraction...';
       case 'fetching':
         return 'Fetching page content...';
+      case 'structured_data':
+        return 'Reading recipe data published by the page...';
       case 'ai_call':
         return 'Analyzing recipe with AI...';
       case 'converting':
@@ -193,6 +193,35 @@ describe('AddByUrlModal', () => {
     });
   });
 
+  it('shows a progress message for the structured data step', async () => {
+    const user = userEvent.setup();
+
+    mockExtractStream.mockImplementation(
+      async (
+        url: string,
+        _token: any,
+        onProgress: (ev: any) => void
+      ) => {
+        onProgress({ status: 'started' });
+        onProgress({ status: 'structured_data', step: 'structured_data' });
+        return new AbortController();
+      }
+    );
+
+    renderWithRouter(<AddByUrlModal isOpen={true} onClose={() => {}} />);
+
+    await user.type(
+      screen.getByLabelText(/Recipe URL/i),
+      'https://example.com/recipe'
+    );
+    const form = document.querySelector('form') as HTMLFormElement;
+    fireEvent.submit(form);
+
+    expect(
+      await screen.findByText(/Reading recipe data published by the page/i)
+    ).toBeInTheDocument();
+  });
+
   it('handles streaming completion that returns a signed_url and navigates there', async () => {
     const user = userEvent.setup();
     const onClose = vi.fn();
@@ -66,7 +66,10 @@ export interface AIDraftResponse {
 export type SSEEventStatus =
   | 'started'
   | 'fetching'
+  | 'processing'
+  | 'structured_data'
   | 'ai_call'
+  | 'partial'
   | 'converting'
   | 'complete'
   | 'error';
@@ -81,4 +84,14 @@ export interface SSEEvent {
   success?: boolean;
   confidence_score?: number;
   error_code?: string;
+  partial?: SSEPartialRecipe | null;
+}
+
+/**
+ * Summary of the recipe read so far, sent with 'partial' image extraction events
+ */
+export interface SSEPartialRecipe {
+  title?: string | null;
+  ingredient_count: number;
+  instruction_count: number;
 }
@@ -60,7 +60,7 @@ import torch
 # to ensure all optimisation patches are applied.
 import unsloth  # noqa: F401  (side-effect import for patching)
 from datasets import Dataset
-from reward_functions import ToolCallRewardComputer
+from reward_functions import BatchRewardScorer, RewardInput, ToolCallRewardComputer
 from trl import GRPOConfig, GRPOTrainer
 from unsloth import FastLanguageModel
 from unsloth.chat_templates import get_chat_template
@@ -394,15 +394,28 @@ def load_prompts(prompts_path: str, tokenizer) -> tuple[Dataset, list[dict]]:
 def build_reward_fn(
     raw_prompts: list[dict],
     reward_computer: ToolCallRewardComputer,
+    scorer: BatchRewardScorer | None = None,
 ) -> callable:
     """Build reward function that maps prompts to expected tools.
 
     Creates a lookup from prompt text → expected tool so the reward
     function can score completions correctly during GRPO training.
+    Batches are scored through ``scorer`` (in-process by default), which
+    parses each distinct completion once and can fan out to a process pool.
     """
     prompt_to_expected: dict[str, str | None] = {}
     for item in raw_prompts:
         prompt_to_expected[item["prompt"]] = item.get("expected_tool")
+    if scorer is None:
+        scorer = BatchRewardScorer(reward_computer)
+
+    def parse_keywords(value: str) -> tuple[str, ...] | None:
+        try:
+            keywords = json.loads(value)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        # Only a JSON list is a keyword list; other values mean no keywords
+        return tuple(keywords) if isinstance(keywords, list) else None
 
     def reward_fn(
         completions,
@@ -424,7 +437,9 @@ def build_reward_fn(
         ``expected_query_keywords`` contains JSON-serialised keyword lists
         for per-prompt objective query scoring.
         """
-        rewards = []
+        # Each prompt is repeated num_generations times; parse its keywords once
+        keyword_cache: dict[str, tuple[str, ...] | None] = {}
+        inputs = []
         for i, completion in enumerate(completions):
             # Use raw_prompt (original user text) for reward context
             user_text = (
@@ -439,19 +454,13 @@ def build_reward_fn(
                 exp_tool = prompt_to_expected.get(user_text)
             # Parse expected keywords from JSON string column
             keywords = None
-            if expected_query_keywords is not None:
-                try:
-                    keywords = json.loads(expected_query_keywords[i])
-                except (json.JSONDecodeError, TypeError, IndexError):
-                    keywords = None
-            score = reward_computer.compute_total_reward(
-                completion=completion,
-                prompt=user_text,
-                expected_tool=exp_tool,
-                expected_query_keywords=keywords,
-            )
-            rewards.append(score)
-        return rewards
+            if expected_query_keywords is not None and i < len(expected_query_keywords):
+                raw_keywords = expected_query_keywords[i]
+                if raw_keywords not in keyword_cache:
+                    keyword_cache[raw_keywords] = parse_keywords(raw_keywords)
+                keywords = keyword_cache[raw_keywords]
+            inputs.append(RewardInput(completion, user_text, exp_tool, keywords))
+        return scorer.score(inputs)
 
     return reward_fn
 
@@ -616,8 +625,10 @@ def main(args: argparse.Namespace) -> None:
         query_weight=args.query_weight,
     )
 
-    # Build reward function with expected-tool lookup
-    reward_fn = build_reward_fn(raw_prompts, reward_computer)
+    # Build reward function with expected-tool lookup; large batches fan out
+    # to --reward_workers processes
+    reward_scorer = BatchRewardScorer(reward_computer, workers=args.reward_workers)
+    reward_fn = build_reward_fn(raw_prompts, reward_computer, reward_scorer)
 
     # Log hyperparameters manually (Azure ML 200-param limit)
     mlflow.log_params(
@@ -714,7 +725,8 @@ def main(args: argparse.Namespace) -> None:
 
     # Train
     print("\n🔥 Starting GRPO training...")
-    trainer.train()
+    with reward_scorer:
+        trainer.train()
 
     # Save final model
     print("\n💾 Saving final model...")
@@ -891,6 +903,12 @@ if __name__ == "__main__":
         default=1.0,
         help="Reward weight for search query expansion quality",
     )
+    parser.add_argument(
+        "--reward_workers",
+        type=int,
+        default=0,
+        help="Processes for scoring large reward batches (default: 0, in-process)",
+    )
 
     # Quantization
     parser.add_argument(
@@ -9,6 +9,12 @@ Optimization (GRPO) training. Scores model completions on:
 - Argument completeness (required args present)
 - Search query quality and keyword coverage
 
+Each completion is parsed once (``parse_completion``, cached) into a
+``ParsedCompletion`` that every reward dimension reads. Batches are scored
+with ``compute_batch_rewards`` (identical inputs scored once) or, for large
+``num_generations``-expanded batches, ``BatchRewardScorer`` which fans chunks
+out across a spawn-based process pool.
+
 Usage:
     from reward_functions import ToolCallRewardComputer
 
@@ -19,12 +25,23 @@ Usage:
         expected_tool="search_recipes",
         expected_query_keywords=["pesto", "preservation", "freeze"],
     )
+
+    with BatchRewardScorer(reward_computer, workers=4) as scorer:
+        scores = scorer.score([RewardInput(completion, prompt, "search_recipes")])
 """
 
 from __future__ import annotations
 
 import json
+import multiprocessing
 import re
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+from types import TracebackType
+from typing import Self
 
 # PantryPilot tool definitions aligned with the actual agent tool set
 # in apps/backend/src/services/chat_agent/tools/
@@ -96,6 +113,121 @@ AVAILABLE_TOOLS: dict[str, dict[str, list[str]]] = {
 }
 
 
+# Tool call formats, tried in order (see ``extract_tool_call``)
+_TAGGED_TOOL_CALL = re.compile(r"<tool_call>\s*(\{.*?\})\s*</tool_call>", re.DOTALL)
+_RAW_TOOL_CALL = re.compile(
+    r'\{\s*"name"\s*:\s*"[^"]+"\s*,\s*"arguments"\s*:\s*\{.*?\}\s*\}', re.DOTALL
+)
+_FLAT_JSON_OBJECT = re.compile(r"\{[^{}]*\}")
+
+_SPECIFICITY_KEYWORDS = (
+    "recipe",
+    "recipes",
+    "method",
+    "technique",
+    "ideas",
+    "ways",
+    "how to",
+    "dishes",
+)
+
+# Completions kept by the ``parse_completion`` cache; GRPO groups often
+# repeat completions, and each reward dimension reads the same parse
+PARSE_CACHE_SIZE = 16384
+
+# Below this many completions a batch is scored in-process
+PARALLEL_THRESHOLD = 4096
+PARALLEL_CHUNK_SIZE = 512
+
+
+def extract_tool_call(completion: str) -> dict | None:
+    """Extract tool call dict from model completion text.
+
+    Handles multiple formats:
+    - <tool_call>{"name": ..., "arguments": ...}</tool_call>
+    - {"name": ..., "arguments": ...}  (raw JSON)
+    - Function call blocks from ChatML
+
+    Returns:
+        Parsed tool call dict with 'name' and 'arguments' keys,
+        or None if no valid tool call found.
+    """
+    # Try <tool_call> tags first (ChatML / Qwen style)
+    tag_match = _TAGGED_TOOL_CALL.search(completion)
+    if tag_match:
+        try:
+            return json.loads(tag_match.group(1))
+        except json.JSONDecodeError:
+            pass
+
+    # Try raw JSON with name/arguments structure
+    json_match = _RAW_TOOL_CALL.search(completion)
+    if json_match:
+        try:
+            return json.loads(json_match.group(0))
+        except json.JSONDecodeError:
+            pass
+
+    # Try to find any JSON object in the completion
+    for match in _FLAT_JSON_OBJECT.finditer(completion):
+        try:
+            parsed = json.loads(match.group(0))
+            if "name" in parsed:
+                return parsed
+        except json.JSONDecodeError:
+            continue
+
+    return None
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedCompletion:
+    """A completion parsed once for every reward dimension.
+
+    ``tool_call`` may be shared between cache hits; treat it as read-only.
+    """
+
+    text: str
+    tool_call: dict | None
+    has_open_tag: bool
+    has_close_tag: bool
+    extra_chars: int
+
+
+def _extra_chars(completion: str, has_open_tag: bool, has_close_tag: bool) -> int:
+    """Length of the stripped text before and after the tool call."""
+    if has_open_tag:
+        before = completion.split("<tool_call>", 1)[0].strip()
+    else:
+        before = completion.split("{", 1)[0].strip()
+    after = completion.rsplit("</tool_call>", 1)[-1].strip() if has_close_tag else ""
+    return len(before) + len(after)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_completion(completion: str) -> ParsedCompletion:
+    """Parse ``completion`` into the structure the reward dimensions score."""
+    has_open_tag = "<tool_call>" in completion
+    has_close_tag = "</tool_call>" in completion
+    return ParsedCompletion(
+        text=completion,
+        tool_call=extract_tool_call(completion),
+        has_open_tag=has_open_tag,
+        has_close_tag=has_close_tag,
+        extra_chars=_extra_chars(completion, has_open_tag, has_close_tag),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class RewardInput:
+    """One completion to score, with its prompt's expectations."""
+
+    completion: str
+    prompt: str = ""
+    expected_tool: str | None = None
+    expected_query_keywords: tuple[str, ...] | None = None
+
+
 class ToolCallRewardComputer:
     """Compute rewards for tool-calling outputs.
 
@@ -121,52 +253,22 @@ class ToolCallRewardComputer:
         self.args_weight = args_weight
         self.query_weight = query_weight
 
+    @property
+    def weights(self) -> tuple[float, float, float, float]:
+        """``(json, tool, args, query)`` weights, e.g. to rebuild in a worker."""
+        return (self.json_weight, self.tool_weight, self.args_weight, self.query_weight)
+
     def _extract_tool_call(self, completion: str) -> dict | None:
-        """Extract tool call dict from model completion text.
+        """Extract tool call dict from model completion text."""
+        return parse_completion(completion).tool_call
 
-        Handles multiple formats:
-        - <tool_call>{"name": ..., "arguments": ...}</tool_call>
-        - {"name": ..., "arguments": ...}  (raw JSON)
-        - Function call blocks from ChatML
+    @staticmethod
+    def _parsed(completion: str | ParsedCompletion) -> ParsedCompletion:
+        if isinstance(completion, ParsedCompletion):
+            return completion
+        return parse_completion(completion)
 
-        Returns:
-            Parsed tool call dict with 'name' and 'arguments' keys,
-            or None if no valid tool call found.
-        """
-        # Try <tool_call> tags first (ChatML / Qwen style)
-        tag_match = re.search(
-            r"<tool_call>\s*(\{.*?\})\s*</tool_call>", completion, re.DOTALL
-        )
-        if tag_match:
-            try:
-                return json.loads(tag_match.group(1))
-            except json.JSONDecodeError:
-                pass
-
-        # Try raw JSON with name/arguments structure
-        json_match = re.search(
-            r'\{\s*"name"\s*:\s*"[^"]+"\s*,\s*"arguments"\s*:\s*\{.*?\}\s*\}',
-            completion,
-            re.DOTALL,
-        )
-        if json_match:
-            try:
-                return json.loads(json_match.group(0))
-            except json.JSONDecodeError:
-                pass
-
-        # Try to find any JSON object in the completion
-        for match in re.finditer(r"\{[^{}]*\}", completion):
-            try:
-                parsed = json.loads(match.group(0))
-                if "name" in parsed:
-                    return parsed
-            except json.JSONDecodeError:
-                continue
-
-        return None
-
-    def reward_json_validity(self, completion: str) -> float:
+    def reward_json_validity(self, completion: str | ParsedCompletion) -> float:
         """Score JSON parsability and format quality on a continuous scale.
 
         Produces diverse scores by evaluating both parseability and
@@ -183,13 +285,14 @@ class ToolCallRewardComputer:
         Returns:
             Float in [0.0, 1.0]
         """
-        has_open_tag = "<tool_call>" in completion
-        has_close_tag = "</tool_call>" in completion
+        parsed = self._parsed(completion)
+        has_open_tag = parsed.has_open_tag
+        has_close_tag = parsed.has_close_tag
 
-        tool_call = self._extract_tool_call(completion)
+        tool_call = parsed.tool_call
         if tool_call is None:
             # Partial credit for attempting JSON structure
-            if "{" in completion and '"name"' in completion:
+            if "{" in parsed.text and '"name"' in parsed.text:
                 return 0.15
             return 0.0
 
@@ -208,13 +311,7 @@ class ToolCallRewardComputer:
             score += 0.1
 
         # Conciseness: reward minimal text outside the tool call
-        if has_open_tag:
-            before = completion.split("<tool_call>")[0].strip()
-        else:
-            before = completion.split("{")[0].strip()
-        after = completion.split("</tool_call>")[-1].strip() if has_close_tag else ""
-        extra_chars = len(before) + len(after)
-
+        extra_chars = parsed.extra_chars
         if extra_chars < 10:
             score += 0.15
         elif extra_chars < 50:
@@ -225,13 +322,13 @@ class ToolCallRewardComputer:
         return min(score, 1.0)
 
     def reward_tool_name(
-        self, completion: str, expected_tool: str | None = None
+        self, completion: str | ParsedCompletion, expected_tool: str | None = None
     ) -> float:
         """Score tool selection.
 
         Returns: 1.0 (correct) / 0.5 (valid but wrong) / 0.0 (invalid).
         """
-        tool_call = self._extract_tool_call(completion)
+        tool_call = self._parsed(completion).tool_call
         if tool_call is None:
             return 0.0
 
@@ -244,7 +341,7 @@ class ToolCallRewardComputer:
         else:
             return 0.0
 
-    def reward_argument_completeness(self, completion: str) -> float:
+    def reward_argument_completeness(self, completion: str | ParsedCompletion) -> float:
         """Score argument quality: required args + useful optional args.
 
         For tools with required args: primary score from required arg
@@ -257,7 +354,7 @@ class ToolCallRewardComputer:
         Returns:
             Float in [0.0, 1.0]
         """
-        tool_call = self._extract_tool_call(completion)
+        tool_call = self._parsed(completion).tool_call
         if tool_call is None:
             return 0.0
 
@@ -296,9 +393,9 @@ class ToolCallRewardComputer:
 
     def reward_query_expansion(
         self,
-        completion: str,
+        completion: str | ParsedCompletion,
         context: str,
-        expected_keywords: list[str] | None = None,
+        expected_keywords: Sequence[str] | None = None,
     ) -> float:
         """Score search query quality with keyword coverage.
 
@@ -317,7 +414,7 @@ class ToolCallRewardComputer:
         Returns:
             Float in [0.0, 1.0]
         """
-        tool_call = self._extract_tool_call(completion)
+        tool_call = self._parsed(completion).tool_call
         if tool_call is None or tool_call.get("name") != "search_recipes":
             return 0.5  # N/A — not a search task
 
@@ -344,22 +441,15 @@ class ToolCallRewardComputer:
             score += 0.1
 
         # Specificity keywords
-        specificity = [
-            "recipe",
-            "recipes",
-            "method",
-            "technique",
-            "ideas",
-            "ways",
-            "how to",
-            "dishes",
-        ]
-        if any(kw in query.lower() for kw in specificity):
+        query_lower = query.lower()
+        if any(kw in query_lower for kw in _SPECIFICITY_KEYWORDS):
             score += 0.1
 
         return min(score, 1.0)
 
-    def reward_no_tool(self, completion: str, expected_tool: str | None) -> float:
+    def reward_no_tool(
+        self, completion: str | ParsedCompletion, expected_tool: str | None
+    ) -> float:
         """Score correct non-tool-call behavior with response quality.
 
         When expected_tool is None, the model should NOT produce a tool call.
@@ -372,12 +462,12 @@ class ToolCallRewardComputer:
         if expected_tool is not None:
             return 0.5  # N/A — not a no-tool scenario
 
-        tool_call = self._extract_tool_call(completion)
-        if tool_call is not None:
+        parsed = self._parsed(completion)
+        if parsed.tool_call is not None:
             return 0.0  # Incorrectly called a tool
 
         # Correct: no tool call. Score response substance for differentiation.
-        text = completion.strip()
+        text = parsed.text.strip()
         length = len(text)
         if length == 0:
             return 0.3  # Empty response
@@ -391,10 +481,10 @@ class ToolCallRewardComputer:
 
     def compute_total_reward(
         self,
-        completion: str,
+        completion: str | ParsedCompletion,
         prompt: str,
         expected_tool: str | None = None,
-        expected_query_keywords: list[str] | None = None,
+        expected_query_keywords: Sequence[str] | None = None,
     ) -> float:
         """Compute weighted total reward with keyword-aware scoring.
 
@@ -406,21 +496,22 @@ class ToolCallRewardComputer:
         expected_query_keywords for per-prompt, objective scoring
         that creates high variance across completions.
         """
+        parsed = self._parsed(completion)
         if expected_tool is None:
-            no_tool_score = self.reward_no_tool(completion, expected_tool)
+            no_tool_score = self.reward_no_tool(parsed, expected_tool)
             if no_tool_score > 0:
                 return no_tool_score  # Varies by response quality (0.3-1.0)
             # Incorrectly called a tool — small credit for well-formed JSON
-            json_score = self.reward_json_validity(completion)
+            json_score = self.reward_json_validity(parsed)
             return json_score * 0.15
 
         # Tool expected — score all dimensions
         rewards = {
-            "json": self.reward_json_validity(completion) * self.json_weight,
-            "tool": self.reward_tool_name(completion, expected_tool) * self.tool_weight,
-            "args": self.reward_argument_completeness(completion) * self.args_weight,
+            "json": self.reward_json_validity(parsed) * self.json_weight,
+            "tool": self.reward_tool_name(parsed, expected_tool) * self.tool_weight,
+            "args": self.reward_argument_completeness(parsed) * self.args_weight,
             "query": self.reward_query_expansion(
-                completion, prompt, expected_keywords=expected_query_keywords
+                parsed, prompt, expected_keywords=expected_query_keywords
             )
             * self.query_weight,
         }
@@ -429,3 +520,94 @@ class ToolCallRewardComputer:
             self.json_weight + self.tool_weight + self.args_weight + self.query_weight
         )
         return sum(rewards.values()) / total_weight
+
+    def compute_batch_rewards(self, inputs: Sequence[RewardInput]) -> list[float]:
+        """Score a batch in-process; identical inputs are scored once."""
+        scores: dict[RewardInput, float] = {}
+        rewards = []
+        for item in inputs:
+            score = scores.get(item)
+            if score is None:
+                score = scores[item] = self.compute_total_reward(
+                    item.completion,
+                    item.prompt,
+                    expected_tool=item.expected_tool,
+                    expected_query_keywords=item.expected_query_keywords,
+                )
+            rewards.append(score)
+        return rewards
+
+
+@lru_cache(maxsize=8)
+def _worker_computer(
+    weights: tuple[float, float, float, float],
+) -> ToolCallRewardComputer:
+    return ToolCallRewardComputer(*weights)
+
+
+def _score_chunk(
+    weights: tuple[float, float, float, float], chunk: list[RewardInput]
+) -> list[float]:
+    return _worker_computer(weights).compute_batch_rewards(chunk)
+
+
+class BatchRewardScorer:
+    """Score reward batches, fanning large ones out across a process pool.
+
+    Batches smaller than ``parallel_threshold`` (or any batch when
+    ``workers <= 1``) are scored in-process, where pickling would cost more
+    than it saves. Larger batches are deduplicated, split into
+    ``chunk_size`` chunks and scored by a pool that is started on first use
+    and reused until ``close``. Workers use the ``spawn`` start method so the
+    pool is safe to create after CUDA is initialized.
+    """
+
+    def __init__(
+        self,
+        computer: ToolCallRewardComputer,
+        workers: int = 0,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        chunk_size: int = PARALLEL_CHUNK_SIZE,
+    ) -> None:
+        self.computer = computer
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.chunk_size = chunk_size
+        self._pool: ProcessPoolExecutor | None = None
+
+    def score(self, inputs: Sequence[RewardInput]) -> list[float]:
+        """Return one reward per input, in order."""
+        if self.workers <= 1 or len(inputs) < self.parallel_threshold:
+            return self.computer.compute_batch_rewards(inputs)
+
+        unique = list(dict.fromkeys(inputs))
+        chunks = [
+            unique[i : i + self.chunk_size]
+            for i in range(0, len(unique), self.chunk_size)
+        ]
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        results = self._pool.map(
+            _score_chunk, [self.computer.weights] * len(chunks), chunks
+        )
+        scores = dict(zip(unique, chain.from_iterable(results), strict=True))
+        return [scores[item] for item in inputs]
+
+    def close(self) -> None:
+        """Shut the worker pool down, if one was started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
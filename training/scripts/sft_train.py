@@ -35,7 +35,7 @@ import torch
 # Unsloth MUST be imported before trl, transformers, peft
 # to ensure all optimisation patches are applied.
 import unsloth  # noqa: F401  (side-effect import for patching)
-from datasets import load_dataset
+from datasets import Dataset, load_dataset
 from transformers import TrainerCallback
 from trl import SFTConfig, SFTTrainer
 from unsloth import FastLanguageModel
@@ -240,6 +240,53 @@ def _inject_tools_into_system_prompt(
     return system_content + tools_block
 
 
+def load_packing_plan(plan_path: str, num_samples: int, max_seq_length: int) -> dict:
+    """Load and check a packing plan for a training set of ``num_samples``.
+
+    The plan comes from ``apps/backend/scripts/analyze_token_lengths.py
+    --plan-output`` run on the same training export.
+
+    Returns:
+        The loaded plan
+    """
+    with open(plan_path) as f:
+        plan = json.load(f)
+    order = [i for sequence in plan["sequences"] for i in sequence]
+    order += plan["oversize"]
+    if sorted(order) != list(range(num_samples)):
+        raise ValueError(
+            f"Packing plan {plan_path} covers {len(order)} samples but the "
+            f"training data has {num_samples}; re-run analyze_token_lengths.py "
+            "on this export"
+        )
+    if plan["max_seq_length"] > max_seq_length:
+        print(
+            f"⚠️ Packing plan targets {plan['max_seq_length']} tokens "
+            f"but max_seq_length is {max_seq_length}"
+        )
+    print(
+        f"📦 Packing plan: {len(order)} samples -> "
+        f"{len(plan['sequences']) + len(plan['oversize'])} sequences "
+        f"({plan['utilization']:.1%} utilization)"
+    )
+    return plan
+
+
+def pack_by_plan(dataset: Any, plan: dict) -> Any:
+    """Build one training row per planned sequence from formatted samples.
+
+    Each planned sequence becomes a single ``text`` row holding its samples'
+    chat-formatted texts back to back (each already ends with the template's
+    end-of-turn token); oversize samples stay as rows of their own. The
+    trainer then runs with ``packing=False``, so the plan is used exactly as
+    written rather than re-packed by TRL.
+    """
+    texts = dataset["text"]
+    packed = ["".join(texts[i] for i in sequence) for sequence in plan["sequences"]]
+    packed += [texts[i] for i in plan["oversize"]]
+    return Dataset.from_dict({"text": packed})
+
+
 def main(args: argparse.Namespace) -> None:
     """
     Main training function for SFT.
@@ -312,6 +359,12 @@ def main(args: argparse.Namespace) -> None:
         else:
             eval_dataset = load_dataset("json", data_files=args.val_data, split="train")
 
+    packing_plan: dict | None = None
+    if args.packing_plan:
+        packing_plan = load_packing_plan(
+            args.packing_plan, len(dataset), args.max_seq_length
+        )
+
     # Apply chat template (ChatML for Qwen/Gemma, native for Granite/others)
     chat_template_name = args.chat_template
     print(f"\n💬 Applying chat template: {chat_template_name}...")
@@ -336,6 +389,9 @@ def main(args: argparse.Namespace) -> None:
         )
 
     print(f"✅ Loaded {len(dataset)} training samples")
+    if packing_plan:
+        dataset = pack_by_plan(dataset, packing_plan)
+        print(f"📦 Packed into {len(dataset)} training rows")
     if eval_dataset:
         print(f"✅ Loaded {len(eval_dataset)} validation samples")
 
@@ -364,6 +420,11 @@ def main(args: argparse.Namespace) -> None:
             "logging_steps": args.logging_steps,
             "eval_steps": args.eval_steps,
             "save_steps": args.save_steps,
+            "packing": args.packing,
+            "packing_plan": args.packing_plan is not None,
+            "packing_utilization": (
+                packing_plan["utilization"] if packing_plan else None
+            ),
         }
     )
     mlflow.set_tags(
@@ -408,6 +469,7 @@ def main(args: argparse.Namespace) -> None:
         eval_dataset=eval_dataset,
         dataset_text_field="text",
         max_seq_length=args.max_seq_length,
+        packing=args.packing,
         args=training_args,
         callbacks=[ToolCallMetricsCallback()],
     )
@@ -552,6 +614,20 @@ if __name__ == "__main__":
         "For LFM2.5: q_proj,k_proj,v_proj,out_proj,in_proj,w1,w2,w3",
     )
 
+    # Sequence packing
+    parser.add_argument(
+        "--packing",
+        action="store_true",
+        help="Pack samples into max_seq_length sequences instead of padding",
+    )
+    parser.add_argument(
+        "--packing_plan",
+        type=str,
+        default=None,
+        help="Packing plan JSON from scripts/analyze_token_lengths.py "
+        "--plan-output; rows are packed as planned (not with --packing)",
+    )
+
     # Chat template
     parser.add_argument(
         "--chat_template",
@@ -618,6 +694,8 @@ if __name__ == "__main__":
     )
 
     args = parser.parse_args()
+    if args.packing and args.packing_plan:
+        parser.error("--packing_plan already packs the rows; drop --packing")
 
     # Install Mamba kernels before any model loading if requested
     if args.install_mamba:
@@ -0,0 +1,175 @@
+"""Equivalence checks and throughput benchmark for batched reward scoring.
+
+A synthetic GRPO-shaped workload (each prompt sampled ``num_generations``
+times, so completions repeat within groups) is scored per call with
+``compute_total_reward``, with ``compute_batch_rewards`` and with a
+``BatchRewardScorer`` process pool. Every path must return identical rewards;
+the benchmark prints rewards/sec for each.
+
+Run from repository root:
+    cd apps/backend && PYTHONPATH=../../training/scripts uv run pytest \\
+        ../../training/tests/test_reward_benchmark.py -v -s
+
+    # Standalone, larger workload
+    cd apps/backend && PYTHONPATH=../../training/scripts uv run python \\
+        ../../training/tests/test_reward_benchmark.py --completions 100000 \\
+        --workers 1 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+# Ensure reward_functions module is importable
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+
+from reward_functions import (
+    BatchRewardScorer,
+    RewardInput,
+    ToolCallRewardComputer,
+    parse_completion,
+)
+
+BENCHMARK_COMPLETIONS = 10_000
+NUM_GENERATIONS = 8
+
+_PROMPTS = [
+    ("I have too much basil", "search_recipes", ("pesto", "freeze", "basil")),
+    ("What's the weather like for grilling?", "get_daily_weather", None),
+    ("Add milk and eggs to my list", "add_to_shopping_list", None),
+    ("Suggest a weeknight dinner", "suggest_recipe", ("quick", "dinner")),
+    ("Thanks, that was great!", None, None),
+]
+_QUERIES = ["basil", "basil pesto recipes", "how to freeze fresh basil", "dinner"]
+
+
+def _completion(rng: random.Random, tool: str | None) -> str:
+    """One plausible model output for a prompt expecting ``tool``."""
+    name = tool or rng.choice(["search_recipes", "web_search"])
+    arguments = json.dumps({"query": rng.choice(_QUERIES)})
+    call = f'{{"name": "{name}", "arguments": {arguments}}}'
+    style = rng.randrange(6)
+    if style == 0:
+        return f"<tool_call>\n{call}\n</tool_call>"
+    if style == 1:
+        return f"Let me look that up for you.\n\n<tool_call>{call}</tool_call>"
+    if style == 2:
+        return call
+    if style == 3:
+        return f'<tool_call>{{"name": "{name}", "arguments": {{</tool_call>'
+    if style == 4:
+        return "You're welcome! Let me know if you'd like more ideas. " * (
+            rng.randint(1, 3)
+        )
+    return f"Sure! {call} Hope that helps."
+
+
+def synthetic_batch(n: int, seed: int = 0) -> list[RewardInput]:
+    """``n`` inputs in GRPO order: groups of ``NUM_GENERATIONS`` per prompt."""
+    rng = random.Random(seed)
+    inputs = []
+    while len(inputs) < n:
+        prompt, tool, keywords = rng.choice(_PROMPTS)
+        for _ in range(NUM_GENERATIONS):
+            inputs.append(RewardInput(_completion(rng, tool), prompt, tool, keywords))
+    return inputs[:n]
+
+
+def score_per_call(
+    computer: ToolCallRewardComputer, inputs: list[RewardInput]
+) -> list[float]:
+    """The unbatched path: one ``compute_total_reward`` call per input."""
+    return [
+        computer.compute_total_reward(
+            item.completion,
+            item.prompt,
+            expected_tool=item.expected_tool,
+            expected_query_keywords=item.expected_query_keywords,
+        )
+        for item in inputs
+    ]
+
+
+def rewards_per_second(
+    score: Callable[[list[RewardInput]], list[float]], inputs: list[RewardInput]
+) -> tuple[float, list[float]]:
+    """Time ``score`` on a cold parse cache."""
+    parse_completion.cache_clear()
+    start = time.perf_counter()
+    rewards = score(inputs)
+    return len(inputs) / (time.perf_counter() - start), rewards
+
+
+def test_batch_matches_per_call_scoring() -> None:
+    """Test batched, deduplicated scoring returns the per-call rewards."""
+    computer = ToolCallRewardComputer()
+    inputs = synthetic_batch(2_000)
+
+    expected = score_per_call(computer, inputs)
+
+    assert computer.compute_batch_rewards(inputs) == expected
+    assert len(set(expected)) > 5  # the workload exercises every reward branch
+
+
+def test_process_pool_matches_serial() -> None:
+    """Test the pool path (chunked, deduplicated) keeps order and values."""
+    computer = ToolCallRewardComputer(tool_weight=3.0)
+    inputs = synthetic_batch(1_000, seed=1)
+
+    with BatchRewardScorer(
+        computer, workers=2, parallel_threshold=100, chunk_size=64
+    ) as scorer:
+        assert scorer.score(inputs) == score_per_call(computer, inputs)
+        assert scorer.score(inputs[:10]) == score_per_call(computer, inputs[:10])
+
+
+def test_reward_throughput() -> None:
+    """Report rewards/sec on the benchmark workload (``-s`` to see it)."""
+    computer = ToolCallRewardComputer()
+    inputs = synthetic_batch(BENCHMARK_COMPLETIONS)
+
+    per_call_rate, expected = rewards_per_second(
+        lambda batch: score_per_call(computer, batch), inputs
+    )
+    batch_rate, rewards = rewards_per_second(computer.compute_batch_rewards, inputs)
+
+    assert rewards == expected
+    print(
+        f"\n{len(inputs):,} completions: per-call {per_call_rate:,.0f}/s, "
+        f"batched {batch_rate:,.0f}/s"
+    )
+
+
+def main() -> int:
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark GRPO reward scoring")
+    parser.add_argument("--completions", type=int, default=BENCHMARK_COMPLETIONS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    computer = ToolCallRewardComputer()
+    inputs = synthetic_batch(args.completions)
+    baseline, expected = rewards_per_second(
+        lambda batch: score_per_call(computer, batch), inputs
+    )
+    print(f"{'run':<12} {'rewards/s':>12} {'speedup':>8}  identical")
+    print(f"{'per-call':<12} {baseline:>12,.0f} {1.0:>7.1f}x  True")
+    for workers in args.workers:
+        with BatchRewardScorer(computer, workers=workers) as scorer:
+            scorer.score(inputs)  # start the pool outside the timing
+            rate, rewards = rewards_per_second(scorer.score, inputs)
+        print(
+            f"{f'batch x{workers}':<12} {rate:>12,.0f} "
+            f"{rate / baseline:>7.1f}x  {rewards == expected}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())